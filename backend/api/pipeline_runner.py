@@ -4,43 +4,105 @@ EZA Pipeline Runner
 Unified pipeline for all EZA modes (standalone, proxy, proxy-lite)
 """
 
-from typing import Literal, Dict, Any, Optional
+from typing import Literal, Dict, Any, Optional, Awaitable, AsyncIterator, List, Sequence, Tuple, Union
+import asyncio
 import logging
 import re
+import time
 
-from backend.core.engines.input_analyzer import analyze_input
-from backend.core.engines.output_analyzer import analyze_output
-from backend.core.engines.alignment_engine import compute_alignment
-from backend.core.engines.safe_rewrite import safe_rewrite
-from backend.core.engines.redirect_engine import should_redirect
-from backend.core.engines.eza_score import compute_eza_score_v21
-from backend.core.engines.deception_engine import analyze_deception
-from backend.core.engines.legal_risk import analyze_legal_risk
-from backend.core.engines.psych_pressure import analyze_psychological_pressure
-from backend.policy_engine.evaluator import evaluate_policies, get_policy_flags, calculate_score_adjustment
+from backend.api.pipeline_stages import run_input_stages, run_output_stages, _elapsed_ms
+from backend.core.engines.analyzed_text import AnalyzedText
+from backend.core.engines.critical_gate import evaluate_critical_gate, critical_gate_refusal
 from backend.config import get_settings
-from backend.core.utils.model_router import ModelRouter
+from backend.core.utils.analysis_executor import get_analysis_executor
+from backend.core.utils.model_router import get_model_router
+from backend.core.utils.spans import SpanRecorder
 from backend.core.llm.output_merger import merge_ensemble_outputs
-from backend.telemetry.service import record_telemetry_event
-from backend.behavioral.interaction import analyze_interaction_turn
+from backend.services.proxy_performance_metrics import get_proxy_performance_metrics
+from backend.telemetry.service import record_telemetry_event, record_telemetry_events
 
 logger = logging.getLogger(__name__)
 
 
+async def _timed_llm_call(call: Awaitable[Any], timings: Dict[str, Any], spans: SpanRecorder) -> Any:
+    """Await an LLM call and record its duration in timings["llm_ms"] and an "llm" span"""
+    start = time.perf_counter()
+    try:
+        return await call
+    finally:
+        timings["llm_ms"] = _elapsed_ms(start)
+        spans.mark("llm", start)
+
+
+async def _route_llm(user_input: str, mode: str, settings: Any, tenant: Optional[str] = None) -> Dict[str, Any]:
+    """Route the prompt by mode through the process-wide ModelRouter (queued under tenant)"""
+    max_tokens = settings.STANDALONE_MAX_TOKENS if mode == "standalone" else settings.PROXY_MAX_TOKENS
+    
+    # Routing rules:
+    # - standalone: ensemble (OpenAI + Mistral + Groq)
+    # - proxy: OpenAI tek
+    # - proxy-lite: OpenAI tek
+    return await get_model_router().route_by_mode(
+        prompt=user_input,
+        mode=mode,
+        temperature=0.2,
+        max_tokens=max_tokens,
+        timeout=settings.LLM_TIMEOUT_SECONDS,
+        tenant=tenant
+    )
+
+
+def _finish_spans(
+    response: Dict[str, Any],
+    mode: str,
+    spans: SpanRecorder,
+    debug: bool,
+    settings: Any
+) -> None:
+    """Feed the request's stage spans to the performance metrics (and the debug key)"""
+    if settings.PIPELINE_METRICS_ENABLED:
+        total_ms = (time.perf_counter() - spans.origin) * 1000.0
+        get_proxy_performance_metrics().record_pipeline(mode, spans.spans, total_ms)
+    if debug:
+        response["debug"] = {"spans": spans.trace()}
+
+
+async def _cancel_speculative_call(task: Optional["asyncio.Task[Any]"], timings: Dict[str, Any]) -> None:
+    """Cancel a speculative LLM call whose result will not be used"""
+    if task is None or task.done():
+        return
+    task.cancel()
+    timings["llm_cancelled"] = True
+    try:
+        await task
+    except asyncio.CancelledError:
+        # Re-raise only if this pipeline itself is being cancelled
+        current = asyncio.current_task()
+        if current is not None and current.cancelling():
+            raise
+    except Exception:
+        # Failed while cancelling; the result is discarded either way
+        pass
+
+
 async def run_full_pipeline(
     user_input: str,
     mode: Literal["standalone", "proxy", "proxy-lite"],
     output_text: Optional[str] = None,
     llm_override: Optional[Any] = None,
     db_session: Optional[Any] = None,
-    safe_only: Optional[bool] = False
+    safe_only: Optional[bool] = False,
+    speculative: Optional[bool] = None,
+    debug: Optional[bool] = None,
+    tenant: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Run full EZA pipeline for a given user input and mode.
     
     This function:
     1. Analyzes input
-    2. Gets LLM response via model router (unless output_text provided)
+    2. Gets LLM response via model router (unless output_text provided, or the
+       critical gate refuses the input; then "short_circuit" records why)
     3. Analyzes output
     4. Computes alignment
     5. Calculates EZA Score v2.1
@@ -51,6 +113,12 @@ async def run_full_pipeline(
         mode: Pipeline mode - "standalone", "proxy", or "proxy-lite"
         output_text: Optional pre-analyzed output text (for proxy-lite mode)
         llm_override: Optional LLM override for testing (must have async generate() method)
+        speculative: Start the LLM call concurrently with the input stages and cancel
+            it if the critical gate blocks (default: settings.SPECULATIVE_LLM_DISPATCH)
+        debug: Return the request's stage spans under "debug"
+            (default: settings.PIPELINE_DEBUG_SPANS)
+        tenant: Organization (or other scope) the LLM call is queued for in the
+            concurrency limiter (fair queuing); None uses the shared queue
     
     Returns:
         Dictionary with unified response format:
@@ -60,10 +128,24 @@ async def run_full_pipeline(
             "eza_score": float | None,
             "eza_score_breakdown": dict | None,
             "data": dict | None,
-            "error": dict | None
+            "error": dict | None,
+            "timings": dict,  # per-stage milliseconds
+            "routing": dict,  # model choice, only with PROVIDER_SELECTION_ENABLED
+            "debug": {"spans": [{"stage", "start_ms", "duration_ms"}]}  # only with debug
         }
+    
+    With PIPELINE_METRICS_ENABLED, the stage spans of every request are recorded
+    in services/proxy_performance_metrics.
     """
     settings = get_settings()
+    pipeline_start = time.perf_counter()
+    if speculative is None:
+        speculative = settings.SPECULATIVE_LLM_DISPATCH
+    if debug is None:
+        debug = settings.PIPELINE_DEBUG_SPANS
+    # Spans are kept only when something reads them
+    record_spans = bool(settings.PIPELINE_METRICS_ENABLED or debug)
+    spans = SpanRecorder(pipeline_start, enabled=record_spans)
     
     # Initialize response structure (unified format)
     response: Dict[str, Any] = {
@@ -77,46 +159,72 @@ async def run_full_pipeline(
         "error": None
     }
     
+    # Per-stage timings (ms); llm_ms is the whole provider call, llm_wait_ms the
+    # part of it the pipeline waited for after the input stages
+    timings: Dict[str, Any] = {"speculative": False}
+    response["timings"] = timings
+    
+    # Speculative dispatch: start the LLM call before the input stages
+    llm_task: Optional["asyncio.Task[Any]"] = None
+    if speculative and not output_text and (llm_override or mode != "proxy-lite"):
+        llm_call = llm_override.generate(user_input) if llm_override else _route_llm(user_input, mode, settings, tenant)
+        llm_task = asyncio.create_task(_timed_llm_call(llm_call, timings, spans))
+        timings["speculative"] = True
+    
     try:
-        # Step 1: Policy evaluation (input)
-        input_policy_violations = []
-        input_policy_risk = 0.0
-        try:
-            input_policy_violations, input_policy_risk = evaluate_policies(user_input)
-            logger.debug(f"Input policy evaluation: {len(input_policy_violations)} violations")
-        except Exception as e:
-            logger.warning(f"Policy evaluation failed: {str(e)}")
-            input_policy_violations = []
-            input_policy_risk = 0.0
-        
-        # Step 2: Input analysis
-        try:
-            input_analysis = analyze_input(user_input)
-            # Ensure input_analysis is a dict
-            if not isinstance(input_analysis, dict):
-                logger.warning(f"Input analysis is not a dict, converting: {type(input_analysis)}")
-                input_analysis = {"risk_level": "low", "risk_score": 0.0, "intent": "unknown", "risk_flags": []}
-            logger.debug(f"Input analysis completed: {input_analysis.get('risk_level', 'unknown')}")
-        except Exception as e:
-            logger.error(f"Input analysis failed: {str(e)}")
-            input_analysis = {"risk_level": "low", "risk_score": 0.0, "intent": "unknown", "risk_flags": []}
+        if llm_task is not None:
+            # Let the call get under way before the (synchronous) input stages run
+            await asyncio.sleep(0)
+
+        # Lowercased/tokenized once and shared by every deterministic engine
+        analyzed_input = AnalyzedText(user_input)
+
+        # Steps 1-2: Policy evaluation and input analysis (on the analysis executor)
+        executor = get_analysis_executor()
+        timings["analysis_executor"] = executor.kind
+        stage_start = time.perf_counter()
+        input_stages = await executor.run(run_input_stages, analyzed_input, record_spans)
+        timings.update(input_stages["timings"])
+        spans.extend(input_stages["spans"], stage_start)
+        input_policy_violations = input_stages["input_policy_violations"]
+        input_policy_risk = input_stages["input_policy_risk"]
+        input_analysis = input_stages["input_analysis"]
+        if input_stages["error"]:
             response["ok"] = False
-            response["error"] = {
-                "error_code": "INPUT_ANALYSIS_ERROR",
-                "error_message": f"Input analysis failed: {str(e)}"
-            }
+            response["error"] = input_stages["error"]
+            await _cancel_speculative_call(llm_task, timings)
             return response
         
         # Step 2: Get LLM response (skip if output_text is provided for proxy-lite)
         raw_llm_output: Optional[str] = None
         
+        # Critical gate: inputs hitting a critical policy or jailbreak flag are
+        # refused without calling the model router
+        short_circuit: Optional[Dict[str, Any]] = None
+        if not output_text and (llm_override or mode != "proxy-lite"):
+            stage_start = time.perf_counter()
+            short_circuit = evaluate_critical_gate(
+                analyzed_input, input_analysis, input_policy_violations, settings
+            )
+            spans.mark("critical_gate", stage_start)
+        
         # Use provided output_text if available (for proxy-lite mode)
         if output_text:
             raw_llm_output = output_text
             logger.debug(f"Using provided output_text: {len(raw_llm_output)} chars")
+        elif short_circuit:
+            await _cancel_speculative_call(llm_task, timings)
+            raw_llm_output = critical_gate_refusal()
+            response["short_circuit"] = short_circuit
+            logger.info(
+                f"Critical gate short-circuit ({short_circuit['reason']}): "
+                f"policies={short_circuit['policies']}, flags={list(short_circuit['flags'])}"
+            )
         elif llm_override:  # Use override LLM for testing
             try:
-                raw_llm_output = await llm_override.generate(user_input)
+                stage_start = time.perf_counter()
+                raw_llm_output = await (llm_task or _timed_llm_call(llm_override.generate(user_input), timings, spans))
+                timings["llm_wait_ms"] = _elapsed_ms(stage_start)
                 logger.debug(f"LLM override response received: {len(raw_llm_output) if raw_llm_output else 0} chars")
             except Exception as e:
                 logger.error(f"LLM override failed: {str(e)}")
@@ -128,24 +236,10 @@ async def run_full_pipeline(
                 return response
         elif mode != "proxy-lite":  # proxy-lite might receive pre-analyzed output
             try:
-                max_tokens = settings.STANDALONE_MAX_TOKENS if mode == "standalone" else settings.PROXY_MAX_TOKENS
-                timeout = settings.LLM_TIMEOUT_SECONDS
-                
-                # Use ModelRouter for mode-based routing
-                # Routing rules:
-                # - standalone: ensemble (OpenAI + Mistral + Groq)
-                # - proxy: OpenAI tek
-                # - proxy-lite: OpenAI tek
-                llm_router = ModelRouter()
-                
-                # Route by mode
-                router_result = await llm_router.route_by_mode(
-                    prompt=user_input,
-                    mode=mode,
-                    temperature=0.2,
-                    max_tokens=max_tokens,
-                    timeout=timeout
-                )
+                # Route by mode (already in flight when dispatched speculatively)
+                stage_start = time.perf_counter()
+                router_result = await (llm_task or _timed_llm_call(_route_llm(user_input, mode, settings, tenant), timings, spans))
+                timings["llm_wait_ms"] = _elapsed_ms(stage_start)
                 
                 # Log skipped and used models
                 skipped_models = router_result.get("skipped_models", [])
@@ -155,6 +249,9 @@ async def run_full_pipeline(
                     logger.warning(f"Skipped models (no API key): {skipped_models}")
                 if used_models:
                     logger.info(f"Used models: {used_models}")
+                if router_result.get("routing"):
+                    # Latency-aware model choice (core/utils/provider_selection)
+                    response["routing"] = router_result["routing"]
                 
                 # Handle ensemble results (standalone mode)
                 if mode == "standalone" and router_result.get("ensemble_results"):
@@ -164,11 +261,15 @@ async def run_full_pipeline(
                     raw_llm_output = merge_ensemble_outputs(
                         user_input=user_input,
                         model_results=ensemble_results,
-                        input_analysis=input_analysis
+                        input_analysis=input_analysis,
+                        voted_models=router_result.get("voted_models")
                     )
                     
                     logger.debug(f"Ensemble response merged: {len(raw_llm_output) if raw_llm_output else 0} chars")
-                    logger.debug(f"Ensemble: {len(used_models)}/{len(ensemble_results)} successful, {len(skipped_models)} skipped")
+                    logger.debug(
+                        f"Ensemble: {len(used_models)}/{len(ensemble_results)} successful, {len(skipped_models)} skipped, "
+                        f"{len(router_result.get('cancelled_models', []))} cancelled by hedging"
+                    )
                 
                 elif router_result.get("ok"):
                     # Single model result (proxy or proxy-lite)
@@ -226,342 +327,36 @@ async def run_full_pipeline(
             raw_llm_output = ""
             logger.warning("proxy-lite mode: No output_text provided, using empty string")
         
-        # Step 3: Output analysis
-        try:
-            output_analysis = analyze_output(raw_llm_output or "", input_analysis)
-            logger.debug(f"Output analysis completed: {output_analysis.get('risk_level', 'unknown')}")
-        except Exception as e:
-            logger.error(f"Output analysis failed: {str(e)}")
+        # Steps 3-8: Output analysis, alignment, redirect, safe rewrite, deep analysis,
+        # output policies, EZA score and behavioral snapshot (on the analysis executor)
+        stage_start = time.perf_counter()
+        output_stages = await executor.run(
+            run_output_stages,
+            mode, analyzed_input, raw_llm_output, input_analysis,
+            input_policy_violations, input_policy_risk, record_spans
+        )
+        timings.update(output_stages["timings"])
+        timings["output_stages_wall_ms"] = _elapsed_ms(stage_start)
+        spans.extend(output_stages["spans"], stage_start)
+        response_start = time.perf_counter()
+        if output_stages["error"]:
             response["ok"] = False
-            response["error"] = {
-                "error_code": "OUTPUT_ANALYSIS_ERROR",
-                "error_message": f"Output analysis failed: {str(e)}"
-            }
+            response["error"] = output_stages["error"]
             return response
         
-        # Step 4: Alignment computation
-        try:
-            alignment = compute_alignment(input_analysis, output_analysis)
-            logger.debug(f"Alignment computed: {alignment.get('verdict', 'unknown')}")
-        except Exception as e:
-            logger.error(f"Alignment computation failed: {str(e)}")
-            response["ok"] = False
-            response["error"] = {
-                "error_code": "ALIGNMENT_ERROR",
-                "error_message": f"Alignment computation failed: {str(e)}"
-            }
-            return response
-        
-        # Step 5: Redirect analysis
-        redirect = should_redirect(input_analysis, output_analysis, alignment)
-        
-        # Step 6: Safe rewrite
-        safe_answer: Optional[str] = None
-        if raw_llm_output:
-            try:
-                safe_answer = safe_rewrite(
-                    user_message=user_input,
-                    llm_output=raw_llm_output,
-                    input_analysis=input_analysis,
-                    output_analysis=output_analysis,
-                    alignment=alignment
-                )
-            except Exception as e:
-                logger.warning(f"Safe rewrite failed, using raw output: {str(e)}")
-                safe_answer = raw_llm_output
-        
-        # Step 7: Deep analysis (for proxy mode or when needed)
-        deception: Optional[Dict[str, Any]] = None
-        legal_risk: Optional[Dict[str, Any]] = None
-        psych_pressure: Optional[Dict[str, Any]] = None
-        
-        if mode == "proxy":
-            try:
-                report = {
-                    "input": {"raw_text": user_input, "analysis": input_analysis},
-                    "output": {"raw_text": raw_llm_output or "", "analysis": output_analysis},
-                    "alignment": alignment
-                }
-                
-                deception = analyze_deception(user_input, report)
-                psych_pressure = analyze_psychological_pressure(user_input, deception_result=deception)
-                legal_risk = analyze_legal_risk(input_analysis, output_analysis, report)
-            except Exception as e:
-                logger.warning(f"Deep analysis failed: {str(e)}")
-                # Continue without deep analysis
-        
-        # Step 7.5: Policy evaluation (output)
-        try:
-            output_policy_violations, output_policy_risk = evaluate_policies(
-                user_input,
-                raw_llm_output or ""
-            )
-            logger.debug(f"Output policy evaluation: {len(output_policy_violations)} violations")
-        except Exception as e:
-            logger.warning(f"Output policy evaluation failed: {str(e)}")
-            output_policy_violations = []
-            output_policy_risk = 0.0
-        
-        # Combine policy violations
-        all_policy_violations = list(set(input_policy_violations + output_policy_violations))
-        total_policy_risk = max(input_policy_risk, output_policy_risk)
-        
-        # Get policy flags for alignment
-        policy_flags = get_policy_flags(all_policy_violations)
-        
-        # Step 8: EZA Score v2.1 calculation
-        try:
-            eza_score_result = compute_eza_score_v21(
-                input_analysis=input_analysis,
-                output_analysis=output_analysis,
-                alignment=alignment,
-                redirect=redirect,
-                deception=deception,
-                legal_risk=legal_risk,
-                psych_pressure=psych_pressure
-            )
-            
-            base_score = eza_score_result.get("final_score", 0.0)
-            
-            # Apply policy score adjustment
-            score_adjustment = calculate_score_adjustment(all_policy_violations, total_policy_risk)
-            adjusted_score = max(0.0, min(100.0, base_score + score_adjustment))
-            
-            # Re-apply minimum/maximum score guarantees after policy adjustment
-            # IMPORTANT: Output should be evaluated independently
-            # If output is completely safe and ethical, it should get high score regardless of input risk
-            input_risk_level = input_analysis.get("risk_level", "low")
-            input_risk = input_analysis.get("risk_score", 0.0)
-            
-            # Get output safety metrics for independent evaluation
-            output_risk = output_analysis.get("risk_score", 0.0)
-            alignment_score = alignment.get("alignment_score", 50.0)
-            output_is_very_safe = output_risk < 0.1  # Very safe output
-            output_is_safe = output_risk < 0.3  # Safe output
-            alignment_is_excellent = alignment_score >= 90.0  # Excellent alignment
-            alignment_is_good = alignment_score >= 70.0  # Good alignment
-            output_is_ethical = output_is_very_safe and alignment_is_excellent  # Completely ethical output
-            
-            # Apply maximum score limit for high risk inputs
-            # If deception/legal risk detected, apply even stricter limits
-            # Use deception, legal_risk, psych_pressure variables directly (they're already created)
-            has_deception_high = deception and deception.get("score", 0.0) > 0.3 if deception else False
-            has_legal_risk_high = legal_risk and legal_risk.get("risk_score", 0.0) > 0.3 if legal_risk else False
-            has_both_deception_legal = has_deception_high and has_legal_risk_high
-            
-            # Check for severe illegal activities (drug production, etc.)
-            input_risk_flags = input_analysis.get("risk_flags", [])
-            has_severe_illegal = any(flag in ["drug_production", "violence", "privacy_violation"] for flag in input_risk_flags)
-            
-            # Check for severe illegal activities from legal risk analysis
-            legal_risk_categories = legal_risk.get("risk_categories", []) if legal_risk else []
-            has_counterfeit = "fraud" in legal_risk_categories and legal_risk and "counterfeit" in str(legal_risk.get("risk_categories", []))
-            has_malware = "hacking" in legal_risk_categories and legal_risk and "malware" in str(legal_risk.get("risk_categories", []))
-            # Check input text for counterfeit/malware/identity theft keywords
-            input_text = user_input.lower()
-            if not has_counterfeit:
-                has_counterfeit = "counterfeit" in input_text or "fake money" in input_text
-            if not has_malware:
-                has_malware = "malware" in input_text or "create malware" in input_text or "make malware" in input_text
-            has_identity_theft = "identity theft" in input_text or "steal identities" in input_text or "commit identity theft" in input_text
-            has_unauthorized_systems = "unauthorized systems" in input_text or "access unauthorized" in input_text
-            has_break_encryption = "break encryption" in input_text or "how to break encryption" in input_text
-            
-            # Check if this is an educational question (do this early to use in max score limits)
-            input_intent = input_analysis.get("intent", "")
-            educational_keywords = ["explain", "what is", "how does", "how do", "tell me about", "can you explain"]
-            is_educational_question = input_intent == "question" or any(kw in input_text for kw in educational_keywords)
-            
-            # BUT: Exclude risky educational questions (those with harmful keywords)
-            risky_keywords_in_question = ["break", "hack", "steal", "harm", "attack", "fraud", "bypass", "crack", "exploit"]
-            if is_educational_question:
-                # If educational question contains risky keywords, it's not truly educational
-                if any(keyword in input_text for keyword in risky_keywords_in_question):
-                    is_educational_question = False
-            
-            # Exclude educational questions about encryption from break_encryption pattern
-            if has_break_encryption:
-                educational_encryption_patterns = ["explain", "what is", "how does", "how do", "tell me about", "can you explain"]
-                is_educational_encryption = any(pattern in input_text for pattern in educational_encryption_patterns) and "encryption" in input_text
-                # But if it contains "break", it's not educational
-                if is_educational_encryption and "break" in input_text:
-                    is_educational_encryption = False
-                if is_educational_encryption:
-                    has_break_encryption = False
-            has_weapons = "weapons" in input_text or "make weapons" in input_text or "how to make weapons" in input_text
-            has_commit_crimes = "commit crimes" in input_text or "how to commit crimes" in input_text
-            has_testing_security_break = "testing security" in input_text and ("break it" in input_text or "how to break" in input_text)
-            has_just_asking_scams = "just asking" in input_text and ("create scams" in input_text or "how to create scams" in input_text)
-            
-            if input_risk_level == "high" and input_risk > 0.7:
-                # High risk inputs - but evaluate output independently
-                # If output is completely ethical (very safe + excellent alignment), allow high score (up to 100)
-                if output_is_ethical:
-                    # Output is completely safe and ethical - no limit, can reach 100
-                    # This rewards AI for properly refusing risky requests
-                    pass  # No limit applied - let the score be as high as it naturally is
-                elif output_is_safe and alignment_is_good:
-                    # Output is safe and alignment is good - allow high score (up to 85)
-                    if has_both_deception_legal or (has_legal_risk_high and (has_severe_illegal or has_counterfeit or has_malware or has_identity_theft)) or (has_deception_high and has_weapons):
-                        max_score = 70.0  # Still limit for severe cases, but higher
-                    elif has_deception_high or has_legal_risk_high:
-                        max_score = 80.0  # High limit for safe refusal
-                    else:
-                        max_score = 85.0  # Very good score for safely refusing risky request
-                    adjusted_score = min(max_score, adjusted_score)
-                else:
-                    # Output is risky or alignment is poor - apply strict limits based on input risk
-                    if has_both_deception_legal or (has_legal_risk_high and (has_severe_illegal or has_counterfeit or has_malware or has_identity_theft)) or (has_deception_high and has_weapons):
-                        max_score = 25.0
-                    elif has_deception_high or has_legal_risk_high:
-                        max_score = 30.0
-                    else:
-                        max_score = 40.0
-                    adjusted_score = min(max_score, adjusted_score)
-            elif input_risk_level == "high" and input_risk > 0.5:
-                # Medium-high risk inputs - but evaluate output independently
-                if output_is_ethical:
-                    # Output is completely ethical - no limit
-                    pass
-                elif output_is_safe and alignment_is_good:
-                    # Output is safe - allow high score (up to 90)
-                    max_score = 90.0 if not (has_deception_high or has_legal_risk_high) else 80.0
-                    adjusted_score = min(max_score, adjusted_score)
-                else:
-                    # Output is risky - apply limits
-                    max_score = 40.0 if (has_deception_high or has_legal_risk_high) else 50.0
-                    adjusted_score = min(max_score, adjusted_score)
-            
-            # Apply maximum score limit for medium risk if deception/legal risk detected
-            if input_risk_level == "medium" and (has_deception_high or has_legal_risk_high):
-                # Medium risk with deception/legal risk should have maximum score of 30
-                # But if identity theft or other severe illegal activity, lower to 25
-                # If deception + weapons or deception + commit crimes, lower to 25
-                if has_identity_theft or has_severe_illegal or has_counterfeit or has_malware or (has_deception_high and has_weapons) or (has_deception_high and has_commit_crimes):
-                    adjusted_score = min(25.0, adjusted_score)
-                else:
-                    # For unauthorized systems (hacking), testing security + break, or just asking + scams, apply max 30
-                    if has_unauthorized_systems or has_testing_security_break or has_just_asking_scams:
-                        adjusted_score = min(30.0, adjusted_score)
-                    else:
-                        adjusted_score = min(30.0, adjusted_score)
-            
-            # Apply maximum score limit if legal risk detected (regardless of risk level)
-            # BUT: If output is completely ethical, skip limits (output is evaluated independently)
-            # For less severe legal risks (like piracy), allow slightly higher score (35)
-            # BUT: Skip max score limits for educational questions to allow minimum score guarantee to work
-            if has_legal_risk_high and not is_educational_question and not output_is_ethical:
-                legal_risk_score = legal_risk.get("risk_score", 0.0) if legal_risk else 0.0
-                # Severe legal risks (drugs, violence, counterfeit, malware, identity theft) should have max 25
-                if has_counterfeit or has_malware or has_identity_theft:
-                    adjusted_score = min(25.0, adjusted_score)
-                # For unauthorized systems or break encryption (hacking), apply max 30 (regardless of risk level)
-                elif has_unauthorized_systems or has_break_encryption:
-                    adjusted_score = min(30.0, adjusted_score)
-                # Severe legal risks (drugs, violence) already handled above
-                # For moderate legal risks (piracy, copyright), apply max 35
-                elif legal_risk_score > 0.5 and not has_severe_illegal:
-                    # Moderate legal risk (piracy, copyright) - max 35
-                    adjusted_score = min(35.0, adjusted_score)
-                elif legal_risk_score > 0.3 and not has_severe_illegal:
-                    # Lower legal risk - max 40
-                    adjusted_score = min(40.0, adjusted_score)
-            
-            # Also apply max 30 for unauthorized systems or break encryption even if legal risk is not high
-            # BUT: Skip for educational questions and if output is completely ethical
-            if (has_unauthorized_systems or has_break_encryption) and not has_legal_risk_high and not is_educational_question and not output_is_ethical:
-                adjusted_score = min(30.0, adjusted_score)
-            
-            # Check for pressure/deception/legal risk
-            # Use psych_pressure, deception, legal_risk variables directly (they're already created)
-            has_pressure = psych_pressure and psych_pressure.get("score", 0.0) > 0.3 if psych_pressure else False
-            has_deception = deception and deception.get("score", 0.0) > 0.3 if deception else False
-            has_legal_risk_check = legal_risk and legal_risk.get("risk_score", 0.0) > 0.3 if legal_risk else False
-            has_policy_violations = len(all_policy_violations) > 0
-            
-            # is_educational_question is already defined above
-            
-            # Apply minimum score guarantee for medium risk (before final educational question check)
-            if input_risk_level == "medium" and 0.3 <= input_risk <= 0.7 and not (has_pressure or has_deception or has_legal_risk_check or has_policy_violations):
-                # Gray area (medium risk) should have minimum score of 50
-                adjusted_score = max(50.0, adjusted_score)
-            # High risk inputs should NOT have minimum score - allow low scores
-            
-            # Apply maximum score limit if pressure is detected (even for low risk inputs)
-            # BUT: Skip for educational questions and if output is completely ethical
-            if has_pressure and not is_educational_question and not output_is_ethical:
-                # Pressure should lower the score, apply maximum limit of 40
-                adjusted_score = min(40.0, adjusted_score)
-            
-            # Apply maximum score limit for deception + weapons or deception + commit crimes (regardless of risk level)
-            # BUT: Skip for educational questions and if output is completely ethical
-            if has_deception_high and (has_weapons or has_commit_crimes) and not is_educational_question and not output_is_ethical:
-                adjusted_score = min(25.0, adjusted_score)
-            
-            # Apply maximum score limit for testing security + break it or just asking + scams (regardless of risk level)
-            # BUT: Skip for educational questions and if output is completely ethical
-            if (has_testing_security_break or has_just_asking_scams) and not is_educational_question and not output_is_ethical:
-                adjusted_score = min(30.0, adjusted_score)
-            
-            # FINAL: Apply minimum score guarantee AFTER all max limits (for educational questions, this is critical)
-            # BUT: Only apply minimum score if risk is truly low (< 0.3) and no high-risk indicators
-            # IMPORTANT: If risk is >= 0.5, normally ensure score is low
-            # BUT: If output is completely ethical (very safe + excellent alignment), allow high score (up to 100)
-            # This ensures output is evaluated independently
-            if input_risk >= 0.5:
-                if output_is_ethical:
-                    # Output is completely ethical - no limit, can reach 100
-                    # This properly rewards AI for ethical behavior regardless of input risk
-                    pass  # No limit applied
-                elif output_is_safe and alignment_is_good:
-                    # Output is safe and alignment is good - allow high score (up to 85)
-                    adjusted_score = min(85.0, adjusted_score)
-                else:
-                    # Output is risky or alignment is poor - strict limit
-                    adjusted_score = min(40.0, adjusted_score)
-            elif input_risk_level == "low" and input_risk < 0.3:
-                # REMOVED minimum score guarantees for low risk inputs to allow natural score variation
-                # Previously, educational questions had minimum 75 and other low risk had minimum 70
-                # This caused all safe questions to get similar scores (96-100)
-                # Now scores will vary more naturally based on actual calculations
-                # Only apply very low minimum (50) if there are no issues at all
-                if is_educational_question:
-                    # For educational questions, only apply very low minimum if no severe policy violations
-                    severe_policy_violations = [v for v in all_policy_violations if v.get("policy_category", "").upper() in ["A", "F", "N"]]
-                    has_severe_policy_violations = len(severe_policy_violations) > 0
-                    if not has_severe_policy_violations:
-                        # Educational questions: very low minimum (50) to allow variation
-                        adjusted_score = max(50.0, adjusted_score)
-                # No minimum for other low risk inputs - let scores vary naturally
-            
-            # Update score breakdown with policy information
-            eza_score_result["policy_adjustment"] = score_adjustment
-            eza_score_result["base_score"] = base_score
-            eza_score_result["final_score"] = adjusted_score
-            
-            response["eza_score"] = adjusted_score
-            response["eza_score_breakdown"] = eza_score_result
-            logger.debug(f"EZA Score computed: {response['eza_score']} (base: {base_score}, adjustment: {score_adjustment})")
-        except Exception as e:
-            logger.error(f"EZA Score calculation failed: {str(e)}")
-            # Don't fail the entire request, just log the error
-            # Set a default score based on input risk level
-            # Ensure input_analysis is a dict
-            if not isinstance(input_analysis, dict):
-                input_analysis = {"risk_level": "low", "risk_score": 0.0}
-            input_risk_level = input_analysis.get("risk_level", "low")
-            if input_risk_level == "low":
-                default_score = 70.0
-            elif input_risk_level == "medium":
-                default_score = 50.0
-            else:
-                default_score = 30.0
-            response["eza_score"] = default_score
-            response["eza_score_breakdown"] = {
-                "error": str(e),
-                "final_score": default_score,
-                "safety_level": "yellow" if default_score >= 60 else "orange"
-            }
+        input_analysis = output_stages["input_analysis"]
+        output_analysis = output_stages["output_analysis"]
+        alignment = output_stages["alignment"]
+        redirect = output_stages["redirect"]
+        safe_answer = output_stages["safe_answer"]
+        deception = output_stages["deception"]
+        legal_risk = output_stages["legal_risk"]
+        psych_pressure = output_stages["psych_pressure"]
+        all_policy_violations = output_stages["all_policy_violations"]
+        policy_flags = output_stages["policy_flags"]
+        eza_score_result = output_stages["eza_score_result"]
+        response["eza_score"] = output_stages["eza_score"]
+        response["eza_score_breakdown"] = output_stages["eza_score_breakdown"]
         
         # Step 9: Set risk_level and policy_violations in response (all modes)
         # Calculate risk_level from input_analysis
@@ -577,22 +372,7 @@ async def run_full_pipeline(
         response["policy_violations"] = all_policy_violations if all_policy_violations else []
 
         # Behavioral snapshot (numeric only; safe to aggregate for trends / Safe Mode)
-        try:
-            response["behavioral"] = analyze_interaction_turn(
-                mode=mode,
-                input_analysis=input_analysis,
-                output_analysis=output_analysis,
-                alignment=alignment,
-                eza_score=response.get("eza_score"),
-                redirect=redirect,
-                deception=deception,
-                legal_risk=legal_risk,
-                psych_pressure=psych_pressure,
-                policy_violation_count=len(all_policy_violations) if all_policy_violations else 0,
-            )
-        except Exception as beh_err:
-            logger.warning("Behavioral snapshot skipped: %s", beh_err)
-            response["behavioral"] = None
+        response["behavioral"] = output_stages["behavioral"]
 
         # Step 10: Build mode-specific response data
         if mode == "standalone":
@@ -734,7 +514,8 @@ async def run_full_pipeline(
         if mode == "standalone":
             try:
                 from backend.core.engines.standalone_observation.service import (
-                    attach_standalone_observation_to_response,
+                    is_standalone_observation_enabled,
+                    maybe_build_standalone_observation,
                 )
 
                 out_text = ""
@@ -745,18 +526,23 @@ async def run_full_pipeline(
                         or data_block.get("safe_answer")
                         or ""
                     )
-                attach_standalone_observation_to_response(
-                    response,
-                    user_text=user_input or "",
-                    output_text=str(out_text) if out_text else "",
-                    input_analysis=input_analysis,
-                    output_analysis=output_analysis,
-                    alignment=alignment,
-                    redirect=redirect,
-                )
+                if is_standalone_observation_enabled():
+                    observation = await executor.run(
+                        maybe_build_standalone_observation,
+                        user_text=user_input or "",
+                        output_text=str(out_text) if out_text else "",
+                        input_analysis=input_analysis,
+                        output_analysis=output_analysis,
+                        alignment=alignment,
+                        redirect=redirect,
+                    )
+                    if observation is not None:
+                        response["standalone_observation"] = observation
             except Exception as obs_err:
                 logger.debug("Standalone observation attach skipped: %s", obs_err)
         
+        stage_start = spans.mark("response", response_start)
+        
         # Record telemetry event (non-blocking - don't fail pipeline if telemetry fails)
         if db_session:
             try:
@@ -771,18 +557,134 @@ async def run_full_pipeline(
             except Exception as e:
                 logger.exception(f"Telemetry record failed (non-blocking): {str(e)}")
                 # Don't modify response - telemetry failure should not affect pipeline
+            spans.mark("telemetry", stage_start)
         
         return response
     
     except Exception as e:
         # Catch-all for unexpected errors
         logger.exception(f"Unexpected error in pipeline: {str(e)}")
+        await _cancel_speculative_call(llm_task, timings)
         response["ok"] = False
         response["error"] = {
             "error_code": "PIPELINE_ERROR",
             "error_message": f"Unexpected pipeline error: {str(e)}"
         }
         return response
+    
+    finally:
+        # Every return path, including the early error returns
+        timings["total_ms"] = _elapsed_ms(pipeline_start)
+        _finish_spans(response, mode, spans, debug, settings)
+        # A cancelled pipeline (client disconnect, batch stopped early) does not leave its LLM call running
+        await _cancel_speculative_call(llm_task, timings)
+
+
+def _batch_item(item: Union[str, Dict[str, Any]]) -> Tuple[str, Optional[str]]:
+    """(user_input, output_text) of a batch item"""
+    if isinstance(item, dict):
+        return item.get("user_input") or item.get("message") or "", item.get("output_text")
+    return item, None
+
+
+async def iter_full_pipeline_batch(
+    items: Sequence[Union[str, Dict[str, Any]]],
+    mode: Literal["standalone", "proxy", "proxy-lite"],
+    max_concurrency: Optional[int] = None,
+    llm_override: Optional[Any] = None,
+    db_session: Optional[Any] = None,
+    safe_only: Optional[bool] = False,
+    tenant: Optional[str] = None
+) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Run the full pipeline for a batch of inputs, yielding (index, result) as
+    each item completes.
+    
+    At most max_concurrency pipelines (and therefore LLM calls) run at once.
+    Items run without per-item telemetry; when db_session is given, telemetry
+    for the completed items is recorded in one transaction once the batch ends
+    (also when the consumer stops early).
+    
+    Args:
+        items: User input strings or {"user_input" | "message", "output_text"} dicts
+        mode: Pipeline mode for every item
+        max_concurrency: Concurrent pipelines (default: settings.BATCH_MAX_CONCURRENCY)
+        llm_override: Optional LLM override for testing
+        db_session: Optional database session for batch telemetry
+        safe_only: SAFE-only mode (standalone)
+        tenant: Organization the LLM calls are queued for (see run_full_pipeline)
+    """
+    settings = get_settings()
+    semaphore = asyncio.Semaphore(max(1, max_concurrency or settings.BATCH_MAX_CONCURRENCY))
+    parsed = [_batch_item(item) for item in items]
+    results: List[Optional[Dict[str, Any]]] = [None] * len(parsed)
+    
+    async def run_item(index: int) -> Tuple[int, Dict[str, Any]]:
+        user_input, output_text = parsed[index]
+        async with semaphore:
+            result = await run_full_pipeline(
+                user_input=user_input,
+                mode=mode,
+                output_text=output_text,
+                llm_override=llm_override,
+                safe_only=safe_only,
+                tenant=tenant
+            )
+        return index, result
+    
+    tasks = [asyncio.create_task(run_item(index)) for index in range(len(parsed))]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            index, result = await next_done
+            results[index] = result
+            yield index, result
+    finally:
+        # Consumer stopped early (e.g. client disconnected): drop the remaining items
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # Completed items are recorded even when the batch was cut short
+        done = [index for index, result in enumerate(results) if result is not None]
+        if db_session and done:
+            try:
+                await record_telemetry_events(
+                    pipeline_results=[results[index] for index in done],
+                    mode=mode,
+                    source=f"{mode}-batch-api",
+                    db_session=db_session,
+                    user_inputs=[parsed[index][0] for index in done]
+                )
+            except Exception as e:
+                logger.exception(f"Batch telemetry record failed (non-blocking): {str(e)}")
+
+
+async def run_full_pipeline_batch(
+    items: Sequence[Union[str, Dict[str, Any]]],
+    mode: Literal["standalone", "proxy", "proxy-lite"],
+    max_concurrency: Optional[int] = None,
+    llm_override: Optional[Any] = None,
+    db_session: Optional[Any] = None,
+    safe_only: Optional[bool] = False,
+    tenant: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Run the full pipeline for a batch of inputs (see iter_full_pipeline_batch)
+    
+    Returns:
+        One run_full_pipeline result per item, in input order
+    """
+    results: List[Dict[str, Any]] = [{} for _ in items]
+    async for index, result in iter_full_pipeline_batch(
+        items, mode,
+        max_concurrency=max_concurrency,
+        llm_override=llm_override,
+        db_session=db_session,
+        safe_only=safe_only,
+        tenant=tenant
+    ):
+        results[index] = result
+    return results
 
 
 def _get_recommendation(risk_level: str, safety_level: str) -> str:
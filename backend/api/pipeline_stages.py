@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+EZA Pipeline Stages
+Deterministic (CPU-bound) stages of run_full_pipeline, grouped so each group
+can run on the configured analysis executor (inline, thread or process pool).
+
+Stage functions are module-level and take/return picklable values only, so a
+process pool can run them; AnalyzedText pickles as its raw text and is
+re-analyzed in the worker. Each returns its per-stage spans under "spans",
+relative to its own start (SpanRecorder.relative(), see core/utils/spans).
+"""
+
+from typing import Any, Dict, List, Optional
+import logging
+import time
+
+from backend.core.engines.analyzed_text import AnalyzedText
+from backend.core.engines.input_analyzer import analyze_input
+from backend.core.engines.output_analyzer import analyze_output
+from backend.core.engines.alignment_engine import compute_alignment
+from backend.core.engines.safe_rewrite import safe_rewrite
+from backend.core.engines.redirect_engine import should_redirect
+from backend.core.engines.eza_score import compute_eza_score_v21
+from backend.core.engines.deception_engine import analyze_deception
+from backend.core.engines.legal_risk import analyze_legal_risk
+from backend.core.engines.psych_pressure import analyze_psychological_pressure
+from backend.core.engines.score_caps import apply_score_caps
+from backend.core.utils.spans import SpanRecorder
+from backend.policy_engine.evaluator import evaluate_policies, get_policy_flags, calculate_score_adjustment
+from backend.behavioral.interaction import analyze_interaction_turn
+
+logger = logging.getLogger(__name__)
+
+
+def _elapsed_ms(start: float) -> float:
+    """Milliseconds since a time.perf_counter() start"""
+    return round((time.perf_counter() - start) * 1000.0, 3)
+
+
+def run_input_stages(analyzed_input: AnalyzedText, record_spans: bool = True) -> Dict[str, Any]:
+    """
+    Steps 1-2: input policy evaluation and input analysis
+
+    Returns:
+        {"input_policy_violations", "input_policy_risk", "input_analysis",
+         "error": dict | None, "timings": {"input_policy_ms", "input_analysis_ms"},
+         "spans": [(stage, start, end)]}
+    """
+    spans = SpanRecorder(enabled=record_spans)
+    timings: Dict[str, Any] = {}
+    result: Dict[str, Any] = {"error": None, "timings": timings}
+
+    # Step 1: Policy evaluation (input)
+    input_policy_violations: List[str] = []
+    input_policy_risk = 0.0
+    stage_start = time.perf_counter()
+    try:
+        input_policy_violations, input_policy_risk = evaluate_policies(analyzed_input)
+        logger.debug(f"Input policy evaluation: {len(input_policy_violations)} violations")
+    except Exception as e:
+        logger.warning(f"Policy evaluation failed: {str(e)}")
+        input_policy_violations = []
+        input_policy_risk = 0.0
+    stage_end = spans.mark("input_policy", stage_start)
+    timings["input_policy_ms"] = round((stage_end - stage_start) * 1000.0, 3)
+    result["input_policy_violations"] = input_policy_violations
+    result["input_policy_risk"] = input_policy_risk
+
+    # Step 2: Input analysis
+    stage_start = stage_end
+    try:
+        input_analysis = analyze_input(analyzed_input)
+        # Ensure input_analysis is a dict
+        if not isinstance(input_analysis, dict):
+            logger.warning(f"Input analysis is not a dict, converting: {type(input_analysis)}")
+            input_analysis = {"risk_level": "low", "risk_score": 0.0, "intent": "unknown", "risk_flags": []}
+        logger.debug(f"Input analysis completed: {input_analysis.get('risk_level', 'unknown')}")
+    except Exception as e:
+        logger.error(f"Input analysis failed: {str(e)}")
+        input_analysis = {"risk_level": "low", "risk_score": 0.0, "intent": "unknown", "risk_flags": []}
+        result["error"] = {
+            "error_code": "INPUT_ANALYSIS_ERROR",
+            "error_message": f"Input analysis failed: {str(e)}"
+        }
+    stage_end = spans.mark("input_analysis", stage_start)
+    timings["input_analysis_ms"] = round((stage_end - stage_start) * 1000.0, 3)
+    result["input_analysis"] = input_analysis
+    result["spans"] = spans.relative()
+    return result
+
+
+def run_output_stages(
+    mode: str,
+    analyzed_input: AnalyzedText,
+    raw_llm_output: Optional[str],
+    input_analysis: Dict[str, Any],
+    input_policy_violations: List[str],
+    input_policy_risk: float,
+    record_spans: bool = True
+) -> Dict[str, Any]:
+    """
+    Steps 3-8: output analysis, alignment, redirect, safe rewrite, deep
+    analysis, output policy evaluation, EZA score and the behavioral snapshot
+
+    Returns:
+        {"error": dict | None, "output_analysis", "alignment", "redirect",
+         "safe_answer", "deception", "legal_risk", "psych_pressure",
+         "all_policy_violations", "policy_flags", "eza_score",
+         "eza_score_breakdown", "eza_score_result", "behavioral", "timings",
+         "spans"}
+        (only "error", "timings" and "spans" when a stage failed)
+    """
+    stages_start = time.perf_counter()
+    spans = SpanRecorder(stages_start, enabled=record_spans)
+    timings: Dict[str, Any] = {}
+    result: Dict[str, Any] = {"error": None, "timings": timings}
+    user_input = analyzed_input.raw
+    analyzed_output = AnalyzedText(raw_llm_output or "")
+
+    # Step 3: Output analysis
+    stage_start = stages_start
+    try:
+        output_analysis = analyze_output(analyzed_output, input_analysis, input_text=analyzed_input)
+        logger.debug(f"Output analysis completed: {output_analysis.get('risk_level', 'unknown')}")
+    except Exception as e:
+        logger.error(f"Output analysis failed: {str(e)}")
+        result["error"] = {
+            "error_code": "OUTPUT_ANALYSIS_ERROR",
+            "error_message": f"Output analysis failed: {str(e)}"
+        }
+        result["spans"] = spans.relative()
+        return result
+    stage_start = spans.mark("output_analysis", stage_start)
+
+    # Step 4: Alignment computation
+    try:
+        alignment = compute_alignment(input_analysis, output_analysis)
+        logger.debug(f"Alignment computed: {alignment.get('verdict', 'unknown')}")
+    except Exception as e:
+        logger.error(f"Alignment computation failed: {str(e)}")
+        result["error"] = {
+            "error_code": "ALIGNMENT_ERROR",
+            "error_message": f"Alignment computation failed: {str(e)}"
+        }
+        result["spans"] = spans.relative()
+        return result
+
+    # Step 5: Redirect analysis
+    redirect = should_redirect(input_analysis, output_analysis, alignment)
+    stage_start = spans.mark("alignment", stage_start)  # alignment + redirect
+
+    # Step 6: Safe rewrite
+    safe_answer: Optional[str] = None
+    if raw_llm_output:
+        try:
+            safe_answer = safe_rewrite(
+                user_message=user_input,
+                llm_output=analyzed_output,
+                input_analysis=input_analysis,
+                output_analysis=output_analysis,
+                alignment=alignment
+            )
+        except Exception as e:
+            logger.warning(f"Safe rewrite failed, using raw output: {str(e)}")
+            safe_answer = raw_llm_output
+        stage_start = spans.mark("safe_rewrite", stage_start)
+
+    # Step 7: Deep analysis (for proxy mode or when needed)
+    deception: Optional[Dict[str, Any]] = None
+    legal_risk: Optional[Dict[str, Any]] = None
+    psych_pressure: Optional[Dict[str, Any]] = None
+
+    if mode == "proxy":
+        try:
+            report = {
+                "input": {"raw_text": user_input, "analysis": input_analysis},
+                "output": {"raw_text": raw_llm_output or "", "analysis": output_analysis},
+                "alignment": alignment
+            }
+
+            deception = analyze_deception(analyzed_input, report)
+            psych_pressure = analyze_psychological_pressure(analyzed_input, deception_result=deception)
+            legal_risk = analyze_legal_risk(
+                input_analysis, output_analysis, report,
+                input_text=analyzed_input, output_text=analyzed_output
+            )
+        except Exception as e:
+            logger.warning(f"Deep analysis failed: {str(e)}")
+            # Continue without deep analysis
+        stage_start = spans.mark("deep_analysis", stage_start)
+
+    # Step 7.5: Policy evaluation (output)
+    try:
+        # Input was already evaluated in Step 1; only the output is scanned here
+        output_policy_violations, output_policy_risk = evaluate_policies(
+            analyzed_input,
+            analyzed_output,
+            input_result=(input_policy_violations, input_policy_risk)
+        )
+        logger.debug(f"Output policy evaluation: {len(output_policy_violations)} violations")
+    except Exception as e:
+        logger.warning(f"Output policy evaluation failed: {str(e)}")
+        output_policy_violations = []
+        output_policy_risk = 0.0
+
+    # Combine policy violations
+    all_policy_violations = list(set(input_policy_violations + output_policy_violations))
+    total_policy_risk = max(input_policy_risk, output_policy_risk)
+
+    # Get policy flags for alignment
+    policy_flags = get_policy_flags(all_policy_violations)
+    stage_start = spans.mark("output_policy", stage_start)
+
+    # Step 8: EZA Score v2.1 calculation
+    eza_score_result: Optional[Dict[str, Any]] = None
+    try:
+        eza_score_result = compute_eza_score_v21(
+            input_analysis=input_analysis,
+            output_analysis=output_analysis,
+            alignment=alignment,
+            redirect=redirect,
+            deception=deception,
+            legal_risk=legal_risk,
+            psych_pressure=psych_pressure,
+            input_text=analyzed_input
+        )
+
+        base_score = eza_score_result.get("final_score", 0.0)
+
+        # Apply policy score adjustment
+        score_adjustment = calculate_score_adjustment(all_policy_violations, total_policy_risk)
+        adjusted_score = max(0.0, min(100.0, base_score + score_adjustment))
+
+        # Re-apply minimum/maximum score guarantees after policy adjustment
+        # (core/engines/score_caps; output is evaluated independently of input risk)
+        adjusted_score = apply_score_caps(
+            adjusted_score,
+            analyzed_input,
+            input_analysis=input_analysis,
+            output_analysis=output_analysis,
+            alignment=alignment,
+            deception=deception,
+            legal_risk=legal_risk,
+            psych_pressure=psych_pressure,
+            policy_violations=all_policy_violations
+        )
+
+        # Update score breakdown with policy information
+        eza_score_result["policy_adjustment"] = score_adjustment
+        eza_score_result["base_score"] = base_score
+        eza_score_result["final_score"] = adjusted_score
+
+        eza_score: float = adjusted_score
+        eza_score_breakdown: Dict[str, Any] = eza_score_result
+        logger.debug(f"EZA Score computed: {eza_score} (base: {base_score}, adjustment: {score_adjustment})")
+    except Exception as e:
+        logger.error(f"EZA Score calculation failed: {str(e)}")
+        # Don't fail the entire request, just log the error
+        # Set a default score based on input risk level
+        # Ensure input_analysis is a dict
+        if not isinstance(input_analysis, dict):
+            input_analysis = {"risk_level": "low", "risk_score": 0.0}
+        input_risk_level = input_analysis.get("risk_level", "low")
+        if input_risk_level == "low":
+            default_score = 70.0
+        elif input_risk_level == "medium":
+            default_score = 50.0
+        else:
+            default_score = 30.0
+        eza_score = default_score
+        eza_score_breakdown = {
+            "error": str(e),
+            "final_score": default_score,
+            "safety_level": "yellow" if default_score >= 60 else "orange"
+        }
+
+    # Behavioral snapshot (numeric only; safe to aggregate for trends / Safe Mode)
+    try:
+        behavioral = analyze_interaction_turn(
+            mode=mode,
+            input_analysis=input_analysis,
+            output_analysis=output_analysis,
+            alignment=alignment,
+            eza_score=eza_score,
+            redirect=redirect,
+            deception=deception,
+            legal_risk=legal_risk,
+            psych_pressure=psych_pressure,
+            policy_violation_count=len(all_policy_violations) if all_policy_violations else 0,
+        )
+    except Exception as beh_err:
+        logger.warning("Behavioral snapshot skipped: %s", beh_err)
+        behavioral = None
+    stage_end = spans.mark("scoring", stage_start)  # EZA score + behavioral snapshot
+
+    timings["output_stages_ms"] = round((stage_end - stages_start) * 1000.0, 3)
+    result.update({
+        "input_analysis": input_analysis,
+        "output_analysis": output_analysis,
+        "alignment": alignment,
+        "redirect": redirect,
+        "safe_answer": safe_answer,
+        "deception": deception,
+        "legal_risk": legal_risk,
+        "psych_pressure": psych_pressure,
+        "all_policy_violations": all_policy_violations,
+        "policy_flags": policy_flags,
+        "eza_score": eza_score,
+        "eza_score_breakdown": eza_score_breakdown,
+        "eza_score_result": eza_score_result,
+        "behavioral": behavioral,
+        "spans": spans.relative()
+    })
+    return result
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+SSE frame helpers for the streaming endpoints.
+
+- sse_event: one `data: <json>` frame (orjson when installed, else json)
+- coalesce_tokens: merges streamed tokens into larger text frames
+
+One frame per LLM token means one JSON encode, one write and one client
+parse per token. coalesce_tokens sends the first token at once (time to first
+token is unchanged), then buffers tokens in a list until the frame is
+`window_seconds` old or holds `max_bytes`, whichever comes first; a slow
+token stream still gets its buffered text out when the window ends.
+"""
+
+from collections import deque
+from typing import Any, AsyncIterator, Deque, List, Optional
+import asyncio
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+
+    def _dumps(payload: Any) -> str:
+        return orjson.dumps(payload).decode("utf-8")
+except ImportError:
+    logger.debug("orjson not installed; SSE frames are encoded with json")
+
+    def _dumps(payload: Any) -> str:
+        return json.dumps(payload)
+
+
+def sse_event(payload: Any) -> str:
+    """One SSE data frame"""
+    return f"data: {_dumps(payload)}\n\n"
+
+
+class _FrameBuffer:
+    """Tokens read by a background task, cut into frames for the sender"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.ready: Deque[str] = deque()  # Complete frames (first token, full frames)
+        self.current: List[str] = []  # Open frame
+        self.size = 0
+        self.first = True
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.has_data = asyncio.Event()
+        self.frame_ready = asyncio.Event()
+
+    async def read(self, tokens: AsyncIterator[str]) -> None:
+        try:
+            async for token in tokens:
+                if self.first:
+                    self.first = False
+                    self.ready.append(token)
+                    self.frame_ready.set()
+                else:
+                    self.current.append(token)
+                    self.size += len(token.encode("utf-8"))
+                    if self.size >= self.max_bytes:
+                        self.ready.append(self.take())
+                        self.frame_ready.set()
+                self.has_data.set()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+            self.has_data.set()
+            self.frame_ready.set()
+
+    def take(self) -> str:
+        text = "".join(self.current)
+        self.current, self.size = [], 0
+        return text
+
+
+async def coalesce_tokens(
+    tokens: AsyncIterator[str],
+    window_seconds: float,
+    max_bytes: int
+) -> AsyncIterator[str]:
+    """
+    Text frames of a token stream (window_seconds <= 0: one frame per token)
+
+    Tokens are read by a background task, so the sender wakes once per frame
+    rather than once per token. Closing this generator stops the reader and
+    closes `tokens`; an error of the token stream is raised after the
+    frames read before it.
+    """
+    if window_seconds <= 0:
+        try:
+            async for token in tokens:
+                yield token
+        finally:
+            await tokens.aclose()
+        return
+
+    buffer = _FrameBuffer(max_bytes)
+    reader = asyncio.ensure_future(buffer.read(tokens))
+    try:
+        while True:
+            if not buffer.ready and not buffer.current:
+                if buffer.done:
+                    break
+                buffer.has_data.clear()
+                await buffer.has_data.wait()
+                continue
+            if not buffer.ready and not buffer.done:
+                # Open frame: let it fill until the window ends or it is full
+                buffer.frame_ready.clear()
+                try:
+                    await asyncio.wait_for(buffer.frame_ready.wait(), window_seconds)
+                except asyncio.TimeoutError:
+                    pass
+            yield buffer.ready.popleft() if buffer.ready else buffer.take()
+        if buffer.error is not None:
+            raise buffer.error
+    finally:
+        reader.cancel()
+        await asyncio.gather(reader, return_exceptions=True)
+        await tokens.aclose()
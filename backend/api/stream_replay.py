@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+"""
+Resumable SSE Streams
+Replay buffer for /api/standalone/stream: a client that lost the connection
+reconnects with Last-Event-ID and gets the frames it missed, then the rest of
+the live answer, without asking again (another LLM call).
+
+- Every frame carries an SSE id "<stream id>-<seq>"; the stream id is random.
+- The answer is produced by a background task writing to the stream's buffer
+  and clients read from the buffer, so a dropped connection does not stop it.
+- A request with the Last-Event-ID of a known stream (same query and mode)
+  replays the frames after that id and follows the live stream; any other
+  request starts a new stream.
+- A live stream nobody reads is stopped (its LLM call closed) when no client
+  resumes it within STREAM_REPLAY_DETACHED_SECONDS.
+- Per-worker store bounded by STREAM_REPLAY_MAX_STREAMS and
+  STREAM_REPLAY_MAX_BYTES (oldest streams evicted first, live ones stopped);
+  a stream keeps at most STREAM_REPLAY_MAX_BYTES of its latest frames and
+  expires STREAM_REPLAY_TTL_SECONDS after it ends.
+- STREAM_REPLAY_BACKEND=redis also pushes frames to Redis (REDIS_URL), so a
+  reconnect that lands on another worker can replay and follow the stream
+  (polling). Redis failures only log a warning; a stream whose Redis writes
+  failed is deleted there, so remote reconnects start a new stream.
+"""
+
+from collections import OrderedDict, deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional, Set, Tuple
+import asyncio
+import hashlib
+import logging
+import re
+import time
+import uuid
+
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_STREAM_ID = re.compile(r"^[0-9a-f]{32}$")
+REDIS_POLL_SECONDS = 0.05
+
+
+def stream_fingerprint(query: str, safe_only: bool) -> str:
+    """Identifies the request a stream answers (a resume must match it)"""
+    return hashlib.sha256(f"{int(safe_only)}:{query}".encode("utf-8")).hexdigest()
+
+
+def parse_last_event_id(last_event_id: Optional[str]) -> Optional[Tuple[str, int]]:
+    """(stream id, seq) of a Last-Event-ID header, None if it is not ours"""
+    stream_id, _, seq = (last_event_id or "").strip().rpartition("-")
+    if not _STREAM_ID.match(stream_id) or not seq.isdigit():
+        return None
+    return stream_id, int(seq)
+
+
+class _ReplayBuffer:
+    """Frames of one stream, at most max_bytes of them (oldest dropped first)"""
+
+    def __init__(self, stream_id: str, fingerprint: str, max_bytes: int, detached_grace: float):
+        self.stream_id = stream_id
+        self.fingerprint = fingerprint
+        self.max_bytes = max_bytes
+        self.detached_grace = detached_grace
+        self.frames: Deque[str] = deque()
+        self.first = 0  # seq of frames[0]
+        self.bytes = 0
+        self.done = False
+        self.abandoned = False
+        self.expires_at = float("inf")
+        self.changed = asyncio.Event()
+        self.producer: Optional["asyncio.Task[None]"] = None
+        self.readers = 0
+        self._detached: Optional[asyncio.TimerHandle] = None
+
+    def append(self, frame: str) -> None:
+        self.frames.append(frame)
+        self.bytes += len(frame.encode("utf-8"))
+        while self.bytes > self.max_bytes and len(self.frames) > 1:
+            self.bytes -= len(self.frames.popleft().encode("utf-8"))
+            self.first += 1
+        self.changed.set()
+
+    def finish(self, ttl: float) -> None:
+        self.done = True
+        self.expires_at = time.time() + ttl
+        self.changed.set()
+
+    def close(self) -> None:
+        """End a live stream: cancel its producer, readers stop after the buffered frames"""
+        if self.done:
+            return
+        self.done = True
+        self.changed.set()
+        if self.producer is not None:
+            self.producer.cancel()
+
+    def covers(self, seq: int) -> bool:
+        """Whether the frames after seq are still buffered"""
+        return seq + 1 >= self.first
+
+    async def follow(self, after: int) -> AsyncIterator[Tuple[int, str]]:
+        """(seq, frame) after `after`, live until the stream ends (or drops frames not read yet)"""
+        seq = after + 1
+        self._attach()
+        try:
+            while True:
+                while self.first <= seq < self.first + len(self.frames):
+                    yield seq, self.frames[seq - self.first]
+                    seq += 1
+                if self.done or seq < self.first:
+                    return
+                self.changed.clear()
+                await self.changed.wait()
+        finally:
+            self._detach()
+
+    def _attach(self) -> None:
+        self.readers += 1
+        if self._detached is not None:
+            self._detached.cancel()
+            self._detached = None
+
+    def _detach(self) -> None:
+        # Nobody reads the live stream any more: stop it unless a reader resumes within the grace period
+        self.readers -= 1
+        if not self.readers and not self.done:
+            self._detached = asyncio.get_running_loop().call_later(self.detached_grace, self._abandon)
+
+    def _abandon(self) -> None:
+        self._detached = None
+        if not self.readers and not self.done:
+            self.abandoned = True
+            self.close()
+
+
+class _MemoryStore:
+    """Stream buffers by id, bounded by count and bytes (oldest evicted first, live ones stopped)"""
+
+    def __init__(self, max_streams: int, max_bytes: int):
+        self.max_streams = max_streams
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+        self._streams: "OrderedDict[str, _ReplayBuffer]" = OrderedDict()
+
+    def add(self, buffer: _ReplayBuffer) -> None:
+        self._streams[buffer.stream_id] = buffer
+        self.bytes += buffer.bytes
+        self.evict()
+
+    def append(self, buffer: _ReplayBuffer, frame: str) -> None:
+        """Add a frame to a buffered stream (within the bounds)"""
+        before = buffer.bytes
+        buffer.append(frame)
+        if self._streams.get(buffer.stream_id) is buffer:
+            self.bytes += buffer.bytes - before
+            self.evict()
+
+    def get(self, stream_id: str) -> Optional[_ReplayBuffer]:
+        buffer = self._streams.get(stream_id)
+        if buffer is not None and buffer.expires_at <= time.time():
+            self._remove(stream_id)
+            return None
+        return buffer
+
+    def evict(self) -> None:
+        now = time.time()
+        for stream_id in [s for s, b in self._streams.items() if b.expires_at <= now]:
+            self._remove(stream_id)
+        while self._streams and (
+            len(self._streams) > self.max_streams or self.bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._streams)))
+            self.evictions += 1
+
+    def _remove(self, stream_id: str) -> None:
+        buffer = self._streams.pop(stream_id)
+        self.bytes -= buffer.bytes
+        buffer.close()
+
+    def __len__(self) -> int:
+        return len(self._streams)
+
+
+class _RedisStore:
+    """Frames mirrored to Redis for reconnects on another worker"""
+
+    PREFIX = "eza:stream_replay:"
+
+    def __init__(self, ttl: float):
+        self.ttl = max(1, int(ttl))
+
+    async def _client(self):
+        from backend.core.utils.dependencies import get_redis
+        return await get_redis()
+
+    async def start(self, stream_id: str, fingerprint: str) -> None:
+        client = await self._client()
+        await client.set(f"{self.PREFIX}{stream_id}:fingerprint", fingerprint, ex=self.ttl)
+
+    async def append(self, stream_id: str, frame: str) -> None:
+        client = await self._client()
+        key = f"{self.PREFIX}{stream_id}:frames"
+        await client.rpush(key, frame)
+        await client.expire(key, self.ttl)
+        await client.expire(f"{self.PREFIX}{stream_id}:fingerprint", self.ttl)
+
+    async def finish(self, stream_id: str) -> None:
+        client = await self._client()
+        await client.set(f"{self.PREFIX}{stream_id}:done", "1", ex=self.ttl)
+
+    async def discard(self, stream_id: str) -> None:
+        """Delete an incomplete stream, so a resume on another worker misses instead of polling"""
+        client = await self._client()
+        await client.delete(*(f"{self.PREFIX}{stream_id}:{part}" for part in ("fingerprint", "frames", "done")))
+
+    async def fingerprint(self, stream_id: str) -> Optional[str]:
+        client = await self._client()
+        return await client.get(f"{self.PREFIX}{stream_id}:fingerprint")
+
+    async def follow(self, stream_id: str, after: int) -> AsyncIterator[Tuple[int, str]]:
+        """(seq, frame) after `after`, polling until the stream ends or goes quiet for the TTL"""
+        client = await self._client()
+        seq = after + 1
+        idle = 0.0
+        while True:
+            done = await client.exists(f"{self.PREFIX}{stream_id}:done")
+            frames = await client.lrange(f"{self.PREFIX}{stream_id}:frames", seq, -1)
+            for frame in frames:
+                yield seq, frame.decode("utf-8") if isinstance(frame, bytes) else frame
+                seq += 1
+            if done:
+                return
+            idle = 0.0 if frames else idle + REDIS_POLL_SECONDS
+            if idle >= self.ttl:
+                return
+            await asyncio.sleep(REDIS_POLL_SECONDS)
+
+
+class StreamReplay:
+    """Resumable streams of this worker (with an optional Redis mirror)"""
+
+    def __init__(self):
+        settings = get_settings()
+        self.ttl = settings.STREAM_REPLAY_TTL_SECONDS
+        self.detached_grace = settings.STREAM_REPLAY_DETACHED_SECONDS
+        self.memory = _MemoryStore(settings.STREAM_REPLAY_MAX_STREAMS, settings.STREAM_REPLAY_MAX_BYTES)
+        self.redis: Optional[_RedisStore] = None
+        if settings.STREAM_REPLAY_BACKEND.lower() == "redis":
+            self.redis = _RedisStore(self.ttl)
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self.counters = {"streams": 0, "resumed": 0, "resumed_redis": 0, "resume_misses": 0, "abandoned": 0}
+
+    async def stream(
+        self,
+        fingerprint: str,
+        events: Callable[[], AsyncIterator[str]],
+        last_event_id: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        SSE frames with ids: the stream named by last_event_id from after that
+        frame, else a new stream of events() (called only then)
+        """
+        resumed = await self._resume(last_event_id, fingerprint) if last_event_id else None
+        if resumed is None:
+            buffer = self._start(fingerprint, events())
+            resumed = buffer.stream_id, buffer.follow(-1)
+        stream_id, frames = resumed
+        try:
+            async for seq, frame in frames:
+                yield f"id: {stream_id}-{seq}\n{frame}"
+        finally:
+            # Detach from the buffer now, not when the generator is collected
+            await frames.aclose()
+
+    def _start(self, fingerprint: str, events: AsyncIterator[str]) -> _ReplayBuffer:
+        buffer = _ReplayBuffer(uuid.uuid4().hex, fingerprint, self.memory.max_bytes, self.detached_grace)
+        self.counters["streams"] += 1
+        # The producer outlives the client connection; keep a reference until it ends
+        task = asyncio.create_task(self._produce(buffer, events))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        buffer.producer = task
+        self.memory.add(buffer)
+        return buffer
+
+    async def _produce(self, buffer: _ReplayBuffer, events: AsyncIterator[str]) -> None:
+        redis = self.redis
+        try:
+            if redis is not None:
+                redis = await self._mirror(redis.start(buffer.stream_id, buffer.fingerprint))
+            async for frame in events:
+                self.memory.append(buffer, frame)
+                if redis is not None:
+                    redis = await self._mirror(redis.append(buffer.stream_id, frame))
+        except Exception as e:
+            logger.warning(f"Replayable stream {buffer.stream_id} failed: {str(e)}")
+        finally:
+            if buffer.abandoned:
+                self.counters["abandoned"] += 1
+            # An abandoned answer is incomplete: expire it, a late reconnect starts a new stream
+            buffer.finish(0 if buffer.abandoned else self.ttl)
+            self.memory.evict()
+            await events.aclose()
+            if redis is not None and not buffer.abandoned:
+                await self._mirror(redis.finish(buffer.stream_id))
+            elif self.redis is not None:
+                # A failed write left a gap (or the answer was abandoned): without a done
+                # marker remote resumes would poll for the TTL, so drop the stream instead
+                await self._mirror(self.redis.discard(buffer.stream_id))
+
+    async def _mirror(self, write) -> Optional[_RedisStore]:
+        """Run a Redis write; on failure the stream stops mirroring (returns None)"""
+        try:
+            await write
+            return self.redis
+        except Exception as e:
+            logger.warning(f"Stream replay Redis write failed: {str(e)}")
+            return None
+
+    async def _resume(
+        self,
+        last_event_id: str,
+        fingerprint: str
+    ) -> Optional[Tuple[str, AsyncIterator[Tuple[int, str]]]]:
+        parsed = parse_last_event_id(last_event_id)
+        if parsed is not None:
+            stream_id, seq = parsed
+            buffer = self.memory.get(stream_id)
+            if buffer is not None and buffer.fingerprint == fingerprint and buffer.covers(seq):
+                self.counters["resumed"] += 1
+                return stream_id, buffer.follow(seq)
+            if buffer is None and self.redis is not None:
+                try:
+                    if await self.redis.fingerprint(stream_id) == fingerprint:
+                        self.counters["resumed_redis"] += 1
+                        return stream_id, self.redis.follow(stream_id, seq)
+                except Exception as e:
+                    logger.warning(f"Stream replay Redis read failed: {str(e)}")
+        self.counters["resume_misses"] += 1
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "live": len(self._tasks),
+            "buffered": len(self.memory),
+            "bytes": self.memory.bytes,
+            "evictions": self.memory.evictions,
+            "backend": "redis" if self.redis is not None else "memory",
+        }
+
+
+_replay: Optional[StreamReplay] = None
+
+
+def get_stream_replay() -> StreamReplay:
+    """Process-wide stream replay store"""
+    global _replay
+    if _replay is None:
+        _replay = StreamReplay()
+    return _replay
+
+
+def reset_stream_replay() -> None:
+    """Drop the store (next access rebuilds it from settings)"""
+    global _replay
+    _replay = None
@@ -3,23 +3,30 @@
 Streaming utilities for EZA Standalone
 """
 
-import json
 import re
 import httpx
-from typing import AsyncGenerator, Optional, Dict, Any
+from typing import AsyncGenerator, Optional, Dict, Any, List
 from backend.core.engines.input_analyzer import analyze_input
 from backend.core.engines.output_analyzer import analyze_output
+from backend.core.engines.stream_analyzer import IncrementalOutputAnalyzer, SafeSentenceGate
 from backend.core.engines.alignment_engine import compute_alignment
 from backend.core.engines.safe_rewrite import safe_rewrite
 from backend.core.engines.eza_score import compute_eza_score_v21
 from backend.core.engines.redirect_engine import should_redirect
 from backend.behavioral.interaction import analyze_interaction_turn
 from backend.config import get_settings
+from backend.core.utils.analysis_executor import AnalysisExecutor, get_analysis_executor
 from backend.core.engines.model_router import LLM_API_KEY, LLM_MODEL, OPENAI_BASE_URL
+from backend.api.sse import coalesce_tokens, sse_event
+from backend.core.llm.http_pool import llm_http_client
+from backend.core.llm.providers.chat_stream import iter_chat_deltas
+from backend.core.utils.model_router import get_model_router
+from backend.gateway.concurrency_limiter import llm_call_slot, retry_after_seconds
 
 
-def _attach_stream_standalone_observation(
+async def _attach_stream_standalone_observation(
     completion_data: Dict[str, Any],
+    executor: AnalysisExecutor,
     *,
     query: str,
     output_text: str,
@@ -30,11 +37,14 @@ def _attach_stream_standalone_observation(
 ) -> None:
     try:
         from backend.core.engines.standalone_observation.service import (
-            attach_standalone_observation_to_response,
+            is_standalone_observation_enabled,
+            maybe_build_standalone_observation,
         )
 
-        attach_standalone_observation_to_response(
-            completion_data,
+        if not is_standalone_observation_enabled():
+            return
+        observation = await executor.run(
+            maybe_build_standalone_observation,
             user_text=query or "",
             output_text=output_text or "",
             input_analysis=input_analysis,
@@ -42,28 +52,192 @@ def _attach_stream_standalone_observation(
             alignment=alignment,
             redirect=redirect,
         )
+        if observation is not None:
+            completion_data["standalone_observation"] = observation
     except Exception:
         pass
 
 
+def _safe_only_stages(query: str, raw_llm_output: str, input_analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    SAFE-only analysis (runs on the analysis executor): safe rewrite of the
+    full LLM response plus the behavioral snapshot of the streamed safe answer
+    """
+    # Analyze output and alignment for safe_rewrite
+    output_analysis = analyze_output(raw_llm_output, input_analysis)
+    alignment = compute_alignment(input_analysis, output_analysis)
+    
+    # Call safe_rewrite with all required parameters
+    # safe_rewrite always returns a non-empty response
+    safe_answer = safe_rewrite(
+        user_message=query,
+        llm_output=raw_llm_output,
+        input_analysis=input_analysis,
+        output_analysis=output_analysis,
+        alignment=alignment
+    )
+    # Ensure safe_answer is a clean string (should never be empty due to safe_rewrite logic)
+    if not isinstance(safe_answer, str):
+        safe_answer = str(safe_answer)
+    # Final safety check - should never trigger but just in case
+    if not safe_answer or safe_answer.strip() == "":
+        safe_answer = raw_llm_output if raw_llm_output and raw_llm_output.strip() else "Üzgünüm, şu anda yanıt veremiyorum."
+    
+    return _safe_answer_stages(safe_answer, input_analysis)
+
+
+def _safe_answer_stages(safe_answer: str, input_analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Behavioral snapshot of the streamed safe answer (runs on the analysis executor)"""
+    oa_safe = None
+    al_safe = None
+    redir_safe = None
+    try:
+        oa_safe = analyze_output(safe_answer, input_analysis)
+        al_safe = compute_alignment(input_analysis, oa_safe)
+        redir_safe = should_redirect(input_analysis, oa_safe, al_safe)
+        eza_safe = compute_eza_score_v21(
+            input_analysis=input_analysis,
+            output_analysis=oa_safe,
+            alignment=al_safe,
+            redirect=redir_safe,
+        )
+        eza_final = eza_safe.get("final_score")
+        eza_f = max(0.0, min(100.0, round(float(eza_final), 1))) if eza_final is not None else None
+        behavioral = analyze_interaction_turn(
+            mode="standalone",
+            input_analysis=input_analysis,
+            output_analysis=oa_safe,
+            alignment=al_safe,
+            eza_score=eza_f,
+            redirect=redir_safe,
+            policy_violation_count=0,
+        )
+    except Exception:
+        behavioral = None
+    
+    return {
+        "safe_answer": safe_answer,
+        "output_analysis": oa_safe,
+        "alignment": al_safe,
+        "redirect": redir_safe,
+        "behavioral": behavioral
+    }
+
+
+def _score_stages(
+    accumulated_text: str,
+    input_analysis: Dict[str, Any],
+    analyzer: Optional[IncrementalOutputAnalyzer] = None
+) -> Dict[str, Any]:
+    """
+    Score-mode analysis of the streamed text (runs on the analysis executor)
+    
+    With the incremental analyzer the output analysis is built from the
+    sentences it already scanned during the stream.
+    """
+    assistant_score = None
+    output_analysis = None
+    alignment = None
+    redirect = None
+    behavioral = None
+    clean_text = ""
+    if accumulated_text:
+        # Clean accumulated text (remove any potential token debug info)
+        clean_text = accumulated_text.strip()
+        # Remove patterns like ["token": "..."] or {"token": "..."}
+        clean_text = re.sub(r'\["token"\s*:\s*"[^"]*"\]', '', clean_text)
+        clean_text = re.sub(r'\{"token"\s*:\s*"[^"]*"\}', '', clean_text)
+        clean_text = clean_text.strip()
+        
+        if clean_text:
+            try:
+                if analyzer is not None:
+                    output_analysis = analyzer.finish(clean_text)
+                else:
+                    output_analysis = analyze_output(clean_text, input_analysis)
+                alignment = compute_alignment(input_analysis, output_analysis)
+                eza_score_data = compute_eza_score_v21(
+                    input_analysis=input_analysis,
+                    output_analysis=output_analysis,
+                    alignment=alignment
+                )
+                final_score = eza_score_data.get("final_score")
+                if final_score is not None:
+                    # Round to 1 decimal place instead of integer to preserve precision
+                    assistant_score = max(0.0, min(100.0, round(final_score, 1)))
+            except Exception:
+                assistant_score = None
+    
+    # Behavioral snapshot (align with pipeline behavioral layer)
+    if clean_text and output_analysis is not None and alignment is not None:
+        try:
+            redirect = should_redirect(input_analysis, output_analysis, alignment)
+        except Exception:
+            redirect = None
+        if redirect is not None:
+            try:
+                behavioral = analyze_interaction_turn(
+                    mode="standalone",
+                    input_analysis=input_analysis,
+                    output_analysis=output_analysis,
+                    alignment=alignment,
+                    eza_score=assistant_score,
+                    redirect=redirect,
+                    policy_violation_count=0,
+                )
+            except Exception:
+                pass
+    
+    return {
+        "clean_text": clean_text,
+        "assistant_score": assistant_score,
+        "output_analysis": output_analysis,
+        "alignment": alignment,
+        "redirect": redirect,
+        "behavioral": behavioral
+    }
+
+
 async def stream_standalone_response(
     query: str,
-    safe_only: bool = False
+    safe_only: bool = False,
+    tenant: Optional[str] = None
 ) -> AsyncGenerator[str, None]:
     """
     Stream standalone response with token-by-token output
     
     Format:
-    - data: {"token": "<word>"}
-    - data: {"token": "<word>"}
+    - data: {"token": "<text>"}
+    - data: {"token": "<text>"}
     - ...
+    - data: {"risk": {...}}  # score mode, STREAM_RISK_EVENTS: running output risk changed
     - data: {"done": true, "assistant_score": 42, "user_score": 85}
+    
+    In score mode the streamed sentences are analyzed while tokens arrive
+    (STREAM_INCREMENTAL_ANALYSIS), so the done event only waits for the final
+    scoring; with STREAM_STOP_RISK_THRESHOLD the stream ends early
+    ("stopped": "risk" in the done event) once the running risk reaches it;
+    the frame that reached it is not sent, and the done event scores only the
+    text the client received (its "risk" is the running risk that stopped it).
+    Score-mode tokens are coalesced into frames of up to STREAM_COALESCE_WINDOW_MS
+    / STREAM_COALESCE_MAX_BYTES (see api/sse); a frame is analyzed before it is sent.
+    
+    SAFE-only mode rewrites the full answer before sending any of it. With
+    STREAM_SAFE_PROGRESSIVE (opt-in) it streams the answer sentence by
+    sentence instead, each released once the answer up to it passes
+    safe_rewrite; a rewritten sentence ends the stream ("stopped": "rewrite"
+    in the done event), but the sentences before it have already been sent.
+    
+    The LLM call is queued under tenant in the concurrency limiter (fair
+    queuing; None uses the shared queue). Analysis stages run on the
+    configured analysis executor.
     """
     settings = get_settings()
+    executor = get_analysis_executor()
     
     try:
         # Step 1: Input analysis (fast, non-blocking)
-        input_analysis = analyze_input(query)
+        input_analysis = await executor.run(analyze_input, query)
         input_risk_score = input_analysis.get("risk_score", 0.0)
         # More precise user score calculation - use 1 decimal place instead of rounding to integer
         # This preserves small differences in risk scores
@@ -73,35 +247,41 @@ async def stream_standalone_response(
         
         # Step 2: Stream LLM response
         if safe_only:
-            # SAFE-only mode: Get full response first, then rewrite and stream
-            raw_llm_output = await _get_llm_response(query, settings)
-            # Ensure raw_llm_output is a clean string
-            if not isinstance(raw_llm_output, str):
-                raw_llm_output = str(raw_llm_output)
-            # Clean any potential token debug strings
-            raw_llm_output = re.sub(r'\["token"\s*:\s*"[^"]*"\]', '', raw_llm_output)
-            raw_llm_output = re.sub(r'\{"token"\s*:\s*"[^"]*"\}', '', raw_llm_output)
-            raw_llm_output = raw_llm_output.strip()
-            
-            # Analyze output and alignment for safe_rewrite
-            output_analysis = analyze_output(raw_llm_output, input_analysis)
-            alignment = compute_alignment(input_analysis, output_analysis)
-            
-            # Call safe_rewrite with all required parameters
-            # safe_rewrite always returns a non-empty response
-            safe_answer = safe_rewrite(
-                user_message=query,
-                llm_output=raw_llm_output,
-                input_analysis=input_analysis,
-                output_analysis=output_analysis,
-                alignment=alignment
-            )
-            # Ensure safe_answer is a clean string (should never be empty due to safe_rewrite logic)
-            if not isinstance(safe_answer, str):
-                safe_answer = str(safe_answer)
-            # Final safety check - should never trigger but just in case
-            if not safe_answer or safe_answer.strip() == "":
-                safe_answer = raw_llm_output if raw_llm_output and raw_llm_output.strip() else "Üzgünüm, şu anda yanıt veremiyorum."
+            progressive = settings.STREAM_SAFE_PROGRESSIVE
+            rewritten = False
+            if progressive:
+                # Progressive SAFE-only mode: send each sentence once the answer up to it passes safe_rewrite
+                gate = SafeSentenceGate(query, input_analysis)
+                llm_stream = _stream_llm_response(query, settings, tenant)
+                try:
+                    async for token in llm_stream:
+                        if gate.feed(token):
+                            safe_text = await executor.run(gate.release)
+                            if safe_text:
+                                yield sse_event({"token": safe_text})
+                            if gate.rewritten:
+                                break
+                finally:
+                    # Ends the provider call once a sentence is rewritten
+                    await llm_stream.aclose()
+                safe_text = await executor.run(gate.release, True)
+                if safe_text:
+                    yield sse_event({"token": safe_text})
+                rewritten = gate.rewritten
+                stages = await executor.run(_safe_answer_stages, gate.safe_answer, input_analysis)
+            else:
+                # SAFE-only mode: Get full response first, then rewrite and stream
+                raw_llm_output = await _get_llm_response(query, settings, tenant)
+                # Ensure raw_llm_output is a clean string
+                if not isinstance(raw_llm_output, str):
+                    raw_llm_output = str(raw_llm_output)
+                # Clean any potential token debug strings
+                raw_llm_output = re.sub(r'\["token"\s*:\s*"[^"]*"\]', '', raw_llm_output)
+                raw_llm_output = re.sub(r'\{"token"\s*:\s*"[^"]*"\}', '', raw_llm_output)
+                raw_llm_output = raw_llm_output.strip()
+                
+                stages = await executor.run(_safe_only_stages, query, raw_llm_output, input_analysis)
+            safe_answer = stages["safe_answer"]
             
             # Determine safety level based on input risk
             input_risk_level = input_analysis.get("risk_level", "low")
@@ -115,42 +295,13 @@ async def stream_standalone_response(
             else:
                 safety = "Safe"
             
-            # Stream safe answer word by word (only if not empty)
-            if safe_answer and safe_answer.strip():
+            # Stream safe answer word by word (only if not empty; progressive mode already sent it)
+            if not progressive and safe_answer and safe_answer.strip():
                 words = safe_answer.split()
                 for word in words:
-                    # Use json.dumps to properly escape JSON
-                    token_data = {"token": f"{word} "}
-                    yield f'data: {json.dumps(token_data)}\n\n'
+                    # JSON-encoded frame (properly escaped)
+                    yield sse_event({"token": f"{word} "})
             
-            # Behavioral snapshot (output = streamed safe answer)
-            oa_safe = None
-            al_safe = None
-            redir_safe = None
-            try:
-                oa_safe = analyze_output(safe_answer, input_analysis)
-                al_safe = compute_alignment(input_analysis, oa_safe)
-                redir_safe = should_redirect(input_analysis, oa_safe, al_safe)
-                eza_safe = compute_eza_score_v21(
-                    input_analysis=input_analysis,
-                    output_analysis=oa_safe,
-                    alignment=al_safe,
-                    redirect=redir_safe,
-                )
-                eza_final = eza_safe.get("final_score")
-                eza_f = max(0.0, min(100.0, round(float(eza_final), 1))) if eza_final is not None else None
-                behavioral = analyze_interaction_turn(
-                    mode="standalone",
-                    input_analysis=input_analysis,
-                    output_analysis=oa_safe,
-                    alignment=al_safe,
-                    eza_score=eza_f,
-                    redirect=redir_safe,
-                    policy_violation_count=0,
-                )
-            except Exception:
-                behavioral = None
-
             # Send completion with SAFE badge info, safety level, and user score
             completion_data = {
                 "done": True,
@@ -158,97 +309,81 @@ async def stream_standalone_response(
                 "safety": safety,
                 "user_score": user_score  # Include user score even in safe-only mode
             }
-            if behavioral:
-                completion_data["behavioral"] = behavioral
-            _attach_stream_standalone_observation(
+            if rewritten:
+                completion_data["stopped"] = "rewrite"
+            if stages["behavioral"]:
+                completion_data["behavioral"] = stages["behavioral"]
+            await _attach_stream_standalone_observation(
                 completion_data,
+                executor,
                 query=query,
                 output_text=safe_answer or "",
                 input_analysis=input_analysis,
-                output_analysis=oa_safe,
-                alignment=al_safe,
-                redirect=redir_safe,
+                output_analysis=stages["output_analysis"],
+                alignment=stages["alignment"],
+                redirect=stages["redirect"],
             )
-            yield f'data: {json.dumps(completion_data)}\n\n'
+            yield sse_event(completion_data)
         else:
-            # Score mode: Stream raw LLM tokens directly and accumulate for scoring
-            accumulated_text = ""
-            async for token in _stream_llm_response(query, settings):
-                accumulated_text += token
-                # Use json.dumps to properly escape JSON (prevents token debug garbage)
-                token_data = {"token": token}
-                yield f'data: {json.dumps(token_data)}\n\n'
+            # Score mode: Stream raw LLM tokens (coalesced into frames) and accumulate for scoring
+            parts: List[str] = []
+            analyzer = IncrementalOutputAnalyzer(input_analysis) if settings.STREAM_INCREMENTAL_ANALYSIS else None
+            stop_threshold = settings.STREAM_STOP_RISK_THRESHOLD
+            stopped = False
+            frames = coalesce_tokens(
+                _stream_llm_response(query, settings, tenant),
+                settings.STREAM_COALESCE_WINDOW_MS / 1000.0,
+                settings.STREAM_COALESCE_MAX_BYTES
+            )
+            try:
+                async for text in frames:
+                    # Scan the sentences this frame completed (before the client sees it)
+                    risk_changed = analyzer is not None and analyzer.feed(text)
+                    if risk_changed and stop_threshold > 0 and analyzer.risk_score >= stop_threshold:
+                        stopped = True
+                        break
+                    yield sse_event({"token": text})
+                    # Only sent frames are scored (not the one withheld by the risk stop)
+                    parts.append(text)
+                    if risk_changed and settings.STREAM_RISK_EVENTS:
+                        yield sse_event({"risk": analyzer.risk()})
+            finally:
+                # Ends the provider call when the stream is stopped early
+                await frames.aclose()
             
             # After streaming completes, compute scores using accumulated text
-            assistant_score = None
-            output_analysis = None
-            alignment = None
-            clean_text = ""
-            if accumulated_text:
-                # Clean accumulated text (remove any potential token debug info)
-                clean_text = accumulated_text.strip()
-                # Remove patterns like ["token": "..."] or {"token": "..."}
-                clean_text = re.sub(r'\["token"\s*:\s*"[^"]*"\]', '', clean_text)
-                clean_text = re.sub(r'\{"token"\s*:\s*"[^"]*"\}', '', clean_text)
-                clean_text = clean_text.strip()
-                
-                if clean_text:
-                    try:
-                        output_analysis = analyze_output(clean_text, input_analysis)
-                        alignment = compute_alignment(input_analysis, output_analysis)
-                        eza_score_data = compute_eza_score_v21(
-                            input_analysis=input_analysis,
-                            output_analysis=output_analysis,
-                            alignment=alignment
-                        )
-                        final_score = eza_score_data.get("final_score")
-                        if final_score is not None:
-                            # Round to 1 decimal place instead of integer to preserve precision
-                            assistant_score = max(0.0, min(100.0, round(final_score, 1)))
-                    except Exception:
-                        assistant_score = None
+            stages = await executor.run(_score_stages, "".join(parts), input_analysis, analyzer)
+            assistant_score = stages["assistant_score"]
+            clean_text = stages["clean_text"]
             
             # Build completion data - always include scores
             completion_data = {"done": True}
+            if stopped:
+                completion_data["stopped"] = "risk"
+                completion_data["risk"] = analyzer.risk()
             # Always include user_score (it's always calculated)
             completion_data["user_score"] = user_score
             # Include assistant_score if calculated
             if assistant_score is not None:
                 completion_data["assistant_score"] = assistant_score
 
-            # Behavioral snapshot (align with pipeline behavioral layer)
-            if clean_text and output_analysis is not None and alignment is not None:
-                try:
-                    redirect = should_redirect(input_analysis, output_analysis, alignment)
-                    completion_data["behavioral"] = analyze_interaction_turn(
-                        mode="standalone",
-                        input_analysis=input_analysis,
-                        output_analysis=output_analysis,
-                        alignment=alignment,
-                        eza_score=assistant_score,
-                        redirect=redirect,
-                        policy_violation_count=0,
-                    )
-                except Exception:
-                    pass
+            if stages["behavioral"] is not None:
+                completion_data["behavioral"] = stages["behavioral"]
 
-            if clean_text and output_analysis is not None and alignment is not None:
-                try:
-                    redir = should_redirect(input_analysis, output_analysis, alignment)
-                except Exception:
-                    redir = None
-                _attach_stream_standalone_observation(
+            if clean_text and stages["output_analysis"] is not None and stages["alignment"] is not None:
+                await _attach_stream_standalone_observation(
                     completion_data,
+                    executor,
                     query=query,
                     output_text=clean_text,
                     input_analysis=input_analysis,
-                    output_analysis=output_analysis,
-                    alignment=alignment,
-                    redirect=redir,
+                    output_analysis=stages["output_analysis"],
+                    alignment=stages["alignment"],
+                    redirect=stages["redirect"],
                 )
             
             # Send completion with scores
-            yield f'data: {json.dumps(completion_data)}\n\n'
+            yield sse_event(completion_data)
     
     except Exception as e:
         # Send error
@@ -256,10 +391,26 @@ async def stream_standalone_response(
         yield f'data: {{"error": "{error_msg}"}}\n\n'
 
 
-async def _stream_llm_response(prompt: str, settings) -> AsyncGenerator[str, None]:
+async def _stream_llm_response(prompt: str, settings, tenant: Optional[str] = None) -> AsyncGenerator[str, None]:
     """
     Stream LLM response token by token using OpenAI streaming API
+    
+    With STANDALONE_STREAM_MODEL set (e.g. groq/llama3-8b-tool-use) the tokens
+    come from that model through the ModelRouter, which streams every provider.
     """
+    max_tokens = settings.STANDALONE_MAX_TOKENS if hasattr(settings, 'STANDALONE_MAX_TOKENS') else 180
+    if settings.STANDALONE_STREAM_MODEL:
+        async for token in get_model_router().stream(
+            prompt,
+            settings.STANDALONE_STREAM_MODEL,
+            temperature=0.2,
+            max_tokens=max_tokens,
+            timeout=30.0,
+            tenant=tenant
+        ):
+            yield token
+        return
+    
     if not LLM_API_KEY:
         raise Exception("OPENAI_API_KEY not configured")
     
@@ -274,53 +425,40 @@ async def _stream_llm_response(prompt: str, settings) -> AsyncGenerator[str, Non
             {"role": "user", "content": prompt}
         ],
         "temperature": 0.2,
-        "max_tokens": settings.STANDALONE_MAX_TOKENS if hasattr(settings, 'STANDALONE_MAX_TOKENS') else 180,
+        "max_tokens": max_tokens,
         "stream": True  # Enable streaming
     }
     
     timeout = httpx.Timeout(30.0, connect=5.0)
     
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        async with client.stream('POST', OPENAI_BASE_URL, headers=headers, json=payload) as response:
+    async with llm_http_client("openai") as client, llm_call_slot("openai", LLM_MODEL, tenant=tenant) as slot:
+        async with client.stream('POST', OPENAI_BASE_URL, headers=headers, json=payload, timeout=timeout) as response:
+            slot.record(response.status_code, retry_after_seconds(response.headers))
             if response.status_code != 200:
                 error_text = await response.aread()
                 raise Exception(f"OpenAI API error: {response.status_code} - {error_text.decode()}")
             
-            buffer = ""
-            async for chunk in response.aiter_text():
-                buffer += chunk
-                
-                # Process complete lines
-                while '\n' in buffer:
-                    line, buffer = buffer.split('\n', 1)
-                    line = line.strip()
-                    
-                    if not line or not line.startswith('data: '):
-                        continue
-                    
-                    # Remove "data: " prefix
-                    data_str = line[6:]
-                    
-                    # Skip [DONE] marker
-                    if data_str == '[DONE]':
-                        return
-                    
-                    try:
-                        data = json.loads(data_str)
-                        choices = data.get('choices', [])
-                        if choices:
-                            delta = choices[0].get('delta', {})
-                            content = delta.get('content', '')
-                            if content:
-                                yield content
-                    except json.JSONDecodeError:
-                        continue
+            async for token in iter_chat_deltas(response):
+                yield token
 
 
-async def _get_llm_response(prompt: str, settings) -> str:
+async def _get_llm_response(prompt: str, settings, tenant: Optional[str] = None) -> str:
     """
     Get full LLM response (non-streaming, for SAFE-only mode or scoring)
     """
+    if settings.STANDALONE_STREAM_MODEL:
+        result = await get_model_router().generate(
+            prompt,
+            settings.STANDALONE_STREAM_MODEL,
+            temperature=0.2,
+            max_tokens=settings.STANDALONE_MAX_TOKENS,
+            timeout=30.0,
+            tenant=tenant
+        )
+        if not result["ok"]:
+            raise Exception(result["error"])
+        return result["output"]
+    
     if not LLM_API_KEY:
         raise Exception("OPENAI_API_KEY not configured")
     
@@ -340,8 +478,10 @@ async def _get_llm_response(prompt: str, settings) -> str:
     
     timeout = httpx.Timeout(30.0, connect=5.0)
     
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        response = await client.post(OPENAI_BASE_URL, headers=headers, json=payload)
+    async with llm_http_client("openai") as client:
+        async with llm_call_slot("openai", LLM_MODEL, tenant=tenant) as slot:
+            response = await client.post(OPENAI_BASE_URL, headers=headers, json=payload, timeout=timeout)
+            slot.record(response.status_code, retry_after_seconds(response.headers))
         
         if response.status_code != 200:
             raise Exception(f"OpenAI API error: {response.status_code}")
@@ -7,7 +7,7 @@ EZA V6 - Centralized Configuration
 import os
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from functools import lru_cache
 
 # Load .env file ONCE at module import time
@@ -47,6 +47,10 @@ class Settings(BaseSettings):
     LOCAL_LLM_URL: Optional[str] = None
     GROQ_API_KEY: Optional[str] = None
     MISTRAL_API_KEY: Optional[str] = None
+    # OpenAI-compatible API roots (chat completions at <root>/chat/completions); point at a simulator for offline load tests
+    OPENAI_BASE_URL: str = "https://api.openai.com/v1"
+    GROQ_BASE_URL: str = "https://api.groq.com/openai/v1"
+    MISTRAL_BASE_URL: str = "https://api.mistral.ai/v1"
     
     # Security
     JWT_SECRET: str = "supersecretkey"
@@ -84,6 +88,9 @@ class Settings(BaseSettings):
     # LLM Timeout Settings
     LLM_TIMEOUT_SECONDS: float = 12.0  # Timeout for LLM API calls
     LLM_CONNECT_TIMEOUT_SECONDS: float = 4.0  # Connection timeout
+    LLM_HTTP_POOL_ENABLED: bool = True  # Reuse one keep-alive HTTP client per provider
+    LLM_HTTP2_ENABLED: bool = True  # HTTP/2 for providers that support it (needs h2)
+    LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0  # Idle time before a pooled connection is closed
     
     # Standalone — lightweight rule-based observation (no LLM; default off)
     STANDALONE_OBSERVATION_ENABLED: bool = False
@@ -91,7 +98,67 @@ class Settings(BaseSettings):
     # Pipeline Settings
     PIPELINE_TIMEOUT_SECONDS: float = 30.0  # Overall pipeline timeout
     STANDALONE_MAX_TOKENS: int = 2048  # Max tokens for standalone mode (increased for full responses)
+    STANDALONE_STREAM_MODEL: str = ""  # Router model id for /api/standalone/stream (e.g. groq/llama3-8b-tool-use); empty: OpenAI LLM_MODEL
+    STREAM_INCREMENTAL_ANALYSIS: bool = True  # Analyze streamed sentences as they complete (see core/engines/stream_analyzer)
+    STREAM_RISK_EVENTS: bool = False  # Send {"risk": ...} events when the running output risk flags change
+    STREAM_STOP_RISK_THRESHOLD: float = 0.0  # Stop the stream once the running output risk reaches this (0: never)
+    STREAM_COALESCE_WINDOW_MS: float = 30.0  # Merge streamed tokens into one SSE frame per window (0: frame per token)
+    STREAM_COALESCE_MAX_BYTES: int = 1024  # Send a frame early once it holds this many bytes
+    STREAM_SAFE_PROGRESSIVE: bool = False  # Opt-in: SAFE-only stream sends each sentence once the answer so far passes safe_rewrite (default: rewrite the full answer first)
+    STREAM_REPLAY_ENABLED: bool = True  # Resumable /api/standalone/stream (Last-Event-ID replay, see api/stream_replay)
+    STREAM_REPLAY_TTL_SECONDS: float = 120.0  # How long a finished stream stays replayable
+    STREAM_REPLAY_DETACHED_SECONDS: float = 10.0  # A live stream without readers is stopped after this
+    STREAM_REPLAY_MAX_STREAMS: int = 512  # Per-worker cap on buffered streams (oldest evicted)
+    STREAM_REPLAY_MAX_BYTES: int = 32 * 1024 * 1024  # Per-worker cap on buffered frame bytes
+    STREAM_REPLAY_BACKEND: str = "memory"  # memory / redis (replay on another worker, REDIS_URL)
     PROXY_MAX_TOKENS: int = 512  # Max tokens for proxy mode
+
+    # Critical gate: refuse before the LLM call (see core/engines/critical_gate)
+    CRITICAL_GATE_ENABLED: bool = False  # Opt-in: refused requests skip the LLM call
+    CRITICAL_GATE_POLICIES: List[str] = ["N1", "N2"]  # Input policy violations that short-circuit
+    CRITICAL_GATE_FLAGS: List[str] = ["jailbreak", "instruction_override"]
+    CRITICAL_GATE_MIN_FLAG_SCORE: float = 0.9  # Minimum flag score that short-circuits
+    SPECULATIVE_LLM_DISPATCH: bool = False  # Start the LLM call while the input stages run
+    BATCH_MAX_CONCURRENCY: int = 8  # Concurrent pipelines per batch request
+    BATCH_MAX_ITEMS: int = 1000  # Maximum items per batch request
+    ANALYSIS_EXECUTOR: str = "inline"  # inline / thread / process (deterministic analysis stages)
+    ANALYSIS_EXECUTOR_WORKERS: int = 2  # Threads or worker processes for thread / process
+    EVENT_LOOP_LAG_INTERVAL_MS: float = 50.0  # Event loop lag sampling interval
+    ENGINE_MEMO_ENABLED: bool = True  # Memoize deterministic engine results per text
+    ENGINE_MEMO_MAX_ENTRIES: int = 4096  # Entries per memoized engine (LRU)
+    ENGINE_MEMO_TTL_SECONDS: float = 600.0  # Lifetime of a memoized result
+    PIPELINE_METRICS_ENABLED: bool = False  # Record per-stage latency histograms (about 10us per request)
+    PIPELINE_DEBUG_SPANS: bool = False  # Return stage spans under "debug" by default
+    PROVIDER_HEALTH_WINDOW: int = 100  # Recent calls kept per provider for latency/error stats
+    PROVIDER_UNHEALTHY_AFTER_FAILURES: int = 3  # Consecutive failures that mark a provider unhealthy
+    PROVIDER_HEALTH_COOLDOWN_SECONDS: float = 30.0  # Time before an unhealthy provider is tried again
+    ENSEMBLE_HEDGING_ENABLED: bool = True  # Stop waiting for slow ensemble models (see core/utils/ensemble_policy)
+    ENSEMBLE_POLICIES: Dict[str, Dict[str, float]] = {
+        "standalone": {"min_results": 2, "soft_deadline_seconds": 4.0}
+    }
+    PROVIDER_SELECTION_ENABLED: bool = False  # Latency-aware model choice for single-model modes (see core/utils/provider_selection)
+    PROVIDER_SELECTION_TIERS: Dict[str, List[str]] = {  # Quality tier -> interchangeable models (tie-break order)
+        "standard": ["openai/gpt-4o-mini", "groq/llama3-8b-tool-use", "mistral/mistral-7b-instruct"]
+    }
+    PROVIDER_SELECTION_MODE_TIERS: Dict[str, str] = {"proxy": "standard", "proxy-lite": "standard"}
+    PROVIDER_SELECTION_EWMA_ALPHA: float = 0.2  # Weight of the newest call in the latency/success EWMA
+    PROVIDER_SELECTION_EXPLORE_RATE: float = 0.05  # Share of calls sent to a non-best model to keep its stats fresh
+    LLM_RESPONSE_CACHE_ENABLED: bool = True  # Cache judge prompt responses (see gateway/response_cache)
+    LLM_RESPONSE_CACHE_MAX_TEMPERATURE: float = 0.3  # Only calls at or below this temperature are cached
+    LLM_RESPONSE_CACHE_TTL_SECONDS: float = 86400.0  # Lifetime of a cached response
+    LLM_RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # In-process (L1) size cap
+    LLM_RESPONSE_CACHE_MAX_ENTRY_BYTES: int = 256 * 1024  # Larger responses are not cached
+    LLM_RESPONSE_CACHE_L2: str = "none"  # none / sqlite / redis
+    LLM_RESPONSE_CACHE_SQLITE_PATH: str = "llm_response_cache.sqlite3"  # L2 file for sqlite
+    PROXY_PARAGRAPH_CACHE_ENABLED: bool = True  # Reuse deep-analysis results of unchanged paragraphs (see services/proxy_analyzer)
+    LLM_SINGLE_FLIGHT_ENABLED: bool = True  # Identical concurrent LLM requests share one provider call
+    LLM_CONCURRENCY_LIMITER_ENABLED: bool = True  # AIMD concurrency cap per provider/model (gateway/concurrency_limiter)
+    LLM_CONCURRENCY_INITIAL: int = 16  # Starting concurrent calls per provider/model
+    LLM_CONCURRENCY_MIN: int = 1
+    LLM_CONCURRENCY_MAX: int = 128
+    LLM_CONCURRENCY_DECREASE_FACTOR: float = 0.5  # Limit multiplier on 429/5xx
+    LLM_CONCURRENCY_DECREASE_COOLDOWN_SECONDS: float = 1.0  # At most one decrease per interval
+    LLM_CONCURRENCY_MAX_RETRY_AFTER_SECONDS: float = 60.0  # Cap on a provider's Retry-After
     
     # Regulation
     DEFAULT_POLICY_PACK: str = "eu_ai"  # rtuk, btk, eu_ai, oecd
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Analyzed Text
+Immutable, pre-tokenized view of a text shared by the deterministic engines.
+
+run_full_pipeline builds one AnalyzedText for the input and one for the output;
+every engine in core/engines (and the policy evaluator) accepts either a plain
+string or an AnalyzedText, so lowercasing, folding and tokenization happen once
+per text instead of once per engine.
+"""
+
+from typing import Any, Dict, FrozenSet, Tuple, Union
+import hashlib
+import re
+import string
+
+from backend.core.engines.pattern_index import fold_text
+
+
+_WORD_RE = re.compile(r"\w+")
+_STRIP_PUNCTUATION = str.maketrans("", "", string.punctuation)
+
+
+def content_digest(text: str) -> str:
+    """Hex content hash of a string (cache keys)"""
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+class AnalyzedText:
+    """
+    Derived forms of a text, computed once.
+
+    Attributes:
+        raw: Original text
+        lower: raw.lower()
+        folded: lower with Turkish/English case-insensitive folding (ı -> i, ſ -> s),
+            the form PatternIndex tokenizes
+        tokens: \\w+ tokens of folded, in order
+        words: Unique tokens (as expected by PatternIndex.match)
+
+    stripped (lower without ASCII punctuation) and n-gram sets are computed on
+    first use.
+    """
+
+    __slots__ = ("raw", "lower", "folded", "tokens", "words", "_derived")
+
+    def __init__(self, text: str):
+        text = text or ""
+        lower = text.lower()
+        folded = fold_text(lower)
+        tokens = tuple(_WORD_RE.findall(folded))
+        object.__setattr__(self, "raw", text)
+        object.__setattr__(self, "lower", lower)
+        object.__setattr__(self, "folded", folded)
+        object.__setattr__(self, "tokens", tokens)
+        object.__setattr__(self, "words", frozenset(tokens))
+        object.__setattr__(self, "_derived", {})
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("AnalyzedText is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("AnalyzedText is immutable")
+
+    @classmethod
+    def of(cls, text: Union[str, "AnalyzedText", None]) -> "AnalyzedText":
+        """Return text unchanged if it is already analyzed, else analyze it"""
+        if isinstance(text, AnalyzedText):
+            return text
+        return cls(text or "")
+
+    @property
+    def stripped(self) -> str:
+        """Lowercase text with ASCII punctuation removed"""
+        derived: Dict[str, Any] = self._derived
+        if "stripped" not in derived:
+            derived["stripped"] = self.lower.translate(_STRIP_PUNCTUATION)
+        return derived["stripped"]
+
+    def ngrams(self, n: int) -> FrozenSet[Tuple[str, ...]]:
+        """Set of token n-grams (n >= 1)"""
+        derived: Dict[str, Any] = self._derived
+        key = f"ngrams_{n}"
+        if key not in derived:
+            tokens = self.tokens
+            derived[key] = frozenset(
+                tuple(tokens[i:i + n]) for i in range(len(tokens) - n + 1)
+            )
+        return derived[key]
+
+    def digest(self, form: str = "raw") -> str:
+        """Content hash (hex) of one of the text forms ("raw", "lower" or "folded")"""
+        derived: Dict[str, Any] = self._derived
+        key = f"digest_{form}"
+        if key not in derived:
+            derived[key] = content_digest(getattr(self, form))
+        return derived[key]
+
+    def __reduce__(self) -> Tuple[Any, Tuple[str]]:
+        # Pickled as the raw text (derived forms are rebuilt, e.g. in worker processes)
+        return (AnalyzedText, (self.raw,))
+
+    def __str__(self) -> str:
+        return self.raw
+
+    def __repr__(self) -> str:
+        preview = self.raw if len(self.raw) <= 40 else self.raw[:37] + "..."
+        return f"AnalyzedText({preview!r})"
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, AnalyzedText):
+            return self.raw == other.raw
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.raw)
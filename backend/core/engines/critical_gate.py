@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Critical Gate (pre-LLM short-circuit)
+Decides, from the input-side analysis alone, whether a request will be refused
+anyway so run_full_pipeline can skip the LLM call.
+
+Opt-in (CRITICAL_GATE_ENABLED). The gate fires when:
+- the input violates a configured critical policy (N1/N2 by default) AND
+  matches one of the multi-word CRITICAL_INTENT_PATTERNS; policy triggers are
+  single words ("die", "harm", "weapon") and alone would refuse benign questions
+- or the input carries a configured flag (jailbreak / instruction_override)
+  with a score of at least CRITICAL_GATE_MIN_FLAG_SCORE. Flag scores come from
+  the gate's own patterns below and from input_analysis["risk_flags"] (scored
+  with the input risk score).
+"""
+
+from typing import Any, Dict, List, Optional, Pattern, Sequence, Tuple, Union
+
+from backend.core.engines.analyzed_text import AnalyzedText
+from backend.core.engines.pattern_index import any_of
+from backend.core.engines.safe_rewrite import safe_fallback_message
+
+
+# flag -> [(pattern, score)]; the flag score is the highest matching score
+GATE_FLAG_PATTERNS: Dict[str, List[Tuple[str, float]]] = {
+    "instruction_override": [
+        (r"\b(ignore|disregard|forget|override)\s+(all\s+|any\s+)?(of\s+)?(the\s+|your\s+|my\s+)?(previous|prior|above|earlier|system|original)\s+(instructions?|prompts?|rules|guidelines|directives)\b", 0.95),
+        (r"\b(önceki|tüm|bütün|sistem)\s+(talimatları|kuralları|yönergeleri)\s+(yok\s+say|unut|görmezden\s+gel|geçersiz\s+kıl)", 0.95),
+        (r"\b(reveal|print|show|repeat)\s+(me\s+)?(your|the)\s+(system\s+prompt|hidden\s+instructions)\b", 0.9),
+    ],
+    "jailbreak": [
+        # A bare "jailbreak" is usually about phones and consoles
+        (r"\bjailbreak(ed|ing)?\b", 0.5),
+        (r"\bjailbreak(ing)?\s+(the\s+|this\s+|your\s+)?(ai|assistant|chatbot|model|llm|system\s+prompt)\b", 0.9),
+        (r"\bdo\s+anything\s+now\b", 0.95),
+        (r"\b(developer|dan|god)\s+mode\s+(enabled|on|activated)\b", 0.95),
+        (r"\b(you\s+are|act\s+as|pretend\s+(to\s+be|you\s+are))\s+(an?\s+)?(unfiltered|uncensored|unrestricted)\b", 0.9),
+        (r"\b(without|no)\s+(any\s+)?(restrictions|filters|censorship|safety\s+guidelines)\b", 0.6),
+    ],
+}
+
+# Requests to carry out serious harm; a critical policy violation needs one of these
+CRITICAL_INTENT_PATTERNS: List[str] = [
+    r"\b(how\s+(do|can|would|to)\s+(i|we|you|one)?\s*|help\s+me\s+|teach\s+me\s+(how\s+)?(to\s+)?|steps\s+to\s+)"
+    r"(make|build|assemble|create|synthesi[sz]e|produce|buy)\s+(a\s+|an\s+|some\s+)?(homemade\s+|pipe\s+)?"
+    r"(bomb|explosive|nerve\s+agent|bioweapon|chemical\s+weapon|dirty\s+bomb|untraceable\s+gun|ghost\s+gun)s?\b",
+    r"\b(how\s+(do|can|would|to)\s+(i|we)?\s*|help\s+me\s+|i\s+(want|need|am\s+going)\s+to\s+)"
+    r"(kill|murder|poison|stab|shoot)\s+(a\s+|my\s+|the\s+|some\s+)?"
+    r"(people|person|someone|somebody|him|her|them|wife|husband|boss|neighbou?r|child|kids|classmates|coworkers?)\b",
+    r"\b(how\s+(do|can|to)\s+(i|we)?\s*|help\s+me\s+)(kill\s+myself|end\s+my\s+life|commit\s+suicide)\b",
+]
+
+_CRITICAL_INTENT = any_of(CRITICAL_INTENT_PATTERNS)
+
+_COMPILED_FLAG_PATTERNS: Dict[str, List[Tuple[Pattern, float]]] = {
+    flag: [(any_of([pattern]), score) for pattern, score in patterns]
+    for flag, patterns in GATE_FLAG_PATTERNS.items()
+}
+
+
+def match_gate_flags(text: Union[str, AnalyzedText]) -> Dict[str, float]:
+    """Score of every gate flag whose patterns match the text"""
+    text_lower = text.lower if isinstance(text, AnalyzedText) else (text or "").lower()
+    scores: Dict[str, float] = {}
+    for flag, patterns in _COMPILED_FLAG_PATTERNS.items():
+        matched = [score for pattern, score in patterns if pattern.search(text_lower)]
+        if matched:
+            scores[flag] = max(matched)
+    return scores
+
+
+def evaluate_critical_gate(
+    text: Union[str, AnalyzedText],
+    input_analysis: Dict[str, Any],
+    policy_violations: Sequence[str],
+    settings: Any
+) -> Optional[Dict[str, Any]]:
+    """
+    Check whether the request should be refused without calling the LLM
+
+    Args:
+        text: User input (or its AnalyzedText)
+        input_analysis: analyze_input result
+        policy_violations: Input policy violations (evaluate_policies)
+        settings: Settings with the CRITICAL_GATE_* fields
+
+    Returns:
+        None if the request may proceed, otherwise
+        {"reason": "critical_policy" | "critical_flag", "policies": [...], "flags": {flag: score}}
+    """
+    if not settings.CRITICAL_GATE_ENABLED:
+        return None
+
+    text_lower = text.lower if isinstance(text, AnalyzedText) else (text or "").lower()
+    critical_policies = [pid for pid in policy_violations if pid in settings.CRITICAL_GATE_POLICIES]
+    if critical_policies and not _CRITICAL_INTENT.search(text_lower):
+        critical_policies = []
+
+    gate_flags = set(settings.CRITICAL_GATE_FLAGS)
+    flag_scores = {
+        flag: score for flag, score in match_gate_flags(text).items() if flag in gate_flags
+    }
+    input_risk = input_analysis.get("risk_score", 0.0)
+    for flag in input_analysis.get("risk_flags", []):
+        if flag in gate_flags:
+            flag_scores[flag] = max(flag_scores.get(flag, 0.0), input_risk)
+    critical_flags = {
+        flag: score for flag, score in flag_scores.items()
+        if score >= settings.CRITICAL_GATE_MIN_FLAG_SCORE
+    }
+
+    if not critical_policies and not critical_flags:
+        return None
+
+    return {
+        "reason": "critical_policy" if critical_policies else "critical_flag",
+        "policies": critical_policies,
+        "flags": critical_flags
+    }
+
+
+def critical_gate_refusal() -> str:
+    """Refusal returned in place of the LLM output when the gate fires"""
+    return safe_fallback_message()
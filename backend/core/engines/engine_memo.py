@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Engine Memo
+Bounded LRU + TTL memoization for the deterministic engines.
+
+The same prompts (demo prompts, test suites, client retries) reach
+analyze_input, analyze_output and the policy trigger scan again and again.
+Each memoized engine gets its own EngineMemo keyed on (engine version, content
+hash of the text(s) it reads); the hash comes from AnalyzedText.digest(), so a
+text is hashed once per request however many engines look at it.
+
+Every memo is cleared when the policy map fingerprint changes. Results are
+stored frozen (read-only dict/list subclasses), so a caller can read and
+serialize a cached result but cannot corrupt it for the next caller; copy it
+(dict(result), {**result}) to modify it.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import logging
+import threading
+import time
+
+from backend.config import get_settings
+from backend.policy_engine.registry import get_policy_map_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+def _read_only(self, *args: Any, **kwargs: Any) -> None:
+    raise TypeError(f"{type(self).__name__} is a read-only cached engine result")
+
+
+class FrozenDict(dict):
+    """dict that refuses mutation (cached engine results)"""
+
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+    __ior__ = _read_only
+
+    def __reduce__(self) -> Tuple[Any, Tuple[Dict[Any, Any]]]:
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):
+    """list that refuses mutation (cached engine results)"""
+
+    __setitem__ = __delitem__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+    __iadd__ = __imul__ = _read_only
+
+    def __reduce__(self) -> Tuple[Any, Tuple[list]]:
+        return (FrozenList, (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Read-only deep copy of a JSON-like value (dicts, lists, tuples, scalars)"""
+    if isinstance(value, FrozenDict) or isinstance(value, FrozenList):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(v) for v in value)
+    if isinstance(value, tuple):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+class EngineMemo:
+    """
+    Thread-safe LRU cache with a per-entry TTL.
+
+    Keys are (version, *content hashes); values are frozen on insert.
+    """
+
+    def __init__(self, name: str, version: str, max_entries: int = 4096, ttl: float = 600.0):
+        self.name = name
+        self.version = version
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._fingerprint: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _check_fingerprint(self) -> None:
+        """Drop every entry if the policy map changed (caller holds the lock)"""
+        fingerprint = get_policy_map_fingerprint()
+        if fingerprint != self._fingerprint:
+            if self._entries:
+                self._entries.clear()
+                self.invalidations += 1
+                logger.info(f"Engine memo {self.name} invalidated (policy map changed)")
+            self._fingerprint = fingerprint
+
+    def get_or_compute(self, key: Tuple[Hashable, ...], compute: Callable[[], Any]) -> Any:
+        """Cached value for key, or compute(), freeze and store it"""
+        key = (self.version,) + key
+        now = time.monotonic()
+        with self._lock:
+            self._check_fingerprint()
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+
+        # Computed outside the lock; concurrent misses for one key both compute
+        value = freeze(compute())
+        with self._lock:
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        """Forget all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def reset_stats(self) -> None:
+        """Zero the counters"""
+        with self._lock:
+            self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and size"""
+        lookups = self.hits + self.misses
+        return {
+            "version": self.version,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations
+        }
+
+
+_memos: Dict[str, EngineMemo] = {}
+_memos_lock = threading.Lock()
+
+
+def get_engine_memo(name: str, version: str) -> Optional[EngineMemo]:
+    """
+    Process-wide memo for one engine, or None when ENGINE_MEMO_ENABLED is off
+
+    Args:
+        name: Engine name (one memo per name)
+        version: Engine version; bump it when the engine's output changes
+    """
+    settings = get_settings()
+    if not settings.ENGINE_MEMO_ENABLED:
+        return None
+    memo = _memos.get(name)
+    if memo is None or memo.version != version:
+        with _memos_lock:
+            memo = _memos.get(name)
+            if memo is None or memo.version != version:
+                memo = EngineMemo(
+                    name,
+                    version,
+                    max_entries=settings.ENGINE_MEMO_MAX_ENTRIES,
+                    ttl=settings.ENGINE_MEMO_TTL_SECONDS
+                )
+                _memos[name] = memo
+    return memo
+
+
+def get_engine_memo_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats of every engine memo, by engine name"""
+    return {name: memo.stats() for name, memo in sorted(_memos.items())}
+
+
+def clear_engine_memos() -> None:
+    """Drop every engine memo (tests, settings changes)"""
+    with _memos_lock:
+        _memos.clear()
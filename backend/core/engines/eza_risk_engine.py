@@ -5,6 +5,7 @@ Computes risk matrix (3x3 heatmap) from cases
 """
 
 from typing import Dict, Any, List
+from backend.core.engines.analyzed_text import AnalyzedText
 from backend.core.engines.input_analyzer import analyze_input
 from backend.core.engines.output_analyzer import analyze_output
 from backend.core.engines.alignment_engine import compute_alignment
@@ -22,11 +23,12 @@ def compute_risk(text: str, output_text: str = None) -> Dict[str, Any]:
     Returns:
         Risk analysis dictionary with risk_score, risk_level, etc.
     """
-    input_analysis = analyze_input(text)
+    analyzed_input = AnalyzedText.of(text)
+    input_analysis = analyze_input(analyzed_input)
     risk_score = input_analysis.get("risk_score", 0.0)
     
     if output_text:
-        output_analysis = analyze_output(output_text, input_analysis)
+        output_analysis = analyze_output(output_text, input_analysis, input_text=analyzed_input)
         alignment = compute_alignment(input_analysis, output_analysis)
         
         # Aggregate risk from all sources
@@ -6,6 +6,8 @@ Enhanced scoring system with comprehensive breakdown
 
 from typing import Dict, Any, Optional
 
+from backend.core.engines.analyzed_text import AnalyzedText
+
 
 def compute_eza_score_v21(
     input_analysis: Dict[str, Any],
@@ -14,7 +16,8 @@ def compute_eza_score_v21(
     redirect: Optional[Dict[str, Any]] = None,
     deception: Optional[Dict[str, Any]] = None,
     legal_risk: Optional[Dict[str, Any]] = None,
-    psych_pressure: Optional[Dict[str, Any]] = None
+    psych_pressure: Optional[Dict[str, Any]] = None,
+    input_text: Optional[AnalyzedText] = None
 ) -> Dict[str, Any]:
     """
     Compute EZA Score v2.1 - Enhanced scoring with deep analysis components
@@ -27,6 +30,7 @@ def compute_eza_score_v21(
         deception: Deception analysis dictionary (optional)
         legal_risk: Legal risk analysis dictionary (optional)
         psych_pressure: Psychological pressure analysis dictionary (optional)
+        input_text: AnalyzedText of input_analysis["raw_text"] (optional)
     
     Returns:
         Dictionary with final_score, safety_level, confidence, and detailed breakdown
@@ -111,25 +115,27 @@ def compute_eza_score_v21(
     has_severe_illegal = any(flag in ["drug_production", "violence", "privacy_violation"] for flag in input_risk_flags)
     
     # Check for identity theft (severe crime)
-    input_text = input_analysis.get("raw_text", "").lower() if isinstance(input_analysis, dict) else ""
-    has_identity_theft = "identity theft" in input_text or "steal identities" in input_text or "commit identity theft" in input_text
-    has_weapons = "weapons" in input_text or "make weapons" in input_text or "how to make weapons" in input_text
-    has_commit_crimes = "commit crimes" in input_text or "how to commit crimes" in input_text
-    has_testing_security_break = "testing security" in input_text and ("break it" in input_text or "how to break" in input_text)
-    has_just_asking_scams = "just asking" in input_text and ("create scams" in input_text or "how to create scams" in input_text)
+    if input_text is not None:
+        input_lower = input_text.lower
+    else:
+        input_lower = input_analysis.get("raw_text", "").lower() if isinstance(input_analysis, dict) else ""
+    has_identity_theft = "identity theft" in input_lower or "steal identities" in input_lower or "commit identity theft" in input_lower
+    has_weapons = "weapons" in input_lower or "make weapons" in input_lower or "how to make weapons" in input_lower
+    has_commit_crimes = "commit crimes" in input_lower or "how to commit crimes" in input_lower
+    has_testing_security_break = "testing security" in input_lower and ("break it" in input_lower or "how to break" in input_lower)
+    has_just_asking_scams = "just asking" in input_lower and ("create scams" in input_lower or "how to create scams" in input_lower)
     
     # Check for severe illegal activities from legal risk analysis
     legal_risk_categories = legal_risk.get("risk_categories", []) if legal_risk else []
     has_counterfeit = "fraud" in legal_risk_categories and legal_risk and "counterfeit" in str(legal_risk.get("risk_categories", []))
     has_malware = "hacking" in legal_risk_categories and legal_risk and "malware" in str(legal_risk.get("risk_categories", []))
     # Check input text for counterfeit/malware/unauthorized keywords
-    input_text = input_analysis.get("raw_text", "").lower() if isinstance(input_analysis, dict) else ""
     if not has_counterfeit:
-        has_counterfeit = "counterfeit" in input_text or "fake money" in input_text
+        has_counterfeit = "counterfeit" in input_lower or "fake money" in input_lower
     if not has_malware:
-        has_malware = "malware" in input_text or "create malware" in input_text or "make malware" in input_text
-    has_unauthorized_systems = "unauthorized systems" in input_text or "access unauthorized" in input_text
-    has_break_encryption = "break encryption" in input_text or "how to break encryption" in input_text
+        has_malware = "malware" in input_lower or "create malware" in input_lower or "make malware" in input_lower
+    has_unauthorized_systems = "unauthorized systems" in input_lower or "access unauthorized" in input_lower
+    has_break_encryption = "break encryption" in input_lower or "how to break encryption" in input_lower
     
     # Evaluate output independently - if output is completely ethical, allow high score
     output_is_very_safe = output_risk < 0.1
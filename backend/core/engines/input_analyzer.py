@@ -1,47 +1,138 @@
 # -*- coding: utf-8 -*-
 """
 Input Analyzer Engine (Light version for Fast Pipeline)
+
+All patterns are compiled once at import time. Risk categories are found with
+a single pass over the lowercased text (see match_risk_categories). Results
+are memoized per text (see engine_memo).
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Pattern, Sequence, Tuple, Union
 import re
 
+from backend.core.engines.analyzed_text import AnalyzedText
+from backend.core.engines.engine_memo import get_engine_memo
+from backend.core.engines.pattern_index import PatternIndex, any_of
+
+
+# Memo key version: bump whenever analyze_input's result for a given text changes
+ENGINE_VERSION = "1"
+
+_FLAGS = re.IGNORECASE
+
+# Basic risk patterns (lightweight) - English and Turkish
+# category -> (pattern, score); order defines the order of risk_flags
+RISK_PATTERNS: Dict[str, Tuple[str, float]] = {
+    "violence": (r"\b(kill|murder|harm|attack|violence|harm.someone|hurt.someone|injure|öldür|cinayet|zarar|saldırı|şiddet|birine.zarar|birini.yarala|birini.öldür)\b", 0.8),
+    "illegal": (r"\b(illegal|drug|weapon|hack|steal|yasal.değil|uyuşturucu|ilaç|silah|hackleme|çal|yasadışı)\b", 0.6),
+    "harmful": (r"\b(suicide|self.harm|dangerous|intihar|kendine.zarar|kendime.zarar|zarar.vermek|zarar.ver|tehlikeli|kendini.öldür|kendimi.öldür)\b", 0.8),
+    "manipulation": (r"\b(manipulate|trick|deceive|scam|fraud|commit.fraud|phishing|generate.phishing|create.phishing|manipüle|aldat|hile|dolandır|dolandırıcılık|sahte|fake)\b", 0.7),
+    "academic_dishonesty": (r"\b(cheat|cheating|plagiarism|plagiarize|copy\s+work|copy\s+homework|copy\s+assignment|copy\s+exam|copy\s+test|copy\s+answer|copy\s+answers|academic\s+dishonesty|academic\s+fraud|kopya|kopya\s+çek|kopya\s+çekme|kopya\s+çekmek|intihal|ödev\s+kopyala|sınav\s+kopyala|kopya\s+uzmanlığı|kopya\s+uzmanı|nasıl\s+kopya\s+çek|kopya\s+çekmeyi\s+öğret|kopya\s+çekmeyi\s+öğren)\b", 0.7),
+    "offensive_content": (r"\b(offensive|insult|insulting|rude|vulgar|obscene|profanity|swear|curse|bad.joke|insulting.joke|offensive.joke|kötü|kötü.şaka|hakaret|hakaret.dolu|küfür|kaba|edepsiz|müstehcen|küfürlü|küfürlü.şaka|hakaret.et|kötü.söz)\b", 0.7),
+    "hate_speech": (r"\b(hate|hatred|discriminate|discrimination|racist|racism|sexist|sexism|homophobic|transphobic|nefret|ayrımcılık|ırkçı|ırkçılık|cinsiyetçi|cinsiyetçilik)\b", 0.8),
+    "hacking": (r"\b(hack|hacking|unauthorized.access|break.into|bypass|bypass\s+security|bypass\s+protection|bypass\s+encryption|exploit|break\s+encryption|break\s+security|break\s+protection|crack|crack\s+encryption|crack\s+password|how\s+to\s+crack|hijack|hijack\s+session|how\s+to\s+hijack|how\s+to\s+bypass|how\s+to\s+break|sızma|hackleme|yetkisiz.erişim|kırma|atlama|şifre.kırma|bilgisayar.sızmak|sisteme.sızmak|başkasının.bilgisayarına|başkasının.sistemine)\b", 0.7),
+    "drug_production": (r"\b(drug|drugs|make\s+(illegal\s+)?drugs|produce\s+(illegal\s+)?drugs|drug\s+production|illegal\s+drugs|how\s+to\s+make\s+drugs|how\s+to\s+produce\s+drugs|uyuşturucu|ilaç\s+üretimi|uyuşturucu\s+üretimi|ilaç\s+yapımı|uyuşturucu.yapmak|uyuşturucu.üretmek)\b", 0.8),
+    "privacy_violation": (r"\b(access.someone's.private|private.data|private.messages|unauthorized.access|steal\s+data|steal\s+.*data|breach\s+privacy|breach\s+security|breach\s+protection|how\s+to\s+breach|özel.veri|özel.mesajlar|yetkisiz.erişim|veri.çal|gizlilik.ihlali|başkasının.verilerine|başkasının.bilgilerine)\b", 0.8),
+    "theft": (r"\b(steal|theft|robbery|pirate|piracy|pirate\s+software|illegal\s+download|çal|hırsızlık|soygun|korsan|çalmak|hırsızlık.yapmak)\b", 0.7),
+    # Additional patterns for common risky question formats
+    "risky_question": (r"\b(how\s+to\s+(hack|steal|harm|attack|break|bypass|crack|exploit|kill|murder|cheat)|nasıl\s+(hack|çal|zarar|saldır|kır|atlama|öldür|cinayet|kopya\s+çek)|how\s+can\s+i\s+(hack|steal|harm|attack|break|bypass|cheat)|nasıl\s+yapabilirim\s+(hack|çal|zarar|saldır|kopya\s+çek))\b", 0.75),
+    # Hacker-related questions (medium risk - could be educational but also risky)
+    "hacker_question": (r"\b(how\s+to\s+become\s+a\s+hacker|how\s+to\s+be\s+a\s+hacker|nasıl\s+hacker\s+olurum|nasıl\s+hacker\s+olunur|hacker\s+olmak|hacker\s+olurum|hacker\s+nasıl\s+olunur)\b", 0.6),
+}
+
+_RISK_INDEX = PatternIndex((name, pattern) for name, (pattern, _) in RISK_PATTERNS.items())
+_RISK_SCORES: Tuple[float, ...] = tuple(score for _, score in RISK_PATTERNS.values())
+
+
+def _any_keyword(keywords: Sequence[str]) -> Pattern:
+    """Compile keywords into one word-bounded alternation"""
+    return re.compile(r"\b(?:" + "|".join(keywords) + r")\b", _FLAGS)
+
+
+# Gray area detection: risk patterns with masking/legitimate context
+_MASKING_PATTERN = any_of([
+    r"\b(writing|novel|story|book|research|study|educational|academic|researcher|security.researcher|writing.a.story|kitap|roman|hikaye|araştırma|eğitim|araştırmacı|güvenlik.araştırmacısı|hikaye.yazıyorum)\b",
+    r"\b(character|fictional|hypothetical|theoretical|karakter|kurgusal|varsayımsal|teorik)\b",
+    r"\b(understand|learn|explain|how.works|how.do|security.systems|common.vulnerabilities|anlamak|öğrenmek|açıkla|nasıl.çalışır|güvenlik.sistemleri|yaygın.güvenlik.açıkları)\b",
+    r"^(explain|tell.me|can.you.explain|what.is|how.does|how.do|how.can|what.are|how.are|how.is|açıkla|anlat|nasıl|nedir|ne.demek)",
+    r"\b(explain\s+how|explain\s+what|explain\s+why|explain\s+the|how\s+does\s+\w+\s+work|how\s+do\s+\w+\s+work|what\s+is\s+\w+|what\s+are\s+\w+)\b"
+])
+
+# Educational questions: "explain how X works", "what is X", etc.
+_EDUCATIONAL_PATTERN = any_of([
+    r"^(explain|what.is|how.does|how.do|tell.me.about|can.you.explain)",
+    r"\b(explain\s+how\s+\w+\s+works?|explain\s+what\s+\w+\s+is|how\s+does\s+\w+\s+work|what\s+is\s+\w+)\b"
+])
+
+_RISKY_KEYWORDS_IN_QUESTION = _any_keyword([
+    "break", "hack", "steal", "harm", "attack", "fraud", "bypass", "crack", "exploit", "hijack", "breach",
+    "kötü", "hakaret", "offensive", "insult", "rude", "vulgar"
+])
+_RISKY_QUESTION_KEYWORDS = _any_keyword([
+    "break", "hack", "steal", "harm", "attack", "fraud", "bypass", "crack", "exploit", "hijack", "breach",
+    "kötü", "hakaret", "offensive", "insult", "rude", "vulgar", "bad", "joke"
+])
+_RISKY_SECURITY_KEYWORDS = _any_keyword(["break", "hack", "crack", "bypass", "exploit", "attack"])
+
+_SECURITY_RESEARCHER_PATTERN = re.compile(r"\b(security.researcher|güvenlik.araştırmacısı|researcher.studying.security)\b", _FLAGS)
+_RESEARCH_TOPIC_PATTERN = re.compile(r"\b(vulnerabilities|security.systems|güvenlik.açıkları|güvenlik.sistemleri)\b", _FLAGS)
+_SECURITY_KEYWORD_PATTERN = re.compile(r"\b(security|hack|bypass|exploit|vulnerability|güvenlik|sızma|atlama|güvenlik.açığı)\b", _FLAGS)
+_EDUCATIONAL_SECURITY_PATTERN = re.compile(r"\b(encryption|encrypt|decrypt|cryptography|ssl|tls|https|security.protocol|güvenlik.protokolü)\b", _FLAGS)
+
+_GREETING_PATTERN = any_of([
+    r"^(hello|hi|hey|greetings|merhaba|selam)",
+    r"\b(how.are.you|how.do.you.do|what's.up|nasılsın|naber)\b"
+])
+_QUESTION_WORDS = _any_keyword(["how", "what", "why", "when", "where", "who", "explain", "tell.me", "can.you", "could.you"])
+_GENERATION_WORDS = _any_keyword(["create", "make", "generate", "write", "build", "produce", "yap", "oluştur", "üret"])
+
 
-def analyze_input(text: str) -> Dict[str, Any]:
+def match_risk_categories(
+    text_lower: str,
+    words: Optional[Sequence[str]] = None
+) -> List[Tuple[str, float]]:
+    """
+    Return (category, score) for every risk category matching text_lower,
+    in RISK_PATTERNS order (one tokenization pass, see PatternIndex)
+    
+    Args:
+        text_lower: Lowercased text
+        words: Optional pre-computed word set (AnalyzedText.words)
+    """
+    return [
+        (_RISK_INDEX.names[position], _RISK_SCORES[position])
+        for position in _RISK_INDEX.match(text_lower, words)
+    ]
+
+
+def analyze_input(text: Union[str, AnalyzedText]) -> Dict[str, Any]:
     """
     Light input analysis for Fast Core Pipeline
     Returns risk flags, intent hints, and basic safety signals
+
+    Memoized per text; a cached result is read-only.
     """
+    analyzed = AnalyzedText.of(text)
+    memo = get_engine_memo("analyze_input", ENGINE_VERSION)
+    if memo is None:
+        return _analyze_input(analyzed)
+    return memo.get_or_compute((analyzed.digest(),), lambda: _analyze_input(analyzed))
+
+
+def _analyze_input(text: Union[str, AnalyzedText]) -> Dict[str, Any]:
+    """analyze_input without the memo"""
     risk_flags: List[str] = []
     risk_score = 0.0
     
-    # Basic risk patterns (lightweight) - English and Turkish
-    risk_patterns = {
-        "violence": [r"\b(kill|murder|harm|attack|violence|harm.someone|hurt.someone|injure|öldür|cinayet|zarar|saldırı|şiddet|birine.zarar|birini.yarala|birini.öldür)\b", 0.8],
-        "illegal": [r"\b(illegal|drug|weapon|hack|steal|yasal.değil|uyuşturucu|ilaç|silah|hackleme|çal|yasadışı)\b", 0.6],
-        "harmful": [r"\b(suicide|self.harm|dangerous|intihar|kendine.zarar|kendime.zarar|zarar.vermek|zarar.ver|tehlikeli|kendini.öldür|kendimi.öldür)\b", 0.8],
-        "manipulation": [r"\b(manipulate|trick|deceive|scam|fraud|commit.fraud|phishing|generate.phishing|create.phishing|manipüle|aldat|hile|dolandır|dolandırıcılık|sahte|fake)\b", 0.7],
-        "academic_dishonesty": [r"\b(cheat|cheating|plagiarism|plagiarize|copy\s+work|copy\s+homework|copy\s+assignment|copy\s+exam|copy\s+test|copy\s+answer|copy\s+answers|academic\s+dishonesty|academic\s+fraud|kopya|kopya\s+çek|kopya\s+çekme|kopya\s+çekmek|intihal|ödev\s+kopyala|sınav\s+kopyala|kopya\s+uzmanlığı|kopya\s+uzmanı|nasıl\s+kopya\s+çek|kopya\s+çekmeyi\s+öğret|kopya\s+çekmeyi\s+öğren)\b", 0.7],
-        "offensive_content": [r"\b(offensive|insult|insulting|rude|vulgar|obscene|profanity|swear|curse|bad.joke|insulting.joke|offensive.joke|kötü|kötü.şaka|hakaret|hakaret.dolu|küfür|kaba|edepsiz|müstehcen|küfürlü|küfürlü.şaka|hakaret.et|kötü.söz)\b", 0.7],
-        "hate_speech": [r"\b(hate|hatred|discriminate|discrimination|racist|racism|sexist|sexism|homophobic|transphobic|nefret|ayrımcılık|ırkçı|ırkçılık|cinsiyetçi|cinsiyetçilik)\b", 0.8],
-        "hacking": [r"\b(hack|hacking|unauthorized.access|break.into|bypass|bypass\s+security|bypass\s+protection|bypass\s+encryption|exploit|break\s+encryption|break\s+security|break\s+protection|crack|crack\s+encryption|crack\s+password|how\s+to\s+crack|hijack|hijack\s+session|how\s+to\s+hijack|how\s+to\s+bypass|how\s+to\s+break|sızma|hackleme|yetkisiz.erişim|kırma|atlama|şifre.kırma|bilgisayar.sızmak|sisteme.sızmak|başkasının.bilgisayarına|başkasının.sistemine)\b", 0.7],
-        "drug_production": [r"\b(drug|drugs|make\s+(illegal\s+)?drugs|produce\s+(illegal\s+)?drugs|drug\s+production|illegal\s+drugs|how\s+to\s+make\s+drugs|how\s+to\s+produce\s+drugs|uyuşturucu|ilaç\s+üretimi|uyuşturucu\s+üretimi|ilaç\s+yapımı|uyuşturucu.yapmak|uyuşturucu.üretmek)\b", 0.8],
-        "privacy_violation": [r"\b(access.someone's.private|private.data|private.messages|unauthorized.access|steal\s+data|steal\s+.*data|breach\s+privacy|breach\s+security|breach\s+protection|how\s+to\s+breach|özel.veri|özel.mesajlar|yetkisiz.erişim|veri.çal|gizlilik.ihlali|başkasının.verilerine|başkasının.bilgilerine)\b", 0.8],
-        "theft": [r"\b(steal|theft|robbery|pirate|piracy|pirate\s+software|illegal\s+download|çal|hırsızlık|soygun|korsan|çalmak|hırsızlık.yapmak)\b", 0.7],
-        # Additional patterns for common risky question formats
-        "risky_question": [r"\b(how\s+to\s+(hack|steal|harm|attack|break|bypass|crack|exploit|kill|murder|cheat)|nasıl\s+(hack|çal|zarar|saldır|kır|atlama|öldür|cinayet|kopya\s+çek)|how\s+can\s+i\s+(hack|steal|harm|attack|break|bypass|cheat)|nasıl\s+yapabilirim\s+(hack|çal|zarar|saldır|kopya\s+çek))\b", 0.75],
-        # Hacker-related questions (medium risk - could be educational but also risky)
-        "hacker_question": [r"\b(how\s+to\s+become\s+a\s+hacker|how\s+to\s+be\s+a\s+hacker|nasıl\s+hacker\s+olurum|nasıl\s+hacker\s+olunur|hacker\s+olmak|hacker\s+olurum|hacker\s+nasıl\s+olunur)\b", 0.6],
-    }
-    
-    text_lower = text.lower()
+    analyzed = AnalyzedText.of(text)
+    text = analyzed.raw
+    text_lower = analyzed.lower
     
     # Calculate risk score - accumulate scores for multiple patterns
     pattern_scores = []
-    for pattern_name, (pattern, score) in risk_patterns.items():
-        if re.search(pattern, text_lower, re.IGNORECASE):
-            risk_flags.append(pattern_name)
-            pattern_scores.append(score)
+    for pattern_name, score in match_risk_categories(text_lower, analyzed.words):
+        risk_flags.append(pattern_name)
+        pattern_scores.append(score)
     
     # Risk score calculation: use max as base, but add penalty for multiple patterns
     if pattern_scores:
@@ -51,28 +142,15 @@ def analyze_input(text: str) -> Dict[str, Any]:
             risk_score = min(1.0, risk_score + (len(pattern_scores) - 1) * 0.1)
     
     # Gray area detection: if risk patterns exist but text contains masking/legitimate context
-    masking_patterns = [
-        r"\b(writing|novel|story|book|research|study|educational|academic|researcher|security.researcher|writing.a.story|kitap|roman|hikaye|araştırma|eğitim|araştırmacı|güvenlik.araştırmacısı|hikaye.yazıyorum)\b",
-        r"\b(character|fictional|hypothetical|theoretical|karakter|kurgusal|varsayımsal|teorik)\b",
-        r"\b(understand|learn|explain|how.works|how.do|security.systems|common.vulnerabilities|anlamak|öğrenmek|açıkla|nasıl.çalışır|güvenlik.sistemleri|yaygın.güvenlik.açıkları)\b",
-        r"^(explain|tell.me|can.you.explain|what.is|how.does|how.do|how.can|what.are|how.are|how.is|açıkla|anlat|nasıl|nedir|ne.demek)",
-        r"\b(explain\s+how|explain\s+what|explain\s+why|explain\s+the|how\s+does\s+\w+\s+work|how\s+do\s+\w+\s+work|what\s+is\s+\w+|what\s+are\s+\w+)\b"
-    ]
-    
-    has_masking = any(re.search(pattern, text_lower, re.IGNORECASE) for pattern in masking_patterns)
+    has_masking = _MASKING_PATTERN.search(text_lower) is not None
     
     # Special handling for educational questions: "explain how X works", "what is X", etc.
-    educational_patterns = [
-        r"^(explain|what.is|how.does|how.do|tell.me.about|can.you.explain)",
-        r"\b(explain\s+how\s+\w+\s+works?|explain\s+what\s+\w+\s+is|how\s+does\s+\w+\s+work|what\s+is\s+\w+)\b"
-    ]
-    is_educational_question = any(re.search(pattern, text_lower, re.IGNORECASE) for pattern in educational_patterns)
+    is_educational_question = _EDUCATIONAL_PATTERN.search(text_lower) is not None
     
     # BUT: Exclude risky educational questions (those with harmful keywords)
-    risky_keywords_in_question = ["break", "hack", "steal", "harm", "attack", "fraud", "bypass", "crack", "exploit", "hijack", "breach", "kötü", "hakaret", "offensive", "insult", "rude", "vulgar"]
     if is_educational_question:
         # If educational question contains risky keywords, it's not truly educational
-        if any(re.search(rf"\b{keyword}\b", text_lower, re.IGNORECASE) for keyword in risky_keywords_in_question):
+        if _RISKY_KEYWORDS_IN_QUESTION.search(text_lower):
             is_educational_question = False
     
     # If it's an educational question and no clear risk patterns, set low risk
@@ -81,8 +159,7 @@ def analyze_input(text: str) -> Dict[str, Any]:
     # If risk patterns exist, ignore educational question logic (it's risky regardless)
     if is_educational_question and not pattern_scores and risk_score == 0.0:
         # Double-check: if question contains risky keywords, it's not safe
-        risky_question_keywords = ["break", "hack", "steal", "harm", "attack", "fraud", "bypass", "crack", "exploit", "hijack", "breach", "kötü", "hakaret", "offensive", "insult", "rude", "vulgar", "bad", "joke"]
-        if not any(re.search(rf"\b{keyword}\b", text_lower, re.IGNORECASE) for keyword in risky_question_keywords):
+        if not _RISKY_QUESTION_KEYWORDS.search(text_lower):
             # Add variations based on text characteristics for score diversity
             # Use a wider range to create more noticeable score differences
             text_length = len(text)
@@ -114,8 +191,8 @@ def analyze_input(text: str) -> Dict[str, Any]:
             risk_score = min(0.15, max(0.01, risk_score))  # Clamp to 0.01-0.15 range
     
     # Special case: security researcher asking about vulnerabilities (gray area)
-    if re.search(r"\b(security.researcher|güvenlik.araştırmacısı|researcher.studying.security)\b", text_lower, re.IGNORECASE):
-        if re.search(r"\b(vulnerabilities|security.systems|güvenlik.açıkları|güvenlik.sistemleri)\b", text_lower, re.IGNORECASE):
+    if _SECURITY_RESEARCHER_PATTERN.search(text_lower):
+        if _RESEARCH_TOPIC_PATTERN.search(text_lower):
             # This is gray area - legitimate research context
             risk_score = 0.5  # Medium risk for gray area
             if "gray_area" not in risk_flags:
@@ -124,16 +201,10 @@ def analyze_input(text: str) -> Dict[str, Any]:
     # Gray area: if masking patterns exist with security-related content, set medium risk
     if has_masking and risk_score < 0.3:
         # Check if text mentions security, hacking, bypass, etc. (potentially risky topics)
-        security_keywords = [
-            r"\b(security|hack|bypass|exploit|vulnerability|güvenlik|sızma|atlama|güvenlik.açığı)\b"
-        ]
-        has_security_keyword = any(re.search(pattern, text_lower, re.IGNORECASE) for pattern in security_keywords)
+        has_security_keyword = _SECURITY_KEYWORD_PATTERN.search(text_lower) is not None
         
         # But exclude educational questions about encryption, security concepts
-        educational_security_keywords = [
-            r"\b(encryption|encrypt|decrypt|cryptography|ssl|tls|https|security.protocol|güvenlik.protokolü)\b"
-        ]
-        is_educational_security = any(re.search(pattern, text_lower, re.IGNORECASE) for pattern in educational_security_keywords)
+        is_educational_security = _EDUCATIONAL_SECURITY_PATTERN.search(text_lower) is not None
         
         if has_security_keyword and not is_educational_security:
             # This is gray area - masking + security topic = medium risk
@@ -143,8 +214,7 @@ def analyze_input(text: str) -> Dict[str, Any]:
         elif is_educational_security and is_educational_question:
             # Educational question about security concepts = low risk
             # BUT: If it contains "break", "hack", "crack", etc., it's risky
-            risky_security_keywords = ["break", "hack", "crack", "bypass", "exploit", "attack"]
-            if not any(re.search(rf"\b{keyword}\b", text_lower, re.IGNORECASE) for keyword in risky_security_keywords):
+            if not _RISKY_SECURITY_KEYWORDS.search(text_lower):
                 # Add variations for score diversity - wider range
                 text_length = len(text)
                 if text_length < 50:
@@ -165,21 +235,15 @@ def analyze_input(text: str) -> Dict[str, Any]:
     text_lower_stripped = text_lower.strip()
     
     # Check for greeting first (more specific)
-    greeting_patterns = [
-        r"^(hello|hi|hey|greetings|merhaba|selam)",
-        r"\b(how.are.you|how.do.you.do|what's.up|nasılsın|naber)\b"
-    ]
-    is_greeting = any(re.search(pattern, text_lower, re.IGNORECASE) for pattern in greeting_patterns)
+    is_greeting = _GREETING_PATTERN.search(text_lower) is not None
     
     if is_greeting:
         intent = "greeting"
     # Check for question patterns (how, what, why, explain, tell me, can you)
-    elif any(re.search(rf"\b({word})\b", text_lower, re.IGNORECASE) 
-             for word in ["how", "what", "why", "when", "where", "who", "explain", "tell.me", "can.you", "could.you"]):
+    elif _QUESTION_WORDS.search(text_lower):
         intent = "question"
     # Check for generation patterns (create, make, generate, write, build)
-    elif any(re.search(rf"\b({word})\b", text_lower, re.IGNORECASE) 
-             for word in ["create", "make", "generate", "write", "build", "produce", "yap", "oluştur", "üret"]):
+    elif _GENERATION_WORDS.search(text_lower):
         intent = "generation"
     
     return {
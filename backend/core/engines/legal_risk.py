@@ -4,42 +4,66 @@ Legal Risk Engine (Deep)
 Analyzes legal compliance risks
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Pattern
 import re
 
+from backend.core.engines.analyzed_text import AnalyzedText
+
+
+_FLAGS = re.IGNORECASE
+
+# Illegal content patterns (English and Turkish)
+_ILLEGAL_PATTERNS: Dict[str, Pattern] = {
+    "copyright": re.compile(r"\b(copyright|pirate|illegal.download|telif|korsan)\b", _FLAGS),
+    "privacy": re.compile(r"\b(personal.data|gdpr|privacy.violation|private.messages|without.permission|unauthorized.access|kişisel.veri|gizlilik.ihlali|özel.mesajlar|izin.olmadan|yetkisiz.erişim)\b", _FLAGS),
+    "defamation": re.compile(r"\b(defame|slander|libel|iftira|karalama)\b", _FLAGS),
+    "fraud": re.compile(r"\b(fraud|scam|phishing|counterfeit|make.counterfeit|counterfeit.money|fake.money|fake\s+documents|create\s+fake\s+documents|fake\s+document|dolandırıcılık|aldatma|hile|sahte.para|sahte\s+belge)\b", _FLAGS),
+    "hacking": re.compile(r"\b(hack|hacking|unauthorized.access|unauthorized\s+access|unauthorized\s+systems|access\s+unauthorized|break.into|break\s+encryption|how\s+to\s+break\s+encryption|bypass|exploit|malware|create\s+malware|make\s+malware|sızma|hackleme|yetkisiz.erişim|kırma|atlama)\b", _FLAGS),
+    "drug_production": re.compile(r"\b(drug|drugs|illegal\s+drugs|drug\s+production|make\s+(illegal\s+)?drugs|produce\s+(illegal\s+)?drugs|how\s+to\s+make\s+drugs|how\s+to\s+produce\s+drugs|ilaç\s+üretimi|uyuşturucu|uyuşturucu\s+üretimi|ilaç\s+yapımı)\b", _FLAGS),
+    "violence": re.compile(r"\b(kill|murder|harm|attack|violence|öldür|cinayet|zarar|saldırı|şiddet)\b", _FLAGS),
+    "weapons": re.compile(r"\b(weapon|weapons|bomb|explosive|silah|bomba|patlayıcı)\b", _FLAGS),
+    "theft": re.compile(r"\b(steal|theft|robbery|identity\s+theft|steal\s+identities|commit\s+identity\s+theft|çal|hırsızlık|soygun|kimlik\s+hırsızlığı)\b", _FLAGS)
+}
+
+# Personal data exposure patterns
+_PII_PATTERNS = [
+    re.compile(r"\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b"),  # Credit card
+    re.compile(r"\b\d{3}-\d{2}-\d{4}\b"),  # SSN
+    re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b")  # Email
+]
+
 
 def analyze_legal_risk(
     input_analysis: Dict[str, Any],
     output_analysis: Dict[str, Any],
-    report: Dict[str, Any]
+    report: Dict[str, Any],
+    input_text: Optional[AnalyzedText] = None,
+    output_text: Optional[AnalyzedText] = None
 ) -> Dict[str, Any]:
     """
     Analyze legal compliance risks
     Returns legal risk assessment
+    
+    Args:
+        input_analysis: Input analysis results
+        output_analysis: Output analysis results
+        report: Report with input/output raw_text
+        input_text: Optional AnalyzedText of the input raw_text
+        output_text: Optional AnalyzedText of the output raw_text
     """
     risk_categories = []
     risk_score = 0.0
     
-    # Check for illegal content patterns (English and Turkish)
-    illegal_patterns = {
-        "copyright": r"\b(copyright|pirate|illegal.download|telif|korsan)\b",
-        "privacy": r"\b(personal.data|gdpr|privacy.violation|private.messages|without.permission|unauthorized.access|kişisel.veri|gizlilik.ihlali|özel.mesajlar|izin.olmadan|yetkisiz.erişim)\b",
-        "defamation": r"\b(defame|slander|libel|iftira|karalama)\b",
-        "fraud": r"\b(fraud|scam|phishing|counterfeit|make.counterfeit|counterfeit.money|fake.money|fake\s+documents|create\s+fake\s+documents|fake\s+document|dolandırıcılık|aldatma|hile|sahte.para|sahte\s+belge)\b",
-        "hacking": r"\b(hack|hacking|unauthorized.access|unauthorized\s+access|unauthorized\s+systems|access\s+unauthorized|break.into|break\s+encryption|how\s+to\s+break\s+encryption|bypass|exploit|malware|create\s+malware|make\s+malware|sızma|hackleme|yetkisiz.erişim|kırma|atlama)\b",
-        "drug_production": r"\b(drug|drugs|illegal\s+drugs|drug\s+production|make\s+(illegal\s+)?drugs|produce\s+(illegal\s+)?drugs|how\s+to\s+make\s+drugs|how\s+to\s+produce\s+drugs|ilaç\s+üretimi|uyuşturucu|uyuşturucu\s+üretimi|ilaç\s+yapımı)\b",
-        "violence": r"\b(kill|murder|harm|attack|violence|öldür|cinayet|zarar|saldırı|şiddet)\b",
-        "weapons": r"\b(weapon|weapons|bomb|explosive|silah|bomba|patlayıcı)\b",
-        "theft": r"\b(steal|theft|robbery|identity\s+theft|steal\s+identities|commit\s+identity\s+theft|çal|hırsızlık|soygun|kimlik\s+hırsızlığı)\b"
-    }
-    
-    input_text = report.get("input", {}).get("raw_text", "")
-    output_text = report.get("output", {}).get("raw_text", "")
+    if input_text is not None and output_text is not None:
+        # Lowercasing is per character, so this equals lowercasing the joined text
+        combined_text = input_text.lower + " " + output_text.lower
+    else:
+        raw_input = report.get("input", {}).get("raw_text", "")
+        raw_output = report.get("output", {}).get("raw_text", "")
+        combined_text = (raw_input + " " + raw_output).lower()
     
-    combined_text = (input_text + " " + output_text).lower()
-    
-    for category, pattern in illegal_patterns.items():
-        if re.search(pattern, combined_text, re.IGNORECASE):
+    for category, pattern in _ILLEGAL_PATTERNS.items():
+        if pattern.search(combined_text):
             risk_categories.append(category)
             # Higher risk scores for serious illegal activities
             if category in ["hacking", "drug_production", "violence", "weapons"]:
@@ -61,14 +85,8 @@ def analyze_legal_risk(
     
     # Check for personal data exposure
     # Simplified check - in production, use proper PII detection
-    pii_patterns = [
-        r"\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b",  # Credit card
-        r"\b\d{3}-\d{2}-\d{4}\b",  # SSN
-        r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"  # Email
-    ]
-    
-    for pattern in pii_patterns:
-        if re.search(pattern, combined_text):
+    for pattern in _PII_PATTERNS:
+        if pattern.search(combined_text):
             risk_categories.append("pii_exposure")
             risk_score = max(risk_score, 0.7)
             break
@@ -47,6 +47,8 @@ import httpx
 
 from backend.core.utils.telemetry import log_llm_call
 from backend.config import get_settings
+from backend.core.llm.http_pool import llm_http_client
+from backend.gateway.concurrency_limiter import llm_call_slot, retry_after_seconds
 from backend.gateway.router_adapter import call_llm_provider as gateway_call_llm
 from backend.gateway.error_mapping import LLMProviderError as GatewayLLMProviderError
 
@@ -75,8 +77,8 @@ LLM_PROVIDER: str = _settings.DEFAULT_LLM_PROVIDER.lower()
 LLM_API_KEY: Optional[str] = _settings.OPENAI_API_KEY  # Use OPENAI_API_KEY from Settings
 LLM_MODEL: str = _settings.LLM_MODEL  # Use LLM_MODEL from Settings
 
-# OpenAI chat completions endpoint (OpenAI'nin yeni API adresine göre güncellenebilir)
-OPENAI_BASE_URL = "https://api.openai.com/v1/chat/completions"
+# OpenAI chat completions endpoint (settings.OPENAI_BASE_URL ile değiştirilebilir)
+OPENAI_BASE_URL = f"{_settings.OPENAI_BASE_URL.rstrip('/')}/chat/completions"
 
 DepthMode = Literal["fast", "deep"]
 
@@ -92,6 +94,7 @@ async def _call_openai_chat(
     max_tokens: int = 512,
     timeout_seconds: Optional[float] = None,
     mode: str = "standalone",
+    tenant: Optional[str] = None,
 ) -> str:
     """
     OpenAI Chat Completions çağrısı.
@@ -141,12 +144,16 @@ async def _call_openai_chat(
     error_msg = None
     
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            resp = await client.post(
-                OPENAI_BASE_URL,
-                headers=headers,
-                json=payload,
-            )
+        async with llm_http_client("openai") as client:
+            # Adaptive concurrency cap for this model, queued fairly per tenant (gateway/concurrency_limiter)
+            async with llm_call_slot("openai", LLM_MODEL, tenant=tenant) as slot:
+                resp = await client.post(
+                    OPENAI_BASE_URL,
+                    headers=headers,
+                    json=payload,
+                    timeout=timeout,
+                )
+                slot.record(resp.status_code, retry_after_seconds(resp.headers))
             
             # Calculate duration
             duration_ms = (time.perf_counter() - t0) * 1000
@@ -328,6 +335,7 @@ async def route_model(
     max_tokens: int = 512,
     mode: str = "standalone",
     use_gateway: bool = True,  # V6: Use gateway by default
+    tenant: Optional[str] = None,
 ) -> str:
     """
     EZA v6 için merkezi model router.
@@ -344,6 +352,8 @@ async def route_model(
       temperature, max_tokens: LLM ayarları
       mode:     Pipeline mode for telemetry ("standalone", "proxy_fast", "proxy_deep")
       use_gateway: Use V6 gateway adapter (default: True)
+      tenant:   Organization the call is queued for in the concurrency limiter
+                (fair queuing; None uses the shared queue)
 
     Döner:
       raw_model_output: str (ham LLM cevabı – üst katmanlar bunu analiz edip
@@ -367,7 +377,8 @@ async def route_model(
                 settings=settings,
                 model=LLM_MODEL if provider == "openai" else None,
                 temperature=temperature,
-                max_tokens=max_tokens
+                max_tokens=max_tokens,
+                tenant=tenant
             )
             duration_ms = (time.perf_counter() - t0) * 1000
             
@@ -411,6 +422,7 @@ async def route_model(
             temperature=temperature,
             max_tokens=max_tokens,
             mode=mode,
+            tenant=tenant,
         )
 
     # İleride buraya diğer sağlayıcılar (claude, gemini, llama, mistral…) eklenecek.
@@ -1,87 +1,182 @@
 # -*- coding: utf-8 -*-
 """
 Output Analyzer Engine (Light version for Fast Pipeline)
+
+Results are memoized per (output text, input intent/text) (see engine_memo).
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, FrozenSet, List, NamedTuple, Optional, Pattern, Tuple, Union
 import re
 
+from backend.core.engines.analyzed_text import AnalyzedText, content_digest
+from backend.core.engines.engine_memo import get_engine_memo
+from backend.core.engines.pattern_index import any_of
+
+
+# Memo key version: bump whenever analyze_output's result for given texts changes
+ENGINE_VERSION = "1"
+
+_FLAGS = re.IGNORECASE
+
+_EDUCATIONAL_KEYWORDS = ["explain", "what is", "how does", "how do", "tell me about", "can you explain"]
+
+# Harmful content in output (but exclude educational context)
+# category -> (compiled pattern, score); order defines the order of risk_flags
+_HARMFUL_PATTERNS: Dict[str, Tuple[Pattern, float]] = {
+    "violence": (re.compile(r"\b(kill|murder|harm|attack|violence)\b", _FLAGS), 0.8),
+    "illegal": (re.compile(r"\b(illegal|drug|weapon|steal|yasa\s+dışı|yasadışı)\b", _FLAGS), 0.6),
+    "harmful": (re.compile(r"\b(suicide|self.harm|dangerous|intihar|tehlikeli)\b", _FLAGS), 0.8),
+    "unauthorized_access": (re.compile(r"\b(unauthorized\s+access|izinsiz\s+erişim|yetkisiz\s+erişim|break\s+into|sisteme\s+sızmak|başkasının\s+sistemine)\b", _FLAGS), 0.7),
+    "hacker_tools_risky": (re.compile(r"\b(hacker\s+yazılımları|hacker\s+software|hacker\s+tools|hacker\s+araçları)\b", _FLAGS), 0.6),  # Risky if mentioned without ethical context
+    "legal_violation": (re.compile(r"\b(yasal\s+haklarını\s+kırma|legal\s+rights\s+violation|yasal\s+haklarını\s+çıkarma|break\s+legal\s+rights|yasal\s+haklarını\s+kırma\s+riski)\b", _FLAGS), 0.7),
+    "risky_hacking_advice": (re.compile(r"\b(hacker\s+forumlarında|hacker\s+forums|yasal\s+sorunlar\s+ile\s+karşılaşabilirsiniz|legal\s+problems)\b", _FLAGS), 0.5),  # Mentions hacker forums or legal problems
+}
 
-def analyze_output(output_text: str, input_analysis: Dict[str, Any] = None) -> Dict[str, Any]:
+class OutputScan(NamedTuple):
+    """Pattern matches of an output text (see scan_output)"""
+    harmful: FrozenSet[str]  # _HARMFUL_PATTERNS names that matched
+    has_hacking: bool
+    is_ethical_hacking_content: bool
+
+
+# Hacking pattern - only risky if not in educational/ethical context
+_HACKING_PATTERN = re.compile(r"\b(hack|hacking|hacker|hackleme|hacker\s+olmak|hacker\s+olurum)\b", _FLAGS)
+
+# Output is about ethical hacking, security education, or legal boundaries
+_ETHICAL_HACKING_PATTERN = any_of([
+    r"\b(etik|ethical|yasal|legal|yasal\s+sınırlar|legal\s+boundaries|yasal\s+çerçeve)\b",
+    r"\b(ethical\s+hacking|etik\s+hacking|ethical\s+hacker|etik\s+hacker)\b",
+    r"\b(penetration\s+testing|sızma\s+testi|güvenlik\s+testi|security\s+testing)\b",
+    r"\b(ceh|certified\s+ethical\s+hacker|sertifika|certification)\b",
+    r"\b(ctf|capture\s+the\s+flag|hack\s+the\s+box|tryhackme)\b",
+    r"\b(güvenlik\s+uzmanı|security\s+expert|güvenlik\s+araştırmacısı|security\s+researcher)\b",
+    r"\b(izinsiz\s+erişim|unauthorized\s+access|yasa\s+dışı|illegal)\b",  # Warning about illegal access
+    r"\b(prevent|protect|security|encryption|encrypt|ssl|tls|https|secure|protection|güvenlik)\b",
+    r"\b(how\s+to\s+prevent|how\s+to\s+protect|security\s+measures|security\s+systems|güvenlik\s+önlemleri)\b",
+    r"\b(yasal\s+haklar|legal\s+rights|yasal\s+sorunlar|legal\s+issues)\b",
+    r"\b(sistemleri\s+korumak|protect\s+systems|güvenliği\s+artırmak|improve\s+security)\b"
+])
+
+
+def analyze_output(
+    output_text: Union[str, AnalyzedText],
+    input_analysis: Dict[str, Any] = None,
+    input_text: Optional[AnalyzedText] = None
+) -> Dict[str, Any]:
     """
     Light output analysis for Fast Core Pipeline
     Checks if output aligns with input intent and safety requirements
+    
+    Args:
+        output_text: Output text (or its AnalyzedText)
+        input_analysis: Optional input analysis (intent, raw_text)
+        input_text: Optional AnalyzedText of input_analysis["raw_text"]
+
+    Memoized per (output text, input intent, input text); a cached result is
+    read-only.
+    """
+    analyzed = AnalyzedText.of(output_text)
+    memo = get_engine_memo("analyze_output", ENGINE_VERSION)
+    if memo is None:
+        return _analyze_output(analyzed, input_analysis, input_text)
+
+    # Only the input's intent and lowercased text affect the result
+    input_key = None
+    if input_analysis:
+        if input_text is not None:
+            input_lower_digest = input_text.digest("lower")
+        else:
+            raw_text = input_analysis.get("raw_text")
+            input_lower_digest = content_digest(raw_text.lower() if isinstance(raw_text, str) else "")
+        input_key = (input_analysis.get("intent", "") == "question", input_lower_digest)
+    return memo.get_or_compute(
+        (analyzed.digest(), input_key),
+        lambda: _analyze_output(analyzed, input_analysis, input_text)
+    )
+
+
+def _analyze_output(
+    output_text: Union[str, AnalyzedText],
+    input_analysis: Dict[str, Any] = None,
+    input_text: Optional[AnalyzedText] = None
+) -> Dict[str, Any]:
+    """analyze_output without the memo"""
+    analyzed = AnalyzedText.of(output_text)
+    return build_output_analysis(
+        analyzed.raw,
+        scan_output(analyzed.lower),
+        is_educational_context(input_analysis, input_text)
+    )
+
+
+def is_educational_context(input_analysis: Optional[Dict[str, Any]], input_text: Optional[AnalyzedText] = None) -> bool:
+    """Whether the input asks an (educational) question"""
+    if not input_analysis:
+        return False
+    input_intent = input_analysis.get("intent", "")
+    if input_text is not None:
+        input_lower = input_text.lower
+    else:
+        input_lower = input_analysis.get("raw_text", "").lower() if isinstance(input_analysis.get("raw_text"), str) else ""
+    return input_intent == "question" or any(kw in input_lower for kw in _EDUCATIONAL_KEYWORDS)
+
+
+def scan_output(output_lower: str) -> OutputScan:
     """
+    Pattern matches of a lowercased output text
+
+    No pattern matches across a sentence end, so the scan of a text equals the
+    merge of the scans of its sentences (see merge_scans).
+    """
+    harmful = frozenset(name for name, (pattern, _) in _HARMFUL_PATTERNS.items() if pattern.search(output_lower))
+    has_hacking = _HACKING_PATTERN.search(output_lower) is not None
+    is_ethical_hacking_content = _ETHICAL_HACKING_PATTERN.search(output_lower) is not None
+    return OutputScan(harmful, has_hacking, is_ethical_hacking_content)
+
+
+def merge_scans(first: OutputScan, second: OutputScan) -> OutputScan:
+    """Scan of the concatenation of two texts"""
+    return OutputScan(
+        first.harmful | second.harmful,
+        first.has_hacking or second.has_hacking,
+        first.is_ethical_hacking_content or second.is_ethical_hacking_content
+    )
+
+
+def scan_risk_flags(scan: OutputScan, is_educational: bool) -> Tuple[float, List[str]]:
+    """Pattern risk score and flags of a scan (before the educational adjustments)"""
     risk_flags: List[str] = []
     risk_score = 0.0
-    
-    output_lower = output_text.lower()
-    
-    # Check if this is educational content (from input context)
-    is_educational = False
-    if input_analysis:
-        input_intent = input_analysis.get("intent", "")
-        input_text = input_analysis.get("raw_text", "").lower() if isinstance(input_analysis.get("raw_text"), str) else ""
-        educational_keywords = ["explain", "what is", "how does", "how do", "tell me about", "can you explain"]
-        is_educational = input_intent == "question" or any(kw in input_text for kw in educational_keywords)
-    
-    # Check for harmful content in output (but exclude educational context)
-    harmful_patterns = {
-        "violence": [r"\b(kill|murder|harm|attack|violence)\b", 0.8],
-        "illegal": [r"\b(illegal|drug|weapon|steal|yasa\s+dışı|yasadışı)\b", 0.6],
-        "harmful": [r"\b(suicide|self.harm|dangerous|intihar|tehlikeli)\b", 0.8],
-        "unauthorized_access": [r"\b(unauthorized\s+access|izinsiz\s+erişim|yetkisiz\s+erişim|break\s+into|sisteme\s+sızmak|başkasının\s+sistemine)\b", 0.7],
-        "hacker_tools_risky": [r"\b(hacker\s+yazılımları|hacker\s+software|hacker\s+tools|hacker\s+araçları)\b", 0.6],  # Risky if mentioned without ethical context
-        "legal_violation": [r"\b(yasal\s+haklarını\s+kırma|legal\s+rights\s+violation|yasal\s+haklarını\s+çıkarma|break\s+legal\s+rights|yasal\s+haklarını\s+kırma\s+riski)\b", 0.7],
-        "risky_hacking_advice": [r"\b(hacker\s+forumlarında|hacker\s+forums|yasal\s+sorunlar\s+ile\s+karşılaşabilirsiniz|legal\s+problems)\b", 0.5],  # Mentions hacker forums or legal problems
-    }
-    
-    # Hacking pattern - only risky if not in educational/ethical context
-    hacking_pattern = r"\b(hack|hacking|hacker|hackleme|hacker\s+olmak|hacker\s+olurum)\b"
-    has_hacking = re.search(hacking_pattern, output_lower, re.IGNORECASE)
-    
-    # Check if output is about ethical hacking, security education, or legal boundaries
-    ethical_hacking_indicators = [
-        r"\b(etik|ethical|yasal|legal|yasal\s+sınırlar|legal\s+boundaries|yasal\s+çerçeve)\b",
-        r"\b(ethical\s+hacking|etik\s+hacking|ethical\s+hacker|etik\s+hacker)\b",
-        r"\b(penetration\s+testing|sızma\s+testi|güvenlik\s+testi|security\s+testing)\b",
-        r"\b(ceh|certified\s+ethical\s+hacker|sertifika|certification)\b",
-        r"\b(ctf|capture\s+the\s+flag|hack\s+the\s+box|tryhackme)\b",
-        r"\b(güvenlik\s+uzmanı|security\s+expert|güvenlik\s+araştırmacısı|security\s+researcher)\b",
-        r"\b(izinsiz\s+erişim|unauthorized\s+access|yasa\s+dışı|illegal)\b",  # Warning about illegal access
-        r"\b(prevent|protect|security|encryption|encrypt|ssl|tls|https|secure|protection|güvenlik)\b",
-        r"\b(how\s+to\s+prevent|how\s+to\s+protect|security\s+measures|security\s+systems|güvenlik\s+önlemleri)\b",
-        r"\b(yasal\s+haklar|legal\s+rights|yasal\s+sorunlar|legal\s+issues)\b",
-        r"\b(sistemleri\s+korumak|protect\s+systems|güvenliği\s+artırmak|improve\s+security)\b"
-    ]
-    
-    is_ethical_hacking_content = any(re.search(pattern, output_lower, re.IGNORECASE) for pattern in ethical_hacking_indicators)
-    
-    # If output mentions ethical hacking, legal boundaries, or security education, it's safe
-    if has_hacking and is_ethical_hacking_content:
-        # This is ethical hacking education - don't flag as risky
-        has_hacking = False
-        # Actually, this should reduce risk score if it was set
-        if risk_score > 0:
-            risk_score = max(0.0, risk_score - 0.5)  # Reduce risk for ethical content
-    
-    for pattern_name, (pattern, score) in harmful_patterns.items():
-        if re.search(pattern, output_lower, re.IGNORECASE):
+    for pattern_name, (_, score) in _HARMFUL_PATTERNS.items():
+        if pattern_name in scan.harmful:
             risk_flags.append(f"output_{pattern_name}")
             risk_score = max(risk_score, score)
     
     # Only flag hacking if not in safe educational/ethical context
-    if has_hacking and not is_educational and not is_ethical_hacking_content:
+    # (output about ethical hacking, legal boundaries or security education is safe)
+    if scan.has_hacking and not is_educational and not scan.is_ethical_hacking_content:
         risk_flags.append("output_hacking")
         risk_score = max(risk_score, 0.6)
+    return risk_score, risk_flags
+
+
+def output_risk_score(
+    scan: OutputScan,
+    is_educational: bool,
+    output_length: int,
+    word_count: int
+) -> Tuple[float, List[str]]:
+    """
+    Risk score and flags of an output text from its scan, length and word
+    count (the word count is only used for educational inputs)
+    """
+    is_ethical_hacking_content = scan.is_ethical_hacking_content
+    risk_score, risk_flags = scan_risk_flags(scan, is_educational)
     
     # If educational question and output is safe, ensure low risk
     if is_educational and risk_score < 0.3:
         # Educational content should have very low risk, but add variations for score diversity
         # Use wider range for more noticeable differences
-        output_length = len(output_text)
-        word_count = len(output_text.split())
-        
         # Create variation: 0.01 to 0.12 range based on output length
         if output_length < 100:
             base_risk = 0.10
@@ -103,7 +198,6 @@ def analyze_output(output_text: str, input_analysis: Dict[str, Any] = None) -> D
     # If output is about ethical hacking education, ensure very low risk
     if is_ethical_hacking_content and risk_score < 0.2:
         # Ethical hacking education content should have very low risk, but add variations
-        output_length = len(output_text)
         if output_length < 200:
             risk_score = 0.08
         elif output_length < 500:
@@ -111,6 +205,13 @@ def analyze_output(output_text: str, input_analysis: Dict[str, Any] = None) -> D
         else:
             risk_score = 0.01
         risk_score = min(0.10, max(0.01, risk_score))
+    return risk_score, risk_flags
+
+
+def build_output_analysis(output_text: str, scan: OutputScan, is_educational: bool) -> Dict[str, Any]:
+    """analyze_output result of a text from its scan"""
+    word_count = len(output_text.split()) if is_educational else 0
+    risk_score, risk_flags = output_risk_score(scan, is_educational, len(output_text), word_count)
     
     # Quality check
     quality_score = 50.0
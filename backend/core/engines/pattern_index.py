@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+Pattern Index
+Compiled multi-category matcher for word-bounded keyword regexes.
+
+Engines describe categories as regexes of the form \\b(alt1|alt2|...)\\b.
+Instead of running one re.search per category, PatternIndex tokenizes the text
+once and looks every token up in a prefix index built from the literal start
+of each alternative. Only categories with a candidate token are confirmed with
+their own compiled regex, so results are identical to calling re.search per
+category with re.IGNORECASE.
+"""
+
+from typing import Dict, Iterable, List, Optional, Pattern, Sequence, Set, Tuple
+import re
+
+
+_FLAGS = re.IGNORECASE
+
+# re.IGNORECASE also matches these letters against their ASCII counterpart
+# (see the re docs); for Latin-script literals lowercased text needs no other
+# folding.
+_FOLD = str.maketrans({"ı": "i", "ſ": "s"})
+
+_WORD_RE = re.compile(r"\w+")
+
+# A literal character followed by one of these may be absent from the match
+_OPTIONAL_QUANTIFIERS = "?*{"
+
+
+def fold_text(text_lower: str) -> str:
+    """Fold lowercased text so plain prefix checks agree with re.IGNORECASE"""
+    return text_lower.translate(_FOLD)
+
+
+def any_of(patterns: Sequence[str], flags: int = _FLAGS) -> Pattern:
+    """Compile patterns into one alternation (same result as any(re.search(p) ...))"""
+    return re.compile("|".join(f"(?:{p})" for p in patterns), flags)
+
+
+def _split_alternatives(body: str) -> Optional[List[str]]:
+    """Split a regex body on top-level "|" (None if the body is unbalanced)"""
+    parts: List[str] = []
+    depth = 0
+    start = 0
+    i = 0
+    while i < len(body):
+        char = body[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "[":
+            i += 1
+            while i < len(body) and body[i] != "]":
+                i += 2 if body[i] == "\\" else 1
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth < 0:
+                return None
+        elif char == "|" and depth == 0:
+            parts.append(body[start:i])
+            start = i + 1
+        i += 1
+    if depth != 0:
+        return None
+    parts.append(body[start:])
+    return parts
+
+
+def _leading_literal(alternative: str) -> str:
+    """Word characters every match of the alternative must start with"""
+    literal = ""
+    for char in alternative:
+        if not (char.isalnum() or char == "_"):
+            if char in _OPTIONAL_QUANTIFIERS and literal:
+                literal = literal[:-1]
+            break
+        literal += char
+    lowered = literal.lower()
+    # Letters that change length when lowercased (e.g. "İ") cannot be prefix-checked
+    if len(lowered) != len(literal):
+        return ""
+    return fold_text(lowered)
+
+
+def leading_literals(pattern: str) -> Optional[List[str]]:
+    """
+    Literal token prefixes for a pattern of the form \\b(alt1|alt2|...)\\b.
+
+    Returns None when the pattern does not have that form or when some
+    alternative has no literal start; such patterns must always be searched.
+    """
+    if not (pattern.startswith(r"\b(") and pattern.endswith(r")\b")):
+        return None
+    inner = pattern[2:-2]
+    # The outer group must span the whole body: "(a)|(b)" is not one group
+    alternatives = _split_alternatives(inner)
+    if alternatives is None or len(alternatives) != 1:
+        return None
+    body = inner[1:-1]
+    if body.startswith("?:"):
+        body = body[2:]
+    elif body.startswith("?"):
+        return None
+    alternatives = _split_alternatives(body)
+    if not alternatives:
+        return None
+    literals = [_leading_literal(alt) for alt in alternatives]
+    if not all(literals):
+        return None
+    return literals
+
+
+class PatternIndex:
+    """
+    Matches many word-bounded category regexes with one tokenization pass.
+
+    A regex \\b(alt)\\b whose alternative starts with word characters L can only
+    match where a \\w+ token starts with L, so tokens are looked up in an index
+    of those literals and only the hit categories are confirmed by regex.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, str]], flags: int = _FLAGS):
+        self.names: Tuple[str, ...] = ()
+        self._compiled: List[Pattern] = []
+        self._always: Set[int] = set()
+        self._index: Dict[str, List[Tuple[str, int]]] = {}
+
+        names: List[str] = []
+        keyed: List[Tuple[str, int]] = []
+        for position, (name, pattern) in enumerate(patterns):
+            names.append(name)
+            self._compiled.append(re.compile(pattern, flags))
+            literals = leading_literals(pattern)
+            if literals is None:
+                self._always.add(position)
+            else:
+                keyed.extend((literal, position) for literal in set(literals))
+        self.names = tuple(names)
+
+        self._key_length = min((len(literal) for literal, _ in keyed), default=1)
+        for literal, position in keyed:
+            self._index.setdefault(literal[:self._key_length], []).append((literal, position))
+
+    def candidates(self, tokens: Iterable[str]) -> Set[int]:
+        """Positions of categories that may match, given folded text tokens"""
+        found = set(self._always)
+        key_length = self._key_length
+        index = self._index
+        for token in tokens:
+            entries = index.get(token[:key_length])
+            if entries:
+                for literal, position in entries:
+                    if position not in found and token.startswith(literal):
+                        found.add(position)
+        return found
+
+    def match(self, text_lower: str, tokens: Optional[Sequence[str]] = None) -> List[int]:
+        """
+        Positions of all matching categories, in declaration order.
+
+        Args:
+            text_lower: Lowercased text to search
+            tokens: Optional pre-computed unique \\w+ tokens of fold_text(text_lower)
+        """
+        if tokens is None:
+            tokens = set(_WORD_RE.findall(fold_text(text_lower)))
+        found = self.candidates(tokens)
+        return [
+            position
+            for position in sorted(found)
+            if self._compiled[position].search(text_lower)
+        ]
+
+    def match_names(self, text_lower: str, tokens: Optional[Sequence[str]] = None) -> List[str]:
+        """Names of all matching categories, in declaration order"""
+        return [self.names[position] for position in self.match(text_lower, tokens)]
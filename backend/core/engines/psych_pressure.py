@@ -4,13 +4,81 @@ Psychological Pressure Detector (Deep)
 Detects psychological manipulation and pressure tactics
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Pattern, Tuple, Union
 import re
 import string
 
+from backend.core.engines.analyzed_text import AnalyzedText
+
+
+_FLAGS = re.IGNORECASE
+_STRIP_PUNCTUATION = str.maketrans('', '', string.punctuation)
+
+# Semantic emotional-pressure bucket
+EMOTIONAL_PRESSURE_PHRASES = [
+    "i'm counting on you",
+    "don't let me down",
+    "don't disappoint me",
+    "i need you to",
+    "you must tell me",
+    "please, it's important",
+    "this is really important",
+    "this is really important to me",
+    "i trusted you"
+]
+
+
+def _phrase_check(phrase: str) -> Tuple[str, List[str], Pattern]:
+    """(phrase, substring variations, word-boundary pattern) for a pressure phrase"""
+    phrase_clean = phrase.lower().translate(_STRIP_PUNCTUATION)
+    phrase_lower = phrase.lower()
+    
+    # Also handle apostrophe variations
+    phrase_variations = [
+        phrase_lower,
+        phrase_lower.replace("'", ""),
+        phrase_lower.replace("'", "'"),
+        phrase_clean
+    ]
+    
+    # Handle apostrophe in pattern
+    phrase_pattern_str = phrase_lower.replace("'", "['']?")
+    phrase_pattern = r'\b' + re.escape(phrase_pattern_str).replace(r'\ ', r'\s+') + r'\b'
+    
+    return phrase, phrase_variations, re.compile(phrase_pattern, _FLAGS)
+
+
+_PRESSURE_PHRASE_CHECKS = [_phrase_check(phrase) for phrase in EMOTIONAL_PRESSURE_PHRASES]
+
+
+# Harmful intent indicators
+HARMFUL_INTENT_KEYWORDS = [
+    "hack", "steal", "drugs", "weapons", "fraud", "scam", "malware",
+    "bypass", "exploit", "break", "harm", "violence", "theft",
+    "illegal", "unauthorized", "private data"
+]
+
+_PRESSURE_PATTERNS: Dict[str, Pattern] = {
+    "guilt_trip": re.compile(r"\b(you.owe|you.should.feel|disappointed|counting\s+on\s+you|i'm\s+counting\s+on\s+you|i\s+count\s+on\s+you|i'm\s+counting|counting\s+on|i'm\s+counting\s+on|borçlusun|hayal.kırıklığı)\b", _FLAGS),
+    "let_me_down": re.compile(r"\b(let\s+me\s+down|don'?t\s+let\s+me\s+down|don'?t\s+let\s+me|dont\s+let\s+me\s+down)\b", _FLAGS),
+    "counting_on": re.compile(r"\b(i'm\s+counting\s+on\s+you|counting\s+on\s+you|i\s+count\s+on\s+you)\b", _FLAGS),
+    "fear_appeal": re.compile(r"\b(danger|threat|consequences|punishment|if\s+you\s+don't|if\s+you\s+don't\s+help|eğer\s+bunu\s+söylemezsen|çok\s+kötü\s+şeyler\s+olacak|bad\s+things\s+will\s+happen|bad\s+things|will\s+happen|tehlike|tehdit|sonuç|ceza)\b", _FLAGS),
+    "threat_conditional": re.compile(r"\b(if\s+you\s+don't.*bad|if\s+you\s+don't.*happen|don't\s+help.*bad|don't\s+help.*happen)\b", _FLAGS),
+    "social_proof": re.compile(r"\b(everyone.is|all.people|most.users|herkes|tüm.insanlar|çoğu.kullanıcı)\b", _FLAGS),
+    "scarcity": re.compile(r"\b(limited|only.few|last.chance|sınırlı|az|son.şans)\b", _FLAGS),
+    "reciprocity": re.compile(r"\b(I.did.for.you|I.helped.you|senin.için.yaptım|yardım.ettim)\b", _FLAGS),
+    "urgency": re.compile(r"\b(urgent|immediately|now|need\s+this\s+now|i\s+need\s+this|acil|hemen|şimdi|lütfen.acil|please.urgent|hayat.memat|life\s+and\s+death|matter\s+of\s+life|matter\s+of\s+life\s+and\s+death|this\s+is\s+a\s+matter|life.death)\b", _FLAGS),
+    "pleading": re.compile(r"\b(lütfen.söyle|please.tell|please.say|please|lütfen.yardım|please.help|please\s+just|just\s+this\s+once|just\s+once|please,\s+just\s+this\s+once|çok.önemli|very.important|very.critical|critical|this\s+is\s+critical|i\s+need\s+this\s+now)\b", _FLAGS),
+    "social_proof_question": re.compile(r"\b(herkes.bunu.yapıyor|everyone.is.doing|sen.neden.yapmıyorsun|why.aren't.you|neden.yapmıyorsun)\b", _FLAGS),
+    "reassurance": re.compile(r"\b(kötü.bir.şey.yapmayacağım|won't.do.anything.bad|zararsız|harmless|just.curious|sadece.merak)\b", _FLAGS),
+    "demand": re.compile(r"\b(you\s+must\s+help|you\s+must\s+do|you\s+have\s+to|you\s+must|help\s+me|yapmalısın|yardım\s+et|yapmak\s+zorundasın)\b", _FLAGS),
+    "must_help": re.compile(r"\b(you\s+must|must\s+help|help\s+me|yapmalısın)\b", _FLAGS),
+    "emotional_manipulation": re.compile(r"\b(you.must|you.should|you.owe|everyone.is|yapmalısın|herkes|borçlusun)\b", _FLAGS)
+}
+
 
 def analyze_psychological_pressure(
-    text: str,
+    text: Union[str, AnalyzedText],
     memory: List[Dict[str, Any]] = None,
     deception_result: Dict[str, Any] = None
 ) -> Dict[str, Any]:
@@ -26,47 +94,17 @@ def analyze_psychological_pressure(
     patterns = []
     score = 0.0
     
-    # Semantic emotional-pressure bucket
-    EMOTIONAL_PRESSURE_PHRASES = [
-        "i'm counting on you",
-        "don't let me down",
-        "don't disappoint me",
-        "i need you to",
-        "you must tell me",
-        "please, it's important",
-        "this is really important",
-        "this is really important to me",
-        "i trusted you"
-    ]
-    
-    # Harmful intent indicators
-    HARMFUL_INTENT_KEYWORDS = [
-        "hack", "steal", "drugs", "weapons", "fraud", "scam", "malware",
-        "bypass", "exploit", "break", "harm", "violence", "theft",
-        "illegal", "unauthorized", "private data"
-    ]
-    
     # Preprocess text: lowercase and strip punctuation
-    text_clean = text.lower().translate(str.maketrans('', '', string.punctuation))
-    text_lower = text.lower()
+    analyzed = AnalyzedText.of(text)
+    text_clean = analyzed.stripped
+    text_lower = analyzed.lower
     
     # Check if any emotional pressure phrase is found
     found_pressure_phrase = False
     matched_phrases = []
     
-    for phrase in EMOTIONAL_PRESSURE_PHRASES:
+    for phrase, phrase_variations, phrase_pattern in _PRESSURE_PHRASE_CHECKS:
         # Check both in clean text (no punctuation) and original text
-        phrase_clean = phrase.lower().translate(str.maketrans('', '', string.punctuation))
-        phrase_lower = phrase.lower()
-        
-        # Also handle apostrophe variations
-        phrase_variations = [
-            phrase_lower,
-            phrase_lower.replace("'", ""),
-            phrase_lower.replace("'", "'"),
-            phrase_clean
-        ]
-        
         found_variation = False
         for variation in phrase_variations:
             if variation in text_clean or variation in text_lower:
@@ -74,11 +112,7 @@ def analyze_psychological_pressure(
                 break
         
         # Also check for phrase as word boundary match (more flexible)
-        # Handle apostrophe in pattern
-        phrase_pattern_str = phrase_lower.replace("'", "['']?")
-        phrase_pattern = r'\b' + re.escape(phrase_pattern_str).replace(r'\ ', r'\s+') + r'\b'
-        
-        if found_variation or re.search(phrase_pattern, text_lower, re.IGNORECASE):
+        if found_variation or phrase_pattern.search(text_lower):
             found_pressure_phrase = True
             matched_phrases.append(phrase)
     
@@ -122,26 +156,8 @@ def analyze_psychological_pressure(
             })
     
     # Keep existing pattern-based detection for backward compatibility
-    pressure_patterns = {
-        "guilt_trip": r"\b(you.owe|you.should.feel|disappointed|counting\s+on\s+you|i'm\s+counting\s+on\s+you|i\s+count\s+on\s+you|i'm\s+counting|counting\s+on|i'm\s+counting\s+on|borçlusun|hayal.kırıklığı)\b",
-        "let_me_down": r"\b(let\s+me\s+down|don'?t\s+let\s+me\s+down|don'?t\s+let\s+me|dont\s+let\s+me\s+down)\b",
-        "counting_on": r"\b(i'm\s+counting\s+on\s+you|counting\s+on\s+you|i\s+count\s+on\s+you)\b",
-        "fear_appeal": r"\b(danger|threat|consequences|punishment|if\s+you\s+don't|if\s+you\s+don't\s+help|eğer\s+bunu\s+söylemezsen|çok\s+kötü\s+şeyler\s+olacak|bad\s+things\s+will\s+happen|bad\s+things|will\s+happen|tehlike|tehdit|sonuç|ceza)\b",
-        "threat_conditional": r"\b(if\s+you\s+don't.*bad|if\s+you\s+don't.*happen|don't\s+help.*bad|don't\s+help.*happen)\b",
-        "social_proof": r"\b(everyone.is|all.people|most.users|herkes|tüm.insanlar|çoğu.kullanıcı)\b",
-        "scarcity": r"\b(limited|only.few|last.chance|sınırlı|az|son.şans)\b",
-        "reciprocity": r"\b(I.did.for.you|I.helped.you|senin.için.yaptım|yardım.ettim)\b",
-        "urgency": r"\b(urgent|immediately|now|need\s+this\s+now|i\s+need\s+this|acil|hemen|şimdi|lütfen.acil|please.urgent|hayat.memat|life\s+and\s+death|matter\s+of\s+life|matter\s+of\s+life\s+and\s+death|this\s+is\s+a\s+matter|life.death)\b",
-        "pleading": r"\b(lütfen.söyle|please.tell|please.say|please|lütfen.yardım|please.help|please\s+just|just\s+this\s+once|just\s+once|please,\s+just\s+this\s+once|çok.önemli|very.important|very.critical|critical|this\s+is\s+critical|i\s+need\s+this\s+now)\b",
-        "social_proof_question": r"\b(herkes.bunu.yapıyor|everyone.is.doing|sen.neden.yapmıyorsun|why.aren't.you|neden.yapmıyorsun)\b",
-        "reassurance": r"\b(kötü.bir.şey.yapmayacağım|won't.do.anything.bad|zararsız|harmless|just.curious|sadece.merak)\b",
-        "demand": r"\b(you\s+must\s+help|you\s+must\s+do|you\s+have\s+to|you\s+must|help\s+me|yapmalısın|yardım\s+et|yapmak\s+zorundasın)\b",
-        "must_help": r"\b(you\s+must|must\s+help|help\s+me|yapmalısın)\b",
-        "emotional_manipulation": r"\b(you.must|you.should|you.owe|everyone.is|yapmalısın|herkes|borçlusun)\b"
-    }
-    
-    for pattern_name, pattern in pressure_patterns.items():
-        matches = len(re.findall(pattern, text_lower, re.IGNORECASE))
+    for pattern_name, pattern in _PRESSURE_PATTERNS.items():
+        matches = len(pattern.findall(text_lower))
         if matches > 0:
             patterns.append({
                 "type": pattern_name,
@@ -5,13 +5,26 @@ Ensures final output is ethical, safe, and aligned.
 Only rewriting, never hallucinating new facts.
 """
 
-from typing import Dict, Any
-import re
+from typing import Dict, Any, Union
+
+from backend.core.engines.analyzed_text import AnalyzedText
+from backend.core.engines.pattern_index import any_of
+
+
+# Keywords that indicate actively promoting harmful behavior (not just discussing)
+_ACTIVELY_HARMFUL_PATTERN = any_of([
+    r"\b(how\s+to\s+(hack|break|steal|harm|attack|kill|exploit|crack|bypass))\b",
+    r"\b(here's\s+how\s+to\s+(hack|break|steal|harm|attack|kill))\b",
+    r"\b(you\s+can\s+(hack|break|steal|harm|attack|kill))\b",
+    r"\b(step\s+by\s+step\s+(hack|break|steal|harm|attack|kill))\b",
+    r"\b(make\s+(drugs|weapons|malware|virus))\b",
+    r"\b(create\s+(drugs|weapons|malware|virus|phishing))\b",
+])
 
 
 def safe_rewrite(
     user_message: str,
-    llm_output: str,
+    llm_output: Union[str, AnalyzedText],
     input_analysis: Dict[str, Any],
     output_analysis: Dict[str, Any],
     alignment: Dict[str, Any]
@@ -23,7 +36,7 @@ def safe_rewrite(
     
     Args:
         user_message: Original user message
-        llm_output: Raw LLM output
+        llm_output: Raw LLM output (or its AnalyzedText)
         input_analysis: Input analysis results
         output_analysis: Output analysis results
         alignment: Alignment analysis results
@@ -31,41 +44,24 @@ def safe_rewrite(
     Returns:
         Safe rewritten output (never empty)
     """
+    analyzed = llm_output if isinstance(llm_output, AnalyzedText) else None
+    if analyzed is not None:
+        llm_output = analyzed.raw
+    
     # Ensure we always have output
     if not llm_output or not llm_output.strip():
         return "Üzgünüm, şu anda yanıt veremiyorum. Lütfen tekrar deneyin."
     
-    # Define keywords that indicate actively promoting harmful behavior (not just discussing)
-    actively_harmful_patterns = [
-        r"\b(how\s+to\s+(hack|break|steal|harm|attack|kill|exploit|crack|bypass))\b",
-        r"\b(here's\s+how\s+to\s+(hack|break|steal|harm|attack|kill))\b",
-        r"\b(you\s+can\s+(hack|break|steal|harm|attack|kill))\b",
-        r"\b(step\s+by\s+step\s+(hack|break|steal|harm|attack|kill))\b",
-        r"\b(make\s+(drugs|weapons|malware|virus))\b",
-        r"\b(create\s+(drugs|weapons|malware|virus|phishing))\b",
-    ]
+    output_lower = analyzed.lower if analyzed is not None else llm_output.lower()
     
-    output_lower = llm_output.lower()
+    # Block with fallback if output actively promotes harm (not just discussing safely)
+    # or is poorly aligned, at high risk
+    if needs_safe_fallback(promotes_harm(output_lower), output_analysis, alignment):
+        return safe_fallback_message()
     
-    # Check if output is actively promoting harmful behavior (not just discussing safely)
-    is_promoting_harm = any(
-        re.search(pattern, output_lower, re.IGNORECASE) 
-        for pattern in actively_harmful_patterns
-    )
-    
-    # Check output risk level
-    output_risk_level = output_analysis.get("risk_level", "low")
     output_risk_score = output_analysis.get("risk_score", 0.0)
     alignment_score = alignment.get("alignment_score", 100.0)
     
-    # If output is actively promoting harm AND has high risk → block with fallback
-    if is_promoting_harm and (output_risk_level == "high" or output_risk_score > 0.7):
-        return _get_safe_fallback_message()
-    
-    # If output has very poor alignment (< 30) AND high risk → block
-    if alignment_score < 30 and output_risk_score > 0.7:
-        return _get_safe_fallback_message()
-    
     # If output is safe (low risk, good alignment) → return as-is
     if output_risk_score < 0.3 and alignment_score >= 70:
         return llm_output
@@ -77,11 +73,41 @@ def safe_rewrite(
     
     # For other cases, return original but ensure it's not empty
     # The LLM response is likely safe enough, just discussing sensitive topics
-    return llm_output if llm_output.strip() else _get_safe_fallback_message()
+    return llm_output if llm_output.strip() else safe_fallback_message()
+
+
+def promotes_harm(output_lower: str) -> bool:
+    """
+    Whether a lowercased output actively promotes harmful behavior (not just
+    discussing it safely)
+
+    No pattern matches across a sentence end, so a text promotes harm if any
+    of its sentences does.
+    """
+    return _ACTIVELY_HARMFUL_PATTERN.search(output_lower) is not None
+
+
+def needs_safe_fallback(
+    is_promoting_harm: bool,
+    output_analysis: Dict[str, Any],
+    alignment: Dict[str, Any]
+) -> bool:
+    """Whether safe_rewrite replaces a (non-empty) output with safe_fallback_message"""
+    # Check output risk level
+    output_risk_level = output_analysis.get("risk_level", "low")
+    output_risk_score = output_analysis.get("risk_score", 0.0)
+    alignment_score = alignment.get("alignment_score", 100.0)
+    
+    # If output is actively promoting harm AND has high risk → block with fallback
+    if is_promoting_harm and (output_risk_level == "high" or output_risk_score > 0.7):
+        return True
+    
+    # If output has very poor alignment (< 30) AND high risk → block
+    return alignment_score < 30 and output_risk_score > 0.7
 
 
-def _get_safe_fallback_message() -> str:
-    """Returns a safe fallback message when harmful content is detected"""
+def safe_fallback_message() -> str:
+    """Safe fallback message returned in place of a refused or harmful answer"""
     return (
         "Üzgünüm (Sorry), bu konuda yardımcı olamam (cannot help). "
         "Talebiniz güvenlik, etik veya yasal riskler içerdiği için "
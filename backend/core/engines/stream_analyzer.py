@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Incremental Output Analyzer (SSE streaming)
+
+Consumes LLM tokens while they stream and scans every completed sentence
+once. Pattern matches never cross a sentence end, so the merged sentence
+scans equal the scan of the full text: at the end of the stream the output
+analysis is built from the running state (see output_analyzer.build_output_analysis)
+instead of re-scanning the whole answer.
+
+The running risk (pattern score and flags so far) is available after every
+sentence, for mid-stream risk events and for stopping the stream once it
+crosses a critical threshold. It is provisional: an ethical-context sentence
+later in the answer can still clear a hacking flag.
+
+SafeSentenceGate builds progressive SAFE-only delivery on top of it: a
+streamed sentence is released only once the answer up to and including it
+passes safe_rewrite, so the first safe text goes out after about one sentence
+of generation instead of the whole answer. The safe_rewrite decision is kept
+as running state too (harm patterns, length and word count of the sentences
+so far), so each release only looks at its new sentences.
+"""
+
+from typing import Any, Dict, List, Optional
+import re
+
+from backend.core.engines.alignment_engine import compute_alignment
+from backend.core.engines.output_analyzer import (
+    OutputScan,
+    analyze_output,
+    build_output_analysis,
+    is_educational_context,
+    merge_scans,
+    output_risk_score,
+    scan_output,
+    scan_risk_flags,
+)
+from backend.core.engines.safe_rewrite import (
+    needs_safe_fallback,
+    promotes_harm,
+    safe_fallback_message,
+    safe_rewrite,
+)
+
+# A sentence ends at . ! ? … followed by whitespace (the whitespace stays with it)
+_SENTENCE_END = re.compile(r"[.!?…]+\s+")
+
+_EMPTY_SCAN = OutputScan(frozenset(), False, False)
+
+
+class IncrementalOutputAnalyzer:
+    """Running output analysis of a streamed answer"""
+
+    def __init__(self, input_analysis: Optional[Dict[str, Any]]):
+        self.input_analysis = input_analysis
+        self.is_educational = is_educational_context(input_analysis)
+        self.scan = _EMPTY_SCAN
+        self.sentences = 0
+        self.risk_score = 0.0
+        self.risk_flags: List[str] = []
+        self._pending = ""
+        self._parts: List[str] = []
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far"""
+        return "".join(self._parts) + self._pending
+
+    @property
+    def completed(self) -> List[str]:
+        """Scanned text chunks, each ending at a sentence end (except after flush)"""
+        return self._parts
+
+    def feed(self, token: str) -> bool:
+        """
+        Add a streamed token; scan the sentences it completes
+
+        Returns True if the running risk flags changed.
+        """
+        self._pending += token
+        end = None
+        for end in _SENTENCE_END.finditer(self._pending):
+            pass
+        if end is None:
+            return False
+        completed, self._pending = self._pending[:end.end()], self._pending[end.end():]
+        self._parts.append(completed)
+        self.sentences += len(_SENTENCE_END.findall(completed))
+        return self._update(completed)
+
+    def _update(self, text: str) -> bool:
+        self.scan = merge_scans(self.scan, scan_output(text.lower()))
+        flags_before = self.risk_flags
+        self.risk_score, self.risk_flags = scan_risk_flags(self.scan, self.is_educational)
+        return self.risk_flags != flags_before
+
+    def flush(self) -> bool:
+        """Scan the trailing unfinished sentence (end of stream)"""
+        if not self._pending:
+            return False
+        completed, self._pending = self._pending, ""
+        self._parts.append(completed)
+        self.sentences += 1
+        return self._update(completed)
+
+    def risk(self) -> Dict[str, Any]:
+        """Running risk (SSE "risk" event payload)"""
+        return {
+            "risk_score": self.risk_score,
+            "risk_level": "high" if self.risk_score > 0.7 else "medium" if self.risk_score > 0.4 else "low",
+            "risk_flags": list(self.risk_flags),
+            "sentences": self.sentences,
+        }
+
+    def finish(self, output_text: str) -> Dict[str, Any]:
+        """
+        Output analysis of the final text (same result as analyze_output)
+
+        output_text is the cleaned answer; if cleaning changed more than the
+        surrounding whitespace the text is analyzed from scratch.
+        """
+        self.flush()
+        if output_text.strip() != self.text.strip():
+            return analyze_output(output_text, self.input_analysis)
+        return build_output_analysis(output_text, self.scan, self.is_educational)
+
+
+class SafeSentenceGate:
+    """Releases streamed sentences once the answer up to them passes safe_rewrite"""
+
+    def __init__(self, query: str, input_analysis: Dict[str, Any]):
+        self.query = query
+        self.input_analysis = input_analysis
+        self.analyzer = IncrementalOutputAnalyzer(input_analysis)
+        self.released: List[str] = []
+        self.rewritten = False  # A sentence was replaced; nothing after it is released
+        self._checked = 0
+        # Running safe_rewrite state of the checked sentences
+        self._promotes_harm = False
+        self._length = 0
+        self._words = 0
+        self._has_text = False
+
+    @property
+    def safe_answer(self) -> str:
+        """Everything released so far"""
+        return "".join(self.released)
+
+    def feed(self, token: str) -> bool:
+        """Add a streamed token; True if sentences are waiting for release()"""
+        self.analyzer.feed(token)
+        return len(self.analyzer.completed) > self._checked
+
+    def release(self, final: bool = False) -> str:
+        """
+        Check the completed sentences not released yet (final: also the
+        trailing unfinished one) and return the text that may be sent
+
+        If safe_rewrite changes the answer, its rewrite replaces the new
+        sentences and the gate closes (rewritten).
+        """
+        if self.rewritten:
+            return ""
+        if final:
+            self.analyzer.flush()
+        parts = self.analyzer.completed
+        if len(parts) == self._checked and not (final and not self.released):
+            return ""
+        new_text = "".join(parts[self._checked:])
+        self._checked = len(parts)
+
+        self._promotes_harm = self._promotes_harm or promotes_harm(new_text.lower())
+        self._length += len(new_text)
+        self._words += len(new_text.split())
+        self._has_text = self._has_text or bool(new_text.strip())
+        safe_text = self._check()
+        if safe_text is not None:
+            self.rewritten = True
+            new_text = f"\n\n{safe_text}" if self.released else safe_text
+        self.released.append(new_text)
+        return new_text
+
+    def _check(self) -> Optional[str]:
+        """safe_rewrite of the answer so far if it changes it, else None"""
+        if not self._has_text:
+            # Empty answer: safe_rewrite's own message
+            return safe_rewrite(self.query, "", self.input_analysis, {}, {})
+        analyzer = self.analyzer
+        risk_score, _ = output_risk_score(analyzer.scan, analyzer.is_educational, self._length, self._words)
+        output_analysis = {
+            "risk_score": risk_score,
+            "risk_level": "high" if risk_score > 0.7 else "medium" if risk_score > 0.4 else "low",
+        }
+        alignment = compute_alignment(self.input_analysis, output_analysis)
+        if needs_safe_fallback(self._promotes_harm, output_analysis, alignment):
+            return safe_fallback_message()
+        return None
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+LLM HTTP Pool
+Long-lived, per-provider httpx clients for every LLM call.
+
+A new httpx.AsyncClient per call pays for an SSL context, a TCP connect and a
+TLS handshake on every request. The registry keeps one client per provider
+(keep-alive connections, HTTP/2 where the provider and the h2 package allow
+it) with its own pool limits and default timeouts; callers still pass their
+per-request timeout.
+
+The FastAPI lifespan opens the clients on startup and closes them on shutdown.
+Outside the app (scripts, tests) clients are created on first use. A client is
+bound to the event loop it was created on, so clients are kept per loop. Clients
+of a loop that closed while they were open can no longer be closed cleanly;
+they are dropped, logged and counted (clients_orphaned). With
+LLM_HTTP_POOL_ENABLED off every call gets a one-shot client, as before.
+"""
+
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+import asyncio
+import logging
+import weakref
+
+import httpx
+
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  (httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+    logger.warning("h2 not installed; LLM provider clients use HTTP/1.1 keep-alive only")
+
+
+@dataclass(frozen=True)
+class ProviderPoolConfig:
+    """Connection pool limits and default timeouts of one provider"""
+    max_connections: int
+    max_keepalive_connections: int
+    timeout: float
+    connect_timeout: float
+    http2: bool
+
+
+# Providers behind TLS negotiate HTTP/2 through ALPN; local LLM servers are plain HTTP/1.1
+PROVIDER_POOLS: Dict[str, ProviderPoolConfig] = {
+    "openai": ProviderPoolConfig(100, 20, timeout=60.0, connect_timeout=4.0, http2=True),
+    "groq": ProviderPoolConfig(50, 10, timeout=30.0, connect_timeout=4.0, http2=True),
+    "mistral": ProviderPoolConfig(50, 10, timeout=30.0, connect_timeout=4.0, http2=True),
+    "anthropic": ProviderPoolConfig(50, 10, timeout=60.0, connect_timeout=4.0, http2=True),
+    "local": ProviderPoolConfig(20, 10, timeout=120.0, connect_timeout=4.0, http2=False),
+}
+
+DEFAULT_POOL = ProviderPoolConfig(20, 5, timeout=60.0, connect_timeout=4.0, http2=False)
+
+
+def _client_kwargs(provider: str) -> Dict[str, Any]:
+    """httpx.AsyncClient arguments for a provider"""
+    settings = get_settings()
+    config = PROVIDER_POOLS.get(provider, DEFAULT_POOL)
+    return {
+        "timeout": httpx.Timeout(config.timeout, connect=config.connect_timeout),
+        "limits": httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS
+        ),
+        "http2": config.http2 and HTTP2_AVAILABLE and settings.LLM_HTTP2_ENABLED,
+    }
+
+
+class LLMHTTPPool:
+    """Registry of long-lived httpx.AsyncClients, one per provider and event loop"""
+
+    def __init__(self):
+        # A loop's entry goes away with the loop (see _forget_loop)
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.clients_created = 0
+        self.clients_orphaned = 0
+
+    def get(self, provider: str) -> httpx.AsyncClient:
+        """The provider's client on the running event loop (created on first use)"""
+        loop = asyncio.get_running_loop()
+        clients = self._clients.get(loop)
+        if clients is None:
+            self._drop_closed_loops()
+            clients = self._clients[loop] = {}
+            weakref.finalize(loop, self._forget_loop, clients)
+        client = clients.get(provider)
+        if client is None or client.is_closed:
+            client = clients[provider] = httpx.AsyncClient(**_client_kwargs(provider))
+            self.clients_created += 1
+        return client
+
+    def _forget_loop(self, clients: Dict[str, httpx.AsyncClient]) -> None:
+        """Drop the clients of a loop that is gone, counting those still open"""
+        orphaned = sorted(provider for provider, client in clients.items() if not client.is_closed)
+        clients.clear()
+        if orphaned:
+            self.clients_orphaned += len(orphaned)
+            logger.warning(f"LLM HTTP clients orphaned by a closed event loop: {orphaned}")
+
+    def _drop_closed_loops(self) -> None:
+        for loop in [loop for loop in self._clients if loop.is_closed()]:
+            self._forget_loop(self._clients.pop(loop))
+
+    def open(self, providers: Optional[Tuple[str, ...]] = None) -> None:
+        """Create the clients of the given providers (default: all known) on the running loop"""
+        for provider in providers or tuple(PROVIDER_POOLS):
+            self.get(provider)
+
+    async def close(self) -> None:
+        """
+        Close the clients of the running loop, and those of other running loops
+        on their own loop. Clients of a stopped loop stay until close() runs on
+        it or the loop closes (then they are orphaned).
+        """
+        loop = asyncio.get_running_loop()
+        for client_loop, clients in list(self._clients.items()):
+            if client_loop is not loop and not client_loop.is_running() and not client_loop.is_closed():
+                continue
+            del self._clients[client_loop]
+            if client_loop is loop:
+                await self._close_clients(dict(clients))
+                clients.clear()
+            elif client_loop.is_running():
+                asyncio.run_coroutine_threadsafe(self._close_clients(dict(clients)), client_loop)
+                clients.clear()
+            else:
+                self._forget_loop(clients)
+
+    @staticmethod
+    async def _close_clients(clients: Dict[str, httpx.AsyncClient]) -> None:
+        for provider, client in clients.items():
+            if not client.is_closed:
+                try:
+                    await client.aclose()
+                except Exception as e:
+                    logger.warning(f"Closing LLM HTTP client for {provider} failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Open clients (over all event loops) and their pool configuration"""
+        providers: Dict[str, bool] = {}
+        for clients in list(self._clients.values()):
+            for provider, client in clients.items():
+                providers[provider] = providers.get(provider, False) or not client.is_closed
+        return {
+            "enabled": get_settings().LLM_HTTP_POOL_ENABLED,
+            "http2_available": HTTP2_AVAILABLE,
+            "clients_created": self.clients_created,
+            "clients_orphaned": self.clients_orphaned,
+            "event_loops": len(self._clients),
+            "providers": {
+                provider: {
+                    "open": is_open,
+                    "http2": _client_kwargs(provider)["http2"],
+                    "max_connections": PROVIDER_POOLS.get(provider, DEFAULT_POOL).max_connections,
+                    "max_keepalive_connections": PROVIDER_POOLS.get(provider, DEFAULT_POOL).max_keepalive_connections,
+                }
+                for provider, is_open in sorted(providers.items())
+            }
+        }
+
+
+_pool: Optional[LLMHTTPPool] = None
+
+
+def get_llm_http_pool() -> LLMHTTPPool:
+    """Process-wide LLM HTTP client registry"""
+    global _pool
+    if _pool is None:
+        _pool = LLMHTTPPool()
+    return _pool
+
+
+async def close_llm_http_pool() -> None:
+    """Close the pooled clients (application shutdown)"""
+    if _pool is not None:
+        await _pool.close()
+
+
+@asynccontextmanager
+async def llm_http_client(provider: str) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    HTTP client for one LLM call
+
+    Yields the provider's pooled client (left open), or a one-shot client that
+    is closed afterwards when LLM_HTTP_POOL_ENABLED is off.
+
+    Args:
+        provider: Provider name (openai, groq, mistral, anthropic, local)
+    """
+    if get_settings().LLM_HTTP_POOL_ENABLED:
+        yield get_llm_http_pool().get(provider)
+        return
+    async with httpx.AsyncClient(**_client_kwargs(provider)) as client:
+        yield client
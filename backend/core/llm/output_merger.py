@@ -3,7 +3,7 @@
 Output Merger for Multi-Model Ensemble
 Merges outputs from multiple models into a single safe answer
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from backend.core.engines.output_analyzer import analyze_output
 from backend.core.engines.alignment_engine import compute_alignment
 
@@ -11,7 +11,8 @@ from backend.core.engines.alignment_engine import compute_alignment
 def merge_ensemble_outputs(
     user_input: str,
     model_results: List[Dict[str, Any]],
-    input_analysis: Dict[str, Any]
+    input_analysis: Dict[str, Any],
+    voted_models: Optional[List[str]] = None
 ) -> str:
     """
     Merge outputs from multiple models into a single safe answer
@@ -26,6 +27,7 @@ def merge_ensemble_outputs(
         user_input: Original user input
         model_results: List of model results from ModelRouter.generate_ensemble()
         input_analysis: Input analysis results
+        voted_models: Model IDs whose answers count (hedged ensemble); default all successful
     
     Returns:
         Merged safe answer string
@@ -35,6 +37,8 @@ def merge_ensemble_outputs(
     
     # Filter successful results
     successful_results = [r for r in model_results if r.get("ok") and r.get("output")]
+    if voted_models is not None:
+        successful_results = [r for r in successful_results if r.get("model_id") in voted_models]
     
     if not successful_results:
         # All models failed, return fallback
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Chat Completion Streaming
+SSE streaming shared by the OpenAI-compatible provider clients (OpenAI, Groq, Mistral).
+
+The request is sent with "stream": true; every `data: {...}` line carries a
+chunk whose choices[0].delta.content is the next piece of text, and
+`data: [DONE]` ends the stream. A non-200 answer raises LLMProviderError
+(with the provider's status code and Retry-After) before any text is yielded.
+"""
+
+import json
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+from backend.core.llm.http_pool import llm_http_client
+from backend.gateway.concurrency_limiter import retry_after_seconds
+from backend.gateway.error_mapping import LLMProviderError
+
+
+async def iter_chat_deltas(response: httpx.Response) -> AsyncIterator[str]:
+    """Text deltas of a streaming chat completion response"""
+    async for line in response.aiter_lines():
+        line = line.strip()
+        if not line.startswith("data:"):
+            continue
+        data_str = line[5:].strip()
+        if data_str == "[DONE]":
+            return
+        try:
+            data = json.loads(data_str)
+        except json.JSONDecodeError:
+            continue
+        choices = data.get("choices") or []
+        if choices:
+            content = (choices[0].get("delta") or {}).get("content")
+            if content:
+                yield content
+
+
+async def stream_chat_completion(
+    provider: str,
+    url: str,
+    api_key: str,
+    payload: Dict[str, Any],
+    timeout: Optional[float]
+) -> AsyncIterator[str]:
+    """
+    POST a chat completion with "stream": true and yield its text deltas
+
+    Args:
+        provider: Provider name (pooled HTTP client and error attribution)
+        url: Chat completions endpoint
+        api_key: Bearer token
+        payload: Request body (model, messages, temperature, max_tokens)
+        timeout: Read timeout between chunks in seconds
+    """
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+        "Accept": "text/event-stream",
+    }
+    async with llm_http_client(provider) as client:
+        try:
+            async with client.stream("POST", url, headers=headers, json={**payload, "stream": True}, timeout=timeout) as response:
+                if response.status_code != 200:
+                    error_text = (await response.aread()).decode("utf-8", errors="replace")
+                    raise LLMProviderError(
+                        f"{provider} API error: {response.status_code} - {error_text}",
+                        provider,
+                        status_code=response.status_code,
+                        retry_after=retry_after_seconds(response.headers)
+                    )
+                async for delta in iter_chat_deltas(response):
+                    yield delta
+        except httpx.TimeoutException:
+            raise LLMProviderError(f"{provider} API timeout", provider)
+        except httpx.HTTPError as e:
+            raise LLMProviderError(f"{provider} API error: {str(e)}", provider)
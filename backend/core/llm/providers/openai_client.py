@@ -2,9 +2,13 @@
 """OpenAI Provider Client"""
 import os
 import asyncio
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator
 import httpx
 from backend.config import get_settings
+from backend.core.llm.http_pool import llm_http_client
+from backend.gateway.concurrency_limiter import retry_after_seconds
+from backend.core.llm.providers.chat_stream import stream_chat_completion
+from backend.gateway.error_mapping import LLMProviderError
 
 
 class OpenAIClient:
@@ -13,7 +17,7 @@ class OpenAIClient:
     def __init__(self):
         settings = get_settings()
         self.api_key = settings.OPENAI_API_KEY or os.getenv("OPENAI_API_KEY")
-        self.base_url = "https://api.openai.com/v1/chat/completions"
+        self.base_url = f"{settings.OPENAI_BASE_URL.rstrip('/')}/chat/completions"
         self.timeout = 12.0
         self.connect_timeout = 4.0
     
@@ -49,7 +53,7 @@ class OpenAIClient:
         timeout_seconds = timeout or self.timeout
         
         try:
-            async with httpx.AsyncClient(timeout=timeout_seconds) as client:
+            async with llm_http_client("openai") as client:
                 response = await client.post(
                     self.base_url,
                     headers={
@@ -73,7 +77,8 @@ class OpenAIClient:
                         "output": output,
                         "error": None,
                         "provider": "openai",
-                        "model_name": model
+                        "model_name": model,
+                        "status_code": response.status_code
                     }
                 else:
                     error_msg = f"OpenAI API error: {response.status_code} - {response.text}"
@@ -82,7 +87,9 @@ class OpenAIClient:
                         "output": None,
                         "error": error_msg,
                         "provider": "openai",
-                        "model_name": model
+                        "model_name": model,
+                        "status_code": response.status_code,
+                        "retry_after": retry_after_seconds(response.headers)
                     }
         
         except httpx.TimeoutException:
@@ -101,4 +108,29 @@ class OpenAIClient:
                 "provider": "openai",
                 "model_name": model
             }
-
+    
+    async def stream(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float = 0.2,
+        max_tokens: int = 512,
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response from OpenAI (SSE), yielding text deltas as they arrive
+        
+        Raises:
+            LLMProviderError: Missing API key, non-200 answer, timeout or transport error
+        """
+        if not self.api_key:
+            raise LLMProviderError("OPENAI_API_KEY not configured", "openai")
+        
+        payload = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        async for delta in stream_chat_completion("openai", self.base_url, self.api_key, payload, timeout or self.timeout):
+            yield delta
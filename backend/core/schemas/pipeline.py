@@ -5,7 +5,7 @@ Unified response format for all EZA pipeline modes
 """
 
 from pydantic import BaseModel, Field, model_validator
-from typing import Optional, Dict, Any, Literal
+from typing import Optional, Dict, Any, List, Literal
 
 
 class PipelineError(BaseModel):
@@ -34,6 +34,22 @@ class PipelineResponse(BaseModel):
         None,
         description="Optional rule-based interaction observation (standalone mode; flag-gated)",
     )
+    short_circuit: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Set when the critical gate refused the input without calling the LLM",
+    )
+    timings: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Per-stage pipeline timings in milliseconds",
+    )
+    routing: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Latency-aware model choice of the LLM call (when provider selection is enabled)",
+    )
+    debug: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Stage span timeline of this request (only when debug was requested)",
+    )
 
 
 class StandaloneRequest(BaseModel):
@@ -41,6 +57,7 @@ class StandaloneRequest(BaseModel):
     query: Optional[str] = Field(None, description="User input query", min_length=1)
     text: Optional[str] = Field(None, description="User input text (deprecated, use query)", min_length=1)
     safe_only: Optional[bool] = Field(False, description="Enable SAFE-only mode (rewrite enabled, scores hidden)")
+    debug: Optional[bool] = Field(None, description="Return the stage span timeline under 'debug'")
     
     @model_validator(mode='before')
     @classmethod
@@ -62,10 +79,32 @@ class ProxyRequest(BaseModel):
     message: str = Field(..., description="User input message", min_length=1)
     model: Optional[str] = Field("gpt-4o-mini", description="LLM model to use")
     depth: Literal["fast", "deep"] = Field("fast", description="Analysis depth")
+    debug: Optional[bool] = Field(None, description="Return the stage span timeline under 'debug'")
+
+
+class ProxyBatchItem(BaseModel):
+    """One item of a proxy batch request"""
+    message: str = Field(..., description="User input message", min_length=1)
+    output_text: Optional[str] = Field(None, description="Pre-generated output text (skips the LLM call)")
+
+
+class ProxyBatchRequest(BaseModel):
+    """Request schema for batch proxy mode"""
+    items: List[ProxyBatchItem] = Field(..., description="Items to analyze", min_length=1)
+    stream: bool = Field(False, description="Stream results as NDJSON lines as each item completes")
+
+
+class ProxyBatchResponse(BaseModel):
+    """Batch proxy response (results in request order)"""
+    ok: bool = Field(..., description="Whether every item executed successfully")
+    mode: Literal["proxy"] = "proxy"
+    count: int = Field(..., description="Number of items")
+    results: List[PipelineResponse] = Field(..., description="One pipeline response per item, in request order")
 
 
 class ProxyLiteRequest(BaseModel):
     """Request schema for proxy-lite mode"""
     message: str = Field(..., description="User input message", min_length=1)
     output_text: Optional[str] = Field(None, description="Pre-analyzed output text (optional)")
+    debug: Optional[bool] = Field(None, description="Return the stage span timeline under 'debug'")
 
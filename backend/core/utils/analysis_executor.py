@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Analysis Executor
+Runs the deterministic (CPU-bound) analysis stages off or on the event loop.
+
+Kinds:
+- inline: call the stage function directly on the event loop (default, no overhead)
+- thread: run it in a thread pool (frees the loop while the regex engine and
+  other C code release the GIL; pure-Python work still contends for it)
+- process: run it in a pool of worker processes started with "spawn"; every
+  worker imports the engines at start-up, so compiled patterns and the policy
+  map are built before the first request reaches it
+
+Stage functions must be module-level and take/return picklable values (see
+api/pipeline_stages).
+"""
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+import asyncio
+import functools
+import logging
+import multiprocessing
+
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_KINDS = ("inline", "thread", "process")
+
+
+def _warm_worker() -> None:
+    """Import and exercise the analysis stages once so compiled state exists"""
+    from backend.api.pipeline_stages import run_input_stages, run_output_stages
+    from backend.core.engines.analyzed_text import AnalyzedText
+
+    sample = AnalyzedText("How does encryption protect my data?")
+    stages = run_input_stages(sample)
+    run_output_stages(
+        "proxy", sample, "Encryption scrambles data with a key.",
+        stages["input_analysis"], stages["input_policy_violations"], stages["input_policy_risk"]
+    )
+
+
+class AnalysisExecutor:
+    """Runs stage functions inline, in a thread pool or in a process pool"""
+
+    def __init__(self, kind: str = "inline", max_workers: int = 2):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown analysis executor kind: {kind!r} (expected one of {EXECUTOR_KINDS})")
+        self.kind = kind
+        self.max_workers = max(1, max_workers)
+        self._pool: Optional[Executor] = None
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.kind == "thread":
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="eza-analysis"
+                )
+            else:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_worker
+                )
+            logger.info(f"Analysis executor started: {self.kind} x {self.max_workers}")
+        return self._pool
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run func(*args, **kwargs) on this executor and return its result"""
+        if self.kind == "inline":
+            return func(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_pool(), functools.partial(func, *args, **kwargs))
+
+    async def warm_up(self) -> None:
+        """Start every worker now instead of on the first requests"""
+        if self.kind == "inline":
+            return
+        await asyncio.gather(*(self.run(_warm_worker) for _ in range(self.max_workers)))
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker pool (a later run() starts a new one)"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+
+_executor: Optional[AnalysisExecutor] = None
+
+
+def get_analysis_executor() -> AnalysisExecutor:
+    """Process-wide analysis executor (ANALYSIS_EXECUTOR / ANALYSIS_EXECUTOR_WORKERS)"""
+    global _executor
+    if _executor is None:
+        settings = get_settings()
+        _executor = AnalysisExecutor(settings.ANALYSIS_EXECUTOR, settings.ANALYSIS_EXECUTOR_WORKERS)
+    return _executor
+
+
+def configure_analysis_executor(kind: str, max_workers: Optional[int] = None) -> AnalysisExecutor:
+    """Replace the process-wide executor (the previous pool is shut down)"""
+    global _executor
+    executor = AnalysisExecutor(kind, max_workers or get_settings().ANALYSIS_EXECUTOR_WORKERS)
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+    _executor = executor
+    return executor
+
+
+def shutdown_analysis_executor() -> None:
+    """Shut down the process-wide executor (application shutdown)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
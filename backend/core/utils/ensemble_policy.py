@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Ensemble Policy
+When ModelRouter.generate_ensemble may stop waiting for the remaining models.
+
+A hedged ensemble returns as soon as `min_results` models answered
+successfully, or, once `soft_deadline_seconds` have passed, with whatever
+successful answers have arrived by then. The calls still running are
+cancelled and reported as not having voted. Without any successful answer
+the ensemble keeps waiting (up to the per-model timeout), as before.
+
+Policies are configured per mode in settings.ENSEMBLE_POLICIES, e.g.
+{"standalone": {"min_results": 2, "soft_deadline_seconds": 4.0}}. A mode
+without an entry (or ENSEMBLE_HEDGING_ENABLED off) waits for every model.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict
+import threading
+
+from backend.config import get_settings
+
+
+@dataclass(frozen=True)
+class EnsemblePolicy:
+    """First-K / soft-deadline hedging of one mode (0 disables either rule)"""
+    min_results: int = 0
+    soft_deadline_seconds: float = 0.0
+
+    @property
+    def hedged(self) -> bool:
+        return self.min_results > 0 or self.soft_deadline_seconds > 0
+
+
+WAIT_FOR_ALL = EnsemblePolicy()
+
+
+def get_ensemble_policy(mode: str) -> EnsemblePolicy:
+    """Ensemble policy of a mode from settings"""
+    settings = get_settings()
+    if not settings.ENSEMBLE_HEDGING_ENABLED:
+        return WAIT_FOR_ALL
+    config = settings.ENSEMBLE_POLICIES.get(mode)
+    if not config:
+        return WAIT_FOR_ALL
+    return EnsemblePolicy(
+        min_results=int(config.get("min_results", 0)),
+        soft_deadline_seconds=float(config.get("soft_deadline_seconds", 0.0))
+    )
+
+
+class EnsembleStats:
+    """How often hedging ended an ensemble early, per mode"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._modes: Dict[str, Dict[str, int]] = {}
+
+    def record(self, mode: str, outcome: Dict[str, Any]) -> None:
+        """Record one ensemble outcome (as returned by ModelRouter in "hedge")"""
+        with self._lock:
+            counters = self._modes.setdefault(mode, {
+                "ensembles": 0,
+                "hedged": 0,
+                "stopped_min_results": 0,
+                "stopped_deadline": 0,
+                "cancelled_calls": 0,
+            })
+            counters["ensembles"] += 1
+            if outcome["cancelled_models"]:
+                counters["hedged"] += 1
+                counters["cancelled_calls"] += len(outcome["cancelled_models"])
+            if outcome["stop_reason"] == "min_results":
+                counters["stopped_min_results"] += 1
+            elif outcome["stop_reason"] == "deadline":
+                counters["stopped_deadline"] += 1
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                mode: {
+                    **counters,
+                    "hedge_rate": round(counters["hedged"] / counters["ensembles"], 4) if counters["ensembles"] else 0.0
+                }
+                for mode, counters in sorted(self._modes.items())
+            }
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Event Loop Lag Monitor
+Measures how late the event loop wakes up a periodic sleeper; synchronous work
+on the loop (e.g. inline analysis of long inputs) shows up directly as lag.
+"""
+
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+import asyncio
+import logging
+import time
+
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopLagMonitor:
+    """
+    Samples event loop lag every `interval` seconds.
+
+    Keeps the last `window` samples (lag in seconds) plus totals since start.
+    """
+
+    def __init__(self, interval: float = 0.05, window: int = 1200):
+        self.interval = interval
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._count = 0
+        self._max = 0.0
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start sampling on the running event loop"""
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._sample_forever())
+
+    async def stop(self) -> None:
+        """Stop sampling"""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def record(self, lag: float) -> None:
+        """Add one lag sample (seconds)"""
+        lag = max(0.0, lag)
+        self._samples.append(lag)
+        self._count += 1
+        if lag > self._max:
+            self._max = lag
+
+    async def _sample_forever(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.record(time.perf_counter() - start - self.interval)
+
+    def reset(self) -> None:
+        """Forget all samples"""
+        self._samples.clear()
+        self._count = 0
+        self._max = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Lag statistics in milliseconds (percentiles over the recent window)"""
+        samples = sorted(self._samples)
+        if samples:
+            last = len(samples) - 1
+            mean = sum(samples) / len(samples)
+            p50 = samples[int(last * 0.50)]
+            p99 = samples[int(last * 0.99)]
+        else:
+            mean = p50 = p99 = 0.0
+        return {
+            "running": self.running,
+            "interval_ms": round(self.interval * 1000.0, 3),
+            "samples": self._count,
+            "window_samples": len(samples),
+            "mean_ms": round(mean * 1000.0, 3),
+            "p50_ms": round(p50 * 1000.0, 3),
+            "p99_ms": round(p99 * 1000.0, 3),
+            "max_ms": round(self._max * 1000.0, 3)
+        }
+
+
+_monitor: Optional[EventLoopLagMonitor] = None
+
+
+def get_event_loop_lag_monitor() -> EventLoopLagMonitor:
+    """Process-wide lag monitor (EVENT_LOOP_LAG_INTERVAL_MS)"""
+    global _monitor
+    if _monitor is None:
+        _monitor = EventLoopLagMonitor(interval=get_settings().EVENT_LOOP_LAG_INTERVAL_MS / 1000.0)
+    return _monitor
@@ -2,6 +2,7 @@
 """
 EZA v6 Multi-Model Router
 Mod bazlı model routing: standalone=ensemble, proxy=openai, proxy-lite=openai
+(PROVIDER_SELECTION_ENABLED: proxy/proxy-lite pick the fastest model of their tier)
 
 Model ID format: provider/model-name
 - openai/gpt-4o-mini
@@ -10,11 +11,21 @@ Model ID format: provider/model-name
 """
 
 import asyncio
+import hashlib
+import json
 import logging
-from typing import Dict, Any, List, Optional, Tuple, Literal
+import threading
+import time
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple, Literal
 from backend.core.llm.providers.openai_client import OpenAIClient
 from backend.core.llm.providers.groq_client import GroqClient
 from backend.core.llm.providers.mistral_client import MistralClient
+from backend.gateway.single_flight import coalesced
+from backend.gateway.concurrency_limiter import llm_call_slot
+from backend.gateway.error_mapping import LLMProviderError
+from backend.core.utils.ensemble_policy import EnsemblePolicy, EnsembleStats, WAIT_FOR_ALL, get_ensemble_policy
+from backend.core.utils.provider_health import ProviderHealthRegistry
+from backend.core.utils.provider_selection import ProviderSelector
 from backend.config import get_settings
 
 logger = logging.getLogger(__name__)
@@ -33,16 +44,14 @@ class ModelRouter:
     Timeout → gracefully fallback
     """
     
-    def __init__(self):
+    def __init__(self, health: Optional[ProviderHealthRegistry] = None):
         """Initialize router with provider clients"""
-        self.settings = get_settings()
-        
-        # Initialize clients (API key kontrolü client içinde yapılır)
-        self.openai_client = OpenAIClient()
-        self.groq_client = GroqClient()
-        self.mistral_client = MistralClient()
-        
-        self.timeout = self.settings.LLM_TIMEOUT_SECONDS
+        # Rolling latency/error stats per provider (kept across settings reloads)
+        self.health = health or ProviderHealthRegistry()
+        self.ensemble_stats = EnsembleStats()
+        # Latency/success EWMA per model for latency-aware single-model routing
+        self.selector = ProviderSelector()
+        self._lock = threading.Lock()
         self.max_retries = 2
         
         # Model ID mappings (provider/model-name format)
@@ -52,10 +61,60 @@ class ModelRouter:
             "mistral/mistral-7b-instruct": "mistral-tiny"
         }
         
+        self._configure(get_settings())
+    
+    def _configure(self, settings: Any) -> None:
+        """Build the provider clients and availability flags from settings"""
+        self.settings = settings
+        
+        # Initialize clients (API key kontrolü client içinde yapılır)
+        self.openai_client = OpenAIClient()
+        self.groq_client = GroqClient()
+        self.mistral_client = MistralClient()
+        
+        self.timeout = self.settings.LLM_TIMEOUT_SECONDS
+        
         # Check which models are available (API keys loaded)
         self.available_models = self._check_available_models()
         logger.info(f"ModelRouter initialized. Available models: {self.available_models}")
     
+    def refresh(self) -> "ModelRouter":
+        """Rebuild clients if the settings were reloaded (get_settings cache cleared)"""
+        settings = get_settings()
+        if settings is not self.settings:
+            with self._lock:
+                if settings is not self.settings:
+                    self._configure(settings)
+        return self
+    
+    def reload(self) -> "ModelRouter":
+        """Rebuild clients and availability flags from the current settings now"""
+        with self._lock:
+            self._configure(get_settings())
+        return self
+    
+    def is_provider_healthy(self, provider: str) -> bool:
+        """False while the provider is failing repeatedly (see core/utils/provider_health)"""
+        return self.health.is_healthy(provider)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Availability flags and rolling health statistics per provider, ensemble hedging counters"""
+        health = self.health.summary()
+        providers = {}
+        for model_id in self.model_mappings:
+            provider = model_id.split("/", 1)[0]
+            providers[provider] = {
+                "model_id": model_id,
+                "available": self.is_model_available(model_id),
+                **health.get(provider, {"healthy": True, "window_calls": 0}),
+            }
+        return {
+            "available_models": list(self.available_models),
+            "providers": providers,
+            "ensemble": self.ensemble_stats.summary(),
+            "selection": self.selector.summary()
+        }
+    
     def _check_available_models(self) -> List[str]:
         """Check which models have API keys available"""
         available = []
@@ -118,7 +177,8 @@ class ModelRouter:
         temperature: float = 0.2,
         max_tokens: int = 512,
         timeout: Optional[float] = None,
-        retries: int = 2
+        retries: int = 2,
+        tenant: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Generate response from specified model with retry mechanism
@@ -130,6 +190,8 @@ class ModelRouter:
             max_tokens: Maximum tokens to generate
             timeout: Timeout in seconds (default: 12.0)
             retries: Number of retries (default: 2)
+            tenant: Organization (or other scope) the call is queued for in the
+                concurrency limiter (fair queuing); None uses the shared queue
         
         Returns:
             {
@@ -140,7 +202,37 @@ class ModelRouter:
                 "model_id": str,
                 "skipped": bool  # True if model was skipped (no API key)
             }
+        
+        Identical concurrent requests share one provider call (see gateway/single_flight);
+        each caller gets its own copy of the result.
         """
+        key = json.dumps([
+            model_id,
+            hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+            temperature,
+            max_tokens,
+            timeout,
+            retries,
+            tenant
+        ])
+        result = await coalesced(
+            "router",
+            key,
+            lambda: self._generate(prompt, model_id, temperature, max_tokens, timeout, retries, tenant)
+        )
+        return dict(result)
+    
+    async def _generate(
+        self,
+        prompt: str,
+        model_id: str,
+        temperature: float,
+        max_tokens: int,
+        timeout: Optional[float],
+        retries: int,
+        tenant: Optional[str]
+    ) -> Dict[str, Any]:
+        """generate() without request coalescing"""
         provider, actual_model = self._get_provider_from_model_id(model_id)
         timeout_seconds = timeout or self.timeout
         max_retries = retries or self.max_retries
@@ -162,31 +254,8 @@ class ModelRouter:
         for attempt in range(max_retries + 1):
             try:
                 # Route to appropriate provider
-                if provider == "openai":
-                    result = await self.openai_client.generate(
-                        prompt=prompt,
-                        model=actual_model,
-                        temperature=temperature,
-                        max_tokens=max_tokens,
-                        timeout=timeout_seconds
-                    )
-                elif provider == "groq":
-                    result = await self.groq_client.generate(
-                        prompt=prompt,
-                        model=actual_model,
-                        temperature=temperature,
-                        max_tokens=max_tokens,
-                        timeout=timeout_seconds
-                    )
-                elif provider == "mistral":
-                    result = await self.mistral_client.generate(
-                        prompt=prompt,
-                        model=actual_model,
-                        temperature=temperature,
-                        max_tokens=max_tokens,
-                        timeout=timeout_seconds
-                    )
-                else:
+                client = self._client(provider)
+                if client is None:
                     return {
                         "ok": False,
                         "output": None,
@@ -196,6 +265,27 @@ class ModelRouter:
                         "skipped": False
                     }
                 
+                # Adaptive per provider/model concurrency, queued fairly per tenant (gateway/concurrency_limiter)
+                async with llm_call_slot(provider, actual_model, tenant=tenant) as slot:
+                    started = time.perf_counter()
+                    try:
+                        result = await client.generate(
+                            prompt=prompt,
+                            model=actual_model,
+                            temperature=temperature,
+                            max_tokens=max_tokens,
+                            timeout=timeout_seconds
+                        )
+                    except Exception as e:
+                        latency_ms = (time.perf_counter() - started) * 1000.0
+                        self.health.record(provider, latency_ms, False, str(e))
+                        self.selector.record(model_id, latency_ms, False)
+                        raise
+                    slot.record(result.get("status_code"), result.get("retry_after"))
+                latency_ms = (time.perf_counter() - started) * 1000.0
+                self.health.record(provider, latency_ms, bool(result["ok"]), result.get("error"))
+                self.selector.record(model_id, latency_ms, bool(result["ok"]))
+                
                 # Add model_id to result
                 result["model_id"] = model_id
                 result["skipped"] = False
@@ -205,10 +295,12 @@ class ModelRouter:
                     return result
                 
                 # If rate limit error, retry with delay
-                if "rate limit" in result.get("error", "").lower():
+                if result.get("status_code") == 429 or "rate limit" in result.get("error", "").lower():
                     last_error = result["error"]
                     if attempt < max_retries:
-                        await asyncio.sleep(1.0 * (attempt + 1))  # Exponential backoff
+                        # With Retry-After the limiter holds the next call until then
+                        if not result.get("retry_after"):
+                            await asyncio.sleep(1.0 * (attempt + 1))  # Exponential backoff
                         continue
                 
                 # For timeout errors, try fallback
@@ -238,13 +330,70 @@ class ModelRouter:
             "skipped": False
         }
     
+    def _client(self, provider: str) -> Any:
+        return {
+            "openai": self.openai_client,
+            "groq": self.groq_client,
+            "mistral": self.mistral_client
+        }.get(provider)
+    
+    async def stream(
+        self,
+        prompt: str,
+        model_id: str,
+        temperature: float = 0.2,
+        max_tokens: int = 512,
+        timeout: Optional[float] = None,
+        tenant: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response from the specified model, yielding text deltas as they arrive
+        
+        Every provider (OpenAI, Groq, Mistral) streams natively over SSE. There is no
+        retry: once text has been yielded the call cannot be repeated transparently.
+        The call is queued in the concurrency limiter under tenant (see generate()).
+        
+        Raises:
+            LLMProviderError: Model unavailable (no API key) or the provider call failed
+        """
+        provider, actual_model = self._get_provider_from_model_id(model_id)
+        if not self.is_model_available(model_id):
+            raise LLMProviderError(f"API key not configured for {provider}", provider)
+        client = self._client(provider)
+        if client is None:
+            raise LLMProviderError(f"Unsupported provider: {provider}", provider)
+        
+        async with llm_call_slot(provider, actual_model, tenant=tenant) as slot:
+            started = time.perf_counter()
+            try:
+                async for delta in client.stream(
+                    prompt=prompt,
+                    model=actual_model,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    timeout=timeout or self.timeout
+                ):
+                    yield delta
+            except LLMProviderError as e:
+                slot.record(e.status_code, e.retry_after)
+                latency_ms = (time.perf_counter() - started) * 1000.0
+                self.health.record(provider, latency_ms, False, e.message)
+                self.selector.record(model_id, latency_ms, False)
+                raise
+            slot.record(200)
+            latency_ms = (time.perf_counter() - started) * 1000.0
+            self.health.record(provider, latency_ms, True)
+            self.selector.record(model_id, latency_ms, True)
+    
     async def generate_ensemble(
         self,
         prompt: str,
         model_ids: List[str],
         temperature: float = 0.2,
         max_tokens: int = 512,
-        timeout: Optional[float] = None
+        timeout: Optional[float] = None,
+        policy: Optional[EnsemblePolicy] = None,
+        tenant: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Generate responses from multiple models in parallel (ensemble)
@@ -255,48 +404,128 @@ class ModelRouter:
             temperature: Temperature for generation
             max_tokens: Maximum tokens to generate
             timeout: Timeout per model (default: 12.0)
+            policy: Hedging policy (default: wait for every model)
+            tenant: Organization the calls are queued for (see generate())
         
         Returns:
-            List of results from each model (skipped models included with skipped=True)
+            List of results from each model (skipped models included with skipped=True,
+            models cancelled by hedging with cancelled=True)
         """
+        results, _ = await self._run_ensemble(
+            prompt, model_ids, temperature, max_tokens, timeout, policy or WAIT_FOR_ALL, tenant
+        )
+        return results
+    
+    async def _wait_hedged(self, tasks: List["asyncio.Task[Dict[str, Any]]"], policy: EnsemblePolicy) -> str:
+        """Wait until the policy lets the ensemble stop; returns the stop reason"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + policy.soft_deadline_seconds if policy.soft_deadline_seconds > 0 else None
+        pending = set(tasks)
+        successes = 0
+        
+        while pending:
+            now = loop.time()
+            if deadline is not None and now >= deadline and successes:
+                return "deadline"
+            # Past the deadline without any answer: wait for the next one (up to the model timeout)
+            wait_timeout = deadline - now if deadline is not None and now < deadline else None
+            done, pending = await asyncio.wait(pending, timeout=wait_timeout, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.cancelled() and task.exception() is None and task.result().get("ok"):
+                    successes += 1
+            if policy.min_results and successes >= policy.min_results:
+                return "min_results"
+        return "all"
+    
+    async def _run_ensemble(
+        self,
+        prompt: str,
+        model_ids: List[str],
+        temperature: float,
+        max_tokens: int,
+        timeout: Optional[float],
+        policy: EnsemblePolicy,
+        tenant: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Run the ensemble under a policy; returns (results, hedge outcome)"""
+        started = time.perf_counter()
         tasks = [
-            self.generate(
+            asyncio.ensure_future(self.generate(
                 prompt=prompt,
                 model_id=model_id,
                 temperature=temperature,
                 max_tokens=max_tokens,
-                timeout=timeout
-            )
+                timeout=timeout,
+                tenant=tenant
+            ))
             for model_id in model_ids
         ]
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            if policy.hedged:
+                stop_reason = await self._wait_hedged(tasks, policy)
+            else:
+                await asyncio.wait(tasks)
+                stop_reason = "all"
+        finally:
+            # Cancel the stragglers (also when the caller itself is cancelled)
+            stragglers = [task for task in tasks if not task.done()]
+            for task in stragglers:
+                task.cancel()
+            if stragglers:
+                await asyncio.gather(*stragglers, return_exceptions=True)
         
-        # Convert exceptions to error results
+        # Convert exceptions and cancellations to error results
         processed_results = []
         skipped_models = []
         used_models = []
+        cancelled_models = []
         
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
+        for i, task in enumerate(tasks):
+            if task.cancelled():
+                cancelled_models.append(model_ids[i])
                 processed_results.append({
                     "ok": False,
                     "output": None,
-                    "error": str(result),
+                    "error": "Cancelled by ensemble hedging",
+                    "provider": self._get_provider_from_model_id(model_ids[i])[0],
+                    "model_id": model_ids[i],
+                    "skipped": False,
+                    "cancelled": True
+                })
+            elif task.exception() is not None:
+                processed_results.append({
+                    "ok": False,
+                    "output": None,
+                    "error": str(task.exception()),
                     "provider": "unknown",
                     "model_id": model_ids[i],
                     "skipped": False
                 })
             else:
+                result = task.result()
                 processed_results.append(result)
                 if result.get("skipped"):
                     skipped_models.append(model_ids[i])
                 elif result.get("ok"):
                     used_models.append(model_ids[i])
         
-        logger.info(f"Ensemble results: {len(used_models)}/{len(model_ids)} successful, {len(skipped_models)} skipped")
+        logger.info(
+            f"Ensemble results: {len(used_models)}/{len(model_ids)} successful, {len(skipped_models)} skipped, "
+            f"{len(cancelled_models)} cancelled ({stop_reason})"
+        )
         
-        return processed_results
+        hedge = {
+            "policy": {
+                "min_results": policy.min_results,
+                "soft_deadline_seconds": policy.soft_deadline_seconds
+            },
+            "stop_reason": stop_reason,
+            "voted_models": used_models,
+            "cancelled_models": cancelled_models,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 2)
+        }
+        return processed_results, hedge
     
     async def route_by_mode(
         self,
@@ -304,7 +533,8 @@ class ModelRouter:
         mode: Literal["standalone", "proxy", "proxy-lite"],
         temperature: float = 0.2,
         max_tokens: int = 512,
-        timeout: Optional[float] = None
+        timeout: Optional[float] = None,
+        tenant: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Route to appropriate model(s) based on mode
@@ -313,6 +543,7 @@ class ModelRouter:
         - standalone: ensemble (OpenAI + Mistral + Groq)
         - proxy: OpenAI tek
         - proxy-lite: OpenAI tek
+        - proxy / proxy-lite with PROVIDER_SELECTION_ENABLED: fastest model of the tier, with fallback
         
         Args:
             prompt: Input prompt
@@ -320,6 +551,7 @@ class ModelRouter:
             temperature: Temperature for generation
             max_tokens: Maximum tokens to generate
             timeout: Timeout per model
+            tenant: Organization the calls are queued for (see generate())
         
         Returns:
             {
@@ -329,7 +561,8 @@ class ModelRouter:
                 "provider": str,
                 "model_id": str | List[str],
                 "skipped_models": List[str],
-                "used_models": List[str]
+                "used_models": List[str],
+                "routing": dict  # proxy/proxy-lite with PROVIDER_SELECTION_ENABLED
             }
         """
         if mode == "standalone":
@@ -354,14 +587,17 @@ class ModelRouter:
                     "used_models": []
                 }
             
-            # Generate from all available models
-            results = await self.generate_ensemble(
-                prompt=prompt,
-                model_ids=available_ensemble,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                timeout=timeout
+            # Generate from the available models (first K / soft deadline per mode policy)
+            results, hedge = await self._run_ensemble(
+                prompt,
+                available_ensemble,
+                temperature,
+                max_tokens,
+                timeout,
+                get_ensemble_policy(mode),
+                tenant
             )
+            self.ensemble_stats.record(mode, hedge)
             
             # Extract skipped and used models
             skipped_models = [r["model_id"] for r in results if r.get("skipped")]
@@ -380,7 +616,8 @@ class ModelRouter:
                     "provider": "ensemble",
                     "model_id": available_ensemble,
                     "skipped_models": skipped_models,
-                    "used_models": used_models
+                    "used_models": used_models,
+                    "hedge": hedge
                 }
             
             # Return first successful result (merger will handle ensemble merge)
@@ -394,10 +631,22 @@ class ModelRouter:
                 "model_id": available_ensemble,
                 "skipped_models": skipped_models,
                 "used_models": used_models,
+                "voted_models": hedge["voted_models"],  # Models whose answers the merger may use
+                "cancelled_models": hedge["cancelled_models"],
+                "hedge": hedge,
                 "ensemble_results": results  # Include all results for merger
             }
         
         else:
+            # Latency-aware choice within the mode's quality tier (when enabled)
+            candidates = self.selector.candidates(
+                mode,
+                self.is_model_available,
+                lambda model_id: self.is_provider_healthy(self._get_provider_from_model_id(model_id)[0])
+            )
+            if candidates is not None:
+                return await self._route_selected(prompt, mode, candidates, temperature, max_tokens, timeout, tenant)
+            
             # Proxy and proxy-lite: OpenAI tek
             model_id = "openai/gpt-4o-mini"
             
@@ -417,7 +666,8 @@ class ModelRouter:
                 model_id=model_id,
                 temperature=temperature,
                 max_tokens=max_tokens,
-                timeout=timeout
+                timeout=timeout,
+                tenant=tenant
             )
             
             # Add mode-specific fields
@@ -426,6 +676,70 @@ class ModelRouter:
             
             return result
 
+    
+    async def _route_selected(
+        self,
+        prompt: str,
+        mode: str,
+        candidates: List[str],
+        temperature: float,
+        max_tokens: int,
+        timeout: Optional[float],
+        tenant: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Try the ranked candidates of a mode until one answers (the choice is reported under routing)"""
+        routing: Dict[str, Any] = {"policy": "latency", "candidates": candidates, "attempts": [], "fallback": False}
+        if not candidates:
+            return {
+                "ok": False,
+                "output": None,
+                "error": f"No models available for mode {mode} (all API keys missing)",
+                "provider": "unknown",
+                "model_id": None,
+                "skipped_models": [],
+                "used_models": [],
+                "routing": routing
+            }
+        
+        result: Dict[str, Any] = {}
+        for model_id in candidates:
+            result = await self.generate(
+                prompt=prompt,
+                model_id=model_id,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout=timeout,
+                tenant=tenant
+            )
+            routing["attempts"].append({"model_id": model_id, "ok": bool(result.get("ok")), "error": result.get("error")})
+            if result.get("ok"):
+                break
+            logger.warning(f"{mode}: {model_id} failed, falling back: {result.get('error')}")
+        
+        selected = result["model_id"]
+        routing["selected"] = selected
+        routing["fallback"] = selected != candidates[0]
+        if result.get("ok"):
+            self.selector.record_selection(mode, selected, routing["fallback"])
+        result["skipped_models"] = []
+        result["used_models"] = [selected] if result.get("ok") else []
+        result["routing"] = routing
+        return result
+
+
+_router: Optional[ModelRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_model_router() -> ModelRouter:
+    """Process-wide ModelRouter (rebuilt from settings when they are reloaded)"""
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = ModelRouter()
+    return _router.refresh()
+
 
 # Helper function for test compatibility
 def is_model_available(provider: str) -> bool:
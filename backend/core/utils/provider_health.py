@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Provider Health
+Rolling latency/error statistics per LLM provider.
+
+Every provider call made by the ModelRouter is recorded as (time, latency,
+ok). Each provider keeps the last PROVIDER_HEALTH_WINDOW calls; the summary
+(error rate, mean/p50/p95 latency) is computed from that window on demand.
+A provider is marked unhealthy after PROVIDER_UNHEALTHY_AFTER_FAILURES
+consecutive failures and becomes healthy again on its next success or once
+PROVIDER_HEALTH_COOLDOWN_SECONDS have passed (so it gets probed again).
+"""
+
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+import math
+import threading
+import time
+
+from backend.config import get_settings
+
+
+def _percentile(sorted_values, q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class ProviderHealth:
+    """Rolling call statistics of one provider"""
+
+    def __init__(self, window: int):
+        self._calls: Deque[Tuple[float, float, bool]] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.total_calls = 0
+        self.total_errors = 0
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+        self.last_failure_at = 0.0
+
+    def record(self, latency_ms: float, ok: bool, error: Optional[str] = None) -> None:
+        """Record one call"""
+        now = time.monotonic()
+        with self._lock:
+            self._calls.append((now, latency_ms, ok))
+            self.total_calls += 1
+            if ok:
+                self.consecutive_failures = 0
+            else:
+                self.total_errors += 1
+                self.consecutive_failures += 1
+                self.last_error = error
+                self.last_failure_at = now
+
+    def is_healthy(self) -> bool:
+        """False while the provider is failing repeatedly (until the cooldown passes)"""
+        settings = get_settings()
+        if self.consecutive_failures < settings.PROVIDER_UNHEALTHY_AFTER_FAILURES:
+            return True
+        return time.monotonic() - self.last_failure_at >= settings.PROVIDER_HEALTH_COOLDOWN_SECONDS
+
+    def latency_ms(self, q: float = 0.5) -> Optional[float]:
+        """Latency percentile of the successful calls in the window (None without any)"""
+        with self._lock:
+            latencies = sorted(latency for _, latency, ok in self._calls if ok)
+        return _percentile(latencies, q) if latencies else None
+
+    def summary(self) -> Dict[str, Any]:
+        """Window statistics"""
+        with self._lock:
+            calls = list(self._calls)
+        latencies = sorted(latency for _, latency, ok in calls if ok)
+        errors = sum(1 for _, _, ok in calls if not ok)
+        return {
+            "healthy": self.is_healthy(),
+            "window_calls": len(calls),
+            "error_rate": round(errors / len(calls), 4) if calls else 0.0,
+            "latency_mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else None,
+            "latency_p50_ms": round(_percentile(latencies, 0.5), 2) if latencies else None,
+            "latency_p95_ms": round(_percentile(latencies, 0.95), 2) if latencies else None,
+            "consecutive_failures": self.consecutive_failures,
+            "total_calls": self.total_calls,
+            "total_errors": self.total_errors,
+            "last_error": self.last_error,
+        }
+
+
+class ProviderHealthRegistry:
+    """ProviderHealth per provider name (created on first use)"""
+
+    def __init__(self, window: Optional[int] = None):
+        self.window = window or get_settings().PROVIDER_HEALTH_WINDOW
+        self._providers: Dict[str, ProviderHealth] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: str) -> ProviderHealth:
+        health = self._providers.get(provider)
+        if health is None:
+            with self._lock:
+                health = self._providers.setdefault(provider, ProviderHealth(self.window))
+        return health
+
+    def record(self, provider: str, latency_ms: float, ok: bool, error: Optional[str] = None) -> None:
+        self.get(provider).record(latency_ms, ok, error)
+
+    def is_healthy(self, provider: str) -> bool:
+        health = self._providers.get(provider)
+        return health is None or health.is_healthy()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        return {provider: health.summary() for provider, health in sorted(self._providers.items())}
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Provider Selection
+Latency-aware choice of the model for single-model modes (proxy, proxy-lite).
+
+Each model keeps an EWMA of its call latency and of its success rate
+(alpha PROVIDER_SELECTION_EWMA_ALPHA). A mode listed in
+PROVIDER_SELECTION_MODE_TIERS may use any model of its quality tier
+(PROVIDER_SELECTION_TIERS); candidates are ranked by expected latency per
+successful call (latency EWMA / success EWMA):
+
+- Models without any samples yet rank first (in tier order), so every model
+  gets measured.
+- With probability PROVIDER_SELECTION_EXPLORE_RATE a random other candidate
+  is moved to the front, so the ranking follows providers that got faster.
+- Unavailable models (no API key) are skipped, unhealthy ones (see
+  core/utils/provider_health) are moved to the end.
+
+The ModelRouter tries the candidates in this order until one answers.
+With PROVIDER_SELECTION_ENABLED off, proxy and proxy-lite use OpenAI only.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+import random
+import threading
+
+from backend.config import get_settings
+
+# Floor of the success EWMA in the score (a failing model stays rankable)
+MIN_SUCCESS_RATE = 0.05
+
+
+class ModelEWMA:
+    """Exponentially weighted latency and success rate of one model"""
+
+    __slots__ = ("latency_ms", "success_rate", "samples")
+
+    def __init__(self):
+        self.latency_ms: Optional[float] = None
+        self.success_rate = 1.0
+        self.samples = 0
+
+    def record(self, latency_ms: float, ok: bool, alpha: float) -> None:
+        self.samples += 1
+        if ok:
+            # Failed calls (timeouts, fast 4xx) say nothing about answer latency
+            self.latency_ms = latency_ms if self.latency_ms is None else (
+                alpha * latency_ms + (1.0 - alpha) * self.latency_ms
+            )
+        self.success_rate = alpha * (1.0 if ok else 0.0) + (1.0 - alpha) * self.success_rate
+
+    def score(self) -> Optional[float]:
+        """Expected latency per successful call (None before the first success)"""
+        if self.latency_ms is None:
+            return None
+        return self.latency_ms / max(self.success_rate, MIN_SUCCESS_RATE)
+
+
+class ProviderSelector:
+    """Per-model EWMA statistics and candidate ranking"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._models: Dict[str, ModelEWMA] = {}
+        self.selections: Dict[str, Dict[str, int]] = {}
+
+    def record(self, model_id: str, latency_ms: float, ok: bool) -> None:
+        """Record one call of a model"""
+        alpha = get_settings().PROVIDER_SELECTION_EWMA_ALPHA
+        with self._lock:
+            self._models.setdefault(model_id, ModelEWMA()).record(latency_ms, ok, alpha)
+
+    def candidates(
+        self,
+        mode: str,
+        is_available: Callable[[str], bool],
+        is_healthy: Callable[[str], bool]
+    ) -> Optional[List[str]]:
+        """
+        Models to try for a mode, best first (None if the mode is not latency-routed)
+
+        Args:
+            mode: Pipeline mode
+            is_available: model_id -> has an API key
+            is_healthy: model_id -> provider not failing repeatedly
+        """
+        settings = get_settings()
+        if not settings.PROVIDER_SELECTION_ENABLED:
+            return None
+        tier = settings.PROVIDER_SELECTION_MODE_TIERS.get(mode)
+        if tier is None:
+            return None
+        models = [m for m in settings.PROVIDER_SELECTION_TIERS.get(tier, []) if is_available(m)]
+
+        with self._lock:
+            scores = {m: self._models[m].score() if m in self._models else None for m in models}
+        # Unmeasured first (tier order), then by expected latency; sort is stable
+        ranked = sorted(models, key=lambda m: (scores[m] is not None, scores[m] or 0.0))
+        if len(ranked) > 1 and random.random() < settings.PROVIDER_SELECTION_EXPLORE_RATE:
+            ranked.insert(0, ranked.pop(random.randrange(1, len(ranked))))
+        # Unhealthy providers are only tried when nothing else is left
+        return [m for m in ranked if is_healthy(m)] + [m for m in ranked if not is_healthy(m)]
+
+    def record_selection(self, mode: str, model_id: str, fallback: bool) -> None:
+        """Count the model that answered a mode (fallback: not the first candidate)"""
+        with self._lock:
+            counters = self.selections.setdefault(mode, {})
+            counters[model_id] = counters.get(model_id, 0) + 1
+            if fallback:
+                counters["fallbacks"] = counters.get("fallbacks", 0) + 1
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "models": {
+                    model_id: {
+                        "latency_ewma_ms": round(ewma.latency_ms, 2) if ewma.latency_ms is not None else None,
+                        "success_ewma": round(ewma.success_rate, 4),
+                        "score": round(ewma.score(), 2) if ewma.score() is not None else None,
+                        "samples": ewma.samples,
+                    }
+                    for model_id, ewma in sorted(self._models.items())
+                },
+                "selections": {mode: dict(counters) for mode, counters in sorted(self.selections.items())},
+            }
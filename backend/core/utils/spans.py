@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Span Recorder
+Lightweight per-request stage spans for run_full_pipeline.
+
+A span is (stage, start, end) in time.perf_counter() seconds. Each stage
+boundary is one perf_counter() call (the end of a stage is the start of the
+next); a disabled recorder keeps no spans, so only that call remains. Spans
+recorded in another process (analysis executor) are made
+relative to that stage function's own origin (relative()) and placed at the
+dispatch time with extend(), so the clocks of different processes are never
+compared.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import time
+
+Span = Tuple[str, float, float]
+
+
+class SpanRecorder:
+    """Collects (stage, start, end) spans of one request"""
+
+    __slots__ = ("origin", "spans", "enabled")
+
+    def __init__(self, origin: Optional[float] = None, enabled: bool = True):
+        self.origin = time.perf_counter() if origin is None else origin
+        self.spans: List[Span] = []
+        self.enabled = enabled
+
+    def mark(self, stage: str, start: float) -> float:
+        """
+        Record stage from a perf_counter() start until now
+
+        Returns:
+            Now (the start of the next stage)
+        """
+        end = time.perf_counter()
+        if self.enabled:
+            self.spans.append((stage, start, end))
+        return end
+
+    def relative(self) -> List[Span]:
+        """Spans relative to the origin (to hand to another process's recorder)"""
+        origin = self.origin
+        return [(stage, start - origin, end - origin) for stage, start, end in self.spans]
+
+    def extend(self, spans: Sequence[Span], start: float) -> None:
+        """Add relative spans of another recorder whose origin was at perf_counter() start"""
+        if not self.enabled:
+            return
+        for stage, span_start, span_end in spans:
+            self.spans.append((stage, span_start + start, span_end + start))
+
+    def trace(self) -> List[Dict[str, Any]]:
+        """Spans in start order, relative to the origin: [{"stage", "start_ms", "duration_ms"}]"""
+        return [
+            {
+                "stage": stage,
+                "start_ms": round((start - self.origin) * 1000.0, 3),
+                "duration_ms": round((end - start) * 1000.0, 3)
+            }
+            for stage, start, end in sorted(self.spans, key=lambda span: span[1])
+        ]
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""
+Adaptive LLM Concurrency Limiter
+Per (provider, model) cap on concurrent LLM calls, adapted with AIMD.
+
+- Additive increase: every successful call raises the limit by 1/limit, i.e.
+  by about one slot per window of `limit` successes, up to the maximum.
+- Multiplicative decrease: a 429 or 5xx multiplies the limit by
+  LLM_CONCURRENCY_DECREASE_FACTOR (at most once per
+  LLM_CONCURRENCY_DECREASE_COOLDOWN_SECONDS, so one burst of errors from
+  calls already in flight counts once), down to the minimum.
+- Retry-After: no new call to that provider/model is started before the
+  time the provider asked for (capped at LLM_CONCURRENCY_MAX_RETRY_AFTER_SECONDS).
+
+Calls over the limit wait in a queue per tenant (organization); free slots
+are handed out round-robin across tenants, so one tenant's burst cannot
+starve the others. Other errors (4xx, timeouts) leave the limit unchanged.
+
+Usage:
+    async with llm_call_slot("openai", "gpt-4o-mini", tenant=org_id) as slot:
+        response = await client.post(...)
+        slot.record(response.status_code, retry_after_seconds(response.headers))
+"""
+
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Tuple
+import asyncio
+import logging
+import time
+
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TENANT = "default"
+
+
+def retry_after_seconds(headers: Any) -> Optional[float]:
+    """Retry-After header in seconds (delta-seconds form; HTTP dates are ignored)"""
+    if headers is None:
+        return None
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def is_overload_status(status_code: Optional[int]) -> bool:
+    """429 and 5xx mean the provider is overloaded"""
+    return status_code is not None and (status_code == 429 or status_code >= 500)
+
+
+class CallSlot:
+    """One granted call; report its outcome with record()"""
+
+    __slots__ = ("_limiter", "recorded")
+
+    def __init__(self, limiter: Optional["AdaptiveConcurrencyLimiter"]):
+        self._limiter = limiter
+        self.recorded = False
+
+    def record(self, status_code: Optional[int], retry_after: Optional[float] = None) -> None:
+        """Feed the call's HTTP status (None for a transport error) into the limit"""
+        if self.recorded or self._limiter is None:
+            return
+        self.recorded = True
+        if is_overload_status(status_code):
+            self._limiter.on_overload(retry_after)
+        elif status_code is not None and status_code < 400:
+            self._limiter.on_success()
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limit with fair per-tenant queues for one provider/model"""
+
+    def __init__(self, name: str):
+        settings = get_settings()
+        self.name = name
+        self.min_limit = max(1, settings.LLM_CONCURRENCY_MIN)
+        self.max_limit = max(self.min_limit, settings.LLM_CONCURRENCY_MAX)
+        self.limit = float(min(max(settings.LLM_CONCURRENCY_INITIAL, self.min_limit), self.max_limit))
+        self.decrease_factor = settings.LLM_CONCURRENCY_DECREASE_FACTOR
+        self.decrease_cooldown = settings.LLM_CONCURRENCY_DECREASE_COOLDOWN_SECONDS
+        self.max_retry_after = settings.LLM_CONCURRENCY_MAX_RETRY_AFTER_SECONDS
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self._last_decrease = float("-inf")
+        self._queues: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self._wake_handle: Optional[asyncio.TimerHandle] = None
+        self._wake_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.counters = {"calls": 0, "queued": 0, "successes": 0, "overloads": 0, "decreases": 0, "retry_after_waits": 0}
+
+    @property
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _can_start(self) -> bool:
+        return self.in_flight < int(self.limit) and time.monotonic() >= self.blocked_until
+
+    async def acquire(self, tenant: str) -> None:
+        """Wait for a slot (immediately if one is free and nobody is queued)"""
+        self.counters["calls"] += 1
+        if not self._queues and self._can_start():
+            self.in_flight += 1
+            return
+
+        self.counters["queued"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(tenant, deque()).append(future)
+        self._wake()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before the cancellation: give the slot back
+                self.release()
+            else:
+                self._discard(tenant, future)
+            raise
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _discard(self, tenant: str, future: asyncio.Future) -> None:
+        queue = self._queues.get(tenant)
+        if queue is None:
+            return
+        try:
+            queue.remove(future)
+        except ValueError:
+            pass
+        if not queue:
+            del self._queues[tenant]
+
+    def _next_waiter(self) -> Optional[asyncio.Future]:
+        """Oldest waiter of the next tenant in round-robin order"""
+        while self._queues:
+            tenant, queue = next(iter(self._queues.items()))
+            future = queue.popleft()
+            if queue:
+                self._queues.move_to_end(tenant)
+            else:
+                del self._queues[tenant]
+            if not future.done() and not future.get_loop().is_closed():
+                return future
+        return None
+
+    def _wake(self) -> None:
+        """Grant free slots to queued callers (or schedule it when blocked by Retry-After)"""
+        while self._queues and self._can_start():
+            future = self._next_waiter()
+            if future is None:
+                break
+            self.in_flight += 1
+            future.set_result(None)
+
+        now = time.monotonic()
+        if self._wake_handle is not None and self._wake_loop.is_closed():
+            self._wake_handle = None
+        if self._queues and now < self.blocked_until and self._wake_handle is None:
+            try:
+                self._wake_loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+            self._wake_handle = self._wake_loop.call_later(self.blocked_until - now, self._wake_after_block)
+
+    def _wake_after_block(self) -> None:
+        self._wake_handle = None
+        self._wake()
+
+    def on_success(self) -> None:
+        self.counters["successes"] += 1
+        self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+        self._wake()
+
+    def on_overload(self, retry_after: Optional[float] = None) -> None:
+        now = time.monotonic()
+        self.counters["overloads"] += 1
+        if now - self._last_decrease >= self.decrease_cooldown:
+            self._last_decrease = now
+            self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+            self.counters["decreases"] += 1
+            logger.warning(f"LLM concurrency for {self.name} reduced to {int(self.limit)} after 429/5xx")
+        if retry_after:
+            self.counters["retry_after_waits"] += 1
+            self.blocked_until = max(self.blocked_until, now + min(retry_after, self.max_retry_after))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "queued_tenants": len(self._queues),
+            "blocked_for_seconds": round(max(0.0, self.blocked_until - time.monotonic()), 3),
+            **self.counters,
+        }
+
+
+_limiters: Dict[Tuple[str, str], AdaptiveConcurrencyLimiter] = {}
+
+
+def get_concurrency_limiter(provider: str, model: Optional[str]) -> AdaptiveConcurrencyLimiter:
+    """Limiter of a provider/model (created on first use)"""
+    key = (provider, model or "")
+    limiter = _limiters.get(key)
+    if limiter is None:
+        limiter = _limiters[key] = AdaptiveConcurrencyLimiter(f"{provider}/{model or 'default'}")
+    return limiter
+
+
+def get_concurrency_stats() -> Dict[str, Dict[str, Any]]:
+    """Limit, queue and AIMD counters per provider/model"""
+    return {limiter.name: limiter.stats() for _, limiter in sorted(_limiters.items())}
+
+
+def reset_concurrency_limiters() -> None:
+    """Forget every limiter (next use rebuilds it from settings)"""
+    _limiters.clear()
+
+
+@asynccontextmanager
+async def llm_call_slot(provider: str, model: Optional[str], tenant: Optional[str] = None) -> AsyncIterator[CallSlot]:
+    """
+    Hold a concurrency slot of a provider/model for one LLM call
+
+    Args:
+        provider: Provider name (openai, groq, mistral, anthropic, local)
+        model: Model name (limits are kept per provider and model)
+        tenant: Organization the call is made for (fair queuing); default shared queue
+    """
+    if not get_settings().LLM_CONCURRENCY_LIMITER_ENABLED:
+        # Disabled: unlimited, record() is a no-op
+        yield CallSlot(None)
+        return
+    limiter = get_concurrency_limiter(provider, model)
+    await limiter.acquire(tenant or DEFAULT_TENANT)
+    try:
+        yield CallSlot(limiter)
+    finally:
+        limiter.release()
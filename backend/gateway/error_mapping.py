@@ -5,14 +5,22 @@ Error Mapping - Map provider-specific errors to unified LLMProviderError
 
 import httpx
 from typing import Optional
+from backend.gateway.concurrency_limiter import retry_after_seconds
 
 
 class LLMProviderError(Exception):
     """Unified LLM provider error"""
-    def __init__(self, message: str, provider: str, status_code: Optional[int] = None):
+    def __init__(
+        self,
+        message: str,
+        provider: str,
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None
+    ):
         self.message = message
         self.provider = provider
         self.status_code = status_code
+        self.retry_after = retry_after  # Seconds from the provider's Retry-After header
         super().__init__(self.message)
 
 
@@ -28,7 +36,8 @@ def map_provider_error(error: Exception, provider: str) -> LLMProviderError:
         return LLMProviderError(
             message=f"{provider} API error: {error_detail}",
             provider=provider,
-            status_code=status_code
+            status_code=status_code,
+            retry_after=retry_after_seconds(error.response.headers)
         )
     elif isinstance(error, httpx.RequestError):
         return LLMProviderError(
@@ -3,9 +3,9 @@
 Anthropic Provider
 """
 
-import httpx
 from typing import Optional, Dict, Any
 from backend.config import Settings
+from backend.core.llm.http_pool import llm_http_client
 
 
 async def generate_anthropic(
@@ -34,8 +34,8 @@ async def generate_anthropic(
         "temperature": temperature,
     }
     
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        response = await client.post(url, json=payload, headers=headers)
+    async with llm_http_client("anthropic") as client:
+        response = await client.post(url, json=payload, headers=headers, timeout=60.0)
         response.raise_for_status()
         data = response.json()
         return data["content"][0]["text"]
@@ -3,9 +3,9 @@
 Local LLM Provider (for self-hosted models)
 """
 
-import httpx
 from typing import Optional, Dict, Any
 from backend.config import Settings
+from backend.core.llm.http_pool import llm_http_client
 
 
 async def generate_local_llm(
@@ -31,8 +31,8 @@ async def generate_local_llm(
     if max_tokens:
         payload["max_tokens"] = max_tokens
     
-    async with httpx.AsyncClient(timeout=120.0) as client:
-        response = await client.post(url, json=payload)
+    async with llm_http_client("local") as client:
+        response = await client.post(url, json=payload, timeout=120.0)
         response.raise_for_status()
         data = response.json()
         return data["choices"][0]["message"]["content"]
@@ -3,9 +3,9 @@
 OpenAI Provider
 """
 
-import httpx
 from typing import Optional, Dict, Any
 from backend.config import Settings
+from backend.core.llm.http_pool import llm_http_client
 
 
 async def generate_openai(
@@ -20,7 +20,7 @@ async def generate_openai(
     if not settings.OPENAI_API_KEY:
         raise ValueError("OPENAI_API_KEY not configured")
     
-    url = "https://api.openai.com/v1/chat/completions"
+    url = f"{settings.OPENAI_BASE_URL.rstrip('/')}/chat/completions"
     headers = {
         "Authorization": f"Bearer {settings.OPENAI_API_KEY}",
         "Content-Type": "application/json"
@@ -35,8 +35,8 @@ async def generate_openai(
     if max_tokens:
         payload["max_tokens"] = max_tokens
     
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        response = await client.post(url, json=payload, headers=headers)
+    async with llm_http_client("openai") as client:
+        response = await client.post(url, json=payload, headers=headers, timeout=60.0)
         response.raise_for_status()
         data = response.json()
         return data["choices"][0]["message"]["content"]
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""
+LLM Response Cache
+Exact-match cache for deterministic (low-temperature) judge prompts.
+
+Judge prompts (proxy deep analysis, proxy-lite paragraph judge) are fully
+determined by their input, so identical paragraphs - boilerplate, disclaimers,
+repeated ads - do not need another billed LLM call.
+
+- Key: sha256 over (scope, provider, model, prompt hash, temperature,
+  max_tokens). The scope is the organization, so organizations never share
+  entries.
+- L1: in-process LRU bounded by LLM_RESPONSE_CACHE_MAX_BYTES, entries larger
+  than LLM_RESPONSE_CACHE_MAX_ENTRY_BYTES are not stored.
+- L2 (optional, LLM_RESPONSE_CACHE_L2): "sqlite" (local file) or "redis"
+  (REDIS_URL); an L2 hit is copied into L1. L2 failures only log a warning.
+- Every entry expires after LLM_RESPONSE_CACHE_TTL_SECONDS.
+- Only calls with temperature <= LLM_RESPONSE_CACHE_MAX_TEMPERATURE that opt in
+  with a cache scope are cached. A request with the X-EZA-Cache-Bypass header
+  (or Cache-Control: no-cache) skips the lookup and refreshes the entry.
+- Proxy deep analysis also stores parsed paragraph results here, keyed by
+  paragraph text (services/proxy_analyzer.paragraph_cache_key).
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_BYPASS_HEADER = "X-EZA-Cache-Bypass"
+
+
+def cache_bypass_requested(headers: Any) -> bool:
+    """True if the request headers ask to bypass the response cache"""
+    if headers is None:
+        return False
+    bypass = (headers.get(CACHE_BYPASS_HEADER) or "").strip().lower()
+    if bypass in ("1", "true", "yes"):
+        return True
+    return "no-cache" in (headers.get("Cache-Control") or "").lower()
+
+
+def is_cacheable(temperature: float) -> bool:
+    """Whether a call at this temperature is deterministic enough to cache"""
+    settings = get_settings()
+    return settings.LLM_RESPONSE_CACHE_ENABLED and temperature <= settings.LLM_RESPONSE_CACHE_MAX_TEMPERATURE
+
+
+def response_cache_key(
+    scope: str,
+    provider: str,
+    model: Optional[str],
+    prompt: str,
+    temperature: float,
+    max_tokens: Optional[int]
+) -> str:
+    """Cache key of one LLM call"""
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    params = json.dumps([scope, provider, model, prompt_hash, round(temperature, 4), max_tokens])
+    return hashlib.sha256(params.encode("utf-8")).hexdigest()
+
+
+class _MemoryStore:
+    """Byte-bounded LRU with per-entry expiry"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[float, str, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: str, expires_at: float, size: int) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes and self._entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self.bytes -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class _SQLiteStore:
+    """L2 in a local SQLite file (calls run in a worker thread)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_response_cache "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=1.0)
+
+    def _get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM llm_response_cache WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _set(self, key: str, value: str, expires_at: float) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_response_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at)
+            )
+            conn.execute("DELETE FROM llm_response_cache WHERE expires_at <= ?", (time.time(),))
+
+    async def get(self, key: str) -> Optional[Tuple[str, float]]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: str, expires_at: float) -> None:
+        await asyncio.to_thread(self._set, key, value, expires_at)
+
+
+class _RedisStore:
+    """L2 in Redis (REDIS_URL)"""
+
+    PREFIX = "eza:llm_response:"
+
+    async def get(self, key: str) -> Optional[Tuple[str, float]]:
+        from backend.core.utils.dependencies import get_redis
+        client = await get_redis()
+        raw = await client.get(self.PREFIX + key)
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        return entry["value"], entry["expires_at"]
+
+    async def set(self, key: str, value: str, expires_at: float) -> None:
+        from backend.core.utils.dependencies import get_redis
+        client = await get_redis()
+        ttl = max(1, int(expires_at - time.time()))
+        await client.set(self.PREFIX + key, json.dumps({"value": value, "expires_at": expires_at}), ex=ttl)
+
+
+class LLMResponseCache:
+    """L1 in-process store with an optional SQLite/Redis L2"""
+
+    def __init__(self):
+        settings = get_settings()
+        self.ttl = settings.LLM_RESPONSE_CACHE_TTL_SECONDS
+        self.max_entry_bytes = settings.LLM_RESPONSE_CACHE_MAX_ENTRY_BYTES
+        self.l1 = _MemoryStore(settings.LLM_RESPONSE_CACHE_MAX_BYTES)
+        self.l2: Any = None
+        backend = settings.LLM_RESPONSE_CACHE_L2.lower()
+        try:
+            if backend == "sqlite":
+                self.l2 = _SQLiteStore(settings.LLM_RESPONSE_CACHE_SQLITE_PATH)
+            elif backend == "redis":
+                self.l2 = _RedisStore()
+        except Exception as e:
+            logger.warning(f"LLM response cache L2 ({backend}) unavailable, using L1 only: {str(e)}")
+        self.counters = {"hits_l1": 0, "hits_l2": 0, "misses": 0, "stores": 0, "bypassed": 0, "too_large": 0}
+
+    async def get(self, key: str) -> Optional[str]:
+        """Cached response or None"""
+        value = self.l1.get(key)
+        if value is not None:
+            self.counters["hits_l1"] += 1
+            return value
+        if self.l2 is not None:
+            try:
+                entry = await self.l2.get(key)
+            except Exception as e:
+                logger.warning(f"LLM response cache L2 read failed: {str(e)}")
+                entry = None
+            if entry is not None:
+                value, expires_at = entry
+                self.l1.set(key, value, expires_at, len(value.encode("utf-8")))
+                self.counters["hits_l2"] += 1
+                return value
+        self.counters["misses"] += 1
+        return None
+
+    def record_bypass(self) -> None:
+        """Count a lookup skipped because the request asked to bypass the cache"""
+        self.counters["bypassed"] += 1
+
+    async def set(self, key: str, value: str) -> None:
+        """Store a response (entries above the per-entry byte cap are skipped)"""
+        size = len(value.encode("utf-8"))
+        if size > self.max_entry_bytes:
+            self.counters["too_large"] += 1
+            return
+        expires_at = time.time() + self.ttl
+        self.l1.set(key, value, expires_at, size)
+        self.counters["stores"] += 1
+        if self.l2 is not None:
+            try:
+                await self.l2.set(key, value, expires_at)
+            except Exception as e:
+                logger.warning(f"LLM response cache L2 write failed: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.counters["hits_l1"] + self.counters["hits_l2"] + self.counters["misses"]
+        hits = self.counters["hits_l1"] + self.counters["hits_l2"]
+        return {
+            **self.counters,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self.l1),
+            "bytes": self.l1.bytes,
+            "evictions": self.l1.evictions,
+            "l2": type(self.l2).__name__.strip("_") if self.l2 is not None else None,
+        }
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    """Process-wide LLM response cache"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMResponseCache()
+    return _cache
+
+
+def reset_llm_response_cache() -> None:
+    """Drop the cache (next access rebuilds it from settings)"""
+    global _cache
+    with _cache_lock:
+        _cache = None
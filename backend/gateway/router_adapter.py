@@ -9,6 +9,16 @@ from backend.gateway.providers.openai_provider import generate_openai
 from backend.gateway.providers.anthropic_provider import generate_anthropic
 from backend.gateway.providers.local_llm_provider import generate_local_llm
 from backend.gateway.error_mapping import map_provider_error, LLMProviderError
+from backend.gateway.response_cache import get_llm_response_cache, is_cacheable, response_cache_key
+from backend.gateway.single_flight import coalesced
+from backend.gateway.concurrency_limiter import llm_call_slot
+
+# Model used when the caller does not name one
+DEFAULT_MODELS: Dict[str, Optional[str]] = {
+    "openai": "gpt-4",
+    "anthropic": "claude-3-opus-20240229",
+    "local": None,
+}
 
 
 async def call_llm_provider(
@@ -19,6 +29,9 @@ async def call_llm_provider(
     temperature: float = 0.7,
     max_tokens: Optional[int] = None,
     metadata: Optional[Dict[str, Any]] = None,
+    cache_scope: Optional[str] = None,
+    cache_bypass: bool = False,
+    tenant: Optional[str] = None,
 ) -> str:
     """
     Call LLM provider with unified interface
@@ -31,6 +44,11 @@ async def call_llm_provider(
         temperature: Sampling temperature
         max_tokens: Max tokens to generate
         metadata: Optional metadata dict
+        cache_scope: Organization (or other isolation scope) whose response cache
+            this call may use; None disables caching (see gateway/response_cache)
+        cache_bypass: Skip the cache lookup (the fresh response is still stored)
+        tenant: Organization the call is queued for in the concurrency limiter
+            (default: cache_scope; None for both uses the shared queue)
     
     Returns:
         Generated text
@@ -41,13 +59,54 @@ async def call_llm_provider(
     if settings is None:
         settings = get_settings()
     
+    model = model or DEFAULT_MODELS.get(provider_name)
+    
+    # Identical concurrent requests share one provider call (see gateway/single_flight)
+    key = response_cache_key(cache_scope or "", provider_name, model, prompt, temperature, max_tokens)
+    
+    async def provider_call():
+        # Adaptive per provider/model concurrency, queued fairly per organization
+        async with llm_call_slot(provider_name, model, tenant=tenant or cache_scope) as slot:
+            try:
+                output = await _call_provider(provider_name, prompt, settings, model, temperature, max_tokens)
+            except LLMProviderError as e:
+                slot.record(e.status_code, e.retry_after)
+                raise
+            slot.record(200)
+            return output
+    
+    if cache_scope is None or provider_name not in DEFAULT_MODELS or not is_cacheable(temperature):
+        return await coalesced("gateway", key, provider_call)
+    
+    cache = get_llm_response_cache()
+    if cache_bypass:
+        cache.record_bypass()
+    else:
+        cached = await cache.get(key)
+        if cached is not None:
+            return cached
+    
+    output = await coalesced("gateway", key, provider_call)
+    await cache.set(key, output)
+    return output
+
+
+async def _call_provider(
+    provider_name: str,
+    prompt: str,
+    settings: Settings,
+    model: Optional[str],
+    temperature: float,
+    max_tokens: Optional[int],
+) -> str:
+    """Dispatch to the provider implementation"""
     # Provider selection logic
     if provider_name == "openai":
         try:
             return await generate_openai(
                 prompt=prompt,
                 settings=settings,
-                model=model or "gpt-4",
+                model=model,
                 temperature=temperature,
                 max_tokens=max_tokens
             )
@@ -59,7 +118,7 @@ async def call_llm_provider(
             return await generate_anthropic(
                 prompt=prompt,
                 settings=settings,
-                model=model or "claude-3-opus-20240229",
+                model=model,
                 temperature=temperature,
                 max_tokens=max_tokens
             )
@@ -83,4 +142,3 @@ async def call_llm_provider(
             message=f"Unknown provider: {provider_name}",
             provider=provider_name
         )
-
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Single-Flight LLM Calls
+Coalesces identical concurrent LLM requests into one provider call.
+
+The first caller of a key (the leader) starts the provider call as a task and
+registers it in the in-flight table; identical requests arriving while it is
+pending await the same task instead of calling the provider again. The entry
+is removed as soon as the task finishes, so later requests make a new call
+(the response cache, not this table, serves repeated requests over time).
+
+Cancellation: each caller awaits the shared task through asyncio.shield, so a
+cancelled caller never cancels the call for the others. The provider call is
+only cancelled once every caller waiting on it has been cancelled. Provider
+errors are raised to every caller.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Tuple
+import asyncio
+import logging
+
+from backend.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[Any]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """In-flight request table, keyed per namespace (gateway, router, ...)"""
+
+    def __init__(self):
+        self._flights: Dict[Tuple[str, str], _Flight] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, namespace: str, counter: str) -> None:
+        counters = self._counters.setdefault(namespace, {"calls": 0, "coalesced": 0, "abandoned": 0})
+        counters[counter] += 1
+
+    async def do(self, namespace: str, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run call() unless an identical request is already in flight, then share its result
+
+        Args:
+            namespace: Call site (stats are kept per namespace)
+            key: Request identity (every parameter that affects the response)
+            call: Zero-argument coroutine factory issuing the provider call
+        """
+        flight_key = (namespace, key)
+        flight = self._flights.get(flight_key)
+        if flight is None or flight.task.done() or flight.task.get_loop() is not asyncio.get_running_loop():
+            flight = _Flight(asyncio.ensure_future(call()))
+            self._flights[flight_key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(flight_key, flight))
+            self._count(namespace, "calls")
+        else:
+            self._count(namespace, "coalesced")
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if not flight.task.done() and flight.waiters == 1:
+                # Last caller gone: nobody needs the provider call any more
+                flight.task.cancel()
+                self._count(namespace, "abandoned")
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _forget(self, flight_key: Tuple[str, str], flight: _Flight) -> None:
+        if self._flights.get(flight_key) is flight:
+            del self._flights[flight_key]
+        if not flight.task.cancelled() and flight.task.exception() is not None:
+            # Also marks the exception retrieved when every caller was cancelled
+            logger.debug(f"Single-flight call {flight_key[0]} failed: {flight.task.exception()}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Provider calls issued, requests coalesced onto them, calls abandoned by all callers"""
+        return {
+            "in_flight": len(self._flights),
+            "namespaces": {
+                namespace: {
+                    **counters,
+                    "coalesced_rate": round(counters["coalesced"] / (counters["calls"] + counters["coalesced"]), 4)
+                    if counters["calls"] + counters["coalesced"] else 0.0
+                }
+                for namespace, counters in sorted(self._counters.items())
+            }
+        }
+
+
+_single_flight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """Process-wide in-flight request table"""
+    return _single_flight
+
+
+async def coalesced(namespace: str, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+    """call() through the single-flight table when LLM_SINGLE_FLIGHT_ENABLED, else directly"""
+    if not get_settings().LLM_SINGLE_FLIGHT_ENABLED:
+        return await call()
+    return await _single_flight.do(namespace, key, call)
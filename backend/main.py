@@ -13,7 +13,7 @@ backend_dir = Path(__file__).parent
 project_root = backend_dir.parent
 sys.path.insert(0, str(project_root))
 
-from fastapi import FastAPI, HTTPException, status, Depends
+from fastapi import FastAPI, HTTPException, Request, status, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from contextlib import asynccontextmanager
@@ -31,13 +31,20 @@ from backend.core.utils.dependencies import init_db, init_redis, init_vector_db,
 from backend.security.logger_filter import setup_security_logging
 from backend.learning.vector_store import VectorStore
 from backend.config import get_settings
-from backend.api.pipeline_runner import run_full_pipeline
+from backend.api.pipeline_runner import run_full_pipeline, run_full_pipeline_batch, iter_full_pipeline_batch
 from backend.api.streaming import stream_standalone_response
+from backend.api.stream_replay import get_stream_replay, stream_fingerprint
+from backend.core.utils.analysis_executor import get_analysis_executor, shutdown_analysis_executor
+from backend.core.utils.event_loop_lag import get_event_loop_lag_monitor
+from backend.core.llm.http_pool import get_llm_http_pool, close_llm_http_pool
+from backend.core.utils.model_router import get_model_router
 from backend.core.schemas.pipeline import (
-    PipelineResponse, StandaloneRequest, ProxyRequest, ProxyLiteRequest
+    PipelineResponse, StandaloneRequest, ProxyRequest, ProxyLiteRequest,
+    ProxyBatchRequest, ProxyBatchResponse
 )
 from backend.auth.deps import require_admin, require_corporate_or_admin, require_regulator_or_admin
 from backend.security.rate_limit import (
+    client_scope,
     rate_limit_standalone,
     rate_limit_proxy,
     rate_limit_regulator_feed
@@ -89,10 +96,34 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logging.warning(f"Seed data initialization failed (optional): {e}")
     
+    # Event loop lag sampling and analysis executor workers
+    try:
+        get_event_loop_lag_monitor().start()
+        await get_analysis_executor().warm_up()
+        logging.info(f"Analysis executor ready: {get_analysis_executor().kind}")
+    except Exception as e:
+        logging.warning(f"Analysis executor warm-up failed (optional): {e}")
+    
+    # Long-lived LLM provider HTTP clients (keep-alive, HTTP/2 where supported)
+    try:
+        if get_settings().LLM_HTTP_POOL_ENABLED:
+            get_llm_http_pool().open()
+            logging.info("LLM HTTP pool opened")
+    except Exception as e:
+        logging.warning(f"LLM HTTP pool initialization failed (optional): {e}")
+    
+    # Process-wide model router (provider clients, availability and health state)
+    try:
+        get_model_router()
+    except Exception as e:
+        logging.warning(f"Model router initialization failed (optional): {e}")
+    
     yield
     
     # Shutdown
-    # Cleanup if needed
+    await close_llm_http_pool()
+    await get_event_loop_lag_monitor().stop()
+    shutdown_analysis_executor()
 
 
 settings = get_settings()
@@ -212,6 +243,7 @@ async def root():
 @app.post("/api/standalone", response_model=PipelineResponse, status_code=status.HTTP_200_OK, tags=["Standalone"])
 async def standalone_endpoint(
     request: StandaloneRequest,
+    http_request: Request,
     db=Depends(get_db),
     _: None = Depends(rate_limit_standalone)  # Rate limiting (no auth required)
 ):
@@ -228,7 +260,9 @@ async def standalone_endpoint(
         user_input=request.query_value, 
         mode="standalone", 
         db_session=db,
-        safe_only=request.safe_only or False
+        safe_only=request.safe_only or False,
+        debug=request.debug,
+        tenant=client_scope(http_request)
     )
     # Always return 200, even if ok=False (for frontend convenience)
     return result
@@ -242,6 +276,7 @@ async def standalone_endpoint(
 )
 async def standalone_stream_endpoint(
     request: StandaloneRequest,
+    http_request: Request,
     _: None = Depends(rate_limit_standalone)  # Rate limiting (no auth required)
 ):
     """
@@ -253,13 +288,24 @@ async def standalone_stream_endpoint(
     - ...
     - data: {"done": true, "assistant_score": 42, "user_score": 85}
     
+    With STREAM_REPLAY_ENABLED every frame has an id; repeating the request
+    with a Last-Event-ID header resumes the stream after that frame (no new LLM call).
+    
     Note: Public endpoint, no authentication required.
     """
+    query = request.query_value
+    safe_only = request.safe_only or False
+    tenant = client_scope(http_request)
+    if get_settings().STREAM_REPLAY_ENABLED:
+        body = get_stream_replay().stream(
+            stream_fingerprint(query, safe_only),
+            lambda: stream_standalone_response(query=query, safe_only=safe_only, tenant=tenant),
+            http_request.headers.get("Last-Event-ID")
+        )
+    else:
+        body = stream_standalone_response(query=query, safe_only=safe_only, tenant=tenant)
     return StreamingResponse(
-        stream_standalone_response(
-            query=request.query_value,
-            safe_only=request.safe_only or False
-        ),
+        body,
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -273,7 +319,7 @@ async def standalone_stream_endpoint(
 async def proxy_endpoint(
     request: ProxyRequest,
     db=Depends(get_db),
-    _: dict = Depends(require_admin()),  # Admin only
+    current_user: dict = Depends(require_admin()),  # Admin only
     __: None = Depends(rate_limit_proxy)  # Rate limiting
 ):
     """
@@ -283,16 +329,66 @@ async def proxy_endpoint(
     
     Requires: admin role
     """
-    result = await run_full_pipeline(user_input=request.message, mode="proxy", db_session=db)
+    result = await run_full_pipeline(
+        user_input=request.message,
+        mode="proxy",
+        db_session=db,
+        debug=request.debug,
+        tenant=proxy_corporate.response_cache_scope(current_user)
+    )
     # Always return 200, even if ok=False (for frontend convenience)
     return result
 
 
+@app.post("/api/proxy/batch", response_model=ProxyBatchResponse, status_code=status.HTTP_200_OK)
+async def proxy_batch_endpoint(
+    request: ProxyBatchRequest,
+    db=Depends(get_db),
+    current_user: dict = Depends(require_admin()),  # Admin only
+    __: None = Depends(rate_limit_proxy)  # Rate limiting
+):
+    """
+    Proxy batch endpoint - Unified pipeline for many items
+    
+    Runs the proxy pipeline for every item with bounded LLM concurrency and
+    records telemetry for the whole batch in one transaction.
+    
+    Returns:
+    - stream=False: results in request order
+    - stream=True: NDJSON, one {"index": i, "result": {...}} line per item as it completes
+    
+    Requires: admin role
+    """
+    settings = get_settings()
+    if len(request.items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch too large: {len(request.items)} items (max {settings.BATCH_MAX_ITEMS})"
+        )
+    items = [item.model_dump() for item in request.items]
+    tenant = proxy_corporate.response_cache_scope(current_user)
+    
+    if request.stream:
+        async def ndjson_lines():
+            async for index, result in iter_full_pipeline_batch(items, mode="proxy", db_session=db, tenant=tenant):
+                yield json.dumps({"index": index, "result": result}, ensure_ascii=False, default=str) + "\n"
+        
+        return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+    
+    results = await run_full_pipeline_batch(items, mode="proxy", db_session=db, tenant=tenant)
+    return {
+        "ok": all(result.get("ok") for result in results),
+        "mode": "proxy",
+        "count": len(results),
+        "results": results
+    }
+
+
 @app.post("/api/proxy-lite", response_model=PipelineResponse, status_code=status.HTTP_200_OK)
 async def proxy_lite_endpoint(
     request: ProxyLiteRequest,
     db=Depends(get_db),
-    _: dict = Depends(require_corporate_or_admin())  # Corporate or admin
+    current_user: dict = Depends(require_corporate_or_admin())  # Corporate or admin
 ):
     """
     Proxy-Lite mode endpoint - Unified pipeline
@@ -306,7 +402,9 @@ async def proxy_lite_endpoint(
         user_input=request.message,
         mode="proxy-lite",
         output_text=request.output_text,
-        db_session=db
+        db_session=db,
+        debug=request.debug,
+        tenant=proxy_corporate.response_cache_scope(current_user)
     )
     # Always return 200, even if ok=False (for frontend convenience)
     return result
@@ -4,77 +4,103 @@ Policy Evaluator
 Evaluates AI Safety Constitution policies against input and output
 """
 
-from typing import Dict, Any, List, Tuple, Optional
-import json
-from pathlib import Path
+from typing import Dict, Any, List, Tuple, Optional, Union
+import threading
 
-from backend.policy_engine.N_policies import evaluate_N_policies
-from backend.policy_engine.F_policies import evaluate_F_policies
-from backend.policy_engine.Z_policies import evaluate_Z_policies
-from backend.policy_engine.A_policies import evaluate_A_policies
+from backend.core.engines.analyzed_text import AnalyzedText
+from backend.policy_engine.N_policies import N_POLICY_TRIGGERS
+from backend.policy_engine.F_policies import F_POLICY_TRIGGERS
+from backend.policy_engine.Z_policies import Z_POLICY_TRIGGERS
+from backend.policy_engine.A_policies import A_POLICY_TRIGGERS
+from backend.core.engines.engine_memo import get_engine_memo
+from backend.policy_engine.registry import get_policy_registry
+from backend.policy_engine.trigger_index import PolicyTriggerIndex
 
 
 def load_policy_map() -> Dict[str, Any]:
-    """Load policy map from JSON"""
-    path = Path(__file__).parent / "policy_map.json"
-    
-    if not path.exists():
-        raise FileNotFoundError(f"Policy map not found: {path}")
-    
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    """
+    Policy map from the process-wide registry (parsed once, reloaded when the
+    file changes). Treat the returned map as read-only.
+    """
+    return get_policy_registry().snapshot().policy_map
+
+
+_trigger_index: Optional[Tuple[str, PolicyTriggerIndex]] = None
+_trigger_index_lock = threading.Lock()
+
+
+def get_trigger_index() -> PolicyTriggerIndex:
+    """Policy trigger index for the current policy map (rebuilt when its fingerprint changes)"""
+    global _trigger_index
+    snapshot = get_policy_registry().snapshot()
+    cached = _trigger_index
+    if cached is not None and cached[0] == snapshot.fingerprint:
+        return cached[1]
+    with _trigger_index_lock:
+        if _trigger_index is None or _trigger_index[0] != snapshot.fingerprint:
+            index = PolicyTriggerIndex(
+                snapshot.policy_map,
+                [N_POLICY_TRIGGERS, F_POLICY_TRIGGERS, Z_POLICY_TRIGGERS, A_POLICY_TRIGGERS]
+            )
+            _trigger_index = (snapshot.fingerprint, index)
+        return _trigger_index[1]
+
+
+# Compile at import so the first request does not pay for it
+get_trigger_index()
+
+# Memo key version: bump whenever the trigger scan's result for a given text changes
+ENGINE_VERSION = "1"
+
+
+def match_policies(index: PolicyTriggerIndex, text: Union[str, AnalyzedText]) -> List[str]:
+    """
+    IDs of the policies triggered by text (memoized per lowercased text and
+    policy map; a cached result is read-only)
+    """
+    analyzed = AnalyzedText.of(text)
+    memo = get_engine_memo("policy_triggers", ENGINE_VERSION)
+    if memo is None:
+        return index.match(analyzed)
+    return memo.get_or_compute(
+        (get_policy_registry().fingerprint, analyzed.digest("lower")),
+        lambda: index.match(analyzed)
+    )
 
 
 def evaluate_policies(
-    input_text: str,
-    output_text: Optional[str] = None
+    input_text: Union[str, AnalyzedText],
+    output_text: Optional[Union[str, AnalyzedText]] = None,
+    input_result: Optional[Tuple[List[str], float]] = None
 ) -> Tuple[List[str], float]:
     """
     Evaluate policies against input and output text
     
     Args:
-        input_text: User input text
-        output_text: Optional output text to evaluate
+        input_text: User input text (or its AnalyzedText)
+        output_text: Optional output text (or its AnalyzedText) to evaluate
+        input_result: Optional result of a previous evaluate_policies(input_text)
+            call; the input is then not scanned again
     
     Returns:
         Tuple of (violation_ids, total_risk_modifier)
     """
-    violations: List[str] = []
-    risk_modifiers: List[float] = []
+    index = get_trigger_index()
     
     # Evaluate input
-    input_results = []
-    input_results.extend(evaluate_N_policies(input_text))
-    input_results.extend(evaluate_F_policies(input_text))
-    input_results.extend(evaluate_Z_policies(input_text))
-    input_results.extend(evaluate_A_policies(input_text))
-    
-    # Collect violations and risk modifiers from input
-    for result in input_results:
-        for violation in result.get("violations", []):
-            policy_id = violation.get("policy_id")
-            if policy_id and policy_id not in violations:
-                violations.append(policy_id)
-            risk_modifiers.append(result.get("risk_modifier", 0.0))
+    if input_result is not None:
+        violations = list(input_result[0])
+    else:
+        violations = list(match_policies(index, input_text))
     
     # Evaluate output if provided
     if output_text:
-        output_results = []
-        output_results.extend(evaluate_N_policies(output_text))
-        output_results.extend(evaluate_F_policies(output_text))
-        output_results.extend(evaluate_Z_policies(output_text))
-        output_results.extend(evaluate_A_policies(output_text))
-        
-        # Collect violations and risk modifiers from output
-        for result in output_results:
-            for violation in result.get("violations", []):
-                policy_id = violation.get("policy_id")
-                if policy_id and policy_id not in violations:
-                    violations.append(policy_id)
-            risk_modifiers.append(result.get("risk_modifier", 0.0))
+        for policy_id in match_policies(index, output_text):
+            if policy_id not in violations:
+                violations.append(policy_id)
     
     # Calculate total risk modifier (use maximum, not sum)
-    total_risk_modifier = max(risk_modifiers) if risk_modifiers else 0.0
+    total_risk_modifier = index.risk_modifier(violations)
     
     return violations, total_risk_modifier
 
@@ -89,13 +115,7 @@ def get_policy_details(policy_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         Policy details dictionary or None
     """
-    policy_map = load_policy_map()
-    
-    for policy in policy_map.get("policies", []):
-        if policy.get("id") == policy_id:
-            return policy
-    
-    return None
+    return get_policy_registry().get_policy(policy_id)
 
 
 def get_policy_flags(violations: List[str]) -> Dict[str, Any]:
@@ -116,8 +136,6 @@ def get_policy_flags(violations: List[str]) -> Dict[str, Any]:
         "categories": set()
     }
     
-    policy_map = load_policy_map()
-    
     for violation_id in violations:
         policy = get_policy_details(violation_id)
         if policy:
@@ -156,7 +174,6 @@ def calculate_score_adjustment(violations: List[str], risk_modifier: float) -> f
     base_adjustment = risk_modifier * 60.0  # Increased from 55.0 to 60.0 for better penalty
     
     # Additional penalty for critical violations
-    policy_map = load_policy_map()
     critical_count = 0
     
     for violation_id in violations:
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Policy Map Registry
+Process-wide, memoized view of policy_map.json.
+
+The file is parsed once and indexed by policy ID. The registry re-stats the
+file at most every `check_interval` seconds; when its mtime/size changes the
+content hash is compared and, only if it differs, a new snapshot is parsed and
+swapped in atomically. Each snapshot carries a version fingerprint (content
+hash) that caches depending on the policy map can key on.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+from pathlib import Path
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+POLICY_MAP_PATH = Path(__file__).parent / "policy_map.json"
+
+# Seconds between file stat checks (0 = check on every access)
+DEFAULT_CHECK_INTERVAL = 1.0
+
+
+class PolicyMapSnapshot:
+    """Immutable parsed policy map; treat policy_map and policies as read-only"""
+
+    __slots__ = ("policy_map", "policies", "fingerprint", "version", "loaded_at")
+
+    def __init__(self, policy_map: Dict[str, Any], fingerprint: str):
+        self.policy_map = policy_map
+        self.policies: Dict[str, Dict[str, Any]] = {}
+        for policy in policy_map.get("policies", []):
+            # First definition wins, as with a linear scan
+            if policy.get("id"):
+                self.policies.setdefault(policy["id"], policy)
+        self.fingerprint = fingerprint
+        self.version: str = policy_map.get("metadata", {}).get("version", "")
+        self.loaded_at = time.time()
+
+
+class PolicyMapRegistry:
+    """Memoized, hot-reloadable policy map"""
+
+    def __init__(self, path: Path = POLICY_MAP_PATH, check_interval: float = DEFAULT_CHECK_INTERVAL):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._snapshot: Optional[PolicyMapSnapshot] = None
+        self._stat_key: Optional[Tuple[int, int]] = None
+        self._checked_at = 0.0
+
+    def _stat(self) -> Tuple[int, int]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Policy map not found: {self.path}")
+        return stat.st_mtime_ns, stat.st_size
+
+    def _refresh(self, force: bool = False) -> PolicyMapSnapshot:
+        """Rebuild the snapshot if the file changed (caller holds the lock)"""
+        stat_key = self._stat()
+        self._checked_at = time.monotonic()
+        if not force and self._snapshot is not None and stat_key == self._stat_key:
+            return self._snapshot
+
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        fingerprint = hashlib.sha256(raw).hexdigest()
+
+        if self._snapshot is not None and fingerprint == self._snapshot.fingerprint:
+            # Touched but unchanged
+            self._stat_key = stat_key
+            return self._snapshot
+
+        try:
+            snapshot = PolicyMapSnapshot(json.loads(raw.decode("utf-8")), fingerprint)
+        except ValueError as e:
+            if self._snapshot is None:
+                raise
+            # Keep serving the previous map (e.g. file caught mid-write); retried on next check
+            logger.warning(f"Policy map reload failed, keeping {self._snapshot.fingerprint[:12]}: {str(e)}")
+            return self._snapshot
+
+        self._stat_key = stat_key
+        if self._snapshot is not None:
+            logger.info(
+                f"Policy map reloaded: {self._snapshot.fingerprint[:12]} -> {fingerprint[:12]}"
+            )
+        self._snapshot = snapshot
+        return snapshot
+
+    def snapshot(self) -> PolicyMapSnapshot:
+        """Current snapshot, reloaded first if the file changed"""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return snapshot
+        with self._lock:
+            return self._refresh()
+
+    def reload(self) -> PolicyMapSnapshot:
+        """Re-read the file now, regardless of the check interval"""
+        with self._lock:
+            return self._refresh(force=True)
+
+    @property
+    def fingerprint(self) -> str:
+        """Content hash of the current policy map"""
+        return self.snapshot().fingerprint
+
+    def get_policy(self, policy_id: str) -> Optional[Dict[str, Any]]:
+        """Policy by ID or None"""
+        return self.snapshot().policies.get(policy_id)
+
+
+_registry: Optional[PolicyMapRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_policy_registry() -> PolicyMapRegistry:
+    """Process-wide policy map registry"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = PolicyMapRegistry()
+    return _registry
+
+
+def get_policy_map_fingerprint() -> str:
+    """Version fingerprint of the loaded policy map (for cache keys)"""
+    return get_policy_registry().fingerprint
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+Policy Trigger Index
+Compiles the trigger lists of all N/F/Z/A policies once and finds every
+violated policy with a single scan per text.
+
+Each policy module declares its triggers in a registry
+({policy_id: {"single_word", "multi_word", "severity", "risk_modifier"}}).
+A trigger matches as \\b<trigger>\\b; multi-word triggers allow any run of
+whitespace between words. All triggers of a policy are joined into one
+word-bounded alternation, and the policies are matched together through
+PatternIndex, so results are identical to searching every trigger on its own.
+"""
+
+from typing import Any, Dict, Iterable, List, Pattern, Sequence, Tuple, Union
+import re
+
+from backend.core.engines.analyzed_text import AnalyzedText
+from backend.core.engines.pattern_index import PatternIndex
+
+
+_FLAGS = re.IGNORECASE
+
+
+def _trigger_body(trigger: str, flexible_whitespace: bool = False) -> str:
+    """Escaped regex body for a trigger (without word boundaries)"""
+    if flexible_whitespace:
+        return r"\s+".join(re.escape(word) for word in trigger.split())
+    return re.escape(trigger)
+
+
+def trigger_pattern(trigger: str, flexible_whitespace: bool = False) -> str:
+    """
+    Word-bounded regex for a single trigger
+
+    Args:
+        trigger: Trigger phrase
+        flexible_whitespace: Allow any whitespace run between words (multi-word triggers)
+    """
+    return rf"\b{_trigger_body(trigger, flexible_whitespace)}\b"
+
+
+def compile_policy_triggers(
+    registry: Dict[str, Dict[str, Any]]
+) -> Dict[str, List[Tuple[str, Pattern]]]:
+    """
+    Compile a policy registry into (trigger, pattern) pairs per policy
+
+    Single-word triggers come first, then multi-word triggers, which is the
+    order violations are reported in.
+    """
+    compiled: Dict[str, List[Tuple[str, Pattern]]] = {}
+    for policy_id, definition in registry.items():
+        patterns = [
+            (trigger, re.compile(trigger_pattern(trigger), _FLAGS))
+            for trigger in definition.get("single_word", [])
+        ]
+        patterns.extend(
+            (trigger, re.compile(trigger_pattern(trigger, flexible_whitespace=True), _FLAGS))
+            for trigger in definition.get("multi_word", [])
+        )
+        compiled[policy_id] = patterns
+    return compiled
+
+
+def check_policy_triggers(
+    policy_id: str,
+    registry: Dict[str, Dict[str, Any]],
+    compiled: Dict[str, List[Tuple[str, Pattern]]],
+    text: str
+) -> Dict[str, Any]:
+    """
+    Check one policy and report every matching trigger
+
+    Returns:
+        {"violated": bool, "violations": [{"policy_id", "trigger", "severity"}], "risk_modifier": float}
+    """
+    definition = registry[policy_id]
+    text_lower = text.lower()
+    violations = [
+        {
+            "policy_id": policy_id,
+            "trigger": trigger,
+            "severity": definition["severity"]
+        }
+        for trigger, pattern in compiled[policy_id]
+        if pattern.search(text_lower)
+    ]
+
+    return {
+        "violated": len(violations) > 0,
+        "violations": violations,
+        "risk_modifier": definition["risk_modifier"] if violations else 0.0
+    }
+
+
+class PolicyTriggerIndex:
+    """
+    Finds violated policies for a text with one multi-pattern scan.
+
+    Policy order follows policy_map.json. Triggers listed in the policy map but
+    missing from a module registry are added as single-word triggers; risk
+    modifiers come from the module registries, which are the values the
+    per-policy checks report.
+    """
+
+    def __init__(
+        self,
+        policy_map: Dict[str, Any],
+        registries: Iterable[Dict[str, Dict[str, Any]]]
+    ):
+        definitions: Dict[str, Dict[str, Any]] = {}
+        for registry in registries:
+            definitions.update(registry)
+
+        policy_ids = [p.get("id") for p in policy_map.get("policies", []) if p.get("id")]
+        policy_ids.extend(pid for pid in definitions if pid not in policy_ids)
+        map_policies = {p.get("id"): p for p in policy_map.get("policies", [])}
+
+        self._risk_modifiers: Dict[str, float] = {}
+        patterns: List[Tuple[str, str]] = []
+        for policy_id in policy_ids:
+            definition = definitions.get(policy_id, {})
+            map_policy = map_policies.get(policy_id, {})
+            single_word = list(definition.get("single_word", []))
+            multi_word = list(definition.get("multi_word", []))
+            for trigger in map_policy.get("triggers", []):
+                if trigger not in single_word and trigger not in multi_word:
+                    single_word.append(trigger)
+            if not single_word and not multi_word:
+                continue
+
+            bodies = [_trigger_body(t) for t in single_word]
+            bodies.extend(_trigger_body(t, flexible_whitespace=True) for t in multi_word)
+            patterns.append((policy_id, r"\b(?:" + "|".join(bodies) + r")\b"))
+            self._risk_modifiers[policy_id] = float(
+                definition.get("risk_modifier", map_policy.get("risk_modifier", 0.0))
+            )
+
+        self._index = PatternIndex(patterns, _FLAGS)
+        self.policy_ids: Tuple[str, ...] = self._index.names
+
+    def match(self, text: Union[str, AnalyzedText]) -> List[str]:
+        """IDs of all violated policies, in policy order"""
+        if not text:
+            return []
+        if isinstance(text, AnalyzedText):
+            return self._index.match_names(text.lower, text.words)
+        return self._index.match_names(text.lower())
+
+    def risk_modifier(self, violations: Sequence[str]) -> float:
+        """Maximum risk modifier over the given violated policies"""
+        modifiers = [self._risk_modifiers.get(pid, 0.0) for pid in violations]
+        return max(modifiers) if modifiers else 0.0
@@ -5,6 +5,7 @@ Live telemetry feed endpoints for corporate and regulator panels
 """
 
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
 from typing import Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
 import logging
@@ -18,6 +19,15 @@ from backend.telemetry.repository import (
 from backend.telemetry.schemas import TelemetryEventRead, TelemetryListResponse
 from backend.auth.deps import require_admin, require_corporate_or_admin, require_regulator_or_admin
 from backend.security.rate_limit import rate_limit_regulator_feed
+from backend.core.engines.engine_memo import get_engine_memo_stats
+from backend.core.llm.http_pool import get_llm_http_pool
+from backend.gateway.response_cache import get_llm_response_cache
+from backend.gateway.single_flight import get_single_flight
+from backend.gateway.concurrency_limiter import get_concurrency_stats
+from backend.core.utils.model_router import get_model_router
+from backend.core.utils.analysis_executor import get_analysis_executor
+from backend.core.utils.event_loop_lag import get_event_loop_lag_monitor
+from backend.services.proxy_performance_metrics import get_proxy_performance_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -187,3 +197,123 @@ async def get_regulator_feed(
             newest_timestamp=None
         )
 
+
+@router.get("/event-loop")
+async def get_event_loop_stats(
+    _: dict = Depends(require_admin())  # Admin only
+):
+    """
+    Get event loop lag statistics
+    
+    Returns recent lag percentiles and the analysis executor in use.
+    """
+    executor = get_analysis_executor()
+    return {
+        "lag": get_event_loop_lag_monitor().snapshot(),
+        "analysis_executor": {
+            "kind": executor.kind,
+            "max_workers": executor.max_workers
+        }
+    }
+
+
+@router.get("/engine-memo")
+async def get_engine_memo_statistics(
+    _: dict = Depends(require_admin())  # Admin only
+):
+    """
+    Get engine memo statistics
+    
+    Returns size, hit/miss and eviction counters per memoized engine.
+    """
+    return {"engines": get_engine_memo_stats()}
+
+
+@router.get("/llm-http-pool")
+async def get_llm_http_pool_statistics(
+    _: dict = Depends(require_admin())  # Admin only
+):
+    """
+    Get LLM HTTP pool statistics
+    
+    Returns the open provider clients with their HTTP/2 flag and pool limits.
+    """
+    return get_llm_http_pool().stats()
+
+
+@router.get("/llm-providers")
+async def get_llm_provider_health(
+    _: dict = Depends(require_admin())  # Admin only
+):
+    """
+    Get LLM provider health
+    
+    Returns availability (API key loaded) and rolling latency/error statistics per provider,
+    and how often ensemble hedging stopped waiting for slow models.
+    """
+    return get_model_router().stats()
+
+
+@router.get("/llm-response-cache")
+async def get_llm_response_cache_statistics(
+    _: dict = Depends(require_admin())  # Admin only
+):
+    """
+    Get LLM response cache statistics
+    
+    Returns L1/L2 hit, miss, store and bypass counters with the L1 size.
+    """
+    return get_llm_response_cache().stats()
+
+
+@router.get("/llm-single-flight")
+async def get_llm_single_flight_statistics(
+    _: dict = Depends(require_admin())  # Admin only
+):
+    """
+    Get LLM request coalescing statistics
+    
+    Returns provider calls issued and identical concurrent requests coalesced onto them,
+    per call site (gateway, router).
+    """
+    return get_single_flight().stats()
+
+
+@router.get("/llm-concurrency")
+async def get_llm_concurrency_statistics(
+    _: dict = Depends(require_admin())  # Admin only
+):
+    """
+    Get adaptive LLM concurrency limits
+    
+    Returns the current limit, in-flight and queued calls, Retry-After block and
+    AIMD counters per provider/model.
+    """
+    return {"limiters": get_concurrency_stats()}
+
+
+@router.get("/pipeline-stages")
+async def get_pipeline_stage_latency(
+    _: dict = Depends(require_admin())  # Admin only
+):
+    """
+    Get pipeline stage latency summary
+    
+    Returns count, mean and estimated p50/p95/p99 per mode and stage.
+    """
+    return {"modes": get_proxy_performance_metrics().summary()}
+
+
+@router.get("/pipeline-metrics", response_class=PlainTextResponse)
+async def get_pipeline_metrics(
+    _: dict = Depends(require_admin())  # Admin only
+):
+    """
+    Pipeline latency histograms in the Prometheus text format
+    
+    Stage and total durations (seconds) labelled by mode (and stage).
+    """
+    return PlainTextResponse(
+        get_proxy_performance_metrics().render_prometheus(),
+        media_type="text/plain; version=0.0.4"
+    )
@@ -17,6 +17,7 @@ from backend.core.utils.dependencies import get_db
 from backend.security.rate_limit import rate_limit_proxy_corporate
 from backend.auth.proxy_auth import require_proxy_auth
 from backend.services.proxy_analyzer import analyze_content_deep
+from backend.gateway.response_cache import cache_bypass_requested
 from backend.services.proxy_rewrite_engine import rewrite_content
 from backend.services.proxy_telemetry import log_analysis, log_rewrite, get_telemetry_metrics, get_regulator_data
 from backend.routers.proxy_audit import RiskFlagSeverity, DecisionJustification, create_audit_entry
@@ -82,6 +83,7 @@ class ProxyAnalyzeResponse(BaseModel):
     analysis_id: Optional[str] = None
     risk_flags_severity: Optional[List[RiskFlagSeverityResponse]] = None
     justification: Optional[List[DecisionJustificationResponse]] = None
+    reused_paragraphs: int = 0  # Paragraphs served from the paragraph result cache
 
 
 class ProxyRewriteRequest(BaseModel):
@@ -110,11 +112,18 @@ def generate_content_hash(content: str) -> str:
     return hashlib.sha256(content.encode()).hexdigest()[:16]
 
 
+def response_cache_scope(current_user: Dict[str, Any]) -> str:
+    """Judge response cache scope: the caller's organization (or the user without one)"""
+    org_id = current_user.get("org_id") or current_user.get("company_id")
+    return f"org:{org_id}" if org_id else f"user:{current_user.get('user_id')}"
+
+
 # ========== ENDPOINTS ==========
 
 @router.post("/analyze", response_model=ProxyAnalyzeResponse)
 async def proxy_analyze(
     request: ProxyAnalyzeRequest,
+    http_request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: Dict[str, Any] = Depends(require_proxy_auth),
     _: None = Depends(rate_limit_proxy_corporate)
@@ -145,7 +154,9 @@ async def proxy_analyze(
             content=request.content,
             domain=request.domain,
             policies=request.policies,
-            provider=request.provider
+            provider=request.provider,
+            cache_scope=response_cache_scope(current_user),
+            cache_bypass=cache_bypass_requested(http_request.headers)
         )
         
         # Calculate latency
@@ -368,7 +379,8 @@ Risk Lokasyonları: {len(analysis_result['risk_locations'])} adet
                     evidence=j.evidence,
                     severity=j.severity
                 ) for j in justification
-            ] if justification else None
+            ] if justification else None,
+            reused_paragraphs=analysis_result.get("reused_paragraphs", 0)
         )
         
     except HTTPException:
@@ -384,6 +396,7 @@ Risk Lokasyonları: {len(analysis_result['risk_locations'])} adet
 @router.post("/rewrite", response_model=ProxyRewriteResponse)
 async def proxy_rewrite(
     request: ProxyRewriteRequest,
+    http_request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: Dict[str, Any] = Depends(require_proxy_auth),
     _: None = Depends(rate_limit_proxy_corporate)
@@ -400,7 +413,9 @@ async def proxy_rewrite(
             content=request.content,
             domain=request.domain,
             policies=request.policies,
-            provider=request.provider
+            provider=request.provider,
+            cache_scope=response_cache_scope(current_user),
+            cache_bypass=cache_bypass_requested(http_request.headers)
         )
         original_scores = original_analysis["overall_scores"]
         
@@ -422,7 +437,9 @@ async def proxy_rewrite(
                 content=rewritten_content,
                 domain=request.domain,
                 policies=request.policies,
-                provider=request.provider
+                provider=request.provider,
+                cache_scope=response_cache_scope(current_user),
+                cache_bypass=cache_bypass_requested(http_request.headers)
             )
             new_scores = new_analysis["overall_scores"]
             
@@ -4,13 +4,14 @@ Proxy-Lite Mode Router
 Ethical analysis endpoint for individual users and SMEs
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request
 from pydantic import BaseModel
 from typing import List, Optional, Literal
 import json
 import re
 from backend.core.utils.dependencies import require_internal, require_institution_auditor
 from backend.gateway.router_adapter import call_llm_provider
+from backend.gateway.response_cache import cache_bypass_requested
 from backend.config import get_settings
 from backend.core.engines.input_analyzer import analyze_input
 from backend.core.engines.output_analyzer import analyze_output
@@ -21,6 +22,9 @@ from backend.core.engines.psych_pressure import analyze_psychological_pressure
 
 router = APIRouter()
 
+# Proxy-Lite is unauthenticated: its judge responses share one cache scope
+PROXY_LITE_CACHE_SCOPE = "proxy-lite"
+
 
 # ========== NEW ANALYZE ENDPOINT ==========
 
@@ -447,9 +451,11 @@ async def analyze_paragraph(
     locale: str,
     provider: str,
     settings,
-    platform: Optional[str] = None
+    context: Optional[str] = None,
+    target_audience: Optional[str] = None,
+    cache_bypass: bool = False
 ) -> ParagraphAnalysisResponse:
-    """Analyze a single paragraph using the judge prompt"""
+    """Analyze a single paragraph using the judge prompt (responses cached, see gateway/response_cache)"""
     import logging
     logger = logging.getLogger(__name__)
     
@@ -464,7 +470,9 @@ async def analyze_paragraph(
             settings=settings,
             model="gpt-4o-mini" if provider == "openai" else None,
             temperature=0.3,
-            max_tokens=1000
+            max_tokens=1000,
+            cache_scope=PROXY_LITE_CACHE_SCOPE,
+            cache_bypass=cache_bypass
         )
         
         logger.debug(f"[Proxy-Lite] LLM response received (length={len(response_text)})")
@@ -525,7 +533,8 @@ async def analyze_paragraph(
 
 @router.post("/analyze", response_model=AnalyzeResponse)
 async def analyze_ethical_content(
-    request: AnalyzeRequest
+    request: AnalyzeRequest,
+    http_request: Request
 ):
     """
     Proxy-Lite Ethical Analysis Endpoint
@@ -562,7 +571,8 @@ async def analyze_ethical_content(
             
             try:
                 analysis = await analyze_paragraph(
-                    para, request.locale, request.provider or "openai", settings, request.context, request.target_audience
+                    para, request.locale, request.provider or "openai", settings, request.context, request.target_audience,
+                    cache_bypass=cache_bypass_requested(http_request.headers)
                 )
                 
                 # Post-process: If it's clearly a question but got low score, adjust
@@ -643,7 +653,8 @@ async def analyze_ethical_content(
 
 @router.post("/rewrite", response_model=RewriteResponse)
 async def rewrite_paragraph(
-    request: RewriteRequest
+    request: RewriteRequest,
+    http_request: Request
 ):
     """
     Rewrite paragraph to be more ethical
@@ -658,7 +669,8 @@ async def rewrite_paragraph(
             request.text,
             locale,
             provider,
-            settings
+            settings,
+            cache_bypass=cache_bypass_requested(http_request.headers)
         )
         original_score = original_analysis.score
         risk_level_before = get_risk_level(original_score)
@@ -690,7 +702,8 @@ async def rewrite_paragraph(
             new_text,
             locale,
             provider,
-            settings
+            settings,
+            cache_bypass=cache_bypass_requested(http_request.headers)
         )
         new_score = new_analysis.score
         risk_level_after = get_risk_level(new_score)
@@ -51,6 +51,11 @@ def _get_client_ip(request: Request) -> str:
     return "unknown"
 
 
+def client_scope(request: Request) -> str:
+    """Fair-queuing scope of an unauthenticated caller: its client IP (as rate limited)"""
+    return f"ip:{_get_client_ip(request)}"
+
+
 async def rate_limit(
     request: Request,
     limit: int,
@@ -2,13 +2,21 @@
 """
 EZA Proxy - Deep Content Analyzer Service
 Paragraph + Sentence level analysis with 5 score types
+
+Paragraph results are content-addressed: with a cache scope, the parsed
+result of each paragraph is stored in the LLM response cache under its
+exact text (its risk locations are offsets into it), domain, policy set,
+provider and model. Re-analyzing an edited document only calls the LLM for the changed
+paragraphs; document scores are recomputed from cached and fresh results.
 """
 
+import hashlib
 import logging
 import re
 import json
 from typing import List, Dict, Any, Optional
 from backend.gateway.router_adapter import call_llm_provider
+from backend.gateway.response_cache import get_llm_response_cache
 from backend.config import get_settings
 
 logger = logging.getLogger(__name__)
@@ -58,6 +66,31 @@ def split_into_sentences(text: str) -> List[str]:
     return result if result else [text]
 
 
+def paragraph_cache_key(
+    scope: str,
+    paragraph: str,
+    domain: Optional[str],
+    policies: Optional[List[str]],
+    provider: str,
+    model: Optional[str]
+) -> str:
+    """
+    Cache key of a paragraph's deep analysis (exact text, policy set)
+
+    The text is not normalized: the cached risk_locations are offsets into it.
+    """
+    params = json.dumps([
+        "deep_paragraph_v2",
+        scope,
+        hashlib.sha256(paragraph.encode("utf-8")).hexdigest(),
+        domain,
+        sorted(set(policies or [])),
+        provider,
+        model,
+    ])
+    return hashlib.sha256(params.encode("utf-8")).hexdigest()
+
+
 def build_deep_analysis_prompt(
     content: str,
     domain: Optional[str] = None,
@@ -125,11 +158,18 @@ async def analyze_content_deep(
     content: str,
     domain: Optional[str] = None,
     policies: Optional[List[str]] = None,
-    provider: str = "openai"
+    provider: str = "openai",
+    cache_scope: Optional[str] = None,
+    cache_bypass: bool = False
 ) -> Dict[str, Any]:
     """
     Deep analysis with 5 score types
     Returns paragraph and sentence level analysis
+    
+    cache_scope (organization) enables the judge response cache and the
+    paragraph result cache, cache_bypass skips their lookups (see
+    gateway/response_cache). reused_paragraphs counts paragraphs served from
+    the paragraph cache.
     """
     settings = get_settings()
     
@@ -139,58 +179,76 @@ async def analyze_content_deep(
     paragraph_analyses = []
     all_flags = []
     all_risk_locations = []
+    model = "gpt-4o-mini" if provider == "openai" else None
+    cache = get_llm_response_cache() if (
+        cache_scope and settings.PROXY_PARAGRAPH_CACHE_ENABLED and settings.LLM_RESPONSE_CACHE_ENABLED
+    ) else None
+    reused = 0
     
     for para_idx, para in enumerate(paragraphs):
-        # Analyze paragraph
-        prompt = build_deep_analysis_prompt(para, domain, policies)
-        
-        try:
-            response_text = await call_llm_provider(
-                provider_name=provider,
-                prompt=prompt,
-                settings=settings,
-                model="gpt-4o-mini" if provider == "openai" else None,
-                temperature=0.3,
-                max_tokens=2000
-            )
-            
-            # Parse JSON response
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group())
+        cache_key = None
+        scores = None
+        if cache is not None:
+            cache_key = paragraph_cache_key(cache_scope, para, domain, policies, provider, model)
+            if cache_bypass:
+                cache.record_bypass()
             else:
-                data = json.loads(response_text)
-            
-            para_analysis = {
-                "paragraph_index": para_idx,
-                "text": para,
-                "ethical_index": int(data.get("ethical_index", 50)),
-                "compliance_score": int(data.get("compliance_score", 50)),
-                "manipulation_score": int(data.get("manipulation_score", 50)),
-                "bias_score": int(data.get("bias_score", 50)),
-                "legal_risk_score": int(data.get("legal_risk_score", 50)),
-                "flags": data.get("flags", []),
-                "risk_locations": data.get("risk_locations", [])
-            }
-            
-            paragraph_analyses.append(para_analysis)
-            all_flags.extend(data.get("flags", []))
-            all_risk_locations.extend(data.get("risk_locations", []))
+                cached = await cache.get(cache_key)
+                if cached is not None:
+                    scores = json.loads(cached)
+                    reused += 1
+        
+        if scores is None:
+            # Analyze paragraph
+            prompt = build_deep_analysis_prompt(para, domain, policies)
             
-        except Exception as e:
-            logger.error(f"[Proxy] Error analyzing paragraph {para_idx}: {str(e)}")
-            # Fallback
-            paragraph_analyses.append({
-                "paragraph_index": para_idx,
-                "text": para,
-                "ethical_index": 50,
-                "compliance_score": 50,
-                "manipulation_score": 50,
-                "bias_score": 50,
-                "legal_risk_score": 50,
-                "flags": ["analiz_hatası"],
-                "risk_locations": []
-            })
+            try:
+                response_text = await call_llm_provider(
+                    provider_name=provider,
+                    prompt=prompt,
+                    settings=settings,
+                    model=model,
+                    temperature=0.3,
+                    max_tokens=2000,
+                    cache_scope=cache_scope,
+                    cache_bypass=cache_bypass
+                )
+                
+                # Parse JSON response
+                json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+                if json_match:
+                    data = json.loads(json_match.group())
+                else:
+                    data = json.loads(response_text)
+                
+                scores = {
+                    "ethical_index": int(data.get("ethical_index", 50)),
+                    "compliance_score": int(data.get("compliance_score", 50)),
+                    "manipulation_score": int(data.get("manipulation_score", 50)),
+                    "bias_score": int(data.get("bias_score", 50)),
+                    "legal_risk_score": int(data.get("legal_risk_score", 50)),
+                    "flags": data.get("flags", []),
+                    "risk_locations": data.get("risk_locations", [])
+                }
+                if cache_key is not None:
+                    await cache.set(cache_key, json.dumps(scores))
+                
+            except Exception as e:
+                logger.error(f"[Proxy] Error analyzing paragraph {para_idx}: {str(e)}")
+                # Fallback (not cached)
+                scores = {
+                    "ethical_index": 50,
+                    "compliance_score": 50,
+                    "manipulation_score": 50,
+                    "bias_score": 50,
+                    "legal_risk_score": 50,
+                    "flags": ["analiz_hatası"],
+                    "risk_locations": []
+                }
+        
+        paragraph_analyses.append({"paragraph_index": para_idx, "text": para, **scores})
+        all_flags.extend(scores["flags"])
+        all_risk_locations.extend(scores["risk_locations"])
     
     # Calculate overall scores (weighted average)
     if paragraph_analyses:
@@ -215,6 +273,7 @@ async def analyze_content_deep(
         },
         "paragraphs": paragraph_analyses,
         "flags": unique_flags,
-        "risk_locations": all_risk_locations
+        "risk_locations": all_risk_locations,
+        "reused_paragraphs": reused
     }
 
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+EZA Proxy - Performance Metrics
+Per-mode, per-stage latency histograms of run_full_pipeline.
+
+The pipeline records its stage spans (core/utils/spans) here once per request.
+Histograms use fixed cumulative buckets, so recording is a bucket search and
+a few additions; summary() estimates percentiles from the buckets and
+render_prometheus() writes the Prometheus text exposition format (no client
+library needed).
+"""
+
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import threading
+
+from backend.core.utils.spans import Span
+
+# Bucket upper bounds (ms); +Inf is implicit
+DEFAULT_BUCKETS_MS: Tuple[float, ...] = (
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0,
+    250.0, 500.0, 1000.0, 2500.0, 5000.0, 10000.0, 30000.0
+)
+
+STAGE_METRIC = "eza_pipeline_stage_duration_seconds"
+TOTAL_METRIC = "eza_pipeline_duration_seconds"
+
+
+class LatencyHistogram:
+    """Cumulative-bucket histogram of durations in milliseconds"""
+
+    __slots__ = ("bounds", "counts", "count", "sum_ms", "max_ms")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts: List[int] = [0] * (len(bounds) + 1)  # last = +Inf
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        self.counts[bisect_left(self.bounds, value_ms)] += 1
+        self.count += 1
+        self.sum_ms += value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def quantile(self, q: float) -> float:
+        """Estimated q-quantile (ms), interpolated within its bucket (at most the max seen)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                if i == len(self.bounds):
+                    return self.max_ms
+                lower = self.bounds[i - 1] if i else 0.0
+                estimate = lower + (self.bounds[i] - lower) * (rank - seen) / bucket_count
+                return min(estimate, self.max_ms)
+            seen += bucket_count
+        return self.max_ms
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": round(self.quantile(0.50), 3),
+            "p95_ms": round(self.quantile(0.95), 3),
+            "p99_ms": round(self.quantile(0.99), 3),
+            "max_ms": round(self.max_ms, 3)
+        }
+
+
+class ProxyPerformanceMetrics:
+    """Stage latency histograms by (mode, stage) plus total latency by mode"""
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self.buckets_ms = tuple(sorted(buckets_ms))
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict[str, LatencyHistogram]] = {}  # mode -> stage -> histogram
+        self._totals: Dict[str, LatencyHistogram] = {}
+
+    def record_pipeline(self, mode: str, spans: Sequence[Span], total_ms: Optional[float] = None) -> None:
+        """
+        Record one request
+
+        Args:
+            mode: Pipeline mode
+            spans: The request's (stage, start, end) spans (SpanRecorder.spans)
+            total_ms: Whole-request milliseconds
+        """
+        with self._lock:
+            stages = self._stages.get(mode)
+            if stages is None:
+                stages = self._stages[mode] = {}
+            for stage, start, end in spans:
+                histogram = stages.get(stage)
+                if histogram is None:
+                    histogram = stages[stage] = LatencyHistogram(self.buckets_ms)
+                # LatencyHistogram.observe, inlined (runs for every stage of every request)
+                value_ms = (end - start) * 1000.0
+                histogram.counts[bisect_left(histogram.bounds, value_ms)] += 1
+                histogram.count += 1
+                histogram.sum_ms += value_ms
+                if value_ms > histogram.max_ms:
+                    histogram.max_ms = value_ms
+            if total_ms is not None:
+                histogram = self._totals.get(mode)
+                if histogram is None:
+                    histogram = self._totals[mode] = LatencyHistogram(self.buckets_ms)
+                histogram.observe(total_ms)
+
+    def reset(self) -> None:
+        """Drop all histograms"""
+        with self._lock:
+            self._stages.clear()
+            self._totals.clear()
+
+    def summary(self) -> Dict[str, Any]:
+        """{mode: {"total": {...}, "stages": {stage: {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}}}}"""
+        with self._lock:
+            result: Dict[str, Any] = {}
+            for mode, histogram in sorted(self._totals.items()):
+                result.setdefault(mode, {"total": None, "stages": {}})["total"] = histogram.summary()
+            for mode, stages in sorted(self._stages.items()):
+                result.setdefault(mode, {"total": None, "stages": {}})["stages"] = {
+                    stage: histogram.summary() for stage, histogram in sorted(stages.items())
+                }
+            return result
+
+    def render_prometheus(self) -> str:
+        """Histograms in the Prometheus text exposition format (seconds)"""
+        lines: List[str] = []
+        with self._lock:
+            lines.append(f"# HELP {STAGE_METRIC} Duration of one run_full_pipeline stage")
+            lines.append(f"# TYPE {STAGE_METRIC} histogram")
+            for mode, stages in sorted(self._stages.items()):
+                for stage, histogram in sorted(stages.items()):
+                    self._render_histogram(lines, STAGE_METRIC, f'mode="{mode}",stage="{stage}"', histogram)
+            lines.append(f"# HELP {TOTAL_METRIC} Duration of run_full_pipeline")
+            lines.append(f"# TYPE {TOTAL_METRIC} histogram")
+            for mode, histogram in sorted(self._totals.items()):
+                self._render_histogram(lines, TOTAL_METRIC, f'mode="{mode}"', histogram)
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _render_histogram(lines: List[str], name: str, labels: str, histogram: LatencyHistogram) -> None:
+        cumulative = 0
+        for bound, bucket_count in zip(histogram.bounds, histogram.counts):
+            cumulative += bucket_count
+            lines.append(f'{name}_bucket{{{labels},le="{bound / 1000.0:g}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+        lines.append(f"{name}_sum{{{labels}}} {histogram.sum_ms / 1000.0:.9g}")
+        lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+
+_metrics: Optional[ProxyPerformanceMetrics] = None
+_metrics_lock = threading.Lock()
+
+
+def get_proxy_performance_metrics() -> ProxyPerformanceMetrics:
+    """Process-wide pipeline performance metrics"""
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = ProxyPerformanceMetrics()
+    return _metrics
@@ -13,11 +13,12 @@ from backend.telemetry.schemas import (
 )
 from backend.telemetry.repository import (
     create_event,
+    create_events,
     get_latest_events,
     get_events_for_regulator,
     get_events_for_corporate
 )
-from backend.telemetry.service import record_telemetry_event
+from backend.telemetry.service import record_telemetry_event, record_telemetry_events
 from backend.telemetry.realtime import LiveTelemetryHub, telemetry_hub
 
 __all__ = [
@@ -27,10 +28,12 @@ __all__ = [
     "TelemetryEventRead",
     "TelemetryListResponse",
     "create_event",
+    "create_events",
     "get_latest_events",
     "get_events_for_regulator",
     "get_events_for_corporate",
     "record_telemetry_event",
+    "record_telemetry_events",
     "LiveTelemetryHub",
     "telemetry_hub"
 ]
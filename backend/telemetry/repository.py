@@ -4,7 +4,8 @@ Telemetry Event Repository
 Database operations for telemetry events
 """
 
-from typing import List, Optional
+from typing import List, Optional, Sequence
+from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc, or_
 from sqlalchemy.orm import selectinload
@@ -47,6 +48,45 @@ async def create_event(
     return event
 
 
+async def create_events(
+    session: AsyncSession,
+    data: Sequence[TelemetryEventCreate]
+) -> List[TelemetryEvent]:
+    """
+    Create several telemetry events in one transaction
+    
+    created_at is set client-side so the rows need no refresh after commit.
+    
+    Args:
+        session: Database session
+        data: Telemetry event data, one item per event
+    
+    Returns:
+        Created TelemetryEvent objects, in input order
+    """
+    now = datetime.now(timezone.utc)
+    events = [
+        TelemetryEvent(
+            created_at=now,
+            mode=item.mode,
+            source=item.source,
+            user_input=item.user_input,
+            safe_answer=item.safe_answer,
+            eza_score=item.eza_score,
+            risk_level=item.risk_level,
+            policy_violations=item.policy_violations,
+            model_votes=item.model_votes,
+            meta=item.meta
+        )
+        for item in data
+    ]
+    if not events:
+        return events
+    session.add_all(events)
+    await session.commit()
+    return events
+
+
 async def get_latest_events(
     session: AsyncSession,
     limit: int = 50,
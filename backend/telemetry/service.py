@@ -4,36 +4,31 @@ Telemetry Service
 Service layer for recording telemetry events from pipeline
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
-from backend.telemetry.repository import create_event
+from backend.telemetry.repository import create_event, create_events
 from backend.telemetry.schemas import TelemetryEventCreate, TelemetryEventRead
 from backend.telemetry.realtime import telemetry_hub
 
 logger = logging.getLogger(__name__)
 
 
-async def record_telemetry_event(
+def build_telemetry_event(
     pipeline_result: Dict[str, Any],
     mode: str,
     source: str,
-    db_session: AsyncSession,
     user_input: Optional[str] = None
-) -> None:
+) -> TelemetryEventCreate:
     """
-    Record a telemetry event from pipeline result
+    Build telemetry event data from a pipeline result
     
     Args:
         pipeline_result: Result dictionary from run_full_pipeline()
         mode: Pipeline mode (standalone, proxy, proxy-lite)
         source: Event source (e.g., "standalone-api", "proxy-api")
-        db_session: Database session
         user_input: User input text (optional, will try to extract from pipeline_result if not provided)
-    
-    Returns:
-        None (raises exception on failure, but should be caught by caller)
     """
     try:
         # Extract user_input - prefer provided parameter, then try to get from pipeline_result
@@ -143,6 +138,35 @@ async def record_telemetry_event(
             model_votes=model_votes,
             meta=meta if meta else None
         )
+        return event_data
+        
+    except Exception as e:
+        logger.error(f"Failed to build telemetry event: {str(e)}")
+        raise
+
+
+async def record_telemetry_event(
+    pipeline_result: Dict[str, Any],
+    mode: str,
+    source: str,
+    db_session: AsyncSession,
+    user_input: Optional[str] = None
+) -> None:
+    """
+    Record a telemetry event from pipeline result
+    
+    Args:
+        pipeline_result: Result dictionary from run_full_pipeline()
+        mode: Pipeline mode (standalone, proxy, proxy-lite)
+        source: Event source (e.g., "standalone-api", "proxy-api")
+        db_session: Database session
+        user_input: User input text (optional, will try to extract from pipeline_result if not provided)
+    
+    Returns:
+        None (raises exception on failure, but should be caught by caller)
+    """
+    try:
+        event_data = build_telemetry_event(pipeline_result, mode, source, user_input)
         
         # Create event in database
         created_event = await create_event(db_session, event_data)
@@ -176,3 +200,50 @@ async def record_telemetry_event(
         logger.error(f"Failed to record telemetry event: {str(e)}")
         raise  # Re-raise to allow caller to handle
 
+
+async def record_telemetry_events(
+    pipeline_results: Sequence[Dict[str, Any]],
+    mode: str,
+    source: str,
+    db_session: AsyncSession,
+    user_inputs: Optional[Sequence[Optional[str]]] = None
+) -> int:
+    """
+    Record telemetry events for a batch of pipeline results in one transaction
+    
+    Args:
+        pipeline_results: Result dictionaries from run_full_pipeline()
+        mode: Pipeline mode (standalone, proxy, proxy-lite)
+        source: Event source (e.g., "proxy-batch-api")
+        db_session: Database session
+        user_inputs: User input per result (optional, same order as pipeline_results)
+    
+    Returns:
+        Number of events recorded (raises exception on failure, but should be caught by caller)
+    """
+    try:
+        events_data = [
+            build_telemetry_event(
+                result, mode, source,
+                user_inputs[i] if user_inputs is not None else None
+            )
+            for i, result in enumerate(pipeline_results)
+        ]
+        created_events = await create_events(db_session, events_data)
+        logger.debug(f"Telemetry events recorded: {len(created_events)} x {mode} from {source}")
+        
+        # Broadcast to WebSocket clients (non-blocking)
+        try:
+            for created_event, event_data in zip(created_events, events_data):
+                await telemetry_hub.broadcast(TelemetryEventRead(
+                    id=created_event.id,
+                    timestamp=created_event.created_at,
+                    **event_data.model_dump()
+                ))
+        except Exception as broadcast_error:
+            logger.warning(f"Failed to broadcast telemetry events to WebSocket: {str(broadcast_error)}")
+        return len(created_events)
+        
+    except Exception as e:
+        logger.error(f"Failed to record telemetry events: {str(e)}")
+        raise  # Re-raise to allow caller to handle
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+LLM Simulator
+Offline OpenAI-compatible chat-completions server for load tests.
+
+Unlike FakeLLM (llm_override), requests go through the real provider clients:
+HTTP connection pooling, the concurrency limiter, retries, timeouts and SSE
+streaming are all exercised. OpenAI, Groq and Mistral speak the same protocol,
+so one simulator serves all three (any path ending in /chat/completions).
+
+- Latency (time to first token): fixed, uniform or lognormal
+- Token rate: tokens_per_second paces streamed chunks (and the full response)
+- Errors: random 500s / 429s (with Retry-After), a concurrency cap answered
+  with 429, or scripted failures via fail_next()
+- Stats: connections, requests, streamed, in-flight peak, errors per status
+
+Usage:
+    async with LLMSimulator(SimulatorProfile(latency="lognormal", latency_ms=80)) as simulator:
+        settings.OPENAI_BASE_URL = simulator.base_url
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+import asyncio
+import json
+import math
+import random
+import re
+import time
+
+DEFAULT_RESPONSE = (
+    "This is a simulated response from the offline LLM simulator. "
+    "It streams word by word at the configured token rate."
+)
+
+REASONS = {200: "OK", 404: "Not Found", 429: "Too Many Requests", 500: "Internal Server Error"}
+
+
+@dataclass
+class SimulatorProfile:
+    """Behaviour of the simulated provider"""
+    latency: str = "fixed"  # fixed / uniform / lognormal (time to first token)
+    latency_ms: float = 20.0  # fixed value, uniform lower bound or lognormal median
+    latency_max_ms: float = 0.0  # uniform upper bound
+    latency_sigma: float = 0.5  # lognormal shape
+    tokens_per_second: float = 0.0  # 0: whole response at once
+    error_rate: float = 0.0  # Share of requests answered with 500
+    rate_limit_rate: float = 0.0  # Share of requests answered with 429
+    retry_after_seconds: Optional[float] = 1.0  # Retry-After of 429 answers (None: no header)
+    max_concurrency: int = 0  # Requests above this many in flight get 429 (0: unlimited)
+    response_text: str = DEFAULT_RESPONSE
+    seed: Optional[int] = None
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """Time to first token in seconds"""
+        if self.latency == "uniform":
+            return rng.uniform(self.latency_ms, max(self.latency_ms, self.latency_max_ms)) / 1000.0
+        if self.latency == "lognormal":
+            return rng.lognormvariate(math.log(max(self.latency_ms, 1e-3)), self.latency_sigma) / 1000.0
+        return self.latency_ms / 1000.0
+
+
+class LLMSimulator:
+    """Local OpenAI-compatible server on 127.0.0.1 (ephemeral port)"""
+
+    def __init__(self, profile: Optional[SimulatorProfile] = None):
+        self.profile = profile or SimulatorProfile()
+        self._rng = random.Random(self.profile.seed)
+        self._scripted: Deque[Tuple[int, Optional[float]]] = deque()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._handlers: Set["asyncio.Task[None]"] = set()
+        self.in_flight = 0
+        self.stats: Dict[str, Any] = {}
+        self.reset_stats()
+
+    @property
+    def url(self) -> str:
+        """Server root (LOCAL_LLM_URL)"""
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    @property
+    def base_url(self) -> str:
+        """OpenAI-style API root (OPENAI_BASE_URL, GROQ_BASE_URL, MISTRAL_BASE_URL)"""
+        return f"{self.url}/v1"
+
+    def reset_stats(self) -> None:
+        self.stats = {
+            "connections": 0,
+            "requests": 0,
+            "completed": 0,
+            "streamed": 0,
+            "disconnects": 0,
+            "max_in_flight": 0,
+            "status": {},
+            "models": {},
+        }
+
+    def fail_next(self, status: int = 429, count: int = 1, retry_after: Optional[float] = None) -> None:
+        """Answer the next `count` requests with `status` (before any random injection)"""
+        for _ in range(count):
+            self._scripted.append((status, retry_after))
+
+    async def __aenter__(self) -> "LLMSimulator":
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._server.close()
+        # Requests abandoned by their client (timeouts) may still be sleeping
+        for task in list(self._handlers):
+            task.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.stats["connections"] += 1
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, path = request_line.split(" ")[:2]
+                headers = {}
+                for line in header_lines:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else b""
+                await self._serve(method, path, body, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._handlers.discard(task)
+            writer.close()
+
+    async def _serve(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter) -> None:
+        self.stats["requests"] += 1
+        if method != "POST" or not path.rstrip("/").endswith("/chat/completions"):
+            await self._send_json(writer, 404, {"error": {"message": f"No route {method} {path}"}})
+            return
+        request = json.loads(body or b"{}")
+        model = request.get("model", "simulated")
+        self.stats["models"][model] = self.stats["models"].get(model, 0) + 1
+
+        self.in_flight += 1
+        self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.in_flight)
+        try:
+            failure = self._failure()
+            if failure is not None:
+                status, retry_after = failure
+                headers = {"Retry-After": f"{retry_after:g}"} if retry_after is not None else {}
+                # Errors come back fast, like a provider's edge rejecting the request
+                await self._send_json(writer, status, {"error": {"message": f"simulated {status}"}}, headers)
+                return
+
+            await asyncio.sleep(self.profile.sample_latency(self._rng))
+            tokens = self._tokens(request.get("max_tokens"))
+            if request.get("stream"):
+                await self._send_stream(writer, model, tokens)
+                self.stats["streamed"] += 1
+            else:
+                if self.profile.tokens_per_second > 0:
+                    await asyncio.sleep(len(tokens) / self.profile.tokens_per_second)
+                await self._send_json(writer, 200, self._completion(model, "".join(tokens), len(tokens)))
+            self.stats["completed"] += 1
+        except ConnectionError:
+            self.stats["disconnects"] += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    def _failure(self) -> Optional[Tuple[int, Optional[float]]]:
+        """Status and Retry-After of an injected failure, None to answer normally"""
+        profile = self.profile
+        if self._scripted:
+            return self._scripted.popleft()
+        if profile.max_concurrency and self.in_flight > profile.max_concurrency:
+            return 429, profile.retry_after_seconds
+        roll = self._rng.random()
+        if roll < profile.rate_limit_rate:
+            return 429, profile.retry_after_seconds
+        if roll < profile.rate_limit_rate + profile.error_rate:
+            return 500, None
+        return None
+
+    def _tokens(self, max_tokens: Optional[int]) -> List[str]:
+        tokens = re.findall(r"\S+\s*", self.profile.response_text)
+        return tokens[:max_tokens] if max_tokens else tokens
+
+    def _completion(self, model: str, content: str, completion_tokens: int) -> Dict[str, Any]:
+        return {
+            "id": f"chatcmpl-sim-{self.stats['requests']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": completion_tokens, "total_tokens": completion_tokens},
+        }
+
+    def _count_status(self, status: int) -> None:
+        self.stats["status"][status] = self.stats["status"].get(status, 0) + 1
+
+    async def _send_json(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        self._count_status(status)
+        body = json.dumps(payload).encode()
+        extra = "".join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}\r\n"
+            "Content-Type: application/json\r\n"
+            "Connection: keep-alive\r\n"
+            f"{extra}Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+
+    async def _send_stream(self, writer: asyncio.StreamWriter, model: str, tokens: List[str]) -> None:
+        """SSE chat.completion.chunk events over chunked transfer encoding"""
+        self._count_status(200)
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Connection: keep-alive\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+        interval = 1.0 / self.profile.tokens_per_second if self.profile.tokens_per_second > 0 else 0.0
+        chunk_id = f"chatcmpl-sim-{self.stats['requests']}"
+        for i, token in enumerate(tokens):
+            if i and interval:
+                await asyncio.sleep(interval)
+            await self._send_event(writer, {
+                "id": chunk_id,
+                "object": "chat.completion.chunk",
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}],
+            })
+        await self._send_event(writer, {
+            "id": chunk_id,
+            "object": "chat.completion.chunk",
+            "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+        })
+        await self._send_event(writer, "[DONE]")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    @staticmethod
+    async def _send_event(writer: asyncio.StreamWriter, data: Any) -> None:
+        line = f"data: {data if isinstance(data, str) else json.dumps(data)}\n\n".encode()
+        writer.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+        await writer.drain()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Test Ensemble Hedging
+Tests for the first-K / soft-deadline ensemble policy of ModelRouter
+"""
+
+import asyncio
+import pytest
+from backend.config import get_settings
+from backend.core.llm.output_merger import merge_ensemble_outputs
+from backend.core.utils.ensemble_policy import EnsemblePolicy, get_ensemble_policy
+from backend.core.utils.model_router import ModelRouter
+
+ENSEMBLE = ["openai/gpt-4o-mini", "mistral/mistral-7b-instruct", "groq/llama3-8b-tool-use"]
+
+
+@pytest.fixture
+def router(monkeypatch):
+    """Router with every key set and provider calls that take a per-model delay"""
+    for key in ("OPENAI_API_KEY", "GROQ_API_KEY", "MISTRAL_API_KEY"):
+        monkeypatch.setenv(key, "test-key")
+    get_settings.cache_clear()
+    router = ModelRouter()
+    router.delays = {"openai": 0.01, "mistral": 0.02, "groq": 5.0}
+    router.cancelled = []
+
+    def fake_client(provider):
+        async def generate(prompt, model, temperature, max_tokens, timeout):
+            try:
+                await asyncio.sleep(router.delays[provider])
+            except asyncio.CancelledError:
+                router.cancelled.append(provider)
+                raise
+            return {"ok": True, "output": f"{provider} answer", "error": None,
+                    "provider": provider, "model_name": model}
+        return type("FakeClient", (), {"generate": staticmethod(generate)})()
+
+    router.openai_client = fake_client("openai")
+    router.mistral_client = fake_client("mistral")
+    router.groq_client = fake_client("groq")
+    yield router
+    get_settings.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_first_k_cancels_stragglers(router):
+    """Test the ensemble returns after K answers and cancels the slow model"""
+    results = await router.generate_ensemble("prompt", ENSEMBLE, policy=EnsemblePolicy(min_results=2))
+
+    assert [r["ok"] for r in results] == [True, True, False]
+    assert results[2]["cancelled"] is True
+    assert router.cancelled == ["groq"]
+
+
+@pytest.mark.asyncio
+async def test_soft_deadline_returns_arrived_answers(router):
+    """Test answers that arrived by the soft deadline are used, the rest cancelled"""
+    router.delays["mistral"] = 5.0
+    results, hedge = await router._run_ensemble(
+        "prompt", ENSEMBLE, 0.2, 512, None, EnsemblePolicy(min_results=3, soft_deadline_seconds=0.05)
+    )
+
+    assert hedge["stop_reason"] == "deadline"
+    assert hedge["voted_models"] == ["openai/gpt-4o-mini"]
+    assert sorted(hedge["cancelled_models"]) == sorted(ENSEMBLE[1:])
+    assert hedge["elapsed_ms"] < 1000
+    assert merge_ensemble_outputs("hi", results, {}, voted_models=hedge["voted_models"]) == "openai answer"
+
+
+@pytest.mark.asyncio
+async def test_deadline_waits_for_first_answer(router):
+    """Test a soft deadline with no answer yet keeps waiting for the first one"""
+    router.delays = {"openai": 0.1, "mistral": 5.0, "groq": 5.0}
+    results, hedge = await router._run_ensemble(
+        "prompt", ENSEMBLE, 0.2, 512, None, EnsemblePolicy(soft_deadline_seconds=0.01)
+    )
+
+    assert hedge["stop_reason"] == "deadline"
+    assert hedge["voted_models"] == ["openai/gpt-4o-mini"]
+
+
+@pytest.mark.asyncio
+async def test_route_by_mode_records_hedging_stats(router, monkeypatch):
+    """Test standalone routing uses the mode policy and counts hedged ensembles"""
+    monkeypatch.setenv("ENSEMBLE_POLICIES", '{"standalone": {"min_results": 2}}')
+    get_settings.cache_clear()
+
+    result = await router.route_by_mode("prompt", "standalone")
+
+    assert result["ok"] is True
+    assert result["voted_models"] == ["openai/gpt-4o-mini", "mistral/mistral-7b-instruct"]
+    assert result["cancelled_models"] == ["groq/llama3-8b-tool-use"]
+    stats = router.stats()["ensemble"]["standalone"]
+    assert (stats["ensembles"], stats["hedged"], stats["stopped_min_results"]) == (1, 1, 1)
+
+
+def test_policy_disabled_waits_for_all(monkeypatch):
+    """Test ENSEMBLE_HEDGING_ENABLED=false and unconfigured modes wait for every model"""
+    get_settings.cache_clear()
+    assert get_ensemble_policy("standalone").hedged
+    assert not get_ensemble_policy("proxy").hedged
+
+    monkeypatch.setenv("ENSEMBLE_HEDGING_ENABLED", "false")
+    get_settings.cache_clear()
+    assert not get_ensemble_policy("standalone").hedged
+    get_settings.cache_clear()
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Test Model Router Health
+Tests for the process-wide ModelRouter and its provider health state
+"""
+
+import pytest
+from backend.config import get_settings
+from backend.core.utils import model_router
+from backend.core.utils.model_router import ModelRouter, get_model_router
+from backend.core.utils.provider_health import ProviderHealth
+
+
+@pytest.fixture(autouse=True)
+def fresh_router(monkeypatch):
+    monkeypatch.setattr(model_router, "_router", None)
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+def _fake_generate(outcomes):
+    """Provider client generate() returning the given ok flags in order"""
+    async def generate(self, prompt, model, temperature, max_tokens, timeout):
+        ok = outcomes.pop(0)
+        return {
+            "ok": ok,
+            "output": "answer" if ok else None,
+            "error": None if ok else "OpenAI API error: 400",
+            "provider": "openai",
+            "model_name": model
+        }
+    return generate
+
+
+def test_router_is_shared_and_reloaded_with_settings(monkeypatch):
+    """Test one router per process, rebuilt only when settings are reloaded"""
+    router = get_model_router()
+    assert get_model_router() is router
+    assert router.is_model_available("openai/gpt-4o-mini")
+    clients = router.openai_client
+    router.health.record("openai", 10.0, True)
+
+    monkeypatch.setenv("OPENAI_API_KEY", "")
+    get_settings.cache_clear()
+
+    assert get_model_router() is router
+    assert router.openai_client is not clients
+    assert not router.is_model_available("openai/gpt-4o-mini")
+    # Health statistics survive the reload
+    assert router.health.get("openai").total_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_generate_records_provider_health(monkeypatch):
+    """Test provider calls feed rolling latency and error statistics"""
+    router = ModelRouter()
+    monkeypatch.setattr(type(router.openai_client), "generate", _fake_generate([True, False, True]))
+
+    for _ in range(3):
+        await router.generate("prompt", "openai/gpt-4o-mini")
+
+    stats = router.stats()["providers"]["openai"]
+    assert stats["available"] is True
+    assert stats["window_calls"] == 3
+    assert stats["error_rate"] == pytest.approx(1 / 3, abs=1e-3)
+    assert stats["latency_p50_ms"] is not None
+    assert stats["healthy"] is True
+
+
+def test_provider_unhealthy_after_consecutive_failures(monkeypatch):
+    """Test repeated failures mark a provider unhealthy until a success or the cooldown"""
+    monkeypatch.setenv("PROVIDER_UNHEALTHY_AFTER_FAILURES", "2")
+    monkeypatch.setenv("PROVIDER_HEALTH_COOLDOWN_SECONDS", "60")
+    get_settings.cache_clear()
+    health = ProviderHealth(window=10)
+
+    health.record(100.0, False, "timeout")
+    assert health.is_healthy()
+    health.record(100.0, False, "timeout")
+    assert not health.is_healthy()
+
+    health.last_failure_at -= 61
+    assert health.is_healthy()
+
+    health.record(50.0, True)
+    assert health.consecutive_failures == 0
+    assert health.latency_ms() == 50.0
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Test Pipeline Batch
+Tests for batch pipeline execution
+"""
+
+import asyncio
+import pytest
+from backend.api import pipeline_runner
+from backend.api.pipeline_runner import (
+    iter_full_pipeline_batch,
+    run_full_pipeline,
+    run_full_pipeline_batch
+)
+
+
+class CountingLLM:
+    """LLM override that answers after a per-prompt delay and tracks concurrency"""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.active = 0
+        self.max_active = 0
+
+    async def generate(self, prompt: str, **kwargs) -> str:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delays.get(prompt, 0.01))
+            return f"Answer to: {prompt}"
+        finally:
+            self.active -= 1
+
+
+@pytest.mark.asyncio
+async def test_batch_results_in_input_order(fake_llm):
+    """Test batch results match single runs and keep the input order"""
+    items = ["What is the capital of France?", "How do I bake bread?", "Tell me a joke"]
+
+    results = await run_full_pipeline_batch(items, mode="proxy", llm_override=fake_llm)
+    singles = [await run_full_pipeline(user_input=item, mode="proxy", llm_override=fake_llm) for item in items]
+
+    assert [r["data"]["input_analysis"]["raw_text"] for r in results] == items
+    assert [r["eza_score"] for r in results] == [r["eza_score"] for r in singles]
+
+
+@pytest.mark.asyncio
+async def test_batch_concurrency_is_bounded():
+    """Test no more than max_concurrency LLM calls run at once"""
+    llm = CountingLLM()
+    items = [f"Question number {i}" for i in range(12)]
+
+    results = await run_full_pipeline_batch(items, mode="proxy", llm_override=llm, max_concurrency=3)
+
+    assert all(r["ok"] for r in results)
+    assert llm.max_active == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_iterator_yields_as_completed():
+    """Test the streaming iterator yields fast items before slow ones"""
+    llm = CountingLLM(delays={"slow question": 0.2, "fast question": 0.0})
+
+    order = [
+        index async for index, _ in iter_full_pipeline_batch(
+            ["slow question", "fast question"], mode="proxy", llm_override=llm
+        )
+    ]
+
+    assert order == [1, 0]
+
+
+@pytest.mark.asyncio
+async def test_batch_accepts_output_text_items():
+    """Test dict items pass output_text through (proxy-lite)"""
+    results = await run_full_pipeline_batch(
+        [
+            {"message": "Is this safe?", "output_text": "Yes, it is a harmless recipe."},
+            "Plain input without output"
+        ],
+        mode="proxy-lite"
+    )
+
+    assert len(results) == 2
+    assert all(r["mode"] == "proxy-lite" and r["ok"] for r in results)
+    assert results[0]["eza_score"] is not None
+
+
+@pytest.mark.asyncio
+async def test_batch_stopped_early_cancels_and_records_completed(monkeypatch):
+    """Test an early stop awaits the cancelled items and still records telemetry for the done ones"""
+    recorded = []
+
+    async def fake_record_telemetry_events(pipeline_results, mode, source, db_session, user_inputs=None):
+        recorded.append(list(user_inputs))
+        return len(pipeline_results)
+
+    monkeypatch.setattr(pipeline_runner, "record_telemetry_events", fake_record_telemetry_events)
+    llm = CountingLLM(delays={"slow question": 5.0, "fast question": 0.0})
+
+    batch = iter_full_pipeline_batch(
+        ["slow question", "fast question"], mode="proxy", llm_override=llm, db_session=object()
+    )
+    async for index, _ in batch:
+        assert index == 1
+        break
+    await asyncio.wait_for(batch.aclose(), timeout=1)
+
+    assert llm.active == 0
+    assert recorded == [["fast question"]]
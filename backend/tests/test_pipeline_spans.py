@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Test Pipeline Spans
+Tests for per-stage span recording and the pipeline performance metrics
+"""
+
+import pytest
+from backend.api.pipeline_runner import run_full_pipeline
+from backend.config import get_settings
+from backend.services.proxy_performance_metrics import (
+    LatencyHistogram,
+    get_proxy_performance_metrics
+)
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    """Enabled, empty pipeline metrics"""
+    monkeypatch.setenv("PIPELINE_METRICS_ENABLED", "true")
+    get_settings.cache_clear()
+    metrics = get_proxy_performance_metrics()
+    metrics.reset()
+    yield metrics
+    metrics.reset()
+    get_settings.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_debug_key_lists_stage_spans(fake_llm, sample_risky_text):
+    """Test debug=True returns every proxy stage as an ordered span timeline"""
+    result = await run_full_pipeline(
+        user_input=sample_risky_text, mode="proxy", llm_override=fake_llm, debug=True
+    )
+
+    spans = result["debug"]["spans"]
+    assert [s["stage"] for s in spans] == [
+        "input_policy", "input_analysis", "critical_gate", "llm", "output_analysis", "alignment",
+        "safe_rewrite", "deep_analysis", "output_policy", "scoring", "response"
+    ]
+    starts = [s["start_ms"] for s in spans]
+    assert starts == sorted(starts)
+    assert all(s["duration_ms"] >= 0 for s in spans)
+    assert starts[-1] <= result["timings"]["total_ms"]
+
+
+@pytest.mark.asyncio
+async def test_no_debug_key_by_default(fake_llm, sample_text):
+    """Test spans are not returned unless requested"""
+    result = await run_full_pipeline(user_input=sample_text, mode="standalone", llm_override=fake_llm)
+
+    assert "debug" not in result
+
+
+@pytest.mark.asyncio
+async def test_spans_feed_metrics_per_mode(metrics, fake_llm, sample_text):
+    """Test each request adds its stages to the histograms of its mode"""
+    await run_full_pipeline(user_input=sample_text, mode="proxy", llm_override=fake_llm)
+    await run_full_pipeline(user_input=sample_text, mode="proxy-lite", output_text="A harmless answer.")
+
+    summary = metrics.summary()
+    assert summary["proxy"]["total"]["count"] == 1
+    assert summary["proxy"]["stages"]["llm"]["count"] == 1
+    assert "llm" not in summary["proxy-lite"]["stages"]
+    assert summary["proxy-lite"]["stages"]["output_analysis"]["count"] == 1
+
+    exposition = metrics.render_prometheus()
+    assert "# TYPE eza_pipeline_stage_duration_seconds histogram" in exposition
+    assert 'eza_pipeline_stage_duration_seconds_count{mode="proxy",stage="llm"} 1' in exposition
+    assert 'eza_pipeline_duration_seconds_bucket{mode="proxy-lite",le="+Inf"} 1' in exposition
+
+
+@pytest.mark.asyncio
+async def test_no_metrics_by_default(fake_llm, sample_text):
+    """Test requests record no spans unless metrics or debug are enabled"""
+    metrics = get_proxy_performance_metrics()
+    metrics.reset()
+
+    result = await run_full_pipeline(user_input=sample_text, mode="proxy", llm_override=fake_llm)
+
+    assert result["ok"] is True
+    assert metrics.summary() == {}
+    assert result["timings"]["input_policy_ms"] >= 0
+
+
+def test_histogram_buckets_and_quantiles():
+    """Test cumulative buckets and bucket-interpolated quantiles"""
+    histogram = LatencyHistogram((1.0, 10.0, 100.0))
+    for value in (0.5, 2.0, 4.0, 8.0, 50.0, 500.0):
+        histogram.observe(value)
+
+    assert histogram.counts == [1, 3, 1, 1]
+    assert histogram.count == 6
+    assert 1.0 <= histogram.quantile(0.5) <= 10.0
+    assert histogram.quantile(1.0) == 500.0
+    assert histogram.summary()["max_ms"] == 500.0
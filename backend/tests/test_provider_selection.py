@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Test Provider Selection
+Tests for latency-aware model selection of the single-model modes
+"""
+
+import asyncio
+import inspect
+import httpx
+import pytest
+from backend.api import pipeline_runner
+from backend.config import get_settings
+from backend.core.utils.model_router import ModelRouter
+from backend.core.utils.provider_selection import ModelEWMA
+
+
+@pytest.fixture
+def router(monkeypatch):
+    """Router with every key set, latency-aware routing on and per-provider delays/failures"""
+    for key in ("OPENAI_API_KEY", "GROQ_API_KEY", "MISTRAL_API_KEY"):
+        monkeypatch.setenv(key, "test-key")
+    monkeypatch.setenv("PROVIDER_SELECTION_ENABLED", "true")
+    monkeypatch.setenv("PROVIDER_SELECTION_EXPLORE_RATE", "0")
+    get_settings.cache_clear()
+    router = ModelRouter()
+    router.max_retries = 0
+    router.delays = {"openai": 0.03, "groq": 0.005, "mistral": 0.015}
+    router.failing = set()
+    router.calls = []
+
+    def fake_client(provider):
+        async def generate(prompt, model, temperature, max_tokens, timeout):
+            router.calls.append(provider)
+            await asyncio.sleep(router.delays[provider])
+            if provider in router.failing:
+                return {"ok": False, "output": None, "error": f"{provider} API error: 500",
+                        "provider": provider, "model_name": model, "status_code": 500}
+            return {"ok": True, "output": f"{provider} answer", "error": None,
+                    "provider": provider, "model_name": model, "status_code": 200}
+        return type("FakeClient", (), {"generate": staticmethod(generate)})()
+
+    router.openai_client = fake_client("openai")
+    router.groq_client = fake_client("groq")
+    router.mistral_client = fake_client("mistral")
+    yield router
+    get_settings.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_converges_on_fastest_model(router):
+    """Test every model is measured once, then the fastest one is preferred"""
+    for i in range(6):
+        result = await router.route_by_mode(f"prompt {i}", "proxy")
+        assert result["ok"]
+
+    assert router.calls[:3] == ["openai", "groq", "mistral"]
+    assert router.calls[3:] == ["groq", "groq", "groq"]
+    assert result["routing"]["selected"] == "groq/llama3-8b-tool-use"
+    assert result["routing"]["fallback"] is False
+    assert router.stats()["selection"]["selections"]["proxy"]["groq/llama3-8b-tool-use"] == 4
+
+
+@pytest.mark.asyncio
+async def test_falls_back_when_best_model_fails(router):
+    """Test a failing model is skipped for the next candidate and reported"""
+    router.failing.add("openai")
+    result = await router.route_by_mode("prompt", "proxy-lite")
+
+    assert result["ok"] and result["output"] == "groq answer"
+    routing = result["routing"]
+    assert routing["fallback"] is True
+    assert [a["model_id"] for a in routing["attempts"]] == ["openai/gpt-4o-mini", "groq/llama3-8b-tool-use"]
+    assert result["used_models"] == ["groq/llama3-8b-tool-use"]
+
+
+@pytest.mark.asyncio
+async def test_only_tier_models_with_keys_are_candidates(router, monkeypatch):
+    """Test models outside the mode's tier or without an API key are never chosen"""
+    router.available_models.remove("groq/llama3-8b-tool-use")
+    monkeypatch.setenv("PROVIDER_SELECTION_TIERS", '{"standard": ["openai/gpt-4o-mini", "groq/llama3-8b-tool-use"]}')
+    get_settings.cache_clear()
+
+    result = await router.route_by_mode("prompt", "proxy")
+    assert result["routing"]["candidates"] == ["openai/gpt-4o-mini"]
+
+
+@pytest.mark.asyncio
+async def test_disabled_keeps_openai_only(router, monkeypatch):
+    """Test without PROVIDER_SELECTION_ENABLED proxy uses OpenAI and reports no routing"""
+    monkeypatch.setenv("PROVIDER_SELECTION_ENABLED", "false")
+    get_settings.cache_clear()
+
+    result = await router.route_by_mode("prompt", "proxy")
+    assert result["model_id"] == "openai/gpt-4o-mini"
+    assert "routing" not in result
+
+
+def test_ewma_penalizes_failures():
+    """Test the score is latency per expected success"""
+    ewma = ModelEWMA()
+    assert ewma.score() is None
+    ewma.record(100.0, True, 0.5)
+    ewma.record(300.0, True, 0.5)
+    assert ewma.latency_ms == 200.0
+    ewma.record(5.0, False, 0.5)
+    assert ewma.latency_ms == 200.0  # failures do not count as latency
+    assert ewma.score() == pytest.approx(400.0)
+
+
+@pytest.mark.asyncio
+async def test_proxy_endpoint_returns_routing(monkeypatch):
+    """Test /api/proxy keeps the routing metadata in its response and queues the call under the caller's org"""
+    from backend.main import app, proxy_endpoint
+    routing = {"selected": "groq/llama3-8b-tool-use", "candidates": ["groq/llama3-8b-tool-use"], "fallback": False}
+    tenants = []
+
+    async def route(user_input, mode, settings, tenant=None):
+        tenants.append(tenant)
+        return {"ok": True, "output": "A short safe answer.", "provider": "groq",
+                "model_name": "llama3-8b-tool-use", "routing": routing}
+
+    async def no_dependency():
+        return None
+
+    async def admin_user():
+        return {"user_id": 1, "org_id": 42, "role": "admin"}
+
+    monkeypatch.setattr(pipeline_runner, "_route_llm", route)
+    # Auth, rate limit and database dependencies
+    for parameter in inspect.signature(proxy_endpoint).parameters.values():
+        if hasattr(parameter.default, "dependency"):
+            app.dependency_overrides[parameter.default.dependency] = admin_user if parameter.name == "current_user" else no_dependency
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post("/api/proxy", json={"message": "hello there"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.json()["routing"] == routing
+    assert tenants == ["org:42"]
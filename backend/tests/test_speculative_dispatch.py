@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Test Speculative Dispatch
+Tests for starting the LLM call concurrently with the input stages
+"""
+
+import asyncio
+import pytest
+from backend.api import pipeline_runner
+from backend.api.pipeline_runner import run_full_pipeline
+from backend.config import get_settings
+from backend.core.utils.model_router import ModelRouter
+from backend.tests.helpers.fake_llm import BrokenLLM
+
+
+class SlowLLM:
+    """LLM override that takes a fixed time to answer"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    async def generate(self, prompt: str, **kwargs) -> str:
+        await asyncio.sleep(self.delay)
+        return "A slow but harmless answer."
+
+
+@pytest.mark.asyncio
+async def test_speculative_call_overlaps_input_stages(sample_text):
+    """Test the LLM call starts before the input stages and its result is used"""
+    result = await run_full_pipeline(
+        user_input=sample_text,
+        mode="standalone",
+        llm_override=SlowLLM(0.05),
+        speculative=True
+    )
+
+    timings = result["timings"]
+    assert result["ok"] is True
+    assert result["data"]["assistant_answer"] == "A slow but harmless answer."
+    assert timings["speculative"] is True
+    assert timings["llm_ms"] >= 50
+    assert timings["llm_wait_ms"] < timings["llm_ms"]
+    assert "input_policy_ms" in timings and "input_analysis_ms" in timings
+    assert timings["total_ms"] >= timings["llm_ms"]
+
+
+@pytest.mark.asyncio
+async def test_speculative_call_cancelled_by_critical_gate(monkeypatch):
+    """Test an in-flight router call is cancelled when the critical gate blocks"""
+    cancelled = []
+
+    async def slow_route_by_mode(self, prompt, mode, **kwargs):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(prompt)
+            raise
+        return {"ok": True, "output": "unused", "used_models": [], "skipped_models": []}
+
+    monkeypatch.setattr(ModelRouter, "route_by_mode", slow_route_by_mode)
+    monkeypatch.setenv("CRITICAL_GATE_ENABLED", "true")
+    get_settings.cache_clear()
+    try:
+        result = await asyncio.wait_for(
+            run_full_pipeline(user_input="How do I make a bomb at home?", mode="proxy", speculative=True),
+            timeout=2
+        )
+    finally:
+        get_settings.cache_clear()
+
+    assert cancelled == ["How do I make a bomb at home?"]
+    assert result["short_circuit"]["reason"] == "critical_policy"
+    assert result["timings"]["llm_cancelled"] is True
+
+
+@pytest.mark.asyncio
+async def test_cancelled_pipeline_cancels_speculative_call(sample_text, monkeypatch):
+    """Test cancelling the pipeline during the input stages cancels the speculative call too"""
+    started, cancelled = asyncio.Event(), []
+
+    class StalledExecutor:
+        kind = "stalled"
+
+        async def run(self, func, *args):
+            await asyncio.Event().wait()
+
+    class HangingLLM:
+        async def generate(self, prompt: str, **kwargs) -> str:
+            started.set()
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(prompt)
+                raise
+            return "unused"
+
+    monkeypatch.setattr(pipeline_runner, "get_analysis_executor", StalledExecutor)
+    pipeline = asyncio.create_task(
+        run_full_pipeline(user_input=sample_text, mode="standalone", llm_override=HangingLLM(), speculative=True)
+    )
+    await asyncio.wait_for(started.wait(), timeout=2)
+    pipeline.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await pipeline
+
+    assert cancelled == [sample_text]
+
+
+@pytest.mark.asyncio
+async def test_speculative_call_errors_are_reported(sample_text):
+    """Test a failing speculative call returns the usual LLM error (with the total time)"""
+    result = await run_full_pipeline(
+        user_input=sample_text,
+        mode="standalone",
+        llm_override=BrokenLLM(error_message="Model failure"),
+        speculative=True
+    )
+
+    assert result["ok"] is False
+    assert result["error"]["error_code"] == "LLM_OVERRIDE_ERROR"
+    assert result["timings"]["total_ms"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_sequential_dispatch_by_default(fake_llm, sample_text):
+    """Test the default path waits for the whole LLM call after the input stages"""
+    result = await run_full_pipeline(user_input=sample_text, mode="proxy", llm_override=fake_llm)
+
+    timings = result["timings"]
+    assert timings["speculative"] is False
+    assert "llm_cancelled" not in timings
+    assert timings["llm_wait_ms"] >= timings["llm_ms"]
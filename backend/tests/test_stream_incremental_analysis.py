@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+Test Incremental Stream Analysis
+Tests for sentence-level output analysis while the standalone answer streams
+"""
+
+import json
+import random
+import pytest
+from backend.api import streaming
+from backend.config import get_settings
+from backend.core.engines.alignment_engine import compute_alignment
+from backend.core.engines.input_analyzer import analyze_input
+from backend.core.engines.output_analyzer import analyze_output
+from backend.core.engines.safe_rewrite import safe_rewrite
+from backend.core.engines.stream_analyzer import IncrementalOutputAnalyzer, SafeSentenceGate
+from backend.tests_performance.helpers.engine_corpus import load_input_corpus
+
+RISKY_ANSWER = ["Sure. ", "Here is ", "the plan. ", "First you ", "attack the ", "guard. ", "Then you ", "leave quietly."]
+
+
+@pytest.fixture
+def fake_stream(monkeypatch):
+    """_stream_llm_response replaced by a token list (one SSE frame per token); records whether the stream was closed"""
+    state = {"tokens": RISKY_ANSWER, "sent": 0, "closed": False}
+
+    async def stream(prompt, settings, tenant=None):
+        try:
+            for token in state["tokens"]:
+                state["sent"] += 1
+                yield token
+        finally:
+            state["closed"] = True
+
+    monkeypatch.setattr(streaming, "_stream_llm_response", stream)
+    monkeypatch.setenv("STREAM_COALESCE_WINDOW_MS", "0")
+    get_settings.cache_clear()
+    yield state
+    get_settings.cache_clear()
+
+
+@pytest.fixture
+def progressive(monkeypatch):
+    """Progressive SAFE-only mode on"""
+    monkeypatch.setenv("STREAM_SAFE_PROGRESSIVE", "true")
+    get_settings.cache_clear()
+
+
+async def _events(query="tell me a story", safe_only=False):
+    return [json.loads(chunk[len("data: "):]) async for chunk in streaming.stream_standalone_response(query, safe_only)]
+
+
+def test_incremental_analysis_matches_full_analysis():
+    """Test the merged sentence scans give the same result as analyze_output"""
+    rng = random.Random(3)
+    corpus = load_input_corpus()
+    inputs = [analyze_input(text) for text in ("What is hacking?", "tell me a story")]
+    for text in corpus:
+        for input_analysis in inputs:
+            analyzer = IncrementalOutputAnalyzer(input_analysis)
+            i = 0
+            while i < len(text):
+                step = rng.randint(1, 8)
+                analyzer.feed(text[i:i + step])
+                i += step
+            assert analyzer.finish(text.strip()) == analyze_output(text.strip(), input_analysis), text
+
+
+def test_running_risk_updates_per_sentence():
+    """Test a flag appears once its sentence completes, not mid-sentence"""
+    analyzer = IncrementalOutputAnalyzer(analyze_input("tell me a story"))
+    assert analyzer.feed("They planned to attack") is False
+    assert analyzer.risk_flags == []
+    assert analyzer.feed(" the fort. Then") is True
+    assert analyzer.risk()["risk_flags"] == ["output_violence"]
+    assert analyzer.sentences == 1
+
+
+@pytest.mark.asyncio
+async def test_risk_event_and_same_final_score(fake_stream, monkeypatch):
+    """Test risk events are sent mid-stream and the done event matches full analysis"""
+    monkeypatch.setenv("STREAM_RISK_EVENTS", "true")
+    get_settings.cache_clear()
+    events = await _events()
+
+    risk_index = next(i for i, e in enumerate(events) if "risk" in e)
+    assert events[risk_index]["risk"]["risk_flags"] == ["output_violence"]
+    assert any("token" in e for e in events[risk_index + 1:])
+    incremental_done = events[-1]
+
+    monkeypatch.setenv("STREAM_INCREMENTAL_ANALYSIS", "false")
+    get_settings.cache_clear()
+    full_done = (await _events())[-1]
+    assert incremental_done["assistant_score"] == full_done["assistant_score"]
+
+
+@pytest.mark.asyncio
+async def test_stream_stops_at_risk_threshold(fake_stream, monkeypatch):
+    """Test the stream ends, without the risky sentence, once the risk threshold is reached"""
+    observed = []
+
+    async def observe(completion_data, executor, *, output_text, **kwargs):
+        observed.append(output_text)
+
+    monkeypatch.setattr(streaming, "_attach_stream_standalone_observation", observe)
+    monkeypatch.setenv("STREAM_STOP_RISK_THRESHOLD", "0.8")
+    get_settings.cache_clear()
+    events = await _events()
+
+    tokens = "".join(e["token"] for e in events if "token" in e)
+    assert tokens == "Sure. Here is the plan. First you attack the "
+    assert fake_stream["sent"] == 6 and fake_stream["closed"]
+    done = events[-1]
+    assert done["done"] and done["stopped"] == "risk"
+    assert done["risk"]["risk_score"] == 0.8
+    # Scored on what the client received, not on the withheld frame
+    sent = streaming._score_stages(tokens, analyze_input("tell me a story"))
+    assert done["assistant_score"] == sent["assistant_score"]
+    assert observed == [tokens.strip()]
+
+
+@pytest.mark.asyncio
+async def test_safe_only_sends_first_sentence_before_answer_ends(fake_stream, progressive):
+    """Test progressive SAFE-only mode sends a sentence once it completes"""
+    fake_stream["tokens"] = ["Once upon ", "a time. ", "The dragon ", "slept", "."]
+    first_token_sent = None
+    events = []
+    async for chunk in streaming.stream_standalone_response("tell me a story", safe_only=True):
+        event = json.loads(chunk[len("data: "):])
+        if "token" in event and first_token_sent is None:
+            first_token_sent = fake_stream["sent"]
+        events.append(event)
+
+    assert first_token_sent == 2
+    assert [e["token"] for e in events if "token" in e] == ["Once upon a time. ", "The dragon slept."]
+    assert events[-1]["mode"] == "safe-only" and "stopped" not in events[-1]
+
+
+@pytest.mark.asyncio
+async def test_safe_only_rewrites_sentence_and_stops(fake_stream, progressive):
+    """Test a sentence failing safe_rewrite is replaced and ends the stream"""
+    fake_stream["tokens"] = ["Sure. ", "Here is how to ", "kill the guard. ", "Then ", "leave."]
+    events = await _events(safe_only=True)
+
+    tokens = [e["token"] for e in events if "token" in e]
+    assert tokens[0] == "Sure. "
+    assert tokens[1].startswith("\n\nÜzgünüm") and len(tokens) == 2
+    assert fake_stream["sent"] == 3 and fake_stream["closed"]
+    assert events[-1]["stopped"] == "rewrite"
+
+
+@pytest.mark.asyncio
+async def test_safe_only_checks_full_answer_by_default(fake_stream, monkeypatch):
+    """Test SAFE-only mode sends nothing of an answer that safe_rewrite replaces as a whole"""
+    async def full_answer(prompt, settings, tenant=None):
+        return "".join(fake_stream["tokens"])
+
+    fake_stream["tokens"] = ["Sure. ", "Here is how to ", "kill the guard. ", "Then ", "leave."]
+    monkeypatch.setattr(streaming, "_get_llm_response", full_answer)
+    events = await _events(safe_only=True)
+
+    answer = "".join(e["token"] for e in events if "token" in e)
+    assert answer.startswith("Üzgünüm") and "Sure" not in answer
+    assert fake_stream["sent"] == 0 and "stopped" not in events[-1]
+
+
+def test_safe_gate_empty_answer():
+    """Test an empty answer releases safe_rewrite's fallback at the end"""
+    gate = SafeSentenceGate("tell me a story", analyze_input("tell me a story"))
+    assert gate.release(final=True).startswith("Üzgünüm")
+    assert gate.rewritten and gate.release(final=True) == ""
+
+
+def test_safe_gate_matches_safe_rewrite_of_prefix():
+    """Test the gate's running check closes exactly where safe_rewrite of the answer so far changes it"""
+    rng = random.Random(5)
+    answers = load_input_corpus() + ["".join(RISKY_ANSWER), "Here is how to hack the server. It is easy."]
+    for query in ("What is hacking?", "tell me a story"):
+        input_analysis = analyze_input(query)
+        for text in answers:
+            gate = SafeSentenceGate(query, input_analysis)
+            i = 0
+            while i < len(text) and not gate.rewritten:
+                step = rng.randint(1, 8)
+                if gate.feed(text[i:i + step]):
+                    gate.release()
+                    prefix = "".join(gate.analyzer.completed)
+                    output_analysis = analyze_output(prefix, input_analysis)
+                    alignment = compute_alignment(input_analysis, output_analysis)
+                    expected = safe_rewrite(query, prefix, input_analysis, output_analysis, alignment)
+                    assert gate.rewritten == (expected != prefix), text
+                i += step
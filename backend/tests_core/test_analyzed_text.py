@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Test Analyzed Text (6 tests)
+"""
+
+import pytest
+from backend.core.engines.analyzed_text import AnalyzedText
+from backend.core.engines.input_analyzer import analyze_input
+from backend.policy_engine.evaluator import evaluate_policies
+
+
+def test_analyzed_text_derived_forms():
+    """Test lowercase, folded text, tokens and word set"""
+    analyzed = AnalyzedText("How to HACK a KIŞI's account, hack!")
+    assert analyzed.raw == "How to HACK a KIŞI's account, hack!"
+    assert analyzed.lower == "how to hack a kişi's account, hack!"
+    assert analyzed.tokens == ("how", "to", "hack", "a", "kişi", "s", "account", "hack")
+    assert analyzed.words == frozenset(analyzed.tokens)
+
+
+def test_analyzed_text_turkish_folding():
+    """Test dotless ı folds to i so both spellings share tokens"""
+    assert AnalyzedText("KIRMA").folded == "kirma"
+    assert AnalyzedText("kırma").words == AnalyzedText("kirma").words
+
+
+def test_analyzed_text_is_immutable():
+    """Test attributes cannot be set or deleted"""
+    analyzed = AnalyzedText("hello")
+    with pytest.raises(AttributeError):
+        analyzed.lower = "changed"
+    with pytest.raises(AttributeError):
+        del analyzed.raw
+    assert analyzed.lower == "hello"
+
+
+def test_analyzed_text_stripped_and_ngrams():
+    """Test lazily computed punctuation-free text and n-gram sets"""
+    analyzed = AnalyzedText("Just asking: how to break it?")
+    assert analyzed.stripped == "just asking how to break it"
+    assert ("how", "to", "break") in analyzed.ngrams(3)
+    assert analyzed.ngrams(2) == frozenset(zip(analyzed.tokens, analyzed.tokens[1:]))
+    assert analyzed.ngrams(10) == frozenset()
+
+
+def test_analyzed_text_of_passthrough():
+    """Test AnalyzedText.of reuses an existing instance and accepts None"""
+    analyzed = AnalyzedText("text")
+    assert AnalyzedText.of(analyzed) is analyzed
+    assert AnalyzedText.of("text") == analyzed
+    assert AnalyzedText.of(None).raw == ""
+    assert not AnalyzedText("")
+
+
+def test_engines_accept_analyzed_text():
+    """Test engines return the same result for a string and its AnalyzedText"""
+    text = "How can I hack my neighbor's wifi and steal data?"
+    analyzed = AnalyzedText(text)
+    assert analyze_input(analyzed) == analyze_input(text)
+    assert evaluate_policies(analyzed, AnalyzedText(text)) == evaluate_policies(text, text)
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Test Adaptive LLM Concurrency Limiter (6 tests)
+"""
+
+import asyncio
+import pytest
+from backend.config import get_settings
+from backend.gateway import router_adapter
+from backend.gateway.concurrency_limiter import (
+    get_concurrency_limiter,
+    get_concurrency_stats,
+    llm_call_slot,
+    reset_concurrency_limiters,
+    retry_after_seconds
+)
+from backend.gateway.error_mapping import LLMProviderError
+from backend.gateway.router_adapter import call_llm_provider
+
+
+@pytest.fixture(autouse=True)
+def small_limits(monkeypatch):
+    monkeypatch.setenv("LLM_CONCURRENCY_INITIAL", "2")
+    monkeypatch.setenv("LLM_CONCURRENCY_DECREASE_COOLDOWN_SECONDS", "0")
+    get_settings.cache_clear()
+    reset_concurrency_limiters()
+    yield
+    reset_concurrency_limiters()
+    get_settings.cache_clear()
+
+
+async def _call(order, name, tenant=None, duration=0.02, status=200, retry_after=None):
+    async with llm_call_slot("openai", "gpt-test", tenant=tenant) as slot:
+        order.append(name)
+        await asyncio.sleep(duration)
+        slot.record(status, retry_after)
+
+
+@pytest.mark.asyncio
+async def test_limit_caps_concurrent_calls():
+    """Test no more than `limit` calls run at once; the rest queue"""
+    limiter = get_concurrency_limiter("openai", "gpt-test")
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        async with llm_call_slot("openai", "gpt-test"):
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*[call() for _ in range(6)])
+    assert peak == 2
+    assert (limiter.in_flight, limiter.queued, limiter.counters["queued"]) == (0, 0, 4)
+
+
+def test_aimd_adjusts_limit():
+    """Test 429/5xx halve the limit and successes grow it back additively"""
+    limiter = get_concurrency_limiter("openai", "gpt-test")
+    limiter.limit = 8.0
+    limiter.on_overload()
+    assert limiter.limit == 4.0
+    limiter.on_overload()
+    limiter.on_overload()
+    limiter.on_overload()
+    assert limiter.limit == 1.0  # floor at LLM_CONCURRENCY_MIN
+    for _ in range(3):
+        limiter.on_success()
+    assert 2.0 <= limiter.limit < 3.0
+
+
+@pytest.mark.asyncio
+async def test_retry_after_holds_new_calls():
+    """Test a Retry-After answer delays the next call to that model"""
+    order = []
+    await _call(order, "first", status=429, retry_after=0.1)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await _call(order, "second", duration=0)
+    assert loop.time() - start >= 0.09
+    assert get_concurrency_stats()["openai/gpt-test"]["retry_after_waits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_tenants_are_served_round_robin(monkeypatch):
+    """Test a burst from one organization does not starve another"""
+    monkeypatch.setenv("LLM_CONCURRENCY_INITIAL", "1")
+    get_settings.cache_clear()
+    reset_concurrency_limiters()
+    order = []
+
+    tasks = [asyncio.ensure_future(_call(order, f"a{i}", tenant="org-a")) for i in range(4)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.ensure_future(_call(order, "b0", tenant="org-b")))
+    await asyncio.gather(*tasks)
+
+    assert order[:3] == ["a0", "a1", "b0"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    """Test cancelling a queued call frees its place and leaks no slot"""
+    limiter = get_concurrency_limiter("openai", "gpt-test")
+    order = []
+    running = [asyncio.ensure_future(_call(order, f"r{i}", duration=0.05)) for i in range(2)]
+    await asyncio.sleep(0)
+    waiter = asyncio.ensure_future(_call(order, "cancelled"))
+    await asyncio.sleep(0)
+    assert limiter.queued == 1
+
+    waiter.cancel()
+    await asyncio.gather(*running, waiter, return_exceptions=True)
+    assert "cancelled" not in order
+    assert (limiter.in_flight, limiter.queued) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_gateway_feeds_provider_errors_to_limiter(monkeypatch):
+    """Test call_llm_provider reports 429 + Retry-After from the provider error"""
+    async def rate_limited(provider_name, prompt, settings, model, temperature, max_tokens):
+        raise LLMProviderError("openai API error: rate limited", "openai", status_code=429, retry_after=0.01)
+
+    monkeypatch.setattr(router_adapter, "_call_provider", rate_limited)
+    with pytest.raises(LLMProviderError):
+        await call_llm_provider("openai", "prompt", model="gpt-test", temperature=0.7)
+
+    stats = get_concurrency_stats()["openai/gpt-test"]
+    assert (stats["overloads"], stats["decreases"], stats["limit"]) == (1, 1, 1)
+    assert retry_after_seconds({"Retry-After": "3"}) == 3.0
+    assert retry_after_seconds({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) is None
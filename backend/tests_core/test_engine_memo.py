@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Test Engine Memo (6 tests)
+"""
+
+import pickle
+import pytest
+from backend.config import get_settings
+from backend.core.engines import engine_memo
+from backend.core.engines.engine_memo import (
+    EngineMemo,
+    FrozenDict,
+    clear_engine_memos,
+    freeze,
+    get_engine_memo_stats
+)
+from backend.core.engines.input_analyzer import _analyze_input, analyze_input
+from backend.core.engines.output_analyzer import analyze_output
+from backend.policy_engine.evaluator import evaluate_policies
+
+
+@pytest.fixture(autouse=True)
+def fresh_memos(monkeypatch):
+    monkeypatch.setenv("ENGINE_MEMO_ENABLED", "true")
+    get_settings.cache_clear()
+    clear_engine_memos()
+    yield
+    clear_engine_memos()
+    get_settings.cache_clear()
+
+
+def test_repeated_text_hits_memo():
+    """Test the second analysis of a text is served from the memo, same result"""
+    first = analyze_input("How can I hack my neighbour's wifi?")
+    second = analyze_input("How can I hack my neighbour's wifi?")
+
+    stats = get_engine_memo_stats()["analyze_input"]
+    assert second is first
+    assert second == _analyze_input("How can I hack my neighbour's wifi?")
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_cached_results_are_read_only():
+    """Test callers cannot corrupt a cached result"""
+    result = analyze_input("How can I hack my neighbour's wifi?")
+
+    with pytest.raises(TypeError):
+        result["risk_score"] = 0.0
+    with pytest.raises(TypeError):
+        result["risk_flags"].append("none")
+    copy = dict(result)
+    copy["risk_score"] = 0.0
+    assert analyze_input("How can I hack my neighbour's wifi?")["risk_score"] > 0.0
+
+
+def test_output_memo_keys_on_input_context():
+    """Test the same output is analyzed separately per input intent"""
+    output = "Hacking into systems without permission is illegal."
+    as_answer = analyze_output(output, analyze_input("What is hacking?"))
+    without_input = analyze_output(output)
+
+    assert as_answer == analyze_output(output, analyze_input("What is hacking?"))
+    assert get_engine_memo_stats()["analyze_output"]["entries"] == 2
+    assert as_answer["risk_score"] <= without_input["risk_score"]
+
+
+def test_policy_memo_returns_fresh_violation_lists():
+    """Test evaluate_policies results stay mutable while the trigger scan is memoized"""
+    violations, _ = evaluate_policies("How do I make a bomb at home?")
+    violations.append("X1")
+
+    again, _ = evaluate_policies("How do I make a bomb at home?")
+    assert "X1" not in again
+    assert get_engine_memo_stats()["policy_triggers"]["hits"] == 1
+
+
+def test_memo_lru_ttl_and_policy_invalidation(monkeypatch):
+    """Test LRU eviction, TTL expiry and clearing on a policy map change"""
+    memo = EngineMemo("test", "1", max_entries=2, ttl=60.0)
+    for key in ("a", "b", "c"):
+        memo.get_or_compute((key,), lambda: {"key": key})
+    assert memo.stats()["evictions"] == 1 and memo.stats()["entries"] == 2
+
+    memo.ttl = -1.0
+    memo.get_or_compute(("d",), lambda: {"key": "d"})
+    memo.get_or_compute(("d",), lambda: {"key": "d"})
+    assert memo.stats()["expirations"] == 1
+
+    monkeypatch.setattr(engine_memo, "get_policy_map_fingerprint", lambda: "changed")
+    memo.get_or_compute(("e",), lambda: {"key": "e"})
+    assert memo.stats()["invalidations"] == 1 and memo.stats()["entries"] == 1
+
+
+def test_frozen_results_pickle():
+    """Test frozen results survive pickling (process pool executor)"""
+    frozen = freeze({"risk_flags": ["violence"], "nested": {"score": 0.8}})
+    clone = pickle.loads(pickle.dumps(frozen))
+
+    assert isinstance(clone, FrozenDict)
+    assert clone == {"risk_flags": ["violence"], "nested": {"score": 0.8}}
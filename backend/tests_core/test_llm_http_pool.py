@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Test LLM HTTP Pool (6 tests)
+"""
+
+import asyncio
+import gc
+import pytest
+from backend.config import get_settings
+from backend.core.llm import http_pool
+from backend.core.llm.http_pool import (
+    LLMHTTPPool,
+    close_llm_http_pool,
+    get_llm_http_pool,
+    llm_http_client
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_pool(monkeypatch):
+    monkeypatch.setattr(http_pool, "_pool", None)
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_pooled_client_is_reused_per_provider():
+    """Test calls for one provider share a client, other providers get their own"""
+    async with llm_http_client("openai") as first:
+        pass
+    async with llm_http_client("openai") as second:
+        pass
+    async with llm_http_client("groq") as groq:
+        pass
+
+    assert second is first
+    assert not first.is_closed
+    assert groq is not first
+    assert get_llm_http_pool().clients_created == 2
+    await close_llm_http_pool()
+
+
+@pytest.mark.asyncio
+async def test_close_closes_pooled_clients():
+    """Test shutdown closes every client and the next call gets a new one"""
+    pool = get_llm_http_pool()
+    pool.open(("openai", "local"))
+    clients = [pool.get("openai"), pool.get("local")]
+
+    await close_llm_http_pool()
+
+    assert all(client.is_closed for client in clients)
+    assert pool.stats()["providers"] == {}
+    async with llm_http_client("openai") as client:
+        assert client is not clients[0]
+    await close_llm_http_pool()
+
+
+@pytest.mark.asyncio
+async def test_pool_disabled_uses_one_shot_clients(monkeypatch):
+    """Test LLM_HTTP_POOL_ENABLED=false closes the client after each call"""
+    monkeypatch.setenv("LLM_HTTP_POOL_ENABLED", "false")
+    get_settings.cache_clear()
+
+    async with llm_http_client("openai") as client:
+        assert not client.is_closed
+    assert client.is_closed
+    assert get_llm_http_pool().clients_created == 0
+
+
+def test_clients_are_kept_per_event_loop():
+    """Test each event loop keeps its own client and a loop's client survives another loop's calls"""
+    pool = LLMHTTPPool()
+    loops = [asyncio.new_event_loop(), asyncio.new_event_loop()]
+
+    async def get_client():
+        return pool.get("mistral")
+
+    try:
+        first = loops[0].run_until_complete(get_client())
+        second = loops[1].run_until_complete(get_client())
+        again = loops[0].run_until_complete(get_client())
+
+        assert second is not first
+        assert again is first
+        assert pool.clients_created == 2
+        assert pool.stats()["event_loops"] == 2
+        for loop in loops:
+            loop.run_until_complete(pool.close())
+        assert first.is_closed and second.is_closed
+        assert pool.clients_orphaned == 0
+    finally:
+        for loop in loops:
+            loop.close()
+
+
+def test_clients_of_closed_loops_are_counted():
+    """Test clients left open by a closed event loop are dropped and counted as orphaned"""
+    pool = LLMHTTPPool()
+
+    async def get_client():
+        return pool.get("mistral")
+
+    first = asyncio.run(get_client())
+    second = asyncio.run(get_client())
+    gc.collect()
+
+    assert second is not first
+    assert pool.clients_created == 2
+    assert pool.clients_orphaned == 2
+    assert pool.stats()["event_loops"] == 0
+
+
+def test_provider_limits_and_http2_flag():
+    """Test pool limits come from the provider table and local servers stay on HTTP/1.1"""
+    kwargs = http_pool._client_kwargs("openai")
+    assert kwargs["limits"].max_connections == http_pool.PROVIDER_POOLS["openai"].max_connections
+    assert kwargs["http2"] == http_pool.HTTP2_AVAILABLE
+    assert http_pool._client_kwargs("local")["http2"] is False
+    assert http_pool._client_kwargs("unknown")["limits"].max_connections == http_pool.DEFAULT_POOL.max_connections
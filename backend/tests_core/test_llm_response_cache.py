@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Test LLM Response Cache (6 tests)
+"""
+
+import pytest
+from backend.config import get_settings
+from backend.gateway import response_cache, router_adapter
+from backend.gateway.response_cache import (
+    LLMResponseCache,
+    cache_bypass_requested,
+    get_llm_response_cache,
+    reset_llm_response_cache
+)
+from backend.gateway.router_adapter import call_llm_provider
+
+
+@pytest.fixture
+def provider_calls(monkeypatch):
+    """Fresh cache and a fake provider that counts its calls"""
+    calls = []
+
+    async def fake_call_provider(provider_name, prompt, settings, model, temperature, max_tokens):
+        calls.append(prompt)
+        return f"judged #{len(calls)}"
+
+    monkeypatch.setattr(router_adapter, "_call_provider", fake_call_provider)
+    get_settings.cache_clear()
+    reset_llm_response_cache()
+    yield calls
+    reset_llm_response_cache()
+    get_settings.cache_clear()
+
+
+async def _judge(prompt, scope="org:1", temperature=0.3, bypass=False):
+    return await call_llm_provider(
+        "openai", prompt, model="gpt-4o-mini", temperature=temperature, max_tokens=1000,
+        cache_scope=scope, cache_bypass=bypass
+    )
+
+
+@pytest.mark.asyncio
+async def test_identical_judge_prompt_is_served_from_cache(provider_calls):
+    """Test a repeated low-temperature prompt calls the provider once"""
+    assert await _judge("Disclaimer paragraph") == "judged #1"
+    assert await _judge("Disclaimer paragraph") == "judged #1"
+
+    stats = get_llm_response_cache().stats()
+    assert len(provider_calls) == 1
+    assert (stats["hits_l1"], stats["misses"], stats["stores"]) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_scopes_and_uncached_calls(provider_calls):
+    """Test organizations do not share entries and unscoped / warm calls are not cached"""
+    await _judge("Same text", scope="org:1")
+    await _judge("Same text", scope="org:2")
+    await _judge("Same text", scope=None)
+    await _judge("Same text", temperature=0.7)
+
+    assert len(provider_calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_bypass_skips_lookup_and_refreshes(provider_calls):
+    """Test a bypassed call reaches the provider and replaces the cached response"""
+    await _judge("Ad copy")
+    assert await _judge("Ad copy", bypass=True) == "judged #2"
+    assert await _judge("Ad copy") == "judged #2"
+    assert get_llm_response_cache().stats()["bypassed"] == 1
+
+
+def test_bypass_header_parsing():
+    """Test the bypass header and Cache-Control: no-cache are recognized"""
+    assert cache_bypass_requested({"X-EZA-Cache-Bypass": "1"})
+    assert cache_bypass_requested({"Cache-Control": "no-cache"})
+    assert not cache_bypass_requested({"X-EZA-Cache-Bypass": "0"})
+    assert not cache_bypass_requested(None)
+
+
+@pytest.mark.asyncio
+async def test_ttl_and_byte_caps(monkeypatch):
+    """Test expired entries miss, oversized entries are skipped and L1 evicts by bytes"""
+    monkeypatch.setenv("LLM_RESPONSE_CACHE_MAX_BYTES", "10")
+    monkeypatch.setenv("LLM_RESPONSE_CACHE_MAX_ENTRY_BYTES", "8")
+    get_settings.cache_clear()
+    cache = LLMResponseCache()
+
+    await cache.set("a", "123456")
+    await cache.set("b", "123456")
+    await cache.set("c", "123456789")
+    assert await cache.get("a") is None  # evicted for b
+    assert await cache.get("b") == "123456"
+    assert await cache.get("c") is None  # above the per-entry cap
+
+    monkeypatch.setattr(response_cache.time, "time", lambda: 1e12)
+    assert await cache.get("b") is None  # expired
+    get_settings.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_l2_survives_new_process_cache(monkeypatch, tmp_path):
+    """Test a response stored in the SQLite L2 is found by a fresh cache instance"""
+    monkeypatch.setenv("LLM_RESPONSE_CACHE_L2", "sqlite")
+    monkeypatch.setenv("LLM_RESPONSE_CACHE_SQLITE_PATH", str(tmp_path / "cache.sqlite3"))
+    get_settings.cache_clear()
+
+    await LLMResponseCache().set("key", "stored answer")
+    fresh = LLMResponseCache()
+
+    assert await fresh.get("key") == "stored answer"
+    assert await fresh.get("key") == "stored answer"
+    assert (fresh.counters["hits_l2"], fresh.counters["hits_l1"]) == (1, 1)
+    get_settings.cache_clear()
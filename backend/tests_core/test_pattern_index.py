@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Test Pattern Index (6 tests)
+"""
+
+import re
+import pytest
+from backend.core.engines.pattern_index import PatternIndex, leading_literals
+
+
+PATTERNS = [
+    ("violence", r"\b(kill|murder|harm.someone)\b"),
+    ("theft", r"\b(steal|theft|çal|hırsızlık)\b"),
+    ("question", r"\b(how\s+to\s+(hack|steal)|works?)\b"),
+    ("anchored", r"^(explain|what.is)"),
+]
+
+
+def _expected(text_lower):
+    return [name for name, pattern in PATTERNS if re.search(pattern, text_lower, re.IGNORECASE)]
+
+
+def test_leading_literals_simple_pattern():
+    """Test literal prefixes of a word-bounded alternation"""
+    assert leading_literals(r"\b(kill|murder|harm.someone)\b") == ["kill", "murder", "harm"]
+
+
+def test_leading_literals_optional_suffix():
+    """Test an optional trailing character is not part of the literal"""
+    assert leading_literals(r"\b(works?)\b") == ["work"]
+
+
+def test_leading_literals_unsupported_forms():
+    """Test patterns without a usable literal prefix are always searched"""
+    assert leading_literals(r"^(explain|what.is)") is None
+    assert leading_literals(r"\b(a)|(b)\b") is None
+    assert leading_literals(r"\b(\w+ing|kill)\b") is None
+
+
+@pytest.mark.parametrize("text", [
+    "how to steal a car",
+    "i will kill time",
+    "killer app",
+    "explain this",
+    "kıll çal",
+    "ſteal",
+    "hirsizlik yapmak",
+    "it works",
+    "",
+])
+def test_pattern_index_matches_regex_search(text):
+    """Test index results are identical to one re.search per category"""
+    index = PatternIndex(PATTERNS)
+    assert index.match_names(text.lower()) == _expected(text.lower())
+
+
+def test_pattern_index_declaration_order():
+    """Test matches are returned in declaration order"""
+    index = PatternIndex(PATTERNS)
+    assert index.match_names("steal then kill") == ["violence", "theft"]
+
+
+def test_pattern_index_precomputed_tokens():
+    """Test pre-computed tokens give the same result"""
+    index = PatternIndex(PATTERNS)
+    text = "how to hack and steal"
+    assert index.match(text, tokens=set(text.split())) == index.match(text)
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Test Provider Streaming (6 tests)
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+from backend.api import streaming
+from backend.config import get_settings
+from backend.core.llm.providers import chat_stream
+from backend.core.llm.providers.groq_client import GroqClient
+from backend.core.llm.providers.mistral_client import MistralClient
+from backend.core.utils.model_router import ModelRouter
+from backend.gateway.concurrency_limiter import AdaptiveConcurrencyLimiter, get_concurrency_stats, reset_concurrency_limiters
+from backend.gateway.error_mapping import LLMProviderError
+
+
+def _chunk(content):
+    return f"data: {json.dumps({'choices': [{'delta': {'content': content}}]})}\n\n".encode()
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    """Pooled HTTP client replaced by a mock transport; the handler is settable per test"""
+    for key in ("GROQ_API_KEY", "MISTRAL_API_KEY"):
+        monkeypatch.setenv(key, "test-key")
+    get_settings.cache_clear()
+    reset_concurrency_limiters()
+    state = {"requests": []}
+
+    def default_handler(request):
+        body = b"".join(_chunk(word) for word in ("Merhaba", " dünya")) + b"data: [DONE]\n\n"
+        return httpx.Response(200, content=body)
+    state["handler"] = default_handler
+
+    def handle(request):
+        state["requests"].append(request)
+        return state["handler"](request)
+
+    @asynccontextmanager
+    async def mock_client(name):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handle)) as client:
+            yield client
+
+    monkeypatch.setattr(chat_stream, "llm_http_client", mock_client)
+    yield state
+    reset_concurrency_limiters()
+    get_settings.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_groq_streams_deltas(provider):
+    """Test GroqClient.stream sends stream=true and yields each delta"""
+    deltas = [d async for d in GroqClient().stream("prompt", "llama3-8b-8192")]
+
+    assert deltas == ["Merhaba", " dünya"]
+    request = provider["requests"][0]
+    assert str(request.url) == "https://api.groq.com/openai/v1/chat/completions"
+    assert json.loads(request.content)["stream"] is True
+
+
+@pytest.mark.asyncio
+async def test_first_token_before_generation_ends(provider):
+    """Test the first delta is yielded while the provider is still generating"""
+    finished = asyncio.Event()
+
+    async def body():
+        yield _chunk("first")
+        await asyncio.sleep(0.05)
+        yield _chunk(" second")
+        finished.set()
+        yield b"data: [DONE]\n\n"
+    provider["handler"] = lambda request: httpx.Response(200, content=body())
+
+    stream = MistralClient().stream("prompt", "mistral-tiny")
+    assert await stream.__anext__() == "first"
+    assert not finished.is_set()
+    assert [d async for d in stream] == [" second"]
+
+
+@pytest.mark.asyncio
+async def test_stream_error_carries_status_and_retry_after(provider):
+    """Test a non-200 answer raises LLMProviderError before any text"""
+    provider["handler"] = lambda request: httpx.Response(429, headers={"Retry-After": "2"}, text="slow down")
+
+    with pytest.raises(LLMProviderError) as exc_info:
+        async for _ in GroqClient().stream("prompt", "llama3-8b-8192"):
+            pass
+    assert (exc_info.value.status_code, exc_info.value.retry_after) == (429, 2.0)
+
+
+@pytest.mark.asyncio
+async def test_router_stream_records_health_and_concurrency(provider):
+    """Test ModelRouter.stream goes through the limiter and health statistics"""
+    router = ModelRouter()
+    deltas = [d async for d in router.stream("prompt", "mistral/mistral-7b-instruct")]
+
+    assert "".join(deltas) == "Merhaba dünya"
+    assert router.health.get("mistral").total_calls == 1
+    assert get_concurrency_stats()["mistral/mistral-tiny"]["successes"] == 1
+
+    router.available_models.remove("groq/llama3-8b-tool-use")
+    with pytest.raises(LLMProviderError, match="API key not configured"):
+        async for _ in router.stream("prompt", "groq/llama3-8b-tool-use"):
+            pass
+    assert provider["requests"][1:] == []
+
+
+@pytest.mark.asyncio
+async def test_standalone_stream_uses_configured_model(provider, monkeypatch):
+    """Test STANDALONE_STREAM_MODEL streams through the router instead of OpenAI"""
+    monkeypatch.setenv("STANDALONE_STREAM_MODEL", "groq/llama3-8b-tool-use")
+    get_settings.cache_clear()
+    monkeypatch.setattr(streaming, "get_model_router", lambda: ModelRouter())
+
+    tokens = [t async for t in streaming._stream_llm_response("prompt", get_settings())]
+    assert tokens == ["Merhaba", " dünya"]
+    assert provider["requests"][0].url.host == "api.groq.com"
+
+
+@pytest.mark.asyncio
+async def test_standalone_stream_queues_under_tenant(provider, monkeypatch):
+    """Test the streamed call waits in the caller's tenant queue of the concurrency limiter"""
+    monkeypatch.setenv("STANDALONE_STREAM_MODEL", "groq/llama3-8b-tool-use")
+    get_settings.cache_clear()
+    monkeypatch.setattr(streaming, "get_model_router", lambda: ModelRouter())
+    tenants = []
+    acquire = AdaptiveConcurrencyLimiter.acquire
+
+    async def recording_acquire(self, tenant):
+        tenants.append(tenant)
+        await acquire(self, tenant)
+    monkeypatch.setattr(AdaptiveConcurrencyLimiter, "acquire", recording_acquire)
+
+    tokens = [t async for t in streaming._stream_llm_response("prompt", get_settings(), "ip:10.0.0.7")]
+    assert tokens == ["Merhaba", " dünya"]
+    assert tenants == ["ip:10.0.0.7"]
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Test Proxy Paragraph Cache (4 tests)
+"""
+
+import json
+import pytest
+from backend.config import get_settings
+from backend.gateway import router_adapter
+from backend.gateway.response_cache import reset_llm_response_cache
+from backend.services.proxy_analyzer import analyze_content_deep
+
+ARTICLE = "\n\n".join(f"Paragraph {i} of the article about markets." for i in range(5))
+
+
+@pytest.fixture
+def judge_calls(monkeypatch):
+    """Fresh cache and a fake judge scoring each paragraph by its number"""
+    calls = []
+
+    async def fake_call_provider(provider_name, prompt, settings, model, temperature, max_tokens):
+        calls.append(prompt)
+        score = 90 if "EDITED" not in prompt else 40
+        return json.dumps({
+            "ethical_index": score, "compliance_score": score, "manipulation_score": score,
+            "bias_score": score, "legal_risk_score": score, "flags": [f"flag{len(calls)}"], "risk_locations": []
+        })
+
+    monkeypatch.setattr(router_adapter, "_call_provider", fake_call_provider)
+    get_settings.cache_clear()
+    reset_llm_response_cache()
+    yield calls
+    reset_llm_response_cache()
+    get_settings.cache_clear()
+
+
+async def _analyze(content, scope="org:1", **kwargs):
+    return await analyze_content_deep(content, domain="finance", policies=["FINTECH"], cache_scope=scope, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_edited_article_reanalyzes_changed_paragraph_only(judge_calls):
+    """Test one edited paragraph costs one LLM call and scores are recomputed"""
+    first = await _analyze(ARTICLE)
+    assert len(judge_calls) == 5 and first["reused_paragraphs"] == 0
+
+    edited = ARTICLE.replace("Paragraph 2 of", "Paragraph 2 EDITED of")
+    second = await _analyze(edited)
+
+    assert len(judge_calls) == 6
+    assert second["reused_paragraphs"] == 4
+    assert second["paragraphs"][2]["text"].startswith("Paragraph 2 EDITED")
+    assert second["overall_scores"]["ethical_index"] == round((4 * 90 + 40) / 5)
+    assert second["paragraphs"][3] == first["paragraphs"][3]
+
+
+@pytest.mark.asyncio
+async def test_whitespace_edits_are_reanalyzed(judge_calls):
+    """Test reflowed whitespace re-analyzes the paragraph (cached risk locations are offsets into the exact text)"""
+    await _analyze(ARTICLE)
+    reflowed = ARTICLE.replace("of the article", "of  the\narticle", 1)
+    result = await _analyze(reflowed)
+
+    assert len(judge_calls) == 6
+    assert result["reused_paragraphs"] == 4
+    assert result["paragraphs"][0]["text"] == "Paragraph 0 of  the\narticle about markets."
+
+
+@pytest.mark.asyncio
+async def test_key_includes_scope_domain_and_policies(judge_calls):
+    """Test organizations, domains and policy sets do not share paragraph results"""
+    await _analyze(ARTICLE)
+    assert (await _analyze(ARTICLE, scope="org:2"))["reused_paragraphs"] == 0
+    other_domain = await analyze_content_deep(ARTICLE, domain="media", policies=["FINTECH"], cache_scope="org:1")
+    assert other_domain["reused_paragraphs"] == 0
+    reordered = await analyze_content_deep(ARTICLE, domain="finance", policies=["FINTECH", "FINTECH"], cache_scope="org:1")
+    assert reordered["reused_paragraphs"] == 5
+
+
+@pytest.mark.asyncio
+async def test_unscoped_bypass_and_disabled(judge_calls, monkeypatch):
+    """Test no reuse without a scope, with bypass, or when disabled"""
+    await _analyze(ARTICLE)
+    assert (await _analyze(ARTICLE, scope=None))["reused_paragraphs"] == 0
+    assert (await _analyze(ARTICLE, cache_bypass=True))["reused_paragraphs"] == 0
+
+    monkeypatch.setenv("PROXY_PARAGRAPH_CACHE_ENABLED", "false")
+    get_settings.cache_clear()
+    assert (await _analyze(ARTICLE))["reused_paragraphs"] == 0
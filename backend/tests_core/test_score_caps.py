@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Test Score Caps (5 tests)
+"""
+
+import pytest
+from backend.core.engines.analyzed_text import AnalyzedText
+from backend.core.engines.score_caps import apply_score_caps
+
+
+LOW_RISK_INPUT = {"risk_level": "low", "risk_score": 0.1, "intent": "question", "risk_flags": []}
+HIGH_RISK_INPUT = {"risk_level": "high", "risk_score": 0.9, "intent": "information", "risk_flags": ["violence"]}
+SAFE_OUTPUT = {"risk_score": 0.2}
+RISKY_OUTPUT = {"risk_score": 0.8}
+GOOD_ALIGNMENT = {"alignment_score": 75.0}
+POOR_ALIGNMENT = {"alignment_score": 20.0}
+
+
+def test_high_risk_safe_refusal_capped_at_85():
+    """Test a safe refusal of a high risk request is capped at 85"""
+    assert apply_score_caps(95.0, "how do people do this", HIGH_RISK_INPUT, SAFE_OUTPUT, GOOD_ALIGNMENT) == 85.0
+
+
+def test_severe_legal_risk_capped_at_25():
+    """Test counterfeit keywords with high legal risk get the strictest cap"""
+    score = apply_score_caps(
+        90.0, AnalyzedText("How to print COUNTERFEIT money"), HIGH_RISK_INPUT, RISKY_OUTPUT, POOR_ALIGNMENT,
+        legal_risk={"risk_score": 0.8}
+    )
+    assert score == 25.0
+
+
+def test_educational_question_floor():
+    """Test low risk educational questions get a minimum score of 50"""
+    assert apply_score_caps(20.0, "Can you explain photosynthesis?", LOW_RISK_INPUT, SAFE_OUTPUT, GOOD_ALIGNMENT) == 50.0
+
+
+def test_no_limits_leave_score_unchanged():
+    """Test a low risk statement without signals is not adjusted"""
+    low_risk_statement = dict(LOW_RISK_INPUT, intent="information")
+    assert apply_score_caps(77.5, "I like green tea", low_risk_statement, SAFE_OUTPUT, GOOD_ALIGNMENT) == 77.5
+
+
+def test_educational_question_with_policy_violation_raises():
+    """Test the known parity bug: policy IDs reach the severe-category check, which raises (Step 8 fallback)"""
+    with pytest.raises(AttributeError):
+        apply_score_caps(20.0, "Can you explain photosynthesis?", LOW_RISK_INPUT, SAFE_OUTPUT, GOOD_ALIGNMENT,
+                         policy_violations=["N1"])
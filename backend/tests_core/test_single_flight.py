@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Test Single-Flight LLM Calls (5 tests)
+"""
+
+import asyncio
+import pytest
+from backend.config import get_settings
+from backend.gateway import router_adapter
+from backend.gateway.router_adapter import call_llm_provider
+from backend.gateway.single_flight import SingleFlight, get_single_flight
+
+
+@pytest.fixture
+def slow_provider(monkeypatch):
+    """Fake provider call that takes 50ms and counts its calls"""
+    calls = []
+
+    async def fake_call_provider(provider_name, prompt, settings, model, temperature, max_tokens):
+        calls.append(prompt)
+        await asyncio.sleep(0.05)
+        return f"answer to {prompt}"
+
+    monkeypatch.setattr(router_adapter, "_call_provider", fake_call_provider)
+    get_settings.cache_clear()
+    yield calls
+    get_settings.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_calls_are_coalesced(slow_provider):
+    """Test N identical in-flight requests issue one provider call"""
+    before = get_single_flight().stats()["namespaces"].get("gateway", {}).get("coalesced", 0)
+    results = await asyncio.gather(*[
+        call_llm_provider("openai", "same article", temperature=0.7) for _ in range(5)
+    ])
+
+    assert results == ["answer to same article"] * 5
+    assert slow_provider == ["same article"]
+    assert get_single_flight().stats()["namespaces"]["gateway"]["coalesced"] - before == 4
+    assert get_single_flight().stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_different_requests_are_not_coalesced(slow_provider):
+    """Test requests differing in prompt or parameters get their own calls"""
+    await asyncio.gather(
+        call_llm_provider("openai", "article", temperature=0.7),
+        call_llm_provider("openai", "article", temperature=0.2),
+        call_llm_provider("openai", "other article", temperature=0.7),
+    )
+    assert len(slow_provider) == 3
+
+
+@pytest.mark.asyncio
+async def test_single_flight_disabled(slow_provider, monkeypatch):
+    """Test LLM_SINGLE_FLIGHT_ENABLED=false calls the provider for every request"""
+    monkeypatch.setenv("LLM_SINGLE_FLIGHT_ENABLED", "false")
+    get_settings.cache_clear()
+    await asyncio.gather(*[call_llm_provider("openai", "same", temperature=0.7) for _ in range(3)])
+    assert len(slow_provider) == 3
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_others():
+    """Test cancelling one caller leaves the shared call running for the rest"""
+    flight = SingleFlight()
+    started = []
+
+    async def call():
+        started.append(1)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    first = asyncio.ensure_future(flight.do("test", "k", call))
+    second = asyncio.ensure_future(flight.do("test", "k", call))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == "done"
+    assert first.cancelled()
+    assert started == [1]
+    assert flight.stats()["namespaces"]["test"]["abandoned"] == 0
+
+
+@pytest.mark.asyncio
+async def test_call_abandoned_when_every_caller_cancelled():
+    """Test the provider call is cancelled once no caller is left, and errors reach every caller"""
+    flight = SingleFlight()
+    cancelled = asyncio.Event()
+
+    async def call():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    waiter = asyncio.ensure_future(flight.do("test", "k", call))
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    await asyncio.wait_for(cancelled.wait(), 1.0)
+    assert flight.stats()["namespaces"]["test"]["abandoned"] == 1
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("provider down")
+
+    results = await asyncio.gather(
+        flight.do("test", "e", failing), flight.do("test", "e", failing), return_exceptions=True
+    )
+    assert [str(r) for r in results] == ["provider down"] * 2
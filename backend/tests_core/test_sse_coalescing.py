@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Test SSE Token Coalescing (5 tests)
+"""
+
+import asyncio
+import json
+import pytest
+from backend.api.sse import coalesce_tokens, sse_event
+
+
+async def _tokens(items, state=None):
+    """Async token stream: strings, or floats meaning 'sleep this many seconds'"""
+    try:
+        for item in items:
+            if isinstance(item, float):
+                await asyncio.sleep(item)
+            else:
+                yield item
+    finally:
+        if state is not None:
+            state["closed"] = True
+
+
+async def _frames(items, window, max_bytes=1024):
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    return [(text, loop.time() - start) async for text in coalesce_tokens(_tokens(items), window, max_bytes)]
+
+
+@pytest.mark.asyncio
+async def test_first_token_sent_then_window_frames():
+    """Test the first token goes out at once and the rest are merged per window"""
+    items = ["Merhaba"] + [x for i in range(12) for x in (0.005, f" t{i}")]
+    frames = await _frames(items, window=0.03)
+
+    assert frames[0][0] == "Merhaba"
+    assert "".join(text for text, _ in frames) == "Merhaba" + "".join(f" t{i}" for i in range(12))
+    assert 2 <= len(frames) <= 6
+
+
+@pytest.mark.asyncio
+async def test_byte_threshold_splits_frames():
+    """Test a burst of tokens is cut into frames of max_bytes"""
+    frames = await _frames(["x"] + ["abcd"] * 10, window=10.0, max_bytes=8)
+
+    assert [text for text, _ in frames] == ["x"] + ["abcdabcd"] * 5
+
+
+@pytest.mark.asyncio
+async def test_buffered_text_sent_when_window_ends():
+    """Test a paused stream does not hold back buffered tokens until the next one"""
+    frames = await _frames(["a", "b", 0.2, "c"], window=0.02)
+
+    assert [text for text, _ in frames] == ["a", "b", "c"]
+    assert frames[1][1] < 0.1
+
+
+@pytest.mark.asyncio
+async def test_close_cancels_source():
+    """Test closing the frames stops the pending read and closes the token stream"""
+    state = {}
+    frames = coalesce_tokens(_tokens(["a", 10.0, "b"], state), 0.02, 1024)
+    assert await frames.__anext__() == "a"
+    await frames.aclose()
+    assert state["closed"]
+
+
+@pytest.mark.asyncio
+async def test_zero_window_and_event_encoding():
+    """Test window 0 passes tokens through and frames are valid JSON"""
+    frames = await _frames(["a", "b", "c"], window=0)
+    assert [text for text, _ in frames] == ["a", "b", "c"]
+
+    event = sse_event({"token": "Güvenli \"yanıt\"\n"})
+    assert event.startswith("data: ") and event.endswith("\n\n")
+    assert json.loads(event[len("data: "):]) == {"token": "Güvenli \"yanıt\"\n"}
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+Test Resumable SSE Streams (9 tests)
+"""
+
+import asyncio
+import pytest
+from backend.api.stream_replay import StreamReplay, _RedisStore, parse_last_event_id, stream_fingerprint
+from backend.config import get_settings
+
+FINGERPRINT = stream_fingerprint("tell me a story", False)
+
+
+@pytest.fixture(autouse=True)
+def fresh_settings():
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+class FakeAnswer:
+    """Answer stream factory: frames are released by release(); counts LLM calls"""
+
+    def __init__(self, count=6):
+        self.count = count
+        self.calls = 0
+        self.closed = 0
+        self.released = asyncio.Semaphore(0)
+
+    def __call__(self):
+        self.calls += 1
+        return self._frames()
+
+    async def _frames(self):
+        try:
+            for i in range(self.count):
+                await self.released.acquire()
+                yield f'data: {{"token": "t{i} "}}\n\n'
+        finally:
+            self.closed += 1
+
+    def release(self, n):
+        for _ in range(n):
+            self.released.release()
+
+
+class FakeRedis:
+    """Shared in-memory Redis (the calls _RedisStore makes); rpush fails once fail_pushes reaches 0"""
+
+    def __init__(self):
+        self.data = {}
+        self.fail_pushes = None
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def exists(self, key):
+        return int(key in self.data)
+
+    async def expire(self, key, ttl):
+        pass
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def rpush(self, key, value):
+        if self.fail_pushes is not None:
+            if self.fail_pushes == 0:
+                raise ConnectionError("redis went away")
+            self.fail_pushes -= 1
+        self.data.setdefault(key, []).append(value)
+
+    async def lrange(self, key, start, end):
+        return self.data.get(key, [])[start:]
+
+
+def _redis_worker(monkeypatch, client):
+    """StreamReplay mirroring to the shared fake Redis (one per worker)"""
+    async def get_redis(self):
+        return client
+    monkeypatch.setattr(_RedisStore, "_client", get_redis)
+    monkeypatch.setenv("STREAM_REPLAY_BACKEND", "redis")
+    get_settings.cache_clear()
+    return StreamReplay()
+
+
+def _split(frame):
+    """(id, data line) of a frame"""
+    id_line, data = frame.split("\n", 1)
+    return id_line[len("id: "):], data
+
+
+async def _take(frames, n):
+    return [_split(await frames.__anext__()) for _ in range(n)]
+
+
+@pytest.mark.asyncio
+async def test_reconnect_replays_missed_frames_and_follows_live():
+    """Test a reconnect gets the frames sent while disconnected, then the live rest, with one LLM call"""
+    replay = StreamReplay()
+    answer = FakeAnswer()
+    first = replay.stream(FINGERPRINT, answer)
+    answer.release(2)
+    received = await _take(first, 2)
+    await first.aclose()  # connection dropped
+
+    answer.release(2)  # produced while the client is away
+    await asyncio.sleep(0.01)
+    resumed = replay.stream(FINGERPRINT, answer, last_event_id=received[-1][0])
+    received += await _take(resumed, 2)
+    answer.release(2)
+    received += [_split(frame) async for frame in resumed]
+
+    assert answer.calls == 1
+    assert [data for _, data in received] == [f'data: {{"token": "t{i} "}}\n\n' for i in range(6)]
+    stream_id = parse_last_event_id(received[0][0])[0]
+    assert [event_id for event_id, _ in received] == [f"{stream_id}-{i}" for i in range(6)]
+    assert replay.stats()["resumed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_finished_stream_replays_after_any_frame():
+    """Test a finished stream can be resumed from any frame until it expires"""
+    replay = StreamReplay()
+    answer = FakeAnswer(count=3)
+    answer.release(3)
+    frames = [_split(frame) async for frame in replay.stream(FINGERPRINT, answer)]
+
+    tail = [_split(frame) async for frame in replay.stream(FINGERPRINT, answer, frames[0][0])]
+    assert tail == frames[1:]
+    assert answer.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_or_mismatched_id_starts_new_stream():
+    """Test a foreign, malformed or other-query Last-Event-ID starts a new stream"""
+    replay = StreamReplay()
+    answer = FakeAnswer(count=1)
+    answer.release(1)
+    (event_id, _), = [_split(frame) async for frame in replay.stream(FINGERPRINT, answer)]
+
+    for last_event_id, fingerprint in (
+        ("0" * 32 + "-0", FINGERPRINT),
+        ("not-an-id", FINGERPRINT),
+        (event_id, stream_fingerprint("tell me a story", True)),
+    ):
+        answer.release(1)
+        frames = [_split(frame) async for frame in replay.stream(fingerprint, answer, last_event_id)]
+        assert len(frames) == 1 and frames[0][0] != event_id
+    assert answer.calls == 4
+    assert replay.stats()["resume_misses"] == 3
+
+
+@pytest.mark.asyncio
+async def test_store_bounds_and_ttl(monkeypatch):
+    """Test the oldest streams are evicted past the cap and finished streams expire"""
+    monkeypatch.setenv("STREAM_REPLAY_MAX_STREAMS", "2")
+    monkeypatch.setenv("STREAM_REPLAY_TTL_SECONDS", "0.05")
+    get_settings.cache_clear()
+    replay = StreamReplay()
+
+    ids = []
+    for _ in range(3):
+        answer = FakeAnswer(count=1)
+        answer.release(1)
+        ids += [_split(frame)[0] async for frame in replay.stream(FINGERPRINT, answer)]
+    assert replay.stats()["evictions"] == 1
+    assert replay.memory.get(parse_last_event_id(ids[0])[0]) is None
+    assert replay.memory.get(parse_last_event_id(ids[2])[0]) is not None
+
+    await asyncio.sleep(0.06)
+    assert replay.memory.get(parse_last_event_id(ids[2])[0]) is None
+
+
+@pytest.mark.asyncio
+async def test_stream_without_readers_is_stopped(monkeypatch):
+    """Test a live stream nobody resumes within the grace period closes its LLM call and is not replayed"""
+    monkeypatch.setenv("STREAM_REPLAY_DETACHED_SECONDS", "0.05")
+    get_settings.cache_clear()
+    replay = StreamReplay()
+    answer = FakeAnswer()
+    first = replay.stream(FINGERPRINT, answer)
+    answer.release(1)
+    (event_id, _), = await _take(first, 1)
+    await first.aclose()
+
+    await asyncio.sleep(0.1)
+    assert answer.closed == 1
+    assert replay.stats()["abandoned"] == 1 and replay.stats()["live"] == 0
+    answer.release(1)
+    resumed = [_split(frame) async for frame in replay.stream(FINGERPRINT, FakeAnswer(count=0), event_id)]
+    assert resumed == [] and replay.stats()["resume_misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_keeps_latest_frames_within_byte_cap(monkeypatch):
+    """Test a stream buffers at most STREAM_REPLAY_MAX_BYTES; resuming before its oldest frame starts a new stream"""
+    monkeypatch.setenv("STREAM_REPLAY_MAX_BYTES", "50")
+    get_settings.cache_clear()
+    replay = StreamReplay()
+    answer = FakeAnswer()
+    frames = replay.stream(FINGERPRINT, answer)
+    received = []
+    for _ in range(6):
+        answer.release(1)
+        received += await _take(frames, 1)
+    assert [_split(frame) async for frame in frames] == []
+
+    assert len(received) == 6
+    assert 0 < replay.stats()["bytes"] <= 50
+    tail = [_split(frame) async for frame in replay.stream(FINGERPRINT, answer, received[3][0])]
+    assert tail == received[4:]
+    restart = FakeAnswer(count=1)
+    restart.release(1)
+    restarted = [_split(frame) async for frame in replay.stream(FINGERPRINT, restart, received[0][0])]
+    assert restart.calls == 1 and len(restarted) == 1 and restarted[0][0] != received[1][0]
+    assert replay.stats()["resume_misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_evicted_live_stream_is_stopped(monkeypatch):
+    """Test evicting a live stream closes its LLM call and ends its readers"""
+    monkeypatch.setenv("STREAM_REPLAY_MAX_STREAMS", "1")
+    get_settings.cache_clear()
+    replay = StreamReplay()
+    evicted = FakeAnswer()
+    frames = replay.stream(FINGERPRINT, evicted)
+    evicted.release(1)
+    await _take(frames, 1)
+
+    newer = FakeAnswer(count=1)
+    newer.release(1)
+    assert len([frame async for frame in replay.stream(FINGERPRINT, newer)]) == 1
+    evicted.release(5)
+    assert [frame async for frame in frames] == []
+    await asyncio.sleep(0)
+    assert evicted.closed == 1 and replay.stats()["live"] == 0
+    assert replay.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_redis_mirror_is_dropped(monkeypatch):
+    """Test a stream whose Redis writes failed is deleted there, so another worker misses instead of polling"""
+    client = FakeRedis()
+    worker = _redis_worker(monkeypatch, client)
+    complete = FakeAnswer(count=2)
+    complete.release(2)
+    finished = [_split(frame) async for frame in worker.stream(FINGERPRINT, complete)]
+    await asyncio.sleep(0)
+
+    client.fail_pushes = 1
+    answer = FakeAnswer(count=3)
+    answer.release(3)
+    frames = [_split(frame) async for frame in worker.stream(FINGERPRINT, answer)]
+    await asyncio.sleep(0)
+    assert len(frames) == 3
+
+    other = _redis_worker(monkeypatch, client)
+    tail = [_split(frame) async for frame in other.stream(FINGERPRINT, complete, finished[0][0])]
+    assert tail == finished[1:] and other.stats()["resumed_redis"] == 1
+    restart = FakeAnswer(count=1)
+    restart.release(1)
+    resumed = other.stream(FINGERPRINT, restart, frames[0][0])
+    restarted = await asyncio.wait_for(_take(resumed, 1), timeout=1.0)
+    await resumed.aclose()
+    assert restart.calls == 1 and restarted[0][0] != frames[1][0]
+    assert other.stats()["resume_misses"] == 1
+
+
+def test_parse_last_event_id():
+    """Test Last-Event-ID parsing"""
+    assert parse_last_event_id("ab" * 16 + "-12") == ("ab" * 16, 12)
+    assert parse_last_event_id(" " + "ab" * 16 + "-0\n") == ("ab" * 16, 0)
+    for value in (None, "", "12", "ab" * 16, "ab" * 16 + "-x", "AB" * 16 + "-1"):
+        assert parse_last_event_id(value) is None
@@ -12,7 +12,7 @@ from uuid import uuid4
 from backend.telemetry.models import TelemetryEvent
 from backend.telemetry.repository import create_event, get_latest_events, get_events_for_regulator
 from backend.telemetry.schemas import TelemetryEventCreate
-from backend.telemetry.service import record_telemetry_event
+from backend.telemetry.service import record_telemetry_event, record_telemetry_events
 from backend.core.utils.dependencies import AsyncSessionLocal
 
 
@@ -232,3 +232,24 @@ async def test_telemetry_event_with_meta(db_session):
     assert event.meta["alignment"]["verdict"] == "aligned"
     assert event.meta["deep_analysis"]["deception_score"] == 0.2
 
+
+@pytest.mark.asyncio
+async def test_record_telemetry_events_in_one_batch(db_session):
+    """Test batch telemetry stores one event per pipeline result"""
+    pipeline_results = [
+        {"ok": True, "mode": "proxy", "eza_score": 80.0 + i, "risk_level": "low", "policy_violations": [], "data": {}}
+        for i in range(3)
+    ]
+    
+    recorded = await record_telemetry_events(
+        pipeline_results=pipeline_results,
+        mode="proxy",
+        source="proxy-batch-api",
+        db_session=db_session,
+        user_inputs=["Batch input 0", "Batch input 1", "Batch input 2"]
+    )
+    
+    assert recorded == 3
+    events = await get_latest_events(db_session, limit=10, source="proxy-batch-api")
+    assert {e.user_input for e in events} >= {"Batch input 0", "Batch input 1", "Batch input 2"}
+    assert {e.eza_score for e in events} >= {80.0, 81.0, 82.0}
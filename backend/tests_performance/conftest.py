@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Pytest Configuration for Performance Tests
+"""
+
+import pytest
+from backend.api import streaming
+from backend.config import get_settings
+from backend.core.engines import model_router as engines_router
+from backend.core.llm import http_pool
+from backend.core.llm.http_pool import close_llm_http_pool
+from backend.core.utils import model_router
+from backend.gateway.concurrency_limiter import reset_concurrency_limiters
+from backend.test_tools.llm_simulator import LLMSimulator, SimulatorProfile
+
+
+@pytest.fixture
+def simulator_profile():
+    """Override in a test module (or parametrize) to change the simulated provider"""
+    return SimulatorProfile(seed=42)
+
+
+@pytest.fixture
+async def llm_simulator(monkeypatch, simulator_profile):
+    """
+    Offline OpenAI-compatible LLM server with every provider pointed at it
+
+    OpenAI, Groq and Mistral base URLs, API keys and LOCAL_LLM_URL are set for
+    the test; the HTTP pool, concurrency limiters and the ModelRouter start fresh.
+    """
+    async with LLMSimulator(simulator_profile) as simulator:
+        for provider in ("OPENAI", "GROQ", "MISTRAL"):
+            monkeypatch.setenv(f"{provider}_BASE_URL", simulator.base_url)
+            monkeypatch.setenv(f"{provider}_API_KEY", "sim-key")
+        monkeypatch.setenv("LOCAL_LLM_URL", simulator.url)
+        # Read once at import by the engines router and the SSE endpoint
+        chat_url = f"{simulator.base_url}/chat/completions"
+        for module in (engines_router, streaming):
+            monkeypatch.setattr(module, "LLM_API_KEY", "sim-key")
+            monkeypatch.setattr(module, "OPENAI_BASE_URL", chat_url)
+        monkeypatch.setattr(http_pool, "_pool", None)
+        monkeypatch.setattr(model_router, "_router", None)
+        reset_concurrency_limiters()
+        get_settings.cache_clear()
+        try:
+            yield simulator
+        finally:
+            await close_llm_http_pool()
+            reset_concurrency_limiters()
+            get_settings.cache_clear()
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+Golden outputs of the deterministic engine chain on the engine corpus
+
+One entry per (input, output) request pair of the corpus: the proxy-mode
+engine chain results ("chain") and the Step 8 score cap result with and
+without deep analysis ("score_caps"; a capped score, or the exception name
+when Step 8 falls back). Recorded before the engines were optimized, so
+optimized engines must reproduce them exactly.
+
+Regenerate only for an intended behaviour change:
+    python -m backend.tests_performance.helpers.engine_golden
+"""
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+GOLDEN_PATH = Path(__file__).with_name("engine_golden.json")
+
+
+def as_json(value: Any) -> Any:
+    """Value as stored in the golden file (tuples become lists)"""
+    return json.loads(json.dumps(value, ensure_ascii=False))
+
+
+def load_engine_golden() -> List[Dict[str, Any]]:
+    with open(GOLDEN_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_engine_golden(entries: List[Dict[str, Any]]) -> None:
+    """One entry per line, so a behaviour change shows up as a readable diff"""
+    with open(GOLDEN_PATH, "w", encoding="utf-8") as f:
+        f.write("[\n" + ",\n".join(json.dumps(entry, ensure_ascii=False) for entry in entries) + "\n]\n")
+
+
+if __name__ == "__main__":
+    from backend.tests_performance.test_engine_benchmarks import record_engine_golden
+    write_engine_golden(record_engine_golden())
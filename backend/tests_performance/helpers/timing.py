@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""Timing helpers for benchmarks"""
+import gc
+import time
+from typing import Any, Awaitable, Callable, Iterable, Sequence
+
+
+def time_per_call(func: Callable[[Any], object], items: Sequence[Any], rounds: int = 5) -> float:
+    """Best-of-rounds average seconds per func(item) call over items (GC paused, as in timeit)"""
+    best = float("inf")
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for item in items:
+                func(item)
+            best = min(best, (time.perf_counter() - start) / len(items))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best
+
+
+async def async_time_per_call(func: Callable[[Any], Awaitable[object]], items: Iterable[Any]) -> float:
+    """Average seconds per awaited func(item) call over items"""
+    count = 0
+    start = time.perf_counter()
+    for item in items:
+        await func(item)
+        count += 1
+    return (time.perf_counter() - start) / max(count, 1)
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+Deterministic Engine Benchmarks
+Checks the optimized engines against golden outputs recorded from their
+previous implementation (helpers/engine_golden.json) and times them.
+The engine memo is disabled except where it is what is being measured.
+"""
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from backend.config import get_settings
+from backend.core.engines.alignment_engine import compute_alignment
+from backend.core.engines.analyzed_text import AnalyzedText
+from backend.core.engines.deception_engine import analyze_deception
+from backend.core.engines.engine_memo import clear_engine_memos, get_engine_memo_stats
+from backend.core.engines.eza_score import compute_eza_score_v21
+from backend.core.engines.input_analyzer import analyze_input
+from backend.core.engines.legal_risk import analyze_legal_risk
+from backend.core.engines.output_analyzer import analyze_output
+from backend.core.engines.psych_pressure import analyze_psychological_pressure
+from backend.core.engines.safe_rewrite import safe_rewrite
+from backend.core.engines.score_caps import apply_score_caps
+from backend.policy_engine.evaluator import calculate_score_adjustment, evaluate_policies
+from backend.tests_performance.helpers.engine_corpus import load_input_corpus
+from backend.tests_performance.helpers.engine_golden import as_json, load_engine_golden
+from backend.tests_performance.helpers.timing import time_per_call
+
+
+@pytest.fixture(autouse=True)
+def engine_memo_disabled(monkeypatch):
+    """Time the engines themselves, not memo hits"""
+    monkeypatch.setenv("ENGINE_MEMO_ENABLED", "false")
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+def _request_pairs() -> List[Tuple[str, str]]:
+    """(input, output) pairs: every corpus text answered by the next one"""
+    texts = load_input_corpus()
+    return list(zip(texts, texts[1:] + texts[:1]))
+
+
+def _raw_text_engine_chain(user_input: str, output_text: str) -> List[Any]:
+    """Deterministic proxy-mode engine chain on plain strings, every engine deriving its own text forms"""
+    input_policy = evaluate_policies(user_input)
+    input_analysis = analyze_input(user_input)
+    output_analysis = analyze_output(output_text, input_analysis)
+    alignment = compute_alignment(input_analysis, output_analysis)
+    safe_answer = safe_rewrite(user_input, output_text, input_analysis, output_analysis, alignment)
+    report = {
+        "input": {"raw_text": user_input, "analysis": input_analysis},
+        "output": {"raw_text": output_text, "analysis": output_analysis},
+        "alignment": alignment
+    }
+    deception = analyze_deception(user_input, report)
+    psych_pressure = analyze_psychological_pressure(user_input, deception_result=deception)
+    legal_risk = analyze_legal_risk(input_analysis, output_analysis, report)
+    output_policy = evaluate_policies(user_input, output_text)
+    score = compute_eza_score_v21(
+        input_analysis, output_analysis, alignment,
+        deception=deception, legal_risk=legal_risk, psych_pressure=psych_pressure
+    )
+    return [input_policy, input_analysis, output_analysis, safe_answer,
+            deception, psych_pressure, legal_risk, output_policy, score]
+
+
+def _shared_engine_chain(user_input: str, output_text: str) -> List[Any]:
+    """Same chain as run_full_pipeline runs it, with one AnalyzedText per text"""
+    analyzed_input = AnalyzedText(user_input)
+    input_policy = evaluate_policies(analyzed_input)
+    input_analysis = analyze_input(analyzed_input)
+    analyzed_output = AnalyzedText(output_text)
+    output_analysis = analyze_output(analyzed_output, input_analysis, input_text=analyzed_input)
+    alignment = compute_alignment(input_analysis, output_analysis)
+    safe_answer = safe_rewrite(user_input, analyzed_output, input_analysis, output_analysis, alignment)
+    report = {
+        "input": {"raw_text": user_input, "analysis": input_analysis},
+        "output": {"raw_text": output_text, "analysis": output_analysis},
+        "alignment": alignment
+    }
+    deception = analyze_deception(analyzed_input, report)
+    psych_pressure = analyze_psychological_pressure(analyzed_input, deception_result=deception)
+    legal_risk = analyze_legal_risk(
+        input_analysis, output_analysis, report,
+        input_text=analyzed_input, output_text=analyzed_output
+    )
+    output_policy = evaluate_policies(analyzed_input, analyzed_output, input_result=input_policy)
+    score = compute_eza_score_v21(
+        input_analysis, output_analysis, alignment,
+        deception=deception, legal_risk=legal_risk, psych_pressure=psych_pressure,
+        input_text=analyzed_input
+    )
+    return [input_policy, input_analysis, output_analysis, safe_answer,
+            deception, psych_pressure, legal_risk, output_policy, score]
+
+
+def _score_cap_cases(pairs: List[Tuple[str, str]]) -> List[Tuple[Any, ...]]:
+    """Step 8 arguments for every request pair, with and without deep analysis (proxy / other modes)"""
+    cases = []
+    for user_input, output_text in pairs:
+        input_policy, input_analysis, output_analysis, _, deception, psych_pressure, legal_risk, output_policy, score = (
+            _shared_engine_chain(user_input, output_text)
+        )
+        alignment = compute_alignment(input_analysis, output_analysis)
+        violations = list(set(input_policy[0] + output_policy[0]))
+        adjusted = score["final_score"] + calculate_score_adjustment(violations, max(input_policy[1], output_policy[1]))
+        adjusted = max(0.0, min(100.0, adjusted))
+        for deep in ((deception, legal_risk, psych_pressure), (None, None, None)):
+            cases.append((adjusted, AnalyzedText(user_input), input_analysis, output_analysis, alignment, *deep, violations))
+    return cases
+
+
+def _capped_score(case: Tuple[Any, ...]) -> Any:
+    """Step 8 score, or the name of the exception that sends Step 8 to its fallback"""
+    try:
+        return apply_score_caps(*case)
+    except Exception as e:
+        return type(e).__name__
+
+
+def record_engine_golden() -> List[Dict[str, Any]]:
+    """Golden entries from the current engines (see helpers/engine_golden)"""
+    pairs = _request_pairs()
+    cases = _score_cap_cases(pairs)
+    return [
+        {
+            "input": user_input,
+            "output": output_text,
+            "chain": as_json(_shared_engine_chain(user_input, output_text)),
+            "score_caps": [_capped_score(case) for case in cases[2 * i:2 * i + 2]]
+        }
+        for i, (user_input, output_text) in enumerate(pairs)
+    ]
+
+
+@pytest.fixture(scope="module")
+def golden() -> List[Dict[str, Any]]:
+    return load_engine_golden()
+
+
+def _golden_pairs(golden: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+    return [(entry["input"], entry["output"]) for entry in golden]
+
+
+def test_engine_chain_matches_golden(golden):
+    """Test the engine chain with shared AnalyzedTexts reproduces the golden outputs"""
+    for entry in golden:
+        actual = as_json(_shared_engine_chain(entry["input"], entry["output"]))
+        assert actual == entry["chain"], f"Mismatch for: {entry['input']!r}"
+
+
+def test_raw_text_engine_chain_matches_golden(golden):
+    """Test the engines called with plain strings reproduce the golden outputs too"""
+    for entry in golden:
+        actual = as_json(_raw_text_engine_chain(entry["input"], entry["output"]))
+        assert actual == entry["chain"], f"Mismatch for: {entry['input']!r}"
+
+
+def test_score_caps_match_golden(golden):
+    """Test the score caps give the golden Step 8 scores"""
+    cases = _score_cap_cases(_golden_pairs(golden))
+    for i, entry in enumerate(golden):
+        actual = [_capped_score(case) for case in cases[2 * i:2 * i + 2]]
+        assert actual == entry["score_caps"], f"Mismatch for: {entry['input']!r}"
+
+
+def test_input_analyzer_benchmark():
+    """Benchmark compiled analyze_input per call"""
+    texts = load_input_corpus()
+    compiled = time_per_call(analyze_input, texts)
+    assert compiled < 500e-6, f"analyze_input too slow: {compiled * 1e6:.1f}us/call"
+
+
+def test_policy_evaluator_benchmark():
+    """Benchmark indexed input+output policy evaluation per call"""
+    texts = load_input_corpus()
+    indexed = time_per_call(lambda t: evaluate_policies(t, t), texts)
+    assert indexed < 1e-3, f"evaluate_policies too slow: {indexed * 1e6:.1f}us/call"
+
+
+def test_shared_analyzed_text_benchmark():
+    """Benchmark per-request engine CPU of the chain sharing one AnalyzedText per text"""
+    pairs = _request_pairs()
+    shared = time_per_call(lambda p: _shared_engine_chain(*p), pairs)
+    assert shared < 1e-3, f"Shared engine chain too slow: {shared * 1e6:.1f}us/request"
+
+
+def test_engine_memo_benchmark(monkeypatch):
+    """Benchmark the engine chain on repeated requests: memo hits vs computing every time"""
+    pairs = _request_pairs()
+    uncached = time_per_call(lambda p: _shared_engine_chain(*p), pairs)
+
+    monkeypatch.setenv("ENGINE_MEMO_ENABLED", "true")
+    get_settings.cache_clear()
+    clear_engine_memos()
+    try:
+        for pair in pairs:
+            _shared_engine_chain(*pair)
+        memoized = time_per_call(lambda p: _shared_engine_chain(*p), pairs)
+        stats = get_engine_memo_stats()
+    finally:
+        clear_engine_memos()
+
+    assert all(s["hits"] > 0 for s in stats.values())
+    assert memoized < uncached
@@ -1,12 +1,16 @@
 # -*- coding: utf-8 -*-
 """
-Latency Performance Tests (12 tests)
+Latency Performance Tests (13 tests)
 Tests response time and latency metrics using fake_llm for cost efficiency
 """
+import asyncio
 import pytest
 import time
 from backend.api.pipeline_runner import run_full_pipeline
+from backend.core.utils.spans import SpanRecorder
+from backend.services.proxy_performance_metrics import ProxyPerformanceMetrics
 from backend.test_tools.llm_override import FakeLLM
+from backend.tests_performance.helpers.timing import time_per_call
 
 
 @pytest.mark.asyncio
@@ -187,3 +191,47 @@ async def test_latency_score_calculation():
     # Score calculation should be fast
     assert latency < 2.0, f"Score calculation latency too high: {latency:.3f}s"
 
+
+class DelayedLLM(FakeLLM):
+    """FakeLLM answering after a fixed delay (a fast provider)"""
+
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+
+    async def generate(self, prompt: str, **kwargs) -> str:
+        await asyncio.sleep(self.delay)
+        return await super().generate(prompt, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_latency_stage_span_overhead():
+    """Test stage span recording + metrics cost under 1% of a request with a 10 ms LLM call"""
+    prompts = [f"How does encryption protect message number {i}?" for i in range(20)]
+
+    async def mean_request_seconds(llm):
+        start = time.perf_counter()
+        for prompt in prompts:
+            result = await run_full_pipeline(prompt, "proxy", llm_override=llm, debug=True)
+        return (time.perf_counter() - start) / len(prompts), result
+
+    request_time, result = await mean_request_seconds(DelayedLLM(0.01))
+    no_llm_time, _ = await mean_request_seconds(FakeLLM())
+    stages = [span["stage"] for span in result["debug"]["spans"]]
+
+    # Replay the recording work of one request: one mark per stage, then the metrics update
+    metrics = ProxyPerformanceMetrics()
+
+    def record_request():
+        spans = SpanRecorder()
+        stage_start = spans.origin
+        for stage in stages:
+            stage_start = spans.mark(stage, stage_start)
+        metrics.record_pipeline("proxy", spans.spans, 1.0)
+
+    record_request()
+    overhead = time_per_call(lambda _: record_request(), range(2000))
+    assert overhead < 0.01 * request_time, (
+        f"Stage spans cost {overhead * 1e6:.2f}us/request for {len(stages)} stages "
+        f"({overhead / no_llm_time:.2%} of a zero-latency-LLM request)"
+    )
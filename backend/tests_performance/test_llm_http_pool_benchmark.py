@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+LLM HTTP Pool Benchmark
+Sequential LLM calls against the offline LLM simulator, with pooled clients
+and with a new client per call (the previous behaviour). The pooled path must
+reuse one connection and spend less time per request.
+"""
+import pytest
+
+from backend.config import get_settings
+from backend.core.llm.http_pool import close_llm_http_pool
+from backend.gateway.providers.local_llm_provider import generate_local_llm
+from backend.test_tools.llm_simulator import SimulatorProfile
+from backend.tests_performance.helpers.timing import async_time_per_call
+
+REQUESTS = 200
+
+
+@pytest.fixture
+def simulator_profile():
+    """Instant answers, so the time per request is the client and connection cost"""
+    return SimulatorProfile(latency_ms=0.0, seed=42)
+
+
+async def _run_requests(monkeypatch, simulator, pooled: bool) -> tuple:
+    """Seconds per request and connections opened for REQUESTS sequential calls"""
+    monkeypatch.setenv("LLM_HTTP_POOL_ENABLED", "true" if pooled else "false")
+    get_settings.cache_clear()
+    settings = get_settings()
+    simulator.reset_stats()
+
+    # Warm-up call (imports, first connection)
+    await generate_local_llm("warm up", settings)
+    elapsed = await async_time_per_call(lambda i: generate_local_llm(f"prompt {i}", settings), range(REQUESTS))
+    await close_llm_http_pool()
+    assert simulator.stats["completed"] == REQUESTS + 1
+    return elapsed, simulator.stats["connections"]
+
+
+@pytest.mark.asyncio
+async def test_pooled_client_reuses_connections(monkeypatch, llm_simulator):
+    """Benchmark pooled clients against a new client per call"""
+    one_shot, one_shot_connections = await _run_requests(monkeypatch, llm_simulator, pooled=False)
+    pooled, pooled_connections = await _run_requests(monkeypatch, llm_simulator, pooled=True)
+
+    assert one_shot_connections == REQUESTS + 1
+    assert pooled_connections == 1
+    assert pooled < one_shot, (
+        f"Pooled {pooled * 1e3:.2f}ms/request not faster than one-shot {one_shot * 1e3:.2f}ms/request"
+    )
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+SSE Coalescing Benchmark
+Concurrent score-mode streams with one SSE frame per token (window 0, the
+previous behaviour) and with coalesced frames (STREAM_COALESCE_WINDOW_MS).
+Coalescing must send far fewer frames and spend less CPU per token.
+"""
+import asyncio
+import time
+
+import pytest
+
+from backend.api import streaming
+from backend.config import get_settings
+
+STREAMS = 40
+TOKENS = 500
+BURST = 5
+
+
+@pytest.fixture(autouse=True)
+def token_stream(monkeypatch):
+    """_stream_llm_response replaced by TOKENS short tokens, a burst of BURST per 2ms network read"""
+    async def stream(prompt, settings, tenant=None):
+        for i in range(TOKENS):
+            if i % BURST == 0:
+                await asyncio.sleep(0.002)
+            yield f"word{i % 50} " if i % 12 else "Sentence ends. "
+
+    monkeypatch.setattr(streaming, "_stream_llm_response", stream)
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+async def _run_streams(monkeypatch, window_ms: float) -> tuple:
+    """Frames sent and CPU ms per 1k tokens for STREAMS concurrent streams"""
+    monkeypatch.setenv("STREAM_COALESCE_WINDOW_MS", str(window_ms))
+    get_settings.cache_clear()
+
+    async def consume(i):
+        return sum([1 async for chunk in streaming.stream_standalone_response(f"tell me a story {i}")
+                    if chunk.startswith('data: {"token"')])
+
+    cpu = time.process_time()
+    frames = sum(await asyncio.gather(*[consume(i) for i in range(STREAMS)]))
+    cpu_per_1k = (time.process_time() - cpu) * 1e3 / (STREAMS * TOKENS / 1000)
+    return frames, cpu_per_1k
+
+
+@pytest.mark.asyncio
+async def test_coalescing_reduces_frames_and_cpu(monkeypatch):
+    """Benchmark one frame per token against 30ms coalesced frames"""
+    await _run_streams(monkeypatch, 0)  # warm-up (imports, analyzer caches)
+    per_token_frames, per_token_cpu = await _run_streams(monkeypatch, 0)
+    coalesced_frames, coalesced_cpu = await _run_streams(monkeypatch, 30)
+
+    assert per_token_frames == STREAMS * TOKENS
+    assert coalesced_frames < per_token_frames / 5
+    assert coalesced_cpu < per_token_cpu
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Test Policy Map Registry (5 tests)
+Memoized, hot-reloadable policy map (no LLM)
+"""
+import json
+import os
+import pytest
+from backend.policy_engine.registry import PolicyMapRegistry, get_policy_map_fingerprint
+from backend.policy_engine.evaluator import get_policy_details, load_policy_map
+
+
+def _write_map(path, policies, mtime_ns=None):
+    path.write_text(json.dumps({"policies": policies, "metadata": {"version": "test"}}), encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_registry_parses_once(tmp_path):
+    """Test the same snapshot is returned while the file is unchanged"""
+    path = tmp_path / "policy_map.json"
+    _write_map(path, [{"id": "N1", "severity": "CRITICAL"}])
+    registry = PolicyMapRegistry(path, check_interval=0)
+    first = registry.snapshot()
+    assert registry.snapshot() is first
+    assert registry.get_policy("N1")["severity"] == "CRITICAL"
+    assert registry.get_policy("X9") is None
+
+
+def test_registry_reloads_on_change(tmp_path):
+    """Test a changed file is reloaded with a new fingerprint"""
+    path = tmp_path / "policy_map.json"
+    _write_map(path, [{"id": "N1", "severity": "CRITICAL"}], mtime_ns=1_000_000_000)
+    registry = PolicyMapRegistry(path, check_interval=0)
+    before = registry.fingerprint
+    _write_map(path, [{"id": "N1", "severity": "HIGH"}], mtime_ns=2_000_000_000)
+    assert registry.fingerprint != before
+    assert registry.get_policy("N1")["severity"] == "HIGH"
+
+
+def test_registry_touch_keeps_snapshot(tmp_path):
+    """Test a new mtime with identical content keeps the snapshot"""
+    path = tmp_path / "policy_map.json"
+    _write_map(path, [{"id": "N1"}], mtime_ns=1_000_000_000)
+    registry = PolicyMapRegistry(path, check_interval=0)
+    first = registry.snapshot()
+    os.utime(path, ns=(3_000_000_000, 3_000_000_000))
+    assert registry.snapshot() is first
+
+
+def test_registry_keeps_snapshot_on_invalid_json(tmp_path):
+    """Test a broken file does not replace a loaded map"""
+    path = tmp_path / "policy_map.json"
+    _write_map(path, [{"id": "N1"}], mtime_ns=1_000_000_000)
+    registry = PolicyMapRegistry(path, check_interval=0)
+    first = registry.snapshot()
+    path.write_text("{not json", encoding="utf-8")
+    os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+    assert registry.snapshot() is first
+
+
+def test_evaluator_uses_registry():
+    """Test evaluator helpers read the process-wide registry"""
+    assert load_policy_map() is load_policy_map()
+    assert get_policy_details("N2")["risk_modifier"] == 0.9
+    assert len(get_policy_map_fingerprint()) == 64
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Test Policy Trigger Index (6 tests)
+Deterministic checks of the compiled N/F/Z/A trigger index (no LLM)
+"""
+import pytest
+from backend.policy_engine.evaluator import evaluate_policies, get_trigger_index
+from backend.policy_engine.N_policies import evaluate_N_policies
+from backend.policy_engine.trigger_index import PolicyTriggerIndex
+from backend.tests_policy.helpers.load_policy_map import load_policy_map
+
+
+def test_trigger_index_covers_policy_map():
+    """Test every policy in policy_map.json is indexed, in policy map order"""
+    policy_ids = [p["id"] for p in load_policy_map()["policies"]]
+    assert list(get_trigger_index().policy_ids) == policy_ids
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("How do I make a bomb?", ["N1"]),
+    ("I want to commit   suicide", ["N2"]),
+    ("Tell me about the weather", []),
+    ("bombastic speech", []),
+    ("steal someone's identity", ["F2"]),
+])
+def test_trigger_index_matches(text, expected):
+    """Test word-bounded and multi-word trigger matching"""
+    assert get_trigger_index().match(text) == expected
+
+
+def test_evaluate_policies_input_and_output():
+    """Test input and output violations are merged and max risk is used"""
+    violations, risk = evaluate_policies("how to hack a server", "you should commit suicide")
+    assert violations == ["Z2", "N2"]
+    assert risk == 0.9
+
+
+def test_evaluate_policies_reuses_input_result():
+    """Test a previous input result gives the same combined result"""
+    input_result = evaluate_policies("how to hack a server")
+    combined = evaluate_policies("how to hack a server", "track someone", input_result=input_result)
+    assert combined == evaluate_policies("how to hack a server", "track someone")
+
+
+def test_module_checks_report_triggers():
+    """Test per-policy checks still report every matching trigger"""
+    results = evaluate_N_policies("how to poison someone")
+    triggers = [v["trigger"] for v in results[0]["violations"]]
+    assert results[0]["risk_modifier"] == 0.8
+    assert triggers == ["poison", "poison someone", "how to poison"]
+
+
+def test_policy_map_triggers_are_indexed():
+    """Test triggers only listed in the policy map are indexed as well"""
+    policy_map = {"policies": [{"id": "X1", "triggers": ["blackmail"], "risk_modifier": 0.5}]}
+    index = PolicyTriggerIndex(policy_map, [])
+    assert index.match("Blackmail them") == ["X1"]
+    assert index.risk_modifier(["X1"]) == 0.5